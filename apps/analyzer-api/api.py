@@ -92,6 +92,11 @@ async def post_analyze(request: Request) -> JSONResponse:
             )
         if exc.code == "INVALID_INPUT":
             return _validation_error(exc.message)
+        if exc.code == "TIMEOUT":
+            return JSONResponse(
+                status_code=408,
+                content={"code": "ANALYZE_TIMEOUT", "message": exc.message},
+            )
         return JSONResponse(status_code=500, content={"code": exc.code, "message": exc.message})
 
     return JSONResponse(status_code=200, content=output)
@@ -194,6 +194,9 @@ def validate_analysis_output_v1(
                         )
                     _validate_guest_candidates(mval["candidates"], path + ".candidates")
 
+            if role != "pro" and "tempo_curve" in mval:
+                raise _err(path + ".tempo_curve", "tempo_curve is pro-only")
+
             # Engine v1 says bpm/key_mode MUST be omitted when unreliable.
             # This validator can't compute reliability, but it can prevent them being returned
             # as locked.
@@ -16,6 +16,14 @@ class EngineV1Tunables:
     # Internal processing
     INTERNAL_SAMPLE_RATE_HZ: int = 44100
 
+    # Decode budgets (wall-clock seconds per decode stage; None disables the budget).
+    # Operational limits only: they bound worker time, they do not change outputs.
+    decode_transcode_timeout_seconds: float | None = 30.0
+
+    # Memory cap (bytes, per analysis) on magnitude spectrograms cached by
+    # DerivedSignals; geometries beyond it are streamed. Operational only.
+    spectrogram_cache_bytes: int = 64 * 1024 * 1024
+
     # Omit thresholds (global, applies to all roles)
     bpm_min_confidence_omit: float = 0.35
     key_mode_min_confidence_omit: float = 0.45
@@ -34,6 +42,38 @@ class EngineV1Tunables:
     key_mode_top2_ambiguity_threshold: float = 0.15
     mode_emit_pair_stability_min: float = 0.90
     mode_emit_pair_gap_min: float = 0.25
+    # Softmax temperature turning per-window key correlations into soft votes;
+    # lower values approach one hard vote per window.
+    key_mode_window_score_temperature: float = 0.01
+
+    # Key hint windows from PCM chroma. Backend "fft": STFT on the mono downmix
+    # decimated by key_chroma_decimate (n_fft/hop in decimated samples).
+    # Backend "goertzel" (low-CPU tiers): one Goertzel filter per semitone over
+    # key_chroma_goertzel_octaves octaves from key_chroma_fmin_hz, each about
+    # key_chroma_goertzel_cycles periods long, on heavier decimation; same frame period.
+    # CPU: FFT chroma costs about 55-70% of the tempo front end, Goertzel about 20%.
+    key_chroma_backend: str = "fft"
+    key_chroma_decimate: int = 8
+    key_chroma_n_fft: int = 2048
+    key_chroma_hop: int = 2048
+    key_chroma_fmin_hz: float = 110.0
+    key_chroma_fmax_hz: float = 2000.0
+    key_chroma_goertzel_decimate: int = 16
+    key_chroma_goertzel_octaves: int = 3
+    key_chroma_goertzel_cycles: float = 17.0
+    key_chroma_window_seconds: float = 8.0
+    key_chroma_hop_seconds: float = 4.0
+    # Windows whose best key profile correlates below this carry no key hint.
+    key_chroma_min_correlation: float = 0.6
+    # Windows quieter than this fraction of the loudest window are skipped.
+    key_chroma_min_relative_energy: float = 0.05
+
+    # Tonal drift (Free/Pro events): one-sided CUSUM over per-window key scores.
+    # A competing key must out-score the held key by tonal_drift_margin per window,
+    # accumulating tonal_drift_threshold over at least tonal_drift_min_windows windows.
+    tonal_drift_threshold: float = 0.3
+    tonal_drift_margin: float = 0.05
+    tonal_drift_min_windows: int = 2
 
     # Tempo candidates (half/double)
     tempo_half_double_delta_max: float = 0.08
@@ -41,7 +81,17 @@ class EngineV1Tunables:
     # Grid thresholds
     grid_min_confidence_omit: float = 0.25
     grid_min_confidence_minimally_usable: float = 0.45
+    # Alignment score from which a grid reports "high" confidence.
+    grid_min_confidence_high: float = 0.60
+    # Non-Pro roles see a locked grid's preview (anchor, meter) only from this score.
     grid_guest_preview_min_confidence: float = 0.60
+    # Beat tracker: penalty weight on log(interval / period)^2 between beats.
+    grid_beat_tightness: float = 100.0
+    grid_beats_per_bar: int = 4
+    # Onset energy within this distance of a beat counts as beat-aligned.
+    grid_alignment_tolerance_seconds: float = 0.02
+    # Downbeats are omitted unless the best bar phase beats the runner-up by this margin.
+    grid_downbeat_min_margin: float = 0.15
 
     # Event consolidation (Pro)
     merge_gap_seconds: float = 0.10
@@ -93,6 +143,15 @@ class EngineV1Tunables:
     bpm_reportable_direct_double_min_score: float = 0.12
     bpm_reportable_direct_double_min_support: float = 0.08
 
+    # -----------------------------
+    # Tempo curve (Pro)
+    # -----------------------------
+    # Per-window tempo smoothed by a Viterbi pass over window candidates.
+    tempo_curve_min_windows: int = 3
+    # Path cost per octave of tempo change between adjacent windows (emissions are 0-1),
+    # so a single window cannot flip the curve to half/double time.
+    tempo_curve_octave_penalty: float = 2.0
+
 
 DEFAULT_TUNABLES_V1 = EngineV1Tunables()
 
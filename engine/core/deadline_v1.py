@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Literal
+
+from engine.core.errors import EngineError
+
+# What a runner does once its deadline passes: stop with TIMEOUT, or skip the
+# remaining stages and return what it has (with a warning).
+DeadlinePolicy = Literal["raise", "partial"]
+
+
+class CancellationTokenV1:
+    """
+    Thread-safe cancel flag shared by a caller and the analyses it started.
+
+    `cancel()` may be called from any thread; running analyses notice it at
+    their next deadline check and stop there. A token with a `parent` also
+    reads as cancelled once the parent is, so a runner can add its own cancel
+    source without taking over the caller's token.
+    """
+
+    def __init__(self, *, parent: CancellationTokenV1 | None = None) -> None:
+        self._event = threading.Event()
+        self._parent = parent
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        return self._parent is not None and self._parent.cancelled
+
+
+class DeadlineV1:
+    """
+    Cooperative time budget for one analysis (monotonic clock).
+
+    Long loops (PCM blocks, analysis windows) and the runner between stages
+    call `check(stage)`, which raises EngineError(TIMEOUT) once the budget is
+    spent or the optional token is cancelled; `expired()` asks without raising.
+    Nothing is interrupted preemptively, so work stops at the next check.
+    """
+
+    def __init__(
+        self,
+        *,
+        seconds: float | None = None,
+        token: CancellationTokenV1 | None = None,
+    ):
+        if seconds is not None and not seconds > 0.0:
+            raise ValueError("seconds must be > 0")
+        self._seconds = float(seconds) if seconds is not None else None
+        self._expires_at = time.monotonic() + self._seconds if self._seconds is not None else None
+        self._token = token
+
+    @property
+    def seconds(self) -> float | None:
+        """The budget this deadline was created with (None: cancellation only)."""
+        return self._seconds
+
+    def remaining(self) -> float | None:
+        """Seconds left (0.0 once spent); None without a time budget."""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def cancelled(self) -> bool:
+        return self._token is not None and self._token.cancelled
+
+    def expired(self) -> bool:
+        if self.cancelled():
+            return True
+        return self._expires_at is not None and time.monotonic() >= self._expires_at
+
+    def check(self, stage: str) -> None:
+        if not self.expired():
+            return
+        if self.cancelled():
+            raise EngineError(
+                code="TIMEOUT",
+                message="Analysis cancelled",
+                context={"stage": stage, "reason": "cancelled"},
+            )
+        raise EngineError(
+            code="TIMEOUT",
+            message="Analysis exceeded time budget",
+            context={"stage": stage, "reason": "deadline", "timeout_seconds": self._seconds},
+        )
@@ -6,6 +6,7 @@ ErrorCode = Literal[
     "INVALID_INPUT",
     "UNSUPPORTED_INPUT",
     "CONTRACT_VIOLATION",
+    "TIMEOUT",
     "INTERNAL_ERROR",
 ]
 
@@ -25,6 +26,16 @@ class EngineError(Exception):
         self.message: str = str(message)
         self.context: dict[str, Any] | None = context or None
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Keyword-only __init__: pickle by fields so errors cross process boundaries.
+        return (_rebuild_engine_error, (self.code, self.message, self.context))
+
+
+def _rebuild_engine_error(
+    code: ErrorCode, message: str, context: dict[str, Any] | None
+) -> EngineError:
+    return EngineError(code=code, message=message, context=context)
+
 
 def raise_engine_error(code: ErrorCode, message: str, **context: Any) -> None:
     raise EngineError(code=code, message=message, context=context or None)
@@ -650,3 +650,77 @@ def format_text_report(metrics: EvalMetrics) -> str:
 
     lines.append("=" * 80)
     return "\n".join(lines)
+
+
+def compare_key_backends(
+    results_by_backend: dict[str, list[PredictionResult]],
+    *,
+    reference: str = "fft",
+    cpu_seconds: dict[str, float] | None = None,
+) -> dict[str, Any]:
+    """
+    Key/mode accuracy per chroma backend, against each other.
+
+    Args:
+        results_by_backend: Results of the same fixtures per backend name.
+        reference: Backend the others are compared with (default: the FFT backend).
+        cpu_seconds: Optional CPU time spent per backend run.
+
+    Returns:
+        JSON-serializable dict: per backend the key_strict accuracy/omit rate
+        (as `compute_metrics`), `agreement_with_reference` (fraction of fixtures
+        run by both where the emitted key and mode, or the omission, match) and
+        `cpu_seconds`.
+    """
+
+    def _label(r: PredictionResult) -> tuple[str | None, str | None]:
+        if r.key_mode_omitted:
+            return (None, None)
+        return (r.key_value, r.mode_value)
+
+    ref = {
+        r.fixture.path: r
+        for r in results_by_backend.get(reference, [])
+        if r.success and not r.skipped
+    }
+    backends: dict[str, Any] = {}
+    for name, results in results_by_backend.items():
+        m = compute_metrics(results)
+        compared = 0
+        agreed = 0
+        for r in results:
+            base = ref.get(r.fixture.path)
+            if base is None or not r.success or r.skipped:
+                continue
+            compared += 1
+            if _label(r) == _label(base):
+                agreed += 1
+        backends[name] = {
+            "n_total_strict": m.key_n_total_strict,
+            "n_predicted": m.key_n_predicted,
+            "accuracy_key": m.key_accuracy,
+            "accuracy_both": m.key_both_accuracy,
+            "omit_rate": m.key_omit_rate,
+            "n_compared": compared,
+            "agreement_with_reference": agreed / float(compared) if compared > 0 else None,
+            "cpu_seconds": (cpu_seconds or {}).get(name),
+        }
+    return {"reference": reference, "backends": backends}
+
+
+def format_key_backend_report(comparison: dict[str, Any]) -> str:
+    """Format `compare_key_backends` output as human-readable text."""
+
+    def _pct(v: Any) -> str:
+        return f"{float(v) * 100:.1f}%" if isinstance(v, (int, float)) else "N/A"
+
+    lines = [f"Key Chroma Backends (reference: {comparison['reference']}):"]
+    for name, b in comparison["backends"].items():
+        cpu = b.get("cpu_seconds")
+        cpu_str = f"{float(cpu):.2f}s" if isinstance(cpu, (int, float)) else "N/A"
+        lines.append(
+            f"  {name}: accuracy (both) {_pct(b['accuracy_both'])}, "
+            f"accuracy (key) {_pct(b['accuracy_key'])}, omit rate {_pct(b['omit_rate'])}, "
+            f"agreement {_pct(b['agreement_with_reference'])}, CPU {cpu_str}"
+        )
+    return "\n".join(lines)
@@ -17,6 +17,9 @@ Examples:
 
     # Fail if any audio file is missing
     PYTHONPATH=. python3 engine/eval/run_eval.py --fail-on-missing-files
+
+    # Also rerun with the Goertzel key chroma backend and compare with FFT
+    PYTHONPATH=. python3 engine/eval/run_eval.py --compare-key-chroma-backends
 """
 
 from __future__ import annotations
@@ -25,11 +28,20 @@ import argparse
 import csv
 import json
 import sys
+import time
+from dataclasses import replace
 from pathlib import Path
 from typing import Any
 
+from engine.core.config import EngineConfig
 from engine.eval.loader import load_fixtures
-from engine.eval.metrics import compute_metrics, format_text_report, metrics_to_json
+from engine.eval.metrics import (
+    compare_key_backends,
+    compute_metrics,
+    format_key_backend_report,
+    format_text_report,
+    metrics_to_json,
+)
 from engine.eval.runner import run_all_fixtures
 from engine.ingest.ingest_v1 import decode_input_path_v1
 
@@ -431,6 +443,12 @@ def main() -> int:
         type=Path,
         help="Optional: write per-fixture debug summary CSV to this path",
     )
+    parser.add_argument(
+        "--compare-key-chroma-backends",
+        action="store_true",
+        help="Rerun with the Goertzel key chroma backend and report key accuracy, "
+        "agreement and CPU time against the FFT backend (default: off)",
+    )
 
     args = parser.parse_args()
 
@@ -458,17 +476,28 @@ def main() -> int:
 
     # Run evaluation
     print(f"Running analysis with role={args.role}...", file=sys.stderr)
+    base_config = EngineConfig()
+    backend_configs = {"fft": replace(base_config.tunables, key_chroma_backend="fft")}
+    if args.compare_key_chroma_backends:
+        backend_configs["goertzel"] = replace(base_config.tunables, key_chroma_backend="goertzel")
+    results_by_backend: dict[str, list[Any]] = {}
+    cpu_seconds: dict[str, float] = {}
     try:
-        results = run_all_fixtures(
-            fixtures,
-            role=args.role,
-            fail_on_missing=args.fail_on_missing_files,
-            fail_fast=args.fail_fast,
-            debug_traceback=args.debug_traceback,
-        )
+        for backend, tunables in backend_configs.items():
+            started = time.process_time()
+            results_by_backend[backend] = run_all_fixtures(
+                fixtures,
+                role=args.role,
+                fail_on_missing=args.fail_on_missing_files,
+                fail_fast=args.fail_fast,
+                debug_traceback=args.debug_traceback,
+                config=EngineConfig(tunables=tunables),
+            )
+            cpu_seconds[backend] = time.process_time() - started
     except FileNotFoundError as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
+    results = results_by_backend["fft"]
 
     # Compute metrics
     metrics = compute_metrics(results, top_n_errors=args.top_n)
@@ -495,6 +524,12 @@ def main() -> int:
     json_report["skipped"] = skipped
     json_report["summary_counts"] = summary_counts
     json_report["fixtures"] = fixture_rows
+    if args.compare_key_chroma_backends:
+        comparison = compare_key_backends(
+            results_by_backend, reference="fft", cpu_seconds=cpu_seconds
+        )
+        print("\n" + format_key_backend_report(comparison), file=sys.stderr)
+        json_report["key_chroma_backends"] = comparison
     json_str = json.dumps(json_report, indent=2)
 
     if args.output:
@@ -6,6 +6,7 @@ import traceback
 from pathlib import Path
 from typing import Any, Literal
 
+from engine.core.config import EngineConfig
 from engine.core.errors import EngineError
 from engine.eval.eval_types import Fixture, PredictionResult
 from engine.pipeline.run import run_analysis_v1
@@ -76,6 +77,7 @@ def run_fixture(
     role: Role = "pro",
     fail_on_missing: bool = False,
     debug_traceback: bool = False,
+    config: EngineConfig | None = None,
 ) -> PredictionResult:
     """
     Run analysis on a single fixture and extract predictions.
@@ -85,6 +87,7 @@ def run_fixture(
         role: Analysis role (guest/free/pro). Default: pro for full output.
         fail_on_missing: If True, raise error when audio file missing.
                          If False, skip and record.
+        config: Engine config for the run (default: EngineConfig()).
 
     Returns:
         PredictionResult with extracted predictions.
@@ -106,7 +109,7 @@ def run_fixture(
 
     # Run analysis
     try:
-        output = run_analysis_v1(input_path=str(audio_path), role=role)
+        output = run_analysis_v1(input_path=str(audio_path), role=role, config=config)
         success = True
         error = None
         failure = None
@@ -235,6 +238,7 @@ def run_all_fixtures(
     fail_on_missing: bool = False,
     fail_fast: bool = False,
     debug_traceback: bool = False,
+    config: EngineConfig | None = None,
 ) -> list[PredictionResult]:
     """
     Run analysis on all fixtures.
@@ -244,6 +248,7 @@ def run_all_fixtures(
         role: Analysis role.
         limit: Optional limit on number of fixtures to process.
         fail_on_missing: If True, raise error when audio file missing.
+        config: Engine config for every run (default: EngineConfig()).
 
     Returns:
         List of prediction results (same order as fixtures).
@@ -258,6 +263,7 @@ def run_all_fixtures(
             role=role,
             fail_on_missing=fail_on_missing,
             debug_traceback=debug_traceback,
+            config=config,
         )
         results.append(result)
         if fail_fast and (not result.success and not result.skipped):
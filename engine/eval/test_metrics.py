@@ -5,7 +5,13 @@ from __future__ import annotations
 import pytest
 
 from engine.eval.eval_types import Fixture, PredictionResult
-from engine.eval.metrics import compute_metrics, format_text_report, metrics_to_json
+from engine.eval.metrics import (
+    compare_key_backends,
+    compute_metrics,
+    format_key_backend_report,
+    format_text_report,
+    metrics_to_json,
+)
 
 
 def _make_fixture(
@@ -530,3 +536,42 @@ def test_compute_metrics_key_mode_coverage_and_withheld_counts() -> None:
     assert metrics.mode_omit_rate == pytest.approx(2 / 3, abs=1e-6)
     assert metrics.key_mode_accuracy == pytest.approx(1.0, abs=1e-6)
     assert metrics.key_both_accuracy == pytest.approx(1.0, abs=1e-6)
+
+
+def test_compare_key_backends_reports_accuracy_and_agreement() -> None:
+    """Each backend is scored on its own and against the FFT reference."""
+    fixtures = [
+        _make_fixture(f"{k}.wav", key_gt=k, mode_gt="minor", flags={"key_strict"})
+        for k in ("A", "B", "C", "D")
+    ]
+
+    def _run(labels: list[str | None]) -> list[PredictionResult]:
+        out = []
+        for f, key in zip(fixtures, labels, strict=True):
+            r = _make_result(f)
+            r.key_value = key
+            r.mode_value = "minor" if key is not None else None
+            r.key_mode_omitted = key is None
+            out.append(r)
+        return out
+
+    fft = _run(["A", "B", "C", None])
+    goertzel = _run(["A", "E", None, None])
+    goertzel.append(_make_result(_make_fixture("extra.wav"), skipped=True, success=False))
+
+    comparison = compare_key_backends(
+        {"fft": fft, "goertzel": goertzel}, cpu_seconds={"fft": 2.0, "goertzel": 1.0}
+    )
+    assert comparison["reference"] == "fft"
+    f, g = comparison["backends"]["fft"], comparison["backends"]["goertzel"]
+    assert f["accuracy_both"] == pytest.approx(1.0)
+    assert f["agreement_with_reference"] == pytest.approx(1.0)
+    assert g["accuracy_both"] == pytest.approx(0.5)
+    assert g["omit_rate"] == pytest.approx(0.5)
+    assert g["n_compared"] == 4
+    # A agrees, E != B, omitted != C, both omitted D.
+    assert g["agreement_with_reference"] == pytest.approx(0.5)
+    assert g["cpu_seconds"] == 1.0
+
+    text = format_key_backend_report(comparison)
+    assert "goertzel: accuracy (both) 50.0%" in text
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from engine.features.bpm_policy_v1 import BpmPolicyV1
+from engine.features.types import FeatureContext
+
+# (bpm_key, score_key, double_ratio_key) per hint band.
+BPM_BAND_KEYS_V1 = (
+    ("best_bpm", "best_score", "double_ratio"),
+    ("high_best_bpm", "high_best_score", "high_double_ratio"),
+)
+
+
+def _fold_into_range(bpm: float, *, lo: float, hi: float) -> float:
+    """
+    Fold a BPM estimate into a musically sensible range using half/double steps.
+
+    This is not "correctness"; it's normalization. The raw estimate can still be
+    ambiguous (70 vs 140) and we preserve that ambiguity via candidates.
+    """
+    x = float(bpm)
+    if x <= 0:
+        return x
+    # Prevent infinite loops on extreme values.
+    for _ in range(16):
+        if x < lo:
+            x *= 2.0
+            continue
+        if x > hi:
+            x /= 2.0
+            continue
+        break
+    return x
+
+
+@dataclass(frozen=True)
+class BpmBandEvidence:
+    """
+    Score-weighted histogram of one hint band's folded, rounded window tempos.
+
+    `ranked` is (bpm, weight) by weight desc, then bpm asc (deterministic ties).
+    """
+
+    ranked: tuple[tuple[int, float], ...] = ()
+    total_weight: float = 0.0
+
+    def mode(self) -> tuple[int | None, float]:
+        """(mode_bpm, fraction of total weight voting for it)."""
+        if not self.ranked or self.total_weight <= 0.0:
+            return None, 0.0
+        bpm, w = self.ranked[0]
+        return int(bpm), float(w / self.total_weight)
+
+    def top2(self) -> tuple[int | None, float, int | None, float]:
+        """(top_bpm, top_frac, runnerup_bpm, runnerup_frac); fractions of total weight."""
+        if not self.ranked or self.total_weight <= 0.0:
+            return None, 0.0, None, 0.0
+        top_bpm, top_w = self.ranked[0]
+        runner_bpm: int | None = None
+        runner_w = 0.0
+        if len(self.ranked) >= 2:
+            runner_bpm, runner_w = self.ranked[1]
+        total = self.total_weight
+        return int(top_bpm), float(top_w / total), runner_bpm, float(runner_w / total)
+
+
+@dataclass(frozen=True)
+class BpmEvidence:
+    """
+    Everything the BPM policy reads from a FeatureContext, aggregated in one pass.
+
+    - windows_folded: window tempos selected for candidate scoring (details above
+      the min score, else plain hint windows, else the exact-hint fallback),
+      folded into the normalized range.
+    - low / high: per-band weighted histograms from window details.
+    - double_ratio_n / double_ratio_ambiguous_n: half-lag ratios seen, and how
+      many reached `double_ratio_ambiguous_min`.
+    - has_details: whether window details were present (gates multiband checks).
+    """
+
+    windows_folded: tuple[float, ...]
+    low: BpmBandEvidence = BpmBandEvidence()
+    high: BpmBandEvidence = BpmBandEvidence()
+    double_ratio_n: int = 0
+    double_ratio_ambiguous_n: int = 0
+    has_details: bool = False
+
+
+def _band_from_weights(weights: dict[int, float], total_w: float) -> BpmBandEvidence:
+    if not weights or total_w <= 0.0:
+        return BpmBandEvidence()
+    ranked = tuple(sorted(weights.items(), key=lambda kv: (-kv[1], kv[0])))
+    return BpmBandEvidence(ranked=ranked, total_weight=total_w)
+
+
+def _fallback_windows(ctx: FeatureContext) -> list[float]:
+    if ctx.bpm_hint_windows:
+        return [float(x) for x in ctx.bpm_hint_windows]
+    if ctx.bpm_hint_exact is None:
+        return []
+
+    # Deterministic fallback: treat the hint as stable across windows.
+    # We keep at least 3 windows for stability scoring, unless audio is very short.
+    dur = float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0)
+    n = 2 if dur and dur < 6.0 else 3
+    return [float(ctx.bpm_hint_exact)] * n
+
+
+def _detail_value_v1(v: Any) -> float | None:
+    """A window detail value as float; missing, non-numeric and NaN values are None."""
+    if v is None:
+        return None
+    try:
+        x = float(v)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(x) else x
+
+
+@dataclass(frozen=True)
+class BpmEvidenceColumnsV1:
+    """
+    One track's BPM evidence as columns (the input to `aggregate_bpm_evidence_columns_v1`).
+
+    `bands` is ((bpm, score, double_ratio), ...) in `BPM_BAND_KEYS_V1` order, one
+    float column per key; NaN marks a missing value. The evidence store hands
+    out these records over slices of its mapped columns.
+    """
+
+    bands: tuple[tuple[Sequence[float], Sequence[float], Sequence[float]], ...]
+    fallback_windows: Sequence[float]
+    has_details: bool
+    has_rhythm_evidence: bool
+    duration_seconds: float
+
+    @classmethod
+    def from_context(cls, ctx: FeatureContext) -> BpmEvidenceColumnsV1:
+        """Columns for `ctx`; missing, non-numeric and NaN detail values become NaN."""
+        details: Any = getattr(ctx, "bpm_hint_window_details", None)
+        has_details = bool(details) and isinstance(details, list)
+        rows = [d for d in details if isinstance(d, dict)] if has_details else []
+
+        def column(key: str) -> list[float]:
+            out: list[float] = []
+            for d in rows:
+                x = _detail_value_v1(d.get(key))
+                out.append(math.nan if x is None else x)
+            return out
+
+        return cls(
+            bands=tuple(
+                (column(bpm_key), column(score_key), column(ratio_key))
+                for bpm_key, score_key, ratio_key in BPM_BAND_KEYS_V1
+            ),
+            fallback_windows=_fallback_windows(ctx),
+            has_details=has_details,
+            has_rhythm_evidence=bool(ctx.has_rhythm_evidence),
+            duration_seconds=float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0),
+        )
+
+
+def aggregate_bpm_evidence_v1(ctx: FeatureContext, *, policy: BpmPolicyV1) -> BpmEvidence:
+    """
+    Single pass over `bpm_hint_window_details` building the BPM evidence summary.
+
+    Each detail value is parsed, folded and rounded once; band weights are the
+    per-window scores clamped to [0, 1] (1.0 when a window carries no score).
+    Missing, non-numeric and NaN values count as absent, exactly as NaN does in
+    `aggregate_bpm_evidence_columns_v1` (which the evidence store replays).
+    """
+    lo = float(policy.lo_bpm)
+    hi = float(policy.hi_bpm)
+    details: Any = getattr(ctx, "bpm_hint_window_details", None)
+    has_details = bool(details) and isinstance(details, list)
+
+    windows: list[float] = []
+    band_weights: tuple[dict[int, float], dict[int, float]] = ({}, {})
+    band_totals = [0.0, 0.0]
+    ratio_n = 0
+    ratio_amb = 0
+    if has_details:
+        min_score = policy.hint_window_min_score
+        ratio_min = policy.double_ratio_ambiguous_min
+        for d in details:
+            if not isinstance(d, dict):
+                continue
+            for band, (bpm_key, score_key, ratio_key) in enumerate(BPM_BAND_KEYS_V1):
+                bpm = _detail_value_v1(d.get(bpm_key))
+                if bpm is not None and math.isinf(bpm):
+                    bpm = None  # infinite tempos carry no evidence either
+                s = _detail_value_v1(d.get(score_key))
+
+                # Scoring windows: drop low-quality periodicities.
+                if bpm is not None and not (s is not None and s < min_score):
+                    windows.append(bpm)
+
+                # Band histogram (all windows, score-weighted).
+                if bpm is not None and bpm > 0:
+                    bpm_i = int(round(_fold_into_range(bpm, lo=lo, hi=hi)))
+                    if policy.lo_bpm <= bpm_i <= policy.hi_bpm:
+                        # Clamp: details are "scores" but we do not assume their scale.
+                        w = 1.0 if s is None else min(max(s, 0.0), 1.0)
+                        weights = band_weights[band]
+                        weights[bpm_i] = weights.get(bpm_i, 0.0) + w
+                        band_totals[band] += w
+
+                r = _detail_value_v1(d.get(ratio_key))
+                if r is not None:
+                    ratio_n += 1
+                    if r >= ratio_min:
+                        ratio_amb += 1
+
+    if not windows:
+        windows = _fallback_windows(ctx)
+
+    return BpmEvidence(
+        windows_folded=tuple(_fold_into_range(x, lo=lo, hi=hi) for x in windows),
+        low=_band_from_weights(band_weights[0], band_totals[0]),
+        high=_band_from_weights(band_weights[1], band_totals[1]),
+        double_ratio_n=ratio_n,
+        double_ratio_ambiguous_n=ratio_amb,
+        has_details=has_details,
+    )
+
+
+def aggregate_bpm_evidence_columns_v1(
+    bands: Sequence[tuple[Sequence[float], Sequence[float], Sequence[float]]],
+    *,
+    fallback_windows: Sequence[float],
+    has_details: bool,
+    policy: BpmPolicyV1,
+) -> BpmEvidence:
+    """
+    `aggregate_bpm_evidence_v1` over columnar window evidence.
+
+    `bands` is ((bpm, score, double_ratio), ...) in `BPM_BAND_KEYS_V1` order, one
+    equal-length float column per key for a single track; NaN marks a missing
+    value. `fallback_windows` is what `_fallback_windows` yields for the track.
+    """
+    lo = float(policy.lo_bpm)
+    hi = float(policy.hi_bpm)
+    min_score = policy.hint_window_min_score
+    ratio_min = policy.double_ratio_ambiguous_min
+    isnan = math.isnan
+    isfinite = math.isfinite
+
+    windows: list[float] = []
+    band_weights: tuple[dict[int, float], dict[int, float]] = ({}, {})
+    band_totals = [0.0, 0.0]
+    ratio_n = 0
+    ratio_amb = 0
+    n = len(bands[0][0]) if bands else 0
+    for i in range(n):
+        for band, (bpms, scores, ratios) in enumerate(bands):
+            bpm = bpms[i]
+            s = scores[i]
+            has_score = not isnan(s)
+            if isfinite(bpm):
+                if not (has_score and s < min_score):
+                    windows.append(bpm)
+                if bpm > 0:
+                    bpm_i = int(round(_fold_into_range(bpm, lo=lo, hi=hi)))
+                    if policy.lo_bpm <= bpm_i <= policy.hi_bpm:
+                        w = 1.0
+                        if has_score:
+                            w = s
+                            if w < 0.0:
+                                w = 0.0
+                            if w > 1.0:
+                                w = 1.0
+                        weights = band_weights[band]
+                        weights[bpm_i] = weights.get(bpm_i, 0.0) + w
+                        band_totals[band] += w
+            r = ratios[i]
+            if not isnan(r):
+                ratio_n += 1
+                if r >= ratio_min:
+                    ratio_amb += 1
+
+    if not windows:
+        windows = [float(x) for x in fallback_windows]
+
+    return BpmEvidence(
+        windows_folded=tuple(_fold_into_range(x, lo=lo, hi=hi) for x in windows),
+        low=_band_from_weights(band_weights[0], band_totals[0]),
+        high=_band_from_weights(band_weights[1], band_totals[1]),
+        double_ratio_n=ratio_n,
+        double_ratio_ambiguous_n=ratio_amb,
+        has_details=has_details,
+    )
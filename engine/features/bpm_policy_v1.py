@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from engine.core.config import EngineConfig
+
+# Candidate family labels (v1 UI contract); tables store indices into this tuple.
+CANDIDATE_FAMILIES_V1 = ("base", "double", "half", "triplet", "dotted")
+_RELATIONS_V1 = ("normal", "half", "double")
+
+
+def _relation_to_base(bpm: int, base: int) -> str:
+    if base <= 0:
+        return "normal"
+    if abs(bpm - int(round(base / 2))) <= 1:
+        return "half"
+    if abs(bpm - (base * 2)) <= 1:
+        return "double"
+    return "normal"
+
+
+def _candidate_family_v1(candidate_bpm: int, base_bpm: int, *, tol_bpm: int) -> str:
+    """
+    Classify candidate tempo relative to a base tempo.
+
+    Families:
+      - base: ~base
+      - double: ~2x base
+      - half: ~0.5x base
+      - triplet: ~2/3 base
+      - dotted: ~3/2 base
+    """
+    tol = max(0, int(tol_bpm))
+    base = int(base_bpm)
+    cand = int(candidate_bpm)
+
+    if abs(cand - base) <= tol:
+        return "base"
+    if abs(cand - (2 * base)) <= tol:
+        return "double"
+    if abs((2 * cand) - base) <= tol:
+        return "half"
+
+    trip = int(round(float(base) * (2.0 / 3.0)))
+    if abs(cand - trip) <= tol:
+        return "triplet"
+    dotted = int(round(float(base) * 1.5))
+    if abs(cand - dotted) <= tol:
+        return "dotted"
+
+    # v1 UI contract: no "other" family; default to base.
+    return "base"
+
+
+def _tempo_family_agrees(a: int, b: int, *, tol_bpm: int) -> bool:
+    tol = max(0, int(tol_bpm))
+    if abs(a - b) <= tol:
+        return True
+    if abs(a - (2 * b)) <= tol:
+        return True
+    if abs((2 * a) - b) <= tol:
+        return True
+    # Triplet/dotted relationships (3/2 and 2/3).
+    if abs(a - int(round(float(b) * 1.5))) <= tol:
+        return True
+    if abs(b - int(round(float(a) * 1.5))) <= tol:
+        return True
+    if abs(a - int(round(float(b) * (2.0 / 3.0)))) <= tol:
+        return True
+    if abs(b - int(round(float(a) * (2.0 / 3.0)))) <= tol:
+        return True
+    return False
+
+
+def _tempo_triplet_family_agrees(a: int, b: int, *, tol_bpm: int) -> bool:
+    """
+    Tempo "family" equivalence for score-gap computation.
+
+    We treat triplet/dotted (3/2 and 2/3) periodicities as equivalent evidence,
+    because they frequently arise from production subdivisions (e.g. triplet hats)
+    and should not be interpreted as a competing tempo family.
+
+    We intentionally do *not* treat half/double as equivalent here, because that
+    ambiguity is musically meaningful and should reduce confidence unless we
+    have other evidence to disambiguate.
+    """
+    tol = max(0, int(tol_bpm))
+    if abs(a - b) <= tol:
+        return True
+    if abs(a - int(round(float(b) * 1.5))) <= tol:
+        return True
+    if abs(b - int(round(float(a) * 1.5))) <= tol:
+        return True
+    if abs(a - int(round(float(b) * (2.0 / 3.0)))) <= tol:
+        return True
+    if abs(b - int(round(float(a) * (2.0 / 3.0)))) <= tol:
+        return True
+    return False
+
+
+@dataclass(frozen=True)
+class _RelationTableV1:
+    """Square lookup table over [lo, lo + size); values are small ints (bytes)."""
+
+    lo: int
+    size: int
+    cells: bytes = field(repr=False)
+
+    def index(self, a: int, b: int) -> int | None:
+        i = int(a) - self.lo
+        j = int(b) - self.lo
+        if 0 <= i < self.size and 0 <= j < self.size:
+            return i * self.size + j
+        return None
+
+
+def _build_table(lo: int, hi: int, cell) -> _RelationTableV1:  # type: ignore[no-untyped-def]
+    size = max(0, hi - lo + 1)
+    cells = bytearray(size * size)
+    for i in range(size):
+        row = i * size
+        for j in range(size):
+            cells[row + j] = cell(lo + i, lo + j)
+    return _RelationTableV1(lo=lo, size=size, cells=bytes(cells))
+
+
+@dataclass(frozen=True)
+class BpmPolicyV1:
+    """
+    EngineConfig compiled for the BPM extractor and reportable policy.
+
+    Tunables are resolved once (with the same fallbacks the extractor always
+    used) and tempo relations are precomputed as lookup tables over the tempo
+    domain the policy can see: the normalized range extended to the reportable
+    double-time range. Relation methods fall back to direct arithmetic outside
+    that domain, so results never depend on whether a lookup hit the table.
+
+    Build with `compile_bpm_policy_v1(config)`; instances are cached per config.
+    """
+
+    # Range / candidates
+    lo_bpm: int
+    hi_bpm: int
+    top_n: int
+    tol_bpm: int
+    hint_window_min_score: float
+
+    # Triplet support / promotion
+    triplet_beta: float
+    triplet_min_direct: float
+    promote_min_direct: float
+    promote_delta_max: float
+
+    # Confidence
+    gap_tol: int
+    gap_med: float
+    gap_high: float
+    stab_med: float
+    stab_high: float
+    min_dur_med: float
+    min_dur_high: float
+
+    # Multiband sanity / half-double ambiguity
+    multiband_min_stab: float
+    multiband_family_tol: int
+    multiband_runner_min: float
+    double_ratio_ambiguous_min: float
+    double_ratio_ambiguous_min_fraction: float
+
+    # Reportable policy
+    reportable_raw_stability_min: float
+    reportable_double_max_raw: float
+    reportable_double_min: int
+    reportable_double_max: int
+    reportable_runner_threshold: float
+    reportable_require_direct_for_flip: bool
+    reportable_confidence_cap: str
+    reportable_direct_min_score: float
+    reportable_direct_min_support: float
+
+    # Relation tables
+    _gap_family: _RelationTableV1 = field(repr=False)
+    _gap_triplet_family: _RelationTableV1 = field(repr=False)
+    _multiband_family: _RelationTableV1 = field(repr=False)
+    _candidate_family: _RelationTableV1 = field(repr=False)
+    _relation: _RelationTableV1 = field(repr=False)
+
+    def family_agrees(self, a: int, b: int) -> bool:
+        """`_tempo_family_agrees` at `gap_tol`."""
+        k = self._gap_family.index(a, b)
+        if k is None:
+            return _tempo_family_agrees(int(a), int(b), tol_bpm=self.gap_tol)
+        return bool(self._gap_family.cells[k])
+
+    def triplet_family_agrees(self, a: int, b: int) -> bool:
+        """`_tempo_triplet_family_agrees` at `gap_tol`."""
+        k = self._gap_triplet_family.index(a, b)
+        if k is None:
+            return _tempo_triplet_family_agrees(int(a), int(b), tol_bpm=self.gap_tol)
+        return bool(self._gap_triplet_family.cells[k])
+
+    def multiband_family_agrees(self, a: int, b: int) -> bool:
+        """`_tempo_family_agrees` at `multiband_family_tol`."""
+        k = self._multiband_family.index(a, b)
+        if k is None:
+            return _tempo_family_agrees(int(a), int(b), tol_bpm=self.multiband_family_tol)
+        return bool(self._multiband_family.cells[k])
+
+    def candidate_family(self, candidate_bpm: int, base_bpm: int) -> str:
+        """`_candidate_family_v1` at the UI tolerance (1 BPM)."""
+        k = self._candidate_family.index(candidate_bpm, base_bpm)
+        if k is None:
+            return _candidate_family_v1(int(candidate_bpm), int(base_bpm), tol_bpm=1)
+        return CANDIDATE_FAMILIES_V1[self._candidate_family.cells[k]]
+
+    def relation_to_base(self, bpm: int, base: int) -> str:
+        k = self._relation.index(bpm, base)
+        if k is None:
+            return _relation_to_base(int(bpm), int(base))
+        return _RELATIONS_V1[self._relation.cells[k]]
+
+
+@lru_cache(maxsize=16)
+def compile_bpm_policy_v1(config: EngineConfig) -> BpmPolicyV1:
+    """Resolve BPM tunables and precompute tempo-relation tables for `config`."""
+    t = config.tunables
+    lo = int(getattr(t, "bpm_normalize_min", 60))
+    hi = int(getattr(t, "bpm_normalize_max", 200))
+    tol = int(getattr(t, "bpm_window_match_tolerance_bpm", 1))
+    gap_tol = int(getattr(t, "bpm_gap_family_tolerance_bpm", max(2, tol)))
+    multiband_tol = int(getattr(t, "bpm_multiband_family_tolerance_bpm", 2))
+    dbl_min = int(t.bpm_reportable_double_min)
+    dbl_max = int(t.bpm_reportable_double_max)
+
+    # Tempos the policy compares: folded candidates/modes in [lo, hi] and the
+    # reportable double-time projection in [dbl_min, dbl_max].
+    dom_lo = max(1, min(lo, dbl_min))
+    dom_hi = max(hi, dbl_max)
+
+    def bit(fn, tol_bpm: int):  # type: ignore[no-untyped-def]
+        return lambda a, b: 1 if fn(a, b, tol_bpm=tol_bpm) else 0
+
+    return BpmPolicyV1(
+        lo_bpm=lo,
+        hi_bpm=hi,
+        top_n=int(getattr(t, "bpm_candidates_top_n", 5)),
+        tol_bpm=tol,
+        hint_window_min_score=float(getattr(t, "bpm_hint_window_min_score", 0.0)),
+        triplet_beta=float(getattr(t, "bpm_triplet_support_beta", 0.8)),
+        triplet_min_direct=float(getattr(t, "bpm_triplet_support_min_direct", 0.05)),
+        promote_min_direct=float(getattr(t, "bpm_triplet_promote_min_direct", 0.05)),
+        promote_delta_max=float(getattr(t, "bpm_triplet_promote_score_delta_max", 0.08)),
+        gap_tol=gap_tol,
+        gap_med=float(getattr(t, "bpm_gap_min_medium", 0.12)),
+        gap_high=float(getattr(t, "bpm_gap_min_high", 0.20)),
+        stab_med=float(getattr(t, "bpm_stability_min_medium", 0.60)),
+        stab_high=float(getattr(t, "bpm_stability_min_high", 0.75)),
+        min_dur_med=float(getattr(t, "bpm_min_duration_seconds_medium", 4.0)),
+        min_dur_high=float(getattr(t, "bpm_min_duration_seconds_high", 6.0)),
+        multiband_min_stab=float(getattr(t, "bpm_multiband_min_mode_stability", 0.65)),
+        multiband_family_tol=multiband_tol,
+        multiband_runner_min=float(getattr(t, "bpm_multiband_runnerup_min_fraction", 0.30)),
+        double_ratio_ambiguous_min=float(getattr(t, "bpm_double_ratio_ambiguous_min", 0.45)),
+        double_ratio_ambiguous_min_fraction=float(
+            getattr(t, "bpm_double_ratio_ambiguous_min_fraction", 0.60)
+        ),
+        reportable_raw_stability_min=float(t.bpm_reportable_raw_stability_min),
+        reportable_double_max_raw=float(t.bpm_reportable_double_max_raw),
+        reportable_double_min=dbl_min,
+        reportable_double_max=dbl_max,
+        reportable_runner_threshold=float(t.bpm_reportable_unrelated_competitor_threshold),
+        reportable_require_direct_for_flip=bool(
+            getattr(t, "bpm_reportable_require_direct_double_evidence_for_flip", True)
+        ),
+        reportable_confidence_cap=str(
+            t.bpm_reportable_confidence_cap_without_direct_double_evidence
+        ),
+        reportable_direct_min_score=float(
+            getattr(t, "bpm_reportable_direct_double_min_score", 0.12)
+        ),
+        reportable_direct_min_support=float(
+            getattr(t, "bpm_reportable_direct_double_min_support", 0.08)
+        ),
+        _gap_family=_build_table(dom_lo, dom_hi, bit(_tempo_family_agrees, gap_tol)),
+        _gap_triplet_family=_build_table(
+            dom_lo, dom_hi, bit(_tempo_triplet_family_agrees, gap_tol)
+        ),
+        _multiband_family=_build_table(dom_lo, dom_hi, bit(_tempo_family_agrees, multiband_tol)),
+        _candidate_family=_build_table(
+            dom_lo,
+            dom_hi,
+            lambda c, b: CANDIDATE_FAMILIES_V1.index(_candidate_family_v1(c, b, tol_bpm=1)),
+        ),
+        _relation=_build_table(
+            dom_lo, dom_hi, lambda v, b: _RELATIONS_V1.index(_relation_to_base(v, b))
+        ),
+    )
@@ -1,86 +1,21 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Any
 
 from engine.core.config import EngineConfig
+from engine.features.bpm_evidence_v1 import (
+    BpmEvidence,
+    BpmEvidenceColumnsV1,
+    aggregate_bpm_evidence_columns_v1,
+    aggregate_bpm_evidence_v1,
+)
+from engine.features.bpm_policy_v1 import BpmPolicyV1, compile_bpm_policy_v1
 from engine.features.types import FeatureContext
 from engine.observability import hooks
 
 
-def _fold_into_range(bpm: float, *, lo: float, hi: float) -> float:
-    """
-    Fold a BPM estimate into a musically sensible range using half/double steps.
-
-    This is not "correctness"; it's normalization. The raw estimate can still be
-    ambiguous (70 vs 140) and we preserve that ambiguity via candidates.
-    """
-    x = float(bpm)
-    if x <= 0:
-        return x
-    # Prevent infinite loops on extreme values.
-    for _ in range(16):
-        if x < lo:
-            x *= 2.0
-            continue
-        if x > hi:
-            x /= 2.0
-            continue
-        break
-    return x
-
-
-def _windows_from_ctx(ctx: FeatureContext, *, config: EngineConfig) -> list[float]:
-    # Prefer richer per-window details when available (can include multi-band hints).
-    details = getattr(ctx, "bpm_hint_window_details", None)
-    if details and isinstance(details, list):
-        min_score = float(getattr(config.tunables, "bpm_hint_window_min_score", 0.0))
-        out: list[float] = []
-        for d in details:
-            if not isinstance(d, dict):
-                continue
-            try:
-                v = d.get("best_bpm")
-                s = d.get("best_score")
-                if s is not None and float(s) < min_score:
-                    v = None
-                if v is not None:
-                    out.append(float(v))
-            except (TypeError, ValueError):
-                pass
-            try:
-                v = d.get("high_best_bpm")
-                s = d.get("high_best_score")
-                if s is not None and float(s) < min_score:
-                    v = None
-                if v is not None:
-                    out.append(float(v))
-            except (TypeError, ValueError):
-                pass
-        if out:
-            return out
-
-    if ctx.bpm_hint_windows:
-        return [float(x) for x in ctx.bpm_hint_windows]
-    if ctx.bpm_hint_exact is None:
-        return []
-
-    # Deterministic fallback: treat the hint as stable across windows.
-    # We keep at least 3 windows for stability scoring, unless audio is very short.
-    dur = float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0)
-    n = 2 if dur and dur < 6.0 else 3
-    return [float(ctx.bpm_hint_exact)] * n
-
-
-def _relation_to_base(bpm: int, base: int) -> str:
-    if base <= 0:
-        return "normal"
-    if abs(bpm - int(round(base / 2))) <= 1:
-        return "half"
-    if abs(bpm - (base * 2)) <= 1:
-        return "double"
-    return "normal"
-
-
 def _ensure_top_n_candidates(
     *,
     candidates: list[int],
@@ -117,39 +52,145 @@ def _ensure_top_n_candidates(
     return out[: max(n, 1)]
 
 
-def _score_candidate_from_windows(
+@dataclass(frozen=True)
+class _BpmHistogramV1:
+    """
+    Integer BPM histogram of folded windows with prefix sums over [lo, hi].
+
+    Support (windows within +/- tol) and closeness (sum of |candidate - w|) for
+    any candidate are O(1) lookups, so scoring every candidate is O(range)
+    regardless of how many windows the hint stage produced.
+
+    Windows that could not be folded into [lo, hi] (only absurd inputs) are kept
+    aside in `outliers` and scanned directly.
+    """
+
+    lo: int
+    n: int
+    counts: tuple[int, ...]
+    count_prefix: tuple[int, ...]
+    value_prefix: tuple[int, ...]
+    outliers: tuple[int, ...] = ()
+
+    @property
+    def hi(self) -> int:
+        return self.lo + len(self.counts) - 1
+
+    def count_within(self, bpm: int, tol: int) -> int:
+        a = max(int(bpm) - tol, self.lo)
+        b = min(int(bpm) + tol, self.hi)
+        inside = (
+            self.count_prefix[b - self.lo + 1] - self.count_prefix[a - self.lo] if a <= b else 0
+        )
+        if self.outliers:
+            inside += sum(1 for w in self.outliers if abs(int(bpm) - w) <= tol)
+        return inside
+
+    def abs_distance_sum(self, bpm: int) -> int:
+        c = int(bpm)
+        k = min(max(c - self.lo + 1, 0), len(self.counts))
+        n_in = self.count_prefix[-1]
+        below_n, below_s = self.count_prefix[k], self.value_prefix[k]
+        above_n, above_s = n_in - below_n, self.value_prefix[-1] - below_s
+        total = (c * below_n - below_s) + (above_s - c * above_n)
+        return total + sum(abs(c - w) for w in self.outliers)
+
+    def observed(self) -> list[tuple[int, int]]:
+        """Non-empty bins as (bpm, count)."""
+        out = [(self.lo + i, c) for i, c in enumerate(self.counts) if c]
+        extra: dict[int, int] = {}
+        for w in self.outliers:
+            extra[w] = extra.get(w, 0) + 1
+        return out + list(extra.items())
+
+
+def _bpm_histogram_v1(windows_folded_f: Iterable[float], *, lo: int, hi: int) -> _BpmHistogramV1:
+    size = max(0, hi - lo + 1)
+    counts = [0] * size
+    outliers: list[int] = []
+    for x in windows_folded_f:
+        if x <= 0:
+            continue
+        w = int(round(x))
+        i = w - lo
+        if 0 <= i < size:
+            counts[i] += 1
+        else:
+            outliers.append(w)
+
+    count_prefix = [0] * (size + 1)
+    value_prefix = [0] * (size + 1)
+    for i, c in enumerate(counts):
+        count_prefix[i + 1] = count_prefix[i] + c
+        value_prefix[i + 1] = value_prefix[i] + c * (lo + i)
+
+    return _BpmHistogramV1(
+        lo=lo,
+        n=count_prefix[-1] + len(outliers),
+        counts=tuple(counts),
+        count_prefix=tuple(count_prefix),
+        value_prefix=tuple(value_prefix),
+        outliers=tuple(outliers),
+    )
+
+
+def _candidate_support_v1(
     candidate: int,
-    windows_folded: list[int],
+    hist: _BpmHistogramV1,
     *,
     tol_bpm: int,
     triplet_beta: float,
     triplet_min_direct: float,
-) -> float:
-    if not windows_folded:
-        return 0.0
+) -> tuple[float, float]:
+    """
+    Returns (direct_support, support) for a candidate.
 
-    # Support is frequency of matches within tolerance after folding/rounding.
-    #
-    # We intentionally allow small +/- jitter because real signals often wobble
-    # by ~1 BPM across windows due to rounding and window boundary effects.
-    tol = max(0, int(tol_bpm))
-    direct = sum(1 for w in windows_folded if abs(candidate - w) <= tol)
-    direct_support = direct / float(len(windows_folded))
+    Support is frequency of matches within tolerance after folding/rounding.
 
-    # Triplet/dotted ambiguity:
-    # Some produced beats yield a strong 2/3 periodicity (e.g. triplet hats),
-    # which can dominate naive autocorrelation and pull tempo toward ~2/3 * BPM.
-    #
-    # We only let 2/3 evidence contribute if there is at least *some* direct
-    # evidence for the candidate tempo (otherwise 120 BPM would "support" 180).
+    We intentionally allow small +/- jitter because real signals often wobble
+    by ~1 BPM across windows due to rounding and window boundary effects.
+
+    Triplet/dotted ambiguity:
+    Some produced beats yield a strong 2/3 periodicity (e.g. triplet hats),
+    which can dominate naive autocorrelation and pull tempo toward ~2/3 * BPM.
+
+    We only let 2/3 evidence contribute if there is at least *some* direct
+    evidence for the candidate tempo (otherwise 120 BPM would "support" 180).
+    """
+    if hist.n <= 0:
+        return 0.0, 0.0
+    tol = max(0, int(tol_bpm))
+    direct = hist.count_within(candidate, tol)
+    direct_support = direct / float(hist.n)
     support = direct_support
     if direct_support >= float(triplet_min_direct):
         two_thirds = int(round(float(candidate) * (2.0 / 3.0)))
-        trip = sum(1 for w in windows_folded if abs(two_thirds - w) <= tol)
-        support = (direct + (float(triplet_beta) * float(trip))) / float(len(windows_folded))
+        trip = hist.count_within(two_thirds, tol)
+        support = (direct + (float(triplet_beta) * float(trip))) / float(hist.n)
+    return direct_support, support
+
+
+def _score_candidate_from_histogram(
+    candidate: int,
+    hist: _BpmHistogramV1,
+    *,
+    tol_bpm: int,
+    triplet_beta: float,
+    triplet_min_direct: float,
+) -> float:
+    if hist.n <= 0:
+        return 0.0
+
+    _, support = _candidate_support_v1(
+        candidate,
+        hist,
+        tol_bpm=tol_bpm,
+        triplet_beta=triplet_beta,
+        triplet_min_direct=triplet_min_direct,
+    )
 
     # Closeness is average absolute distance (in BPM) mapped into [0, 1].
-    mean_abs = sum(abs(candidate - w) for w in windows_folded) / float(len(windows_folded))
+    mean_abs = hist.abs_distance_sum(candidate) / float(hist.n)
     closeness = 1.0 - min(1.0, mean_abs / 10.0)
 
     score = (0.7 * support) + (0.3 * closeness)
@@ -165,56 +206,16 @@ def _confidence_level(
     score_gap: float,
     stability: float,
     duration_seconds: float,
-    config: EngineConfig,
+    policy: BpmPolicyV1,
 ) -> str:
-    # Tunables (fallback to stable defaults if fields don't exist yet).
-    gap_med = float(getattr(config.tunables, "bpm_gap_min_medium", 0.12))
-    gap_high = float(getattr(config.tunables, "bpm_gap_min_high", 0.20))
-    stab_med = float(getattr(config.tunables, "bpm_stability_min_medium", 0.60))
-    stab_high = float(getattr(config.tunables, "bpm_stability_min_high", 0.75))
-    min_dur_med = float(getattr(config.tunables, "bpm_min_duration_seconds_medium", 4.0))
-    min_dur_high = float(getattr(config.tunables, "bpm_min_duration_seconds_high", 6.0))
-
-    if duration_seconds >= min_dur_high and score_gap >= gap_high and stability >= stab_high:
+    p = policy
+    if duration_seconds >= p.min_dur_high and score_gap >= p.gap_high and stability >= p.stab_high:
         return "high"
-    if duration_seconds >= min_dur_med and score_gap >= gap_med and stability >= stab_med:
+    if duration_seconds >= p.min_dur_med and score_gap >= p.gap_med and stability >= p.stab_med:
         return "medium"
     return "low"
 
 
-def _candidate_family_v1(candidate_bpm: int, base_bpm: int, *, tol_bpm: int) -> str:
-    """
-    Classify candidate tempo relative to a base tempo.
-
-    Families:
-      - base: ~base
-      - double: ~2x base
-      - half: ~0.5x base
-      - triplet: ~2/3 base
-      - dotted: ~3/2 base
-    """
-    tol = max(0, int(tol_bpm))
-    base = int(base_bpm)
-    cand = int(candidate_bpm)
-
-    if abs(cand - base) <= tol:
-        return "base"
-    if abs(cand - (2 * base)) <= tol:
-        return "double"
-    if abs((2 * cand) - base) <= tol:
-        return "half"
-
-    trip = int(round(float(base) * (2.0 / 3.0)))
-    if abs(cand - trip) <= tol:
-        return "triplet"
-    dotted = int(round(float(base) * 1.5))
-    if abs(cand - dotted) <= tol:
-        return "dotted"
-
-    # v1 UI contract: no "other" family; default to base.
-    return "base"
-
-
 def _format_bpm_raw_v1(x: float) -> int | float:
     """
     Raw BPM is kept as a number, but we avoid long floats for determinism.
@@ -238,13 +239,18 @@ def _select_reportable_bpm_from_raw_v1(
     tol_bpm: int,
     config: EngineConfig,
     double_window_support: float = 0.0,
+    policy: BpmPolicyV1 | None = None,
 ) -> tuple[int | None, str, str, list[str]]:
     """
     Pure policy: decide UI-facing "reportable" BPM from raw BPM + evidence.
 
+    `policy` is `config` compiled; callers that already hold it pass it through.
+
     Returns:
       (bpm_reportable_rounded_or_none, bpm_reportable_confidence, timefeel, reason_codes)
     """
+    p = policy if policy is not None else compile_bpm_policy_v1(config)
+
     # If raw itself is low confidence, reportable must be omitted (DO NOT LIE).
     if str(raw_confidence).lower() == "low":
         return None, "low", "unknown", ["omitted_low_confidence"]
@@ -254,32 +260,15 @@ def _select_reportable_bpm_from_raw_v1(
     reportable_raw = int(round(raw_exact))
     reportable_conf = str(raw_confidence)
 
-    # Only consider 2x when raw is in the slower band.
-    stab_min = float(config.tunables.bpm_reportable_raw_stability_min)
-    raw_max = float(config.tunables.bpm_reportable_double_max_raw)
-    dbl_min = int(config.tunables.bpm_reportable_double_min)
-    dbl_max = int(config.tunables.bpm_reportable_double_max)
-    runner_thresh = float(config.tunables.bpm_reportable_unrelated_competitor_threshold)
-    require_direct_for_flip = bool(
-        getattr(config.tunables, "bpm_reportable_require_direct_double_evidence_for_flip", True)
-    )
-    cap = str(config.tunables.bpm_reportable_confidence_cap_without_direct_double_evidence)
-    direct_min_score = float(
-        getattr(config.tunables, "bpm_reportable_direct_double_min_score", 0.12)
-    )
-    direct_min_support = float(
-        getattr(config.tunables, "bpm_reportable_direct_double_min_support", 0.08)
-    )
-
-    # Default behavior: prefer raw.
-    if raw_exact > raw_max:
+    # Default behavior: prefer raw. Only consider 2x when raw is in the slower band.
+    if raw_exact > p.reportable_double_max_raw:
         return reportable_raw, reportable_conf, "normal", ["prefer_raw", "capped_by_raw_max"]
-    if raw_stability < stab_min:
+    if raw_stability < p.reportable_raw_stability_min:
         return reportable_raw, reportable_conf, "normal", ["prefer_raw"]
 
     dbl_exact = 2.0 * raw_exact
     dbl_round = int(round(dbl_exact))
-    if dbl_round < dbl_min or dbl_round > dbl_max:
+    if dbl_round < p.reportable_double_min or dbl_round > p.reportable_double_max:
         return (
             reportable_raw,
             reportable_conf,
@@ -294,7 +283,8 @@ def _select_reportable_bpm_from_raw_v1(
             max_double_score = max(max_double_score, float(score))
 
     has_direct_double_evidence = bool(
-        max_double_score >= direct_min_score or float(double_window_support) >= direct_min_support
+        max_double_score >= p.reportable_direct_min_score
+        or float(double_window_support) >= p.reportable_direct_min_support
     )
     direct_code = (
         "has_direct_double_evidence" if has_direct_double_evidence else "no_direct_double_evidence"
@@ -306,19 +296,18 @@ def _select_reportable_bpm_from_raw_v1(
     # tempo family. A competing runner-up must be unrelated to both.
     top_score = float(scored[0][1]) if scored else 0.0
     runner_score = 0.0
-    gap_tol = int(getattr(config.tunables, "bpm_gap_family_tolerance_bpm", max(2, int(tol_bpm))))
     for bpm_i, score in scored[1:]:
         bpm_i_int = int(bpm_i)
-        if _tempo_family_agrees(raw_round, bpm_i_int, tol_bpm=gap_tol):
+        if p.family_agrees(raw_round, bpm_i_int):
             continue
-        if _tempo_family_agrees(dbl_round, bpm_i_int, tol_bpm=gap_tol):
+        if p.family_agrees(dbl_round, bpm_i_int):
             continue
         runner_score = float(score)
         break
     runner_frac = (
         (runner_score / top_score) if top_score > 0 else (1.0 if runner_score > 0 else 0.0)
     )
-    if runner_frac >= runner_thresh:
+    if runner_frac >= p.reportable_runner_threshold:
         return (
             None,
             "low",
@@ -327,7 +316,7 @@ def _select_reportable_bpm_from_raw_v1(
         )
 
     # v1.2 safety gate: do not flip raw->double without direct 2x evidence.
-    if require_direct_for_flip and (not has_direct_double_evidence):
+    if p.reportable_require_direct_for_flip and (not has_direct_double_evidence):
         return (
             reportable_raw,
             reportable_conf,
@@ -341,179 +330,91 @@ def _select_reportable_bpm_from_raw_v1(
         codes.append("prefer_emit_within_1")
 
     if (not has_direct_double_evidence) and reportable_conf.lower() == "high":
-        reportable_conf = cap
+        reportable_conf = p.reportable_confidence_cap
 
     return dbl_round, reportable_conf, "double_time_preferred", codes
 
 
-def _weighted_mode_bpm_from_details(
-    details: list[dict[str, Any]],
-    *,
-    bpm_key: str,
-    score_key: str,
-    lo_bpm: int,
-    hi_bpm: int,
-) -> tuple[int | None, float]:
-    """
-    Best-effort per-band "mode" tempo from window details.
-
-    Returns (mode_bpm, stability_weighted) where stability_weighted is the
-    fraction of total weight voting for the mode (0-1).
+def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, Any] | None:
     """
-    if not details:
-        return None, 0.0
-
-    weights: dict[int, float] = {}
-    total_w = 0.0
-    for d in details:
-        try:
-            bpm = float(d.get(bpm_key))  # type: ignore[arg-type]
-        except (TypeError, ValueError):
-            continue
-        if bpm <= 0:
-            continue
-        bpm_f = _fold_into_range(bpm, lo=float(lo_bpm), hi=float(hi_bpm))
-        bpm_i = int(round(bpm_f))
-        if bpm_i < lo_bpm or bpm_i > hi_bpm:
-            continue
-
-        w = 1.0
-        if score_key in d and d.get(score_key) is not None:
-            try:
-                w = float(d.get(score_key))  # type: ignore[arg-type]
-            except (TypeError, ValueError):
-                w = 1.0
-            # Clamp: details are "scores" but we do not assume their scale.
-            if w < 0.0:
-                w = 0.0
-            if w > 1.0:
-                w = 1.0
-
-        weights[bpm_i] = weights.get(bpm_i, 0.0) + w
-        total_w += w
+    Candidate-first BPM extractor (Engine v1).
 
-    if not weights or total_w <= 0.0:
-        return None, 0.0
+    Principles:
+    - Do not lie: if ambiguous/unstable, omit final value.
+    - Always return candidates when available.
 
-    # Deterministic ties: choose smaller bpm.
-    mode_bpm, mode_w = sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))[0]
-    return int(mode_bpm), float(mode_w / total_w)
+    Notes:
+    - v1 currently operates without PCM. Candidates and stability are derived from
+      deterministic hints / window hints used by tests and future integrations.
+    """
+    return _extract_bpm_with_policy_v1(ctx, config=config, policy=compile_bpm_policy_v1(config))
 
 
-def _weighted_top2_bpms_from_details(
-    details: list[dict[str, Any]],
-    *,
-    bpm_key: str,
-    score_key: str,
-    lo_bpm: int,
-    hi_bpm: int,
-) -> tuple[int | None, float, int | None, float]:
+def extract_bpm_batch_v1(
+    items: Iterable[FeatureContext | BpmEvidenceColumnsV1], *, config: EngineConfig
+) -> list[dict[str, Any] | None]:
     """
-    Returns (top_bpm, top_frac, runnerup_bpm, runnerup_frac).
+    Evaluate the BPM extractor and reportable policy for many tracks.
 
-    Fractions are of total weight (0-1). Deterministic ties: smaller bpm wins.
-    """
-    if not details:
-        return None, 0.0, None, 0.0
-
-    weights: dict[int, float] = {}
-    total_w = 0.0
-    for d in details:
-        try:
-            bpm = float(d.get(bpm_key))  # type: ignore[arg-type]
-        except (TypeError, ValueError):
-            continue
-        if bpm <= 0:
-            continue
-        bpm_i = int(round(_fold_into_range(bpm, lo=float(lo_bpm), hi=float(hi_bpm))))
-        if bpm_i < lo_bpm or bpm_i > hi_bpm:
-            continue
+    `items` are FeatureContexts or evidence records (`BpmEvidenceColumnsV1`,
+    e.g. slices of an evidence store). Each track goes through the columnar
+    aggregation under one compiled policy; per-track blocks (and
+    feature_omitted events) are identical to `extract_bpm_v1`.
 
-        w = 1.0
-        if score_key in d and d.get(score_key) is not None:
-            try:
-                w = float(d.get(score_key))  # type: ignore[arg-type]
-            except (TypeError, ValueError):
-                w = 1.0
-            if w < 0.0:
-                w = 0.0
-            if w > 1.0:
-                w = 1.0
-
-        weights[bpm_i] = weights.get(bpm_i, 0.0) + w
-        total_w += w
-
-    if not weights or total_w <= 0.0:
-        return None, 0.0, None, 0.0
-
-    ranked = sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))
-    top_bpm, top_w = ranked[0]
-    runner_bpm: int | None = None
-    runner_w = 0.0
-    if len(ranked) >= 2:
-        runner_bpm, runner_w = ranked[1]
-    return int(top_bpm), float(top_w / total_w), runner_bpm, float(runner_w / total_w)
-
-
-def _tempo_family_agrees(a: int, b: int, *, tol_bpm: int) -> bool:
-    tol = max(0, int(tol_bpm))
-    if abs(a - b) <= tol:
-        return True
-    if abs(a - (2 * b)) <= tol:
-        return True
-    if abs((2 * a) - b) <= tol:
-        return True
-    # Triplet/dotted relationships (3/2 and 2/3).
-    if abs(a - int(round(float(b) * 1.5))) <= tol:
-        return True
-    if abs(b - int(round(float(a) * 1.5))) <= tol:
-        return True
-    if abs(a - int(round(float(b) * (2.0 / 3.0)))) <= tol:
-        return True
-    if abs(b - int(round(float(a) * (2.0 / 3.0)))) <= tol:
-        return True
-    return False
-
-
-def _tempo_triplet_family_agrees(a: int, b: int, *, tol_bpm: int) -> bool:
+    There is no numpy in this engine, so the policy itself still runs per track
+    in Python: the batch saves the policy lookup and, for records, the context
+    parse, not the per-track scoring.
     """
-    Tempo "family" equivalence for score-gap computation.
+    policy = compile_bpm_policy_v1(config)
+    out: list[dict[str, Any] | None] = []
+    for item in items:
+        cols = (
+            item
+            if isinstance(item, BpmEvidenceColumnsV1)
+            else BpmEvidenceColumnsV1.from_context(item)
+        )
+        evidence = (
+            aggregate_bpm_evidence_columns_v1(
+                cols.bands,
+                fallback_windows=cols.fallback_windows,
+                has_details=cols.has_details,
+                policy=policy,
+            )
+            if cols.has_rhythm_evidence
+            else None
+        )
+        out.append(
+            extract_bpm_from_evidence_v1(
+                evidence, duration_seconds=cols.duration_seconds, config=config, policy=policy
+            )
+        )
+    return out
 
-    We treat triplet/dotted (3/2 and 2/3) periodicities as equivalent evidence,
-    because they frequently arise from production subdivisions (e.g. triplet hats)
-    and should not be interpreted as a competing tempo family.
 
-    We intentionally do *not* treat half/double as equivalent here, because that
-    ambiguity is musically meaningful and should reduce confidence unless we
-    have other evidence to disambiguate.
-    """
-    tol = max(0, int(tol_bpm))
-    if abs(a - b) <= tol:
-        return True
-    if abs(a - int(round(float(b) * 1.5))) <= tol:
-        return True
-    if abs(b - int(round(float(a) * 1.5))) <= tol:
-        return True
-    if abs(a - int(round(float(b) * (2.0 / 3.0)))) <= tol:
-        return True
-    if abs(b - int(round(float(a) * (2.0 / 3.0)))) <= tol:
-        return True
-    return False
+def _extract_bpm_with_policy_v1(
+    ctx: FeatureContext, *, config: EngineConfig, policy: BpmPolicyV1
+) -> dict[str, Any] | None:
+    # One pass over the hint evidence; every policy check below reads this summary.
+    evidence = aggregate_bpm_evidence_v1(ctx, policy=policy) if ctx.has_rhythm_evidence else None
+    duration_seconds = float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0)
+    return extract_bpm_from_evidence_v1(
+        evidence, duration_seconds=duration_seconds, config=config, policy=policy
+    )
 
 
-def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, Any] | None:
+def extract_bpm_from_evidence_v1(
+    evidence: BpmEvidence | None,
+    *,
+    duration_seconds: float,
+    config: EngineConfig,
+    policy: BpmPolicyV1,
+) -> dict[str, Any] | None:
     """
-    Candidate-first BPM extractor (Engine v1).
+    BPM policy over aggregated evidence (shared by context and columnar replay).
 
-    Principles:
-    - Do not lie: if ambiguous/unstable, omit final value.
-    - Always return candidates when available.
-
-    Notes:
-    - v1 currently operates without PCM. Candidates and stability are derived from
-      deterministic hints / window hints used by tests and future integrations.
+    `evidence` is None when the track has no rhythm evidence.
     """
-    if not ctx.has_rhythm_evidence:
+    if evidence is None:
         hooks.emit(
             "feature_omitted",
             feature="bpm",
@@ -522,8 +423,8 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
         )
         return None
 
-    windows_raw = _windows_from_ctx(ctx, config=config)
-    if not windows_raw:
+    windows_folded_f = evidence.windows_folded
+    if not windows_folded_f:
         hooks.emit(
             "feature_omitted",
             feature="bpm",
@@ -532,12 +433,12 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
         )
         return None
 
-    lo_bpm = int(getattr(config.tunables, "bpm_normalize_min", 60))
-    hi_bpm = int(getattr(config.tunables, "bpm_normalize_max", 200))
+    lo_bpm = policy.lo_bpm
+    hi_bpm = policy.hi_bpm
 
-    windows_folded_f = [_fold_into_range(x, lo=lo_bpm, hi=hi_bpm) for x in windows_raw]
-    windows_folded = [int(round(x)) for x in windows_folded_f if x > 0]
-    if not windows_folded:
+    # Histogram by folded-rounded BPM; all window scoring below reads from it.
+    hist = _bpm_histogram_v1(windows_folded_f, lo=lo_bpm, hi=hi_bpm)
+    if hist.n <= 0:
         hooks.emit(
             "feature_omitted",
             feature="bpm",
@@ -546,18 +447,13 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
         )
         return None
 
-    # Histogram by folded-rounded BPM.
-    counts: dict[int, int] = {}
-    for w in windows_folded:
-        counts[w] = counts.get(w, 0) + 1
-
     # Base ordering: count desc, then bpm asc for deterministic ties.
-    ranked_by_count = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    ranked_by_count = sorted(hist.observed(), key=lambda kv: (-kv[1], kv[0]))
     base_bpm = ranked_by_count[0][0]
 
     # Start with observed bins; then pad to top-N with half/double and nearby.
     observed = [b for b, _ in ranked_by_count]
-    top_n = int(getattr(config.tunables, "bpm_candidates_top_n", 5))
+    top_n = policy.top_n
     cand_bpms = _ensure_top_n_candidates(
         candidates=observed,
         base=base_bpm,
@@ -566,15 +462,15 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
         n=max(top_n, 5),
     )
 
-    tol_bpm = int(getattr(config.tunables, "bpm_window_match_tolerance_bpm", 1))
-    triplet_beta = float(getattr(config.tunables, "bpm_triplet_support_beta", 0.8))
-    triplet_min_direct = float(getattr(config.tunables, "bpm_triplet_support_min_direct", 0.05))
+    tol_bpm = policy.tol_bpm
+    triplet_beta = policy.triplet_beta
+    triplet_min_direct = policy.triplet_min_direct
     scored = [
         (
             b,
-            _score_candidate_from_windows(
+            _score_candidate_from_histogram(
                 b,
-                windows_folded,
+                hist,
                 tol_bpm=tol_bpm,
                 triplet_beta=triplet_beta,
                 triplet_min_direct=triplet_min_direct,
@@ -587,12 +483,6 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
     # Enforce minimum count.
     scored = scored[: max(5, top_n)]
 
-    def direct_support(bpm: int) -> float:
-        tol = max(0, tol_bpm)
-        return sum(1 for w in windows_folded if abs(int(bpm) - int(w)) <= tol) / float(
-            len(windows_folded)
-        )
-
     # Triplet/dotted correction:
     # If the top periodicity is ~2/3 of a plausible tempo family, and we see at
     # least some direct evidence near the 3/2 tempo, prefer the 3/2 tempo.
@@ -601,8 +491,8 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
     # ~113 BPM autocorrelation, where 113 is not the intended reportable tempo.
     top0_bpm, top0_score = scored[0]
     promote_target = int(round(float(top0_bpm) * 1.5))
-    promote_min_direct = float(getattr(config.tunables, "bpm_triplet_promote_min_direct", 0.05))
-    promote_delta_max = float(getattr(config.tunables, "bpm_triplet_promote_score_delta_max", 0.08))
+    promote_min_direct = policy.promote_min_direct
+    promote_delta_max = policy.promote_delta_max
 
     if lo_bpm <= promote_target <= hi_bpm:
         tol = max(0, tol_bpm)
@@ -617,7 +507,8 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
         if (
             promote_idx is not None
             and promote_idx > 0
-            and direct_support(int(scored[promote_idx][0])) >= promote_min_direct
+            and hist.count_within(int(scored[promote_idx][0]), tol) / float(hist.n)
+            >= promote_min_direct
             and float(promote_score or 0.0) >= float(top0_score) - promote_delta_max
         ):
             promoted = scored.pop(promote_idx)
@@ -629,9 +520,8 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
     # competitor to avoid over-omitting (e.g. 119 vs 120), and to avoid
     # treating common triplet/dotted periodicities (~2/3) as separate evidence.
     s2 = 0.0
-    gap_tol = int(getattr(config.tunables, "bpm_gap_family_tolerance_bpm", max(2, tol_bpm)))
     for b, s in scored[1:]:
-        if not _tempo_triplet_family_agrees(int(scored[0][0]), int(b), tol_bpm=gap_tol):
+        if not policy.triplet_family_agrees(int(scored[0][0]), int(b)):
             s2 = float(s)
             break
     gap = float(s1 - float(s2))
@@ -642,40 +532,25 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
     # the top tempo (prevents "120 supports 180" artifacts).
     top_bpm = scored[0][0]
     tol = max(0, tol_bpm)
-    direct = sum(1 for w in windows_folded if abs(w - top_bpm) <= tol)
-    direct_support = direct / float(len(windows_folded))
-    stability = direct_support
-    if direct_support >= float(triplet_min_direct):
-        two_thirds = int(round(float(top_bpm) * (2.0 / 3.0)))
-        trip = sum(1 for w in windows_folded if abs(two_thirds - w) <= tol)
-        stability = (direct + (float(triplet_beta) * float(trip))) / float(len(windows_folded))
+    _, stability = _candidate_support_v1(
+        top_bpm,
+        hist,
+        tol_bpm=tol_bpm,
+        triplet_beta=triplet_beta,
+        triplet_min_direct=triplet_min_direct,
+    )
 
-    duration_seconds = float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0)
     confidence = _confidence_level(
-        score_gap=gap, stability=stability, duration_seconds=duration_seconds, config=config
+        score_gap=gap, stability=stability, duration_seconds=duration_seconds, policy=policy
     )
 
     # Sanity check: if low-band and high-band disagree strongly, do not produce
     # a confident-wrong bpm.value. This uses signal evidence only and preserves
     # DO-NOT-LIE by downgrading to low confidence (value omitted).
-    details = getattr(ctx, "bpm_hint_window_details", None)
-    if details and isinstance(details, list):
-        low_mode, low_stab = _weighted_mode_bpm_from_details(
-            details,
-            bpm_key="best_bpm",
-            score_key="best_score",
-            lo_bpm=lo_bpm,
-            hi_bpm=hi_bpm,
-        )
-        high_mode, high_stab = _weighted_mode_bpm_from_details(
-            details,
-            bpm_key="high_best_bpm",
-            score_key="high_best_score",
-            lo_bpm=lo_bpm,
-            hi_bpm=hi_bpm,
-        )
-        min_stab = float(getattr(config.tunables, "bpm_multiband_min_mode_stability", 0.65))
-        family_tol = int(getattr(config.tunables, "bpm_multiband_family_tolerance_bpm", 2))
+    if evidence.has_details:
+        low_mode, low_stab = evidence.low.mode()
+        high_mode, high_stab = evidence.high.mode()
+        min_stab = policy.multiband_min_stab
 
         if confidence in ("medium", "high"):
             if (
@@ -683,34 +558,22 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
                 and high_mode is not None
                 and low_stab >= min_stab
                 and high_stab >= min_stab
-                and not _tempo_family_agrees(low_mode, high_mode, tol_bpm=family_tol)
+                and not policy.multiband_family_agrees(low_mode, high_mode)
             ):
                 confidence = "low"
 
             # If a band has a strong runner-up in a different tempo family, treat
             # the estimate as ambiguous (do not produce a confident-wrong value).
-            runner_min = float(
-                getattr(config.tunables, "bpm_multiband_runnerup_min_fraction", 0.30)
-            )
+            runner_min = policy.multiband_runner_min
             top_bpm = int(scored[0][0])
-            gap_tol = int(getattr(config.tunables, "bpm_gap_family_tolerance_bpm", max(2, tol_bpm)))
-            for bpm_key, score_key in (
-                ("best_bpm", "best_score"),
-                ("high_best_bpm", "high_best_score"),
-            ):
-                _, _, runner_bpm, runner_frac = _weighted_top2_bpms_from_details(
-                    details,
-                    bpm_key=bpm_key,
-                    score_key=score_key,
-                    lo_bpm=lo_bpm,
-                    hi_bpm=hi_bpm,
-                )
+            for band in (evidence.low, evidence.high):
+                _, _, runner_bpm, runner_frac = band.top2()
                 if runner_bpm is None:
                     continue
                 if runner_frac < runner_min:
                     continue
                 # Ignore triplet/dotted equivalence; treat half/double as meaningful ambiguity.
-                if _tempo_triplet_family_agrees(top_bpm, int(runner_bpm), tol_bpm=gap_tol):
+                if policy.triplet_family_agrees(top_bpm, int(runner_bpm)):
                     continue
                 confidence = "low"
                 break
@@ -721,41 +584,21 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
         #
         # This avoids "confident-wrong" half/double picks on patterns where both
         # interpretations are plausible.
-        ratio_min = float(getattr(config.tunables, "bpm_double_ratio_ambiguous_min", 0.45))
-        frac_min = float(getattr(config.tunables, "bpm_double_ratio_ambiguous_min_fraction", 0.60))
-        n = 0
-        n_amb = 0
-        for d in details:
-            if not isinstance(d, dict):
-                continue
-            for k in ("double_ratio", "high_double_ratio"):
-                v = d.get(k)
-                if v is None:
-                    continue
-                try:
-                    r = float(v)
-                except (TypeError, ValueError):
-                    continue
-                n += 1
-                if r >= ratio_min:
-                    n_amb += 1
-        if n and (n_amb / float(n)) >= frac_min:
+        n = evidence.double_ratio_n
+        n_amb = evidence.double_ratio_ambiguous_n
+        if n and (n_amb / float(n)) >= policy.double_ratio_ambiguous_min_fraction:
             confidence = "low"
 
     raw_confidence = confidence
 
     # Compute a raw tempo estimate (exact) even if the final reportable value is omitted.
+    # Kept as a direct pass: the exact mean must match sum() over the raw floats.
     raw_supporting = [w for w in windows_folded_f if int(round(w)) == int(top_bpm)]
     raw_exact = (
         sum(raw_supporting) / float(len(raw_supporting)) if raw_supporting else float(int(top_bpm))
     )
     double_reportable_candidate = int(round(2.0 * float(raw_exact)))
-    double_window_support = (
-        sum(1 for w in windows_folded if abs(int(w) - double_reportable_candidate) <= tol)
-        / float(len(windows_folded))
-        if windows_folded
-        else 0.0
-    )
+    double_window_support = hist.count_within(double_reportable_candidate, tol) / float(hist.n)
 
     (
         bpm_reportable,
@@ -771,6 +614,7 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
         tol_bpm=int(tol_bpm),
         config=config,
         double_window_support=float(double_window_support),
+        policy=policy,
     )
 
     # Back-compat: top-level bpm.confidence/value reflect the reportable selection.
@@ -791,7 +635,7 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
                 "value": {"value_rounded": int(bpm)},
                 "rank": i + 1,
                 "score": float(round(score, 4)),
-                "relation": _relation_to_base(int(bpm), int(top_bpm)),
+                "relation": policy.relation_to_base(int(bpm), int(top_bpm)),
             }
         )
 
@@ -814,7 +658,7 @@ def extract_bpm_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, An
     out["bpm_candidates"] = [
         {
             "candidate_bpm": int(b),
-            "candidate_family": _candidate_family_v1(int(b), base_for_family, tol_bpm=1),
+            "candidate_family": policy.candidate_family(int(b), base_for_family),
             "candidate_score": float(round(float(s), 4)),
         }
         for b, s in scored[:5]
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+from engine.core.config import EngineConfig
+from engine.features.types import FeatureContext
+from engine.observability import hooks
+from engine.preprocess.bpm_hint_windows_v1 import OnsetEnvelope
+
+# Predecessor search window around one beat period (fraction of the period).
+_PERIOD_SLACK_V1 = 0.25
+
+_MARKER_LABELS_V1 = {"grid_anchor": "Grid anchor", "downbeat": "Downbeat"}
+
+
+def _clamp01(x: float) -> float:
+    if x < 0.0:
+        return 0.0
+    if x > 1.0:
+        return 1.0
+    return x
+
+
+def _unit_scaled(band: Sequence[float]) -> list[float]:
+    """Band divided by its standard deviation (all zeros when flat)."""
+    n = len(band)
+    if n == 0:
+        return []
+    mean = sum(band) / n
+    var = sum((x - mean) * (x - mean) for x in band) / n
+    if not var > 0.0:
+        return [0.0] * n
+    sd = math.sqrt(var)
+    return [float(x) / sd for x in band]
+
+
+def _beat_onset_v1(env: OnsetEnvelope) -> list[float]:
+    """Low + high band onset strength, each band scaled to unit variance."""
+    low = _unit_scaled(env.low)
+    high = _unit_scaled(env.high)
+    return [a + b for a, b in zip(low, high, strict=True)]
+
+
+def _track_beats_v1(onset: Sequence[float], *, period: float, tightness: float) -> list[int]:
+    """
+    Dynamic-programming beat tracker (Ellis-style) for a known beat period.
+
+    score[t] = onset[t] + max(0, max_tau score[tau] - tightness * log((t - tau) / period)^2)
+    with tau restricted to [t - 1.25 * period, t - 0.75 * period]. The window
+    width is fixed by the tempo estimate, so one pass is O(n) in frames. Ties
+    keep the shorter interval for determinism.
+    """
+    n = len(onset)
+    if n == 0 or not period > 1.0:
+        return []
+    lo_off = max(1, int(math.floor(period * (1.0 - _PERIOD_SLACK_V1))))
+    hi_off = max(lo_off, int(math.ceil(period * (1.0 + _PERIOD_SLACK_V1))))
+    steps = [(off, tightness * math.log(off / period) ** 2) for off in range(lo_off, hi_off + 1)]
+
+    score = [0.0] * n
+    back = [-1] * n
+    for t in range(n):
+        best = 0.0
+        best_tau = -1
+        for off, penalty in steps:
+            tau = t - off
+            if tau < 0:
+                break
+            v = score[tau] - penalty
+            if v > best:
+                best = v
+                best_tau = tau
+        score[t] = onset[t] + best
+        back[t] = best_tau
+
+    tail = range(max(0, n - hi_off), n)
+    t = max(tail, key=lambda i: (score[i], -i))
+    beats: list[int] = []
+    while t >= 0:
+        beats.append(t)
+        t = back[t]
+    beats.reverse()
+    return beats
+
+
+def _peak_near(band: Sequence[float], frame: int, tol: int) -> float:
+    lo = max(0, frame - tol)
+    hi = min(len(band), frame + tol + 1)
+    return max(band[lo:hi], default=0.0)
+
+
+def _downbeat_phase_v1(
+    beats: Sequence[int], accent: Sequence[float], *, beats_per_bar: int, tol: int
+) -> tuple[int, float]:
+    """
+    (phase, margin): the beat index offset whose beats carry the most low-band
+    accent, and its relative lead over the runner-up phase (0 when ambiguous).
+    """
+    if beats_per_bar < 2 or len(beats) < 2 * beats_per_bar:
+        return 0, 0.0
+    sums = [0.0] * beats_per_bar
+    counts = [0] * beats_per_bar
+    for i, b in enumerate(beats):
+        sums[i % beats_per_bar] += _peak_near(accent, b, tol)
+        counts[i % beats_per_bar] += 1
+    means = [s / c for s, c in zip(sums, counts, strict=True)]
+    order = sorted(range(beats_per_bar), key=lambda k: (-means[k], k))
+    best, runner = means[order[0]], means[order[1]]
+    if not best > 0.0:
+        return 0, 0.0
+    return order[0], (best - runner) / best
+
+
+def _alignment_confidence_v1(onset: Sequence[float], beats: Sequence[int], *, tol: int) -> float:
+    """
+    Share of onset energy within `tol` frames of a beat, rescaled so that the
+    share expected from randomly placed beats maps to 0 and full alignment to 1.
+    """
+    n = len(onset)
+    total = sum(onset)
+    if n == 0 or not total > 0.0 or not beats:
+        return 0.0
+    near = bytearray(n)
+    for b in beats:
+        lo = max(0, b - tol)
+        hi = min(n, b + tol + 1)
+        near[lo:hi] = b"\x01" * (hi - lo)
+    captured = sum(x for x, m in zip(onset, near, strict=True) if m)
+    chance = sum(near) / n
+    if chance >= 1.0:
+        return 0.0
+    return _clamp01((captured / total - chance) / (1.0 - chance))
+
+
+def _grid_tempo_v1(bpm_block: dict[str, Any] | None) -> float | None:
+    """Beat-level tempo for the grid: the raw (felt-grid) BPM, else the reported value."""
+    if not isinstance(bpm_block, dict):
+        return None
+    raw = bpm_block.get("bpm_raw")
+    if raw is None:
+        val = bpm_block.get("value")
+        raw = val.get("value_exact") if isinstance(val, dict) else None
+    try:
+        bpm = float(raw)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return bpm if bpm > 0.0 else None
+
+
+def extract_grid_v1(
+    ctx: FeatureContext,
+    *,
+    config: EngineConfig,
+    bpm_block: dict[str, Any] | None,
+) -> dict[str, Any] | None:
+    """
+    Beat/downbeat grid from the hint stage's onset envelope (no extra decode).
+
+    The beat period comes from `bpm_block` (raw BPM); beats are placed by a
+    dynamic-programming pass that trades onset strength against deviation from
+    the period, and downbeats by the bar phase with the strongest low-band
+    accent. Confidence is the beat alignment of onset energy, gated by the grid
+    tunables:
+      - below `grid_min_confidence_omit`: omitted (None, `feature_omitted`)
+      - below `grid_min_confidence_minimally_usable`: block without `value`
+      - otherwise: `value` with beats, downbeats (when the bar phase is clear)
+        and the grid anchor; "high" confidence from `grid_min_confidence_high`.
+
+    Returns None without an event when there is no envelope or tempo to track.
+    Role gating (Pro-only values, locked previews) is applied in packaging.
+    """
+    env = ctx.onset_envelope
+    bpm = _grid_tempo_v1(bpm_block)
+    if env is None or len(env) < 4 or bpm is None or not ctx.has_rhythm_evidence:
+        # Nothing to track (metadata-only decode or no tempo): not a gated omission.
+        return None
+
+    t = config.tunables
+    omit_min = float(getattr(t, "grid_min_confidence_omit", 0.25))
+    usable_min = float(getattr(t, "grid_min_confidence_minimally_usable", 0.45))
+    high_min = float(getattr(t, "grid_min_confidence_high", 0.60))
+    tightness = float(getattr(t, "grid_beat_tightness", 100.0))
+    beats_per_bar = int(getattr(t, "grid_beats_per_bar", 4))
+    tol_s = float(getattr(t, "grid_alignment_tolerance_seconds", 0.02))
+    downbeat_margin_min = float(getattr(t, "grid_downbeat_min_margin", 0.15))
+
+    frame_s = float(env.frame_seconds)
+    period = 60.0 / (bpm * frame_s)
+    tol = max(1, int(round(tol_s / frame_s)))
+
+    onset = _beat_onset_v1(env)
+    beats = _track_beats_v1(onset, period=period, tightness=tightness)
+    score = _alignment_confidence_v1(onset, beats, tol=tol) if len(beats) >= 2 else 0.0
+    if score < omit_min:
+        hooks.emit(
+            "feature_omitted",
+            feature="grid",
+            reason="confidence_below_threshold",
+            stage="feature:grid",
+        )
+        return None
+
+    phase, margin = _downbeat_phase_v1(
+        beats, _unit_scaled(env.low), beats_per_bar=beats_per_bar, tol=tol
+    )
+    has_downbeats = margin >= downbeat_margin_min
+
+    reason_codes: list[str] = []
+    if score >= high_min:
+        confidence = "high"
+    elif score >= usable_min:
+        confidence = "medium"
+    else:
+        confidence = "low"
+        reason_codes.append("grid_not_minimally_usable")
+    if not has_downbeats:
+        reason_codes.append("downbeat_phase_ambiguous")
+
+    out: dict[str, Any] = {
+        "confidence": confidence,
+        "score": round(score, 4),
+        "method": "grid_dp_beat_tracker_v1",
+        "limits": (
+            "v1 assumes a steady tempo and a fixed meter; downbeats are omitted when "
+            "the bar phase is ambiguous."
+        ),
+        "evidence": {
+            "beat_count": len(beats),
+            "downbeat_margin": round(margin, 4),
+            "tempo_bpm": round(bpm, 2),
+        },
+        "reason_codes": reason_codes,
+    }
+    if confidence == "low":
+        return out
+
+    beats_s = [round(b * frame_s, 3) for b in beats]
+    downbeats_s = beats_s[phase::beats_per_bar] if has_downbeats else []
+    span = (beats[-1] - beats[0]) * frame_s
+    out["value"] = {
+        "bpm": round(60.0 * (len(beats) - 1) / span, 2) if span > 0 else round(bpm, 2),
+        "beats_per_bar": beats_per_bar,
+        "anchor_s": downbeats_s[0] if downbeats_s else beats_s[0],
+        "beats_s": beats_s,
+        "downbeats_s": downbeats_s,
+    }
+    return out
+
+
+def grid_markers_v1(
+    grid_block: dict[str, Any] | None,
+    *,
+    duration_seconds: float,
+    max_markers: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    `markers_pack` markers (`grid_anchor` + `downbeat`) for a grid block.
+
+    Sorted by time, deduplicated per (type, time), clipped to the track and
+    truncated to `max_markers` (Free preview packs). Empty without a grid value.
+    """
+    val = grid_block.get("value") if isinstance(grid_block, dict) else None
+    if not isinstance(val, dict):
+        return []
+    points = [("grid_anchor", val.get("anchor_s"))]
+    points += [("downbeat", s) for s in val.get("downbeats_s") or []]
+
+    seen: set[tuple[str, float]] = set()
+    markers: list[dict[str, Any]] = []
+    for kind, s in points:
+        if s is None:
+            continue
+        ts = float(s)
+        if not 0.0 <= ts <= float(duration_seconds) or (kind, ts) in seen:
+            continue
+        seen.add((kind, ts))
+        markers.append({"time_seconds": ts, "type": kind, "label": _MARKER_LABELS_V1[kind]})
+    markers.sort(key=lambda m: (m["time_seconds"], m["type"]))
+    if max_markers is not None:
+        markers = markers[: max(0, int(max_markers))]
+    return markers
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 from engine.core.config import EngineConfig
@@ -82,63 +86,141 @@ def _windows_from_ctx(ctx: FeatureContext) -> list[tuple[str, str]]:
     return [(key, mode)] * n
 
 
+@dataclass(frozen=True)
+class KeyModeEvidenceV1:
+    """
+    One track's key/mode evidence as the policy reads it.
+
+    `window_scores` are per-window 24-slot key correlations (soft votes); when
+    there are none, `slots` holds the parsed window labels as vote slots (see
+    `_key_mode_slot_v1`). The evidence store hands out these records over
+    slices of its mapped columns.
+    """
+
+    slots: Sequence[int]
+    window_scores: Sequence[Sequence[float]]
+    has_tonal_evidence: bool
+    duration_seconds: float
+
+    @classmethod
+    def from_context(cls, ctx: FeatureContext) -> KeyModeEvidenceV1:
+        scores = list(ctx.key_mode_window_scores or ())
+        slots = [] if scores else [_key_mode_slot_v1(k, m) for k, m in _windows_from_ctx(ctx)]
+        return cls(
+            slots=slots,
+            window_scores=scores,
+            has_tonal_evidence=bool(ctx.has_tonal_evidence),
+            duration_seconds=float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0),
+        )
+
+
+@dataclass(frozen=True)
+class KeyModePolicyV1:
+    """Key/mode tunables resolved once per config (same fallbacks as v1 always used)."""
+
+    gap_med: float
+    gap_high: float
+    stab_med: float
+    stab_high: float
+    min_dur_med: float
+    min_dur_high: float
+    top_n: int
+    ambiguous_gap: float
+    weak_emit_stability_min: float
+    weak_emit_min_duration_seconds: float
+    mode_stability_min: float
+    mode_gap_min: float
+    window_score_temperature: float
+
+
+@lru_cache(maxsize=16)
+def compile_key_mode_policy_v1(config: EngineConfig) -> KeyModePolicyV1:
+    t = config.tunables
+
+    def pick(name: str, legacy: str, default: float) -> float:
+        return float(getattr(t, name, getattr(t, legacy, default)))
+
+    return KeyModePolicyV1(
+        gap_med=pick("key_emit_gap_min_medium", "key_mode_gap_min_medium", 0.20),
+        gap_high=pick("key_emit_gap_min_high", "key_mode_gap_min_high", 0.30),
+        stab_med=pick("key_emit_stability_min_medium", "key_mode_stability_min_medium", 0.60),
+        stab_high=pick("key_emit_stability_min_high", "key_mode_stability_min_high", 0.75),
+        min_dur_med=pick(
+            "key_emit_min_duration_seconds_medium", "key_mode_min_duration_seconds_medium", 4.0
+        ),
+        min_dur_high=pick(
+            "key_emit_min_duration_seconds_high", "key_mode_min_duration_seconds_high", 6.0
+        ),
+        top_n=int(getattr(t, "key_mode_candidates_top_n", 5)),
+        ambiguous_gap=float(getattr(t, "key_mode_top2_ambiguity_threshold", 0.15)),
+        weak_emit_stability_min=pick(
+            "key_weak_emit_stability_min", "key_mode_weak_emit_stability_min", 0.90
+        ),
+        weak_emit_min_duration_seconds=pick(
+            "key_weak_emit_min_duration_seconds", "key_mode_weak_emit_min_duration_seconds", 2.0
+        ),
+        mode_stability_min=float(getattr(t, "mode_emit_pair_stability_min", 0.90)),
+        mode_gap_min=float(getattr(t, "mode_emit_pair_gap_min", 0.25)),
+        window_score_temperature=float(getattr(t, "key_mode_window_score_temperature", 0.01)),
+    )
+
+
 def _confidence_level(
     *,
     score_gap: float,
     stability: float,
     duration_seconds: float,
-    config: EngineConfig,
+    policy: KeyModePolicyV1,
 ) -> str:
-    gap_med = float(
-        getattr(
-            config.tunables,
-            "key_emit_gap_min_medium",
-            getattr(config.tunables, "key_mode_gap_min_medium", 0.20),
-        )
-    )
-    gap_high = float(
-        getattr(
-            config.tunables,
-            "key_emit_gap_min_high",
-            getattr(config.tunables, "key_mode_gap_min_high", 0.30),
-        )
-    )
-    stab_med = float(
-        getattr(
-            config.tunables,
-            "key_emit_stability_min_medium",
-            getattr(config.tunables, "key_mode_stability_min_medium", 0.60),
-        )
-    )
-    stab_high = float(
-        getattr(
-            config.tunables,
-            "key_emit_stability_min_high",
-            getattr(config.tunables, "key_mode_stability_min_high", 0.75),
-        )
-    )
-    min_dur_med = float(
-        getattr(
-            config.tunables,
-            "key_emit_min_duration_seconds_medium",
-            getattr(config.tunables, "key_mode_min_duration_seconds_medium", 4.0),
-        )
-    )
-    min_dur_high = float(
-        getattr(
-            config.tunables,
-            "key_emit_min_duration_seconds_high",
-            getattr(config.tunables, "key_mode_min_duration_seconds_high", 6.0),
-        )
-    )
-
-    if duration_seconds >= min_dur_high and score_gap >= gap_high and stability >= stab_high:
+    p = policy
+    if duration_seconds >= p.min_dur_high and score_gap >= p.gap_high and stability >= p.stab_high:
         return "high"
-    if duration_seconds >= min_dur_med and score_gap >= gap_med and stability >= stab_med:
+    if duration_seconds >= p.min_dur_med and score_gap >= p.gap_med and stability >= p.stab_med:
         return "medium"
     return "low"
 
 
+def _key_mode_slot_v1(key: str, mode: str) -> int:
+    """Dense vote slot for a parsed window: `key_index * 2 + mode_index`."""
+    return _KEY_INDEX[key] * len(_MODE_ORDER) + _MODE_INDEX[mode]
+
+
+def _key_mode_counts_v1(windows: list[tuple[str, str]]) -> list[int]:
+    """Window votes as a dense 24-slot vector (see `_key_mode_slot_v1`)."""
+    return _key_mode_counts_from_slots_v1(_key_mode_slot_v1(k, m) for k, m in windows)
+
+
+def _key_mode_counts_from_slots_v1(slots: Iterable[int]) -> list[int]:
+    counts = [0] * (len(_KEY_ORDER) * len(_MODE_ORDER))
+    for slot in slots:
+        counts[slot] += 1
+    return counts
+
+
+def _key_mode_soft_counts_v1(
+    window_scores: Iterable[Sequence[float]], *, temperature: float
+) -> list[float]:
+    """
+    Soft votes: each window's 24 key-slot correlations as a softmax at `temperature`.
+
+    A window whose best key clearly beats the rest casts (almost) one full vote
+    like a label would; a window torn between, say, relative major and minor
+    splits its vote, which lowers stability instead of picking a side.
+    """
+    n_slots = len(_KEY_ORDER) * len(_MODE_ORDER)
+    counts = [0.0] * n_slots
+    inv_t = 1.0 / max(float(temperature), 1e-6)
+    for scores in window_scores:
+        if len(scores) != n_slots:
+            continue
+        top = max(scores)
+        weights = [math.exp((float(r) - top) * inv_t) for r in scores]
+        norm = 1.0 / sum(weights)
+        for i, w in enumerate(weights):
+            counts[i] += w * norm
+    return counts
+
+
 def extract_key_mode_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[str, Any] | None:
     """
     Candidate-first key/mode extractor (Engine v1).
@@ -148,20 +230,75 @@ def extract_key_mode_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[st
     - Always return candidates when available.
 
     Notes:
-    - v1 currently operates without PCM. Candidates and stability are derived from
-      deterministic hints / window hints used by tests and future integrations.
+    - Candidates and stability come from per-window key scores (soft votes) when
+      the context carries them, else from window label hints / the global hint.
     """
-    if not ctx.has_tonal_evidence:
-        hooks.emit(
-            "feature_omitted",
-            feature="key_mode",
-            reason="confidence_below_threshold",
-            stage="feature:key_mode",
+    return _extract_key_mode_with_policy_v1(ctx, policy=compile_key_mode_policy_v1(config))
+
+
+def extract_key_mode_batch_v1(
+    items: Iterable[FeatureContext | KeyModeEvidenceV1], *, config: EngineConfig
+) -> list[dict[str, Any] | None]:
+    """
+    Evaluate the key/mode policy for many tracks.
+
+    `items` are FeatureContexts or evidence records (`KeyModeEvidenceV1`, e.g.
+    slices of an evidence store). Votes come from the slot/count path under
+    one compiled policy; per-track blocks (and feature_omitted events) are
+    identical to `extract_key_mode_v1`.
+
+    As with `extract_bpm_batch_v1`, the policy runs per track in pure Python
+    (no numpy); batching saves the tunable lookup and the label parse, not
+    the per-track ranking.
+    """
+    policy = compile_key_mode_policy_v1(config)
+    out: list[dict[str, Any] | None] = []
+    for item in items:
+        ev = item if isinstance(item, KeyModeEvidenceV1) else KeyModeEvidenceV1.from_context(item)
+        counts: list[float] | list[int] | None = None
+        if ev.has_tonal_evidence:
+            if ev.window_scores:
+                counts = _key_mode_soft_counts_v1(
+                    ev.window_scores, temperature=policy.window_score_temperature
+                )
+            else:
+                counts = _key_mode_counts_from_slots_v1(ev.slots)
+        out.append(
+            extract_key_mode_from_counts_v1(
+                counts, duration_seconds=ev.duration_seconds, policy=policy
+            )
         )
-        return None
+    return out
+
+
+def _extract_key_mode_with_policy_v1(
+    ctx: FeatureContext, *, policy: KeyModePolicyV1
+) -> dict[str, Any] | None:
+    counts: list[float] | list[int] | None = None
+    if ctx.has_tonal_evidence:
+        if ctx.key_mode_window_scores:
+            counts = _key_mode_soft_counts_v1(
+                ctx.key_mode_window_scores, temperature=policy.window_score_temperature
+            )
+        else:
+            counts = _key_mode_counts_v1(_windows_from_ctx(ctx))
+    duration_seconds = float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0)
+    return extract_key_mode_from_counts_v1(counts, duration_seconds=duration_seconds, policy=policy)
+
 
-    windows = _windows_from_ctx(ctx)
-    if not windows:
+def extract_key_mode_from_counts_v1(
+    counts: Sequence[float] | None,
+    *,
+    duration_seconds: float,
+    policy: KeyModePolicyV1,
+) -> dict[str, Any] | None:
+    """
+    Key/mode policy over a vote vector (shared by context and columnar replay).
+
+    `counts` holds label votes or soft votes (see `_key_mode_soft_counts_v1`);
+    it is None when the track has no tonal evidence.
+    """
+    if counts is None or not any(counts):
         hooks.emit(
             "feature_omitted",
             feature="key_mode",
@@ -170,26 +307,35 @@ def extract_key_mode_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[st
         )
         return None
 
-    counts: dict[tuple[str, str], int] = {}
-    for w in windows:
-        counts[w] = counts.get(w, 0) + 1
+    return _key_mode_block_from_counts_v1(counts, duration_seconds=duration_seconds, policy=policy)
 
-    scored = [((k, m), counts[(k, m)] / float(len(windows))) for k, m in counts]
-    scored.sort(
-        key=lambda t: (
-            -t[1],
-            _KEY_INDEX.get(t[0][0], 999),
-            _MODE_INDEX.get(t[0][1], 999),
-        )
-    )
 
-    counts_key: dict[str, int] = {}
-    for (key, _mode), count in counts.items():
-        counts_key[key] = counts_key.get(key, 0) + count
-    scored_key = [(k, counts_key[k] / float(len(windows))) for k in counts_key]
-    scored_key.sort(key=lambda t: (-t[1], _KEY_INDEX.get(t[0], 999)))
-
-    top_n = int(getattr(config.tunables, "key_mode_candidates_top_n", 5))
+def _key_mode_block_from_counts_v1(
+    counts: Sequence[float],
+    *,
+    duration_seconds: float,
+    policy: KeyModePolicyV1,
+) -> dict[str, Any]:
+    """Key/mode policy over a non-empty 24-slot vote vector (see `_key_mode_counts_v1`)."""
+    n_modes = len(_MODE_ORDER)
+    total = float(sum(counts))
+    scored = [
+        ((_KEY_ORDER[i // n_modes], _MODE_ORDER[i % n_modes]), c / total)
+        for i, c in enumerate(counts)
+        if c
+    ]
+    # Slots are already in (key, mode) order, so a stable sort on score alone keeps
+    # the deterministic tie-break.
+    scored.sort(key=lambda t: -t[1])
+
+    scored_key = []
+    for k, key in enumerate(_KEY_ORDER):
+        c = sum(counts[k * n_modes : (k + 1) * n_modes])
+        if c:
+            scored_key.append((key, c / total))
+    scored_key.sort(key=lambda t: -t[1])
+
+    top_n = policy.top_n
     scored = scored[: max(1, top_n)]
 
     s1 = scored[0][1]
@@ -201,33 +347,20 @@ def extract_key_mode_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[st
     key_s2 = scored_key[1][1] if len(scored_key) > 1 else 0.0
     key_gap = float(key_s1 - key_s2)
     key_stability = float(key_s1)
-    duration_seconds = float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0)
 
     key_confidence = _confidence_level(
         score_gap=key_gap,
         stability=key_stability,
         duration_seconds=duration_seconds,
-        config=config,
+        policy=policy,
     )
 
-    ambiguous_gap = float(getattr(config.tunables, "key_mode_top2_ambiguity_threshold", 0.15))
+    ambiguous_gap = policy.ambiguous_gap
     pair_ambiguous = bool(len(scored) > 1 and pair_gap < ambiguous_gap)
     key_ambiguous = bool(len(scored_key) > 1 and key_gap < ambiguous_gap)
 
-    weak_emit_stability_min = float(
-        getattr(
-            config.tunables,
-            "key_weak_emit_stability_min",
-            getattr(config.tunables, "key_mode_weak_emit_stability_min", 0.90),
-        )
-    )
-    weak_emit_min_duration_seconds = float(
-        getattr(
-            config.tunables,
-            "key_weak_emit_min_duration_seconds",
-            getattr(config.tunables, "key_mode_weak_emit_min_duration_seconds", 2.0),
-        )
-    )
+    weak_emit_stability_min = policy.weak_emit_stability_min
+    weak_emit_min_duration_seconds = policy.weak_emit_min_duration_seconds
     emit_with_weak_evidence = bool(
         key_confidence == "low"
         and (not key_ambiguous)
@@ -236,8 +369,8 @@ def extract_key_mode_v1(ctx: FeatureContext, *, config: EngineConfig) -> dict[st
     )
     effective_confidence = "medium" if emit_with_weak_evidence else key_confidence
     can_emit_key = bool(effective_confidence != "low" and (not key_ambiguous))
-    mode_stability_min = float(getattr(config.tunables, "mode_emit_pair_stability_min", 0.90))
-    mode_gap_min = float(getattr(config.tunables, "mode_emit_pair_gap_min", 0.25))
+    mode_stability_min = policy.mode_stability_min
+    mode_gap_min = policy.mode_gap_min
     mode_evidence_ok = bool(pair_stability >= mode_stability_min and pair_gap >= mode_gap_min)
     can_emit_mode = bool(can_emit_key and mode_evidence_ok and (not pair_ambiguous))
 
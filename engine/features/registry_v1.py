@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Collection, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from engine.core.config import EngineConfig
+from engine.core.errors import EngineError
+from engine.features.bpm_v1 import extract_bpm_v1
+from engine.features.grid_v1 import extract_grid_v1
+from engine.features.key_mode_v1 import extract_key_mode_v1
+from engine.features.tempo_curve_v1 import extract_tempo_curve_v1
+from engine.features.tonal_drift_v1 import extract_tonal_drift_ranges_v1
+from engine.features.types import FeatureContext
+
+# (ctx, config, upstream results by feature name) -> the feature's result.
+FeatureExtractorV1 = Callable[[FeatureContext, EngineConfig, Mapping[str, Any]], Any]
+
+
+@dataclass(frozen=True)
+class ProducerSpecV1:
+    """
+    An evidence producer: a decode-time or hint-stage computation features read.
+
+    `requires` lists producers whose output it consumes. Producers without
+    requirements are fed by the decode's single PCM pass, so every one of
+    them a plan needs runs concurrently, block by block.
+    """
+
+    name: str
+    requires: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class FeatureSpecV1:
+    """
+    A feature: its extractor, the producers it reads and the features it builds on.
+
+    `extract(ctx, config, upstream)` reads the results of the features in
+    `after` from `upstream` (None when one was omitted or skipped). With
+    `needs_upstream`, the runner skips the feature silently unless all of them
+    produced a result. `roles` are the feature roles it runs for; the runner
+    skips it silently for the others.
+    """
+
+    name: str
+    extract: FeatureExtractorV1
+    producers: tuple[str, ...]
+    after: tuple[str, ...] = ()
+    needs_upstream: bool = False
+    roles: frozenset[str] = frozenset({"guest", "free", "pro"})
+
+
+PRODUCERS_V1: dict[str, ProducerSpecV1] = {
+    p.name: p
+    for p in (
+        # Per-frame low/high band energy -> onset envelope.
+        ProducerSpecV1("envelope"),
+        # Per-window tempo lag search over the onset envelope.
+        ProducerSpecV1("tempogram", requires=("envelope",)),
+        # Per-frame pitch-class energy.
+        ProducerSpecV1("chroma"),
+        # Per-window key-profile correlations (scores, spans, labels).
+        ProducerSpecV1("key_windows", requires=("chroma",)),
+    )
+}
+
+
+def _extract_bpm(ctx: FeatureContext, config: EngineConfig, upstream: Mapping[str, Any]) -> Any:
+    return extract_bpm_v1(ctx, config=config)
+
+
+def _extract_tempo_curve(
+    ctx: FeatureContext, config: EngineConfig, upstream: Mapping[str, Any]
+) -> Any:
+    return extract_tempo_curve_v1(ctx, config=config, bpm_block=upstream["bpm"])
+
+
+def _extract_grid(ctx: FeatureContext, config: EngineConfig, upstream: Mapping[str, Any]) -> Any:
+    return extract_grid_v1(ctx, config=config, bpm_block=upstream.get("bpm"))
+
+
+def _extract_key_mode(
+    ctx: FeatureContext, config: EngineConfig, upstream: Mapping[str, Any]
+) -> Any:
+    return extract_key_mode_v1(ctx, config=config)
+
+
+def _extract_tonal_drift(
+    ctx: FeatureContext, config: EngineConfig, upstream: Mapping[str, Any]
+) -> Any:
+    return extract_tonal_drift_ranges_v1(ctx, config=config)
+
+
+# Declaration order is the run order among features with no dependency between them.
+FEATURES_V1: dict[str, FeatureSpecV1] = {
+    f.name: f
+    for f in (
+        FeatureSpecV1("bpm", _extract_bpm, producers=("tempogram",)),
+        FeatureSpecV1(
+            "tempo_curve",
+            _extract_tempo_curve,
+            producers=("tempogram",),
+            after=("bpm",),
+            needs_upstream=True,
+            roles=frozenset({"pro"}),
+        ),
+        FeatureSpecV1("grid", _extract_grid, producers=("envelope",), after=("bpm",)),
+        FeatureSpecV1("key_mode", _extract_key_mode, producers=("key_windows",)),
+        FeatureSpecV1(
+            "tonal_drift",
+            _extract_tonal_drift,
+            producers=("key_windows",),
+            roles=frozenset({"free", "pro"}),
+        ),
+    )
+}
+
+
+def _closure_v1(names: Collection[str], edges: dict[str, tuple[str, ...]]) -> frozenset[str]:
+    out: set[str] = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in out:
+            out.add(name)
+            stack.extend(edges[name])
+    return frozenset(out)
+
+
+@dataclass(frozen=True)
+class FeaturePlanV1:
+    """
+    Which features run and which producers they need (closed over dependencies).
+
+    Built by `plan_features_v1`; ingest and the runner consult it so evidence
+    behind a disabled feature is never computed. `order` lists `features` in
+    dependency order (every feature after the ones it builds on).
+    """
+
+    features: frozenset[str]
+    producers: frozenset[str]
+    order: tuple[str, ...] = ()
+
+    def runs(self, feature: str) -> bool:
+        return feature in self.features
+
+    def needs(self, producer: str) -> bool:
+        return producer in self.producers
+
+
+def plan_features_v1(features: Collection[str] | None = None) -> FeaturePlanV1:
+    """
+    Resolve requested features (None: all of `FEATURES_V1`) into a plan.
+
+    A feature pulls in the features it builds on (`grid` and `tempo_curve`
+    need `bpm`) and, transitively, every producer those read. Raises
+    EngineError(INVALID_INPUT) for a bare string or an unknown feature name.
+    """
+    if features is None:
+        requested: Collection[str] = tuple(FEATURES_V1)
+    elif isinstance(features, str):
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="features must be a collection of feature names",
+            context={"stage": "validate"},
+        )
+    else:
+        requested = tuple(features)
+    unknown = sorted(str(f) for f in requested if f not in FEATURES_V1)
+    if unknown:
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="Unknown feature",
+            context={"stage": "validate", "features": unknown, "known": sorted(FEATURES_V1)},
+        )
+    chosen = _closure_v1(requested, {f.name: f.after for f in FEATURES_V1.values()})
+    direct = [p for f in chosen for p in FEATURES_V1[f].producers]
+    producers = _closure_v1(direct, {p.name: p.requires for p in PRODUCERS_V1.values()})
+    return FeaturePlanV1(features=chosen, producers=producers, order=_dependency_order_v1(chosen))
+
+
+def _dependency_order_v1(chosen: frozenset[str]) -> tuple[str, ...]:
+    order: list[str] = []
+
+    def visit(name: str) -> None:
+        if name in order:
+            return
+        for dep in FEATURES_V1[name].after:
+            visit(dep)
+        order.append(name)
+
+    for name in FEATURES_V1:
+        if name in chosen:
+            visit(name)
+    return tuple(order)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Any, Literal
+
+from engine.core.config import EngineConfig
+from engine.features.key_mode_v1 import (
+    _key_mode_counts_from_slots_v1,
+    _normalize_tonic,
+    _parse_key_mode_label,
+    compile_key_mode_policy_v1,
+    extract_key_mode_from_counts_v1,
+)
+from engine.preprocess.key_hint_windows_v1 import KeyTagCheckV1
+
+TagVerificationStatus = Literal["confirmed", "refuted", "unknown"]
+
+# Camelot wheel (DJ software commonly writes these into TKEY).
+_CAMELOT_V1: dict[str, tuple[str, str]] = {
+    "1A": ("G#", "minor"),
+    "2A": ("D#", "minor"),
+    "3A": ("A#", "minor"),
+    "4A": ("F", "minor"),
+    "5A": ("C", "minor"),
+    "6A": ("G", "minor"),
+    "7A": ("D", "minor"),
+    "8A": ("A", "minor"),
+    "9A": ("E", "minor"),
+    "10A": ("B", "minor"),
+    "11A": ("F#", "minor"),
+    "12A": ("C#", "minor"),
+    "1B": ("B", "major"),
+    "2B": ("F#", "major"),
+    "3B": ("C#", "major"),
+    "4B": ("G#", "major"),
+    "5B": ("D#", "major"),
+    "6B": ("A#", "major"),
+    "7B": ("F", "major"),
+    "8B": ("C", "major"),
+    "9B": ("G", "major"),
+    "10B": ("D", "major"),
+    "11B": ("A", "major"),
+    "12B": ("E", "major"),
+}
+
+
+def parse_tag_key_v1(text: str | None) -> tuple[str | None, str | None]:
+    """
+    Parse a TKEY value into (tonic, mode).
+
+    Accepts ID3 short form ("Am", "F#m", "Db"), long form ("A minor") and Camelot
+    ("8A"). Mode is None when the tag names only a tonic; "o" (off-key) and
+    unparseable values yield (None, None).
+    """
+    if not text:
+        return None, None
+    s = str(text).strip()
+    camelot = _CAMELOT_V1.get(s.upper())
+    if camelot is not None:
+        return camelot
+    if " " in s:
+        return _parse_key_mode_label(s)
+    if s.lower().endswith("m") and len(s) >= 2:
+        tonic = _normalize_tonic(s[:-1])
+        return (tonic, "minor") if tonic is not None else (None, None)
+    tonic = _normalize_tonic(s)
+    return (tonic, None) if tonic is not None else (None, None)
+
+
+def verify_bpm_tag_v1(
+    bpm_block: dict[str, Any] | None,
+    *,
+    tagged_bpm: float | None,
+    config: EngineConfig,
+) -> TagVerificationStatus:
+    """
+    Check a BPM block computed from tag-narrowed evidence against the tag.
+
+    confirmed: the policy emitted a value (non-low confidence) whose reportable
+      or raw tempo matches the tag within `bpm_gap_family_tolerance_bpm`.
+    refuted: a tag exists but the narrowed evidence does not back it (no
+      emitted value, or a value that disagrees). Callers re-run the full search.
+    unknown: no usable tag.
+    """
+    if tagged_bpm is None or tagged_bpm <= 0:
+        return "unknown"
+    if not isinstance(bpm_block, dict) or not isinstance(bpm_block.get("value"), dict):
+        return "refuted"
+    tol = int(getattr(config.tunables, "bpm_gap_family_tolerance_bpm", 2))
+    tag = int(round(float(tagged_bpm)))
+    observed = [bpm_block["value"].get("value_rounded"), bpm_block.get("bpm_raw")]
+    for v in observed:
+        if isinstance(v, (int, float)) and abs(int(round(float(v))) - tag) <= tol:
+            return "confirmed"
+    return "refuted"
+
+
+def verify_key_tag_v1(
+    key_block: dict[str, Any] | None,
+    *,
+    tagged_key: str | None,
+    tagged_mode: str | None,
+) -> TagVerificationStatus:
+    """
+    Check the key policy output against a tagged key.
+
+    confirmed: the emitted key matches (and the mode too, when both name one).
+    refuted: an emitted key or mode contradicts the tag.
+    unknown: no usable tag, or no key was emitted (nothing to compare).
+    """
+    if tagged_key is None:
+        return "unknown"
+    if not isinstance(key_block, dict) or key_block.get("value") is None:
+        return "unknown"
+    if key_block.get("value") != tagged_key:
+        return "refuted"
+    mode = key_block.get("mode")
+    if tagged_mode is not None and mode is not None and mode != tagged_mode:
+        return "refuted"
+    return "confirmed"
+
+
+def key_mode_block_from_tag_check_v1(
+    check: KeyTagCheckV1, *, duration_seconds: float, config: EngineConfig
+) -> dict[str, Any] | None:
+    """
+    Key/mode block for a tag the hint stage confirmed (see `key_tag_check_v1`).
+
+    The key policy reads one vote per supporting window for the tagged slot
+    the window matched; no other key was scored, so the candidates name only
+    the tagged key (and, for a tag without a mode, its two mode rows).
+    """
+    return extract_key_mode_from_counts_v1(
+        _key_mode_counts_from_slots_v1(check.slots),
+        duration_seconds=duration_seconds,
+        policy=compile_key_mode_policy_v1(config),
+    )
+
+
+def with_tag_verification_evidence(
+    block: dict[str, Any], verification: dict[str, Any]
+) -> dict[str, Any]:
+    """Return a copy of a metric block carrying `evidence.tag_verification`."""
+    out = dict(block)
+    evidence = dict(out.get("evidence") or {})
+    evidence["tag_verification"] = dict(verification)
+    out["evidence"] = evidence
+    return out
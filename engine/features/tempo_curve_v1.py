@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from engine.core.config import EngineConfig
+from engine.features.bpm_evidence_v1 import _fold_into_range
+from engine.features.bpm_policy_v1 import compile_bpm_policy_v1
+from engine.features.types import FeatureContext
+from engine.observability import hooks
+
+# (bpm_key, score_key, ratio_key): best tempos carry their own score; double-time
+# tempos are weighted by score * half-lag ratio.
+_CANDIDATE_KEYS_V1 = (
+    ("best_bpm", "best_score", None),
+    ("high_best_bpm", "high_best_score", None),
+    ("double_bpm", "best_score", "double_ratio"),
+    ("high_double_bpm", "high_best_score", "high_double_ratio"),
+)
+
+_TIMEFEEL_FACTORS_V1 = {"double_time_preferred": 2.0, "half_time_preferred": 0.5}
+
+
+def _clamp01(x: float) -> float:
+    if x < 0.0:
+        return 0.0
+    if x > 1.0:
+        return 1.0
+    return x
+
+
+def _window_candidates_v1(d: dict[str, Any], *, lo: float, hi: float) -> dict[float, float]:
+    """Folded candidate tempos (0.1 BPM) -> best emission score for one window."""
+    out: dict[float, float] = {}
+    for bpm_key, score_key, ratio_key in _CANDIDATE_KEYS_V1:
+        try:
+            bpm = float(d[bpm_key])
+            raw_score = d.get(score_key)
+            score = 1.0 if raw_score is None else float(raw_score)
+            if ratio_key is not None:
+                score *= float(d[ratio_key])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not bpm > 0.0 or math.isnan(score):
+            continue
+        folded = round(_fold_into_range(bpm, lo=lo, hi=hi), 1)
+        if not lo <= folded <= hi:
+            continue
+        emit = _clamp01(score)
+        if emit > out.get(folded, -1.0):
+            out[folded] = emit
+    return out
+
+
+def _viterbi_path_v1(
+    states: list[list[tuple[float, float]]], *, octave_penalty: float
+) -> list[float]:
+    """
+    Max-score path through per-window (bpm, emission) states.
+
+    Transitions cost `octave_penalty * |log2(b / b_prev)|`. O(windows * states^2)
+    with at most four states per window, i.e. linear in track length. Ties keep
+    the earlier (lower) state for determinism.
+    """
+    logs = [[math.log2(b) for b, _ in row] for row in states]
+    score = [e for _, e in states[0]]
+    back: list[list[int]] = []
+    for t in range(1, len(states)):
+        prev_logs = logs[t - 1]
+        row_score: list[float] = []
+        row_back: list[int] = []
+        for k, (_, emit) in enumerate(states[t]):
+            lk = logs[t][k]
+            best_j = 0
+            best = -math.inf
+            for j, s in enumerate(score):
+                v = s - octave_penalty * abs(lk - prev_logs[j])
+                if v > best:
+                    best = v
+                    best_j = j
+            row_score.append(best + emit)
+            row_back.append(best_j)
+        score = row_score
+        back.append(row_back)
+
+    k = max(range(len(score)), key=lambda i: (score[i], -i))
+    path = [k]
+    for row_back in reversed(back):
+        k = row_back[k]
+        path.append(k)
+    path.reverse()
+    return [states[t][k][0] for t, k in enumerate(path)]
+
+
+def extract_tempo_curve_v1(
+    ctx: FeatureContext,
+    *,
+    config: EngineConfig,
+    bpm_block: dict[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    """
+    Tempo over time from the hint stage's per-window evidence (Pro).
+
+    Each window contributes its band/double-time tempos (folded into the
+    normalized range) as candidate states; a Viterbi pass picks the smoothest
+    high-evidence path. When `bpm_block` reports a double/half timefeel, the
+    curve is scaled to match the reported tempo.
+
+    Omitted (None) when `bpm_block` carries no `value` (the BPM policy withheld
+    the tempo, so the curve must not publish one) or when fewer than
+    `tempo_curve_min_windows` timed windows exist.
+    """
+    if isinstance(bpm_block, dict) and bpm_block.get("value") is None:
+        hooks.emit(
+            "feature_omitted",
+            feature="tempo_curve",
+            reason="bpm_withheld",
+            stage="feature:tempo_curve",
+        )
+        return None
+    policy = compile_bpm_policy_v1(config)
+    lo = float(policy.lo_bpm)
+    hi = float(policy.hi_bpm)
+    min_windows = int(getattr(config.tunables, "tempo_curve_min_windows", 3))
+    octave_penalty = float(getattr(config.tunables, "tempo_curve_octave_penalty", 2.0))
+
+    spans: list[tuple[float, float]] = []
+    states: list[list[tuple[float, float]]] = []
+    for d in ctx.bpm_hint_window_details or []:
+        if not isinstance(d, dict):
+            continue
+        try:
+            start_s = float(d["start_s"])
+            end_s = float(d["end_s"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not end_s > start_s:
+            continue
+        cands = _window_candidates_v1(d, lo=lo, hi=hi)
+        if not cands:
+            continue
+        spans.append((start_s, end_s))
+        states.append(sorted(cands.items()))
+
+    if len(states) < max(1, min_windows):
+        hooks.emit(
+            "feature_omitted",
+            feature="tempo_curve",
+            reason="insufficient_windows",
+            stage="feature:tempo_curve",
+        )
+        return None
+
+    factor = 1.0
+    if isinstance(bpm_block, dict):
+        factor = _TIMEFEEL_FACTORS_V1.get(str(bpm_block.get("timefeel")), 1.0)
+
+    path = _viterbi_path_v1(states, octave_penalty=octave_penalty)
+    points = [
+        {"start_s": start_s, "end_s": end_s, "bpm": round(bpm * factor, 1)}
+        for (start_s, end_s), bpm in zip(spans, path, strict=True)
+    ]
+    return {
+        "points": points,
+        "method": "tempo_curve_viterbi_v1",
+        "limits": "Window-level tempo (overlapping windows); not beat-accurate.",
+    }
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from engine.core.config import EngineConfig
+from engine.features.types import FeatureContext
+from engine.preprocess.key_hint_windows_v1 import key_slot_label_v1
+
+_KEY_SLOTS_V1 = 24
+
+
+@dataclass(frozen=True)
+class KeySegmentV1:
+    """A run of windows attributed to one key slot (`tonic_index * 2 + mode_index`)."""
+
+    start_s: float
+    end_s: float
+    slot: int
+    windows: int
+
+
+def _argmax(row: Sequence[float]) -> int:
+    return max(range(len(row)), key=row.__getitem__)
+
+
+class TonalDriftDetectorV1:
+    """
+    Online key change-point detector over per-window key scores.
+
+    The current segment is held by one key slot. Each window adds
+    `score[challenger] - score[current] - margin` to a one-sided CUSUM for the
+    best competing slot; the challenger takes over (from the start of the first
+    window that favoured it) once the sum reaches `threshold` over at least
+    `min_windows` windows. A different slot winning resets the race.
+
+    O(1) work and state per window (the first `min_windows` rows are pooled to
+    pick the opening key); only closed segments are retained.
+    """
+
+    def __init__(self, *, threshold: float, margin: float, min_windows: int):
+        if threshold <= 0.0 or margin < 0.0 or min_windows <= 0:
+            raise ValueError("threshold must be > 0, margin >= 0, min_windows > 0")
+        self._threshold = float(threshold)
+        self._margin = float(margin)
+        self._min_windows = int(min_windows)
+        self._segments: list[KeySegmentV1] = []
+        self._warmup: list[tuple[Sequence[float], float, float]] = []
+        self._slot: int | None = None
+        self._start = 0.0
+        self._end = 0.0
+        self._windows = 0
+        self._challenger: int | None = None
+        self._cusum = 0.0
+        self._pending_start = 0.0
+        self._pending = 0
+
+    def feed(self, scores: Sequence[float], *, start_s: float, end_s: float) -> None:
+        """Consume the next window (windows must arrive in time order)."""
+        if len(scores) != _KEY_SLOTS_V1:
+            return
+        if self._slot is None:
+            self._warmup.append((scores, start_s, end_s))
+            if len(self._warmup) >= self._min_windows:
+                self._open_from_warmup()
+            return
+        self._step(self._slot, scores, start_s=start_s, end_s=end_s)
+
+    def _open_from_warmup(self) -> None:
+        pooled = [sum(row[k] for row, _s, _e in self._warmup) for k in range(_KEY_SLOTS_V1)]
+        self._slot = _argmax(pooled)
+        self._start = self._warmup[0][1]
+        self._end = self._warmup[-1][2]
+        self._windows = len(self._warmup)
+        self._warmup = []
+
+    def _step(self, cur: int, scores: Sequence[float], *, start_s: float, end_s: float) -> None:
+        best = _argmax(scores)
+        if self._challenger is not None and best not in (cur, self._challenger):
+            self._reset_race()
+        if self._challenger is None and best != cur:
+            self._challenger = best
+            self._pending_start = start_s
+        if self._challenger is not None:
+            step = scores[self._challenger] - scores[cur] - self._margin
+            self._cusum = max(0.0, self._cusum + step)
+            self._pending += 1
+            if self._cusum == 0.0:
+                self._reset_race()
+            elif self._cusum >= self._threshold and self._pending >= self._min_windows:
+                self._change_to(cur, self._challenger, end_s=end_s)
+                return
+        self._end = end_s
+        self._windows += 1
+
+    def _change_to(self, cur: int, slot: int, *, end_s: float) -> None:
+        at_s = self._pending_start
+        # Pending windows before this one were counted towards the old key.
+        kept = self._windows - (self._pending - 1)
+        if at_s > self._start:
+            self._segments.append(
+                KeySegmentV1(start_s=self._start, end_s=at_s, slot=cur, windows=kept)
+            )
+        self._slot = slot
+        self._start = at_s
+        self._end = end_s
+        self._windows = self._pending
+        self._reset_race()
+
+    def _reset_race(self) -> None:
+        self._challenger = None
+        self._cusum = 0.0
+        self._pending = 0
+
+    def finish(self) -> list[KeySegmentV1]:
+        """Closed segments plus the open one (fewer than `min_windows` windows: none)."""
+        if self._slot is None:
+            return []
+        return [
+            *self._segments,
+            KeySegmentV1(
+                start_s=self._start, end_s=self._end, slot=self._slot, windows=self._windows
+            ),
+        ]
+
+
+def _fifths_distance_v1(a: int, b: int) -> int:
+    """Circle-of-fifths distance between key slots (relative keys are 0 apart)."""
+
+    def position(slot: int) -> int:
+        tonic = slot // 2 if slot % 2 == 0 else (slot // 2 + 3) % 12
+        return (tonic * 7) % 12
+
+    d = abs(position(a) - position(b))
+    return min(d, 12 - d)
+
+
+def _severity_v1(slot: int, *, reference: int) -> str:
+    d = _fifths_distance_v1(slot, reference)
+    if d == 0:
+        return "low"
+    if d == 1:
+        return "medium"
+    return "high"
+
+
+def extract_tonal_drift_ranges_v1(
+    ctx: FeatureContext, *, config: EngineConfig
+) -> list[dict[str, Any]]:
+    """
+    Sections whose key departs from the track's home key, as event ranges.
+
+    Runs `TonalDriftDetectorV1` over the per-window key scores computed for the
+    global key (no extra pass over audio). The home key is the slot held for
+    the longest time; every other segment becomes a range with its key label
+    and a severity by circle-of-fifths distance (relative key "low", adjacent
+    key "medium", anything further "high").
+
+    Empty when there is no tonal evidence, no timed window scores, or a single key.
+    """
+    scores = ctx.key_mode_window_scores
+    spans = ctx.key_mode_window_spans
+    if not ctx.has_tonal_evidence or not scores or not spans or len(scores) != len(spans):
+        return []
+
+    t = config.tunables
+    detector = TonalDriftDetectorV1(
+        threshold=float(getattr(t, "tonal_drift_threshold", 0.3)),
+        margin=float(getattr(t, "tonal_drift_margin", 0.05)),
+        min_windows=int(getattr(t, "tonal_drift_min_windows", 2)),
+    )
+    for row, span in zip(scores, spans, strict=True):
+        try:
+            start_s, end_s = float(span[0]), float(span[1])
+        except (IndexError, TypeError, ValueError):
+            continue
+        detector.feed(row, start_s=start_s, end_s=end_s)
+    segments = detector.finish()
+    if len(segments) < 2:
+        return []
+
+    held: dict[int, float] = {}
+    for seg in segments:
+        held[seg.slot] = held.get(seg.slot, 0.0) + (seg.end_s - seg.start_s)
+    home = max(sorted(held), key=held.__getitem__)
+
+    return [
+        {
+            "start_s": round(seg.start_s, 3),
+            "end_s": round(seg.end_s, 3),
+            "severity": _severity_v1(seg.slot, reference=home),
+            "key": key_slot_label_v1(seg.slot),
+        }
+        for seg in segments
+        if seg.slot != home and seg.end_s > seg.start_s
+    ]
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from engine.preprocess.bpm_hint_windows_v1 import OnsetEnvelope
 from engine.preprocess.preprocess_v1 import PreprocessedAudio
+from engine.preprocess.signals_v1 import DerivedSignals
 
 
 @dataclass(frozen=True)
@@ -26,3 +28,16 @@ class FeatureContext:
     key_mode_hint: str | None = None  # e.g. "F# minor"
     # Window-level key/mode hints (for candidate + stability tests). Values are like "F# minor".
     key_mode_hint_windows: list[str] | None = None
+    # Per-window correlations with the 24 key slots (C major, C minor, C# major, ...),
+    # derived from PCM chroma. When present, the key/mode policy aggregates these as
+    # soft votes instead of counting `key_mode_hint_windows` labels.
+    key_mode_window_scores: list[list[float]] | None = None
+    # [start_s, end_s] of each scored window (aligned with the scores); tonal drift
+    # ranges are placed on these.
+    key_mode_window_spans: list[list[float]] | None = None
+
+    # Hint-stage onset envelope (beat grid input; None when not decoded from PCM).
+    onset_envelope: OnsetEnvelope | None = None
+
+    # Shared lazily-derived signal views (None when the decode kept no PCM).
+    signals: DerivedSignals | None = None
@@ -12,6 +12,7 @@ No analysis logic here (no BPM, no key, no grid).
 
 from .ingest import IngestLimits as IngestLimits
 from .ingest import ingest_v1 as ingest_v1
+from .pcm_v1 import SharedPcm as SharedPcm
 from .types import DecodedAudio as DecodedAudio
 
-__all__ = ["DecodedAudio", "IngestLimits", "ingest_v1"]
+__all__ = ["DecodedAudio", "IngestLimits", "SharedPcm", "ingest_v1"]
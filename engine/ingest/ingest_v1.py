@@ -1,17 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import shutil
+import signal
 import subprocess
 import tempfile
+import wave
+from array import array
+from collections.abc import Collection
 from pathlib import Path
+from typing import Any
 
+from engine.core.config import EngineConfig
+from engine.core.deadline_v1 import DeadlinePolicy, DeadlineV1
 from engine.core.errors import EngineError
 from engine.ingest.decode_wav_v1 import decode_wav_v1
+from engine.ingest.stream_v1 import PcmConsumerV1, PeakLevelV1, SharedPcmWriterV1, stream_wav_v1
 from engine.ingest.types import DecodedAudio
+from engine.observability.stages_v1 import SubStageTimerV1
 from engine.preprocess.bpm_hint_windows_v1 import (
-    compute_bpm_hint_window_details_from_wav_v1,
-    compute_bpm_hint_windows_from_wav_v1,
+    EnergyEnvelopeAccumulatorV1,
+    TempoPrior,
+    bpm_hint_evidence_from_energy_v1,
+    flatten_bpm_hint_windows_v1,
+    onset_envelope_from_energy_v1,
 )
+from engine.preprocess.key_hint_windows_v1 import (
+    chroma_spec_v1,
+    key_slot_label_v1,
+    key_tag_check_v1,
+    key_window_evidence_v1,
+)
+
+# Audio shorter than this carries no hint-stage evidence (BPM or key windows).
+_HINT_MIN_AUDIO_SECONDS_V1 = 2.0
 
 
 def _stderr_snippet(s: str, *, limit: int = 400) -> str:
@@ -21,7 +44,363 @@ def _stderr_snippet(s: str, *, limit: int = 400) -> str:
     return t[:limit] + "..."
 
 
-def _decode_mp3_via_ffmpeg_v1(path: Path) -> DecodedAudio:
+class _BestEffortV1:
+    """Fan-out wrapper for analysis stages: a failing stage drops out (result None)."""
+
+    def __init__(self, consumer: PcmConsumerV1):
+        self._consumer: PcmConsumerV1 | None = consumer
+
+    def feed(self, block: array) -> None:
+        if self._consumer is None:
+            return
+        try:
+            self._consumer.feed(block)
+        except Exception:
+            self._consumer = None
+
+    def finish(self) -> Any:
+        if self._consumer is None:
+            return None
+        try:
+            return self._consumer.finish()
+        except Exception:
+            return None
+
+
+class _DeadlineGatedV1:
+    """
+    Partial-mode wrapper for a hint consumer: once the deadline passes it stops
+    feeding (the stream itself runs on so the PCM copy completes) and yields None.
+    """
+
+    def __init__(self, consumer: PcmConsumerV1, deadline: DeadlineV1):
+        self._consumer = consumer
+        self._deadline = deadline
+        self.dropped = False
+
+    def feed(self, block: array) -> None:
+        if self.dropped:
+            return
+        if self._deadline.expired():
+            self.dropped = True
+            return
+        self._consumer.feed(block)
+
+    def finish(self) -> Any:
+        return None if self.dropped else self._consumer.finish()
+
+
+class _TimedV1:
+    """Fan-out wrapper timing a consumer's `feed` and `finish` calls (`abort` passes through)."""
+
+    def __init__(self, consumer: PcmConsumerV1, timer: SubStageTimerV1):
+        self._consumer = consumer
+        self.timer = timer
+
+    def feed(self, block: array) -> None:
+        with self.timer:
+            self._consumer.feed(block)
+
+    def finish(self) -> Any:
+        with self.timer:
+            return self._consumer.finish()
+
+    def abort(self) -> None:
+        abort = getattr(self._consumer, "abort", None)
+        if abort is not None:
+            abort()
+
+
+def _is_timeout_v1(exc: BaseException) -> bool:
+    return isinstance(exc, EngineError) and exc.code == "TIMEOUT"
+
+
+def _decode_fan_out_v1(
+    wav_path: Path,
+    *,
+    path: Path,
+    suffix: str,
+    config: EngineConfig,
+    tempo_prior: TempoPrior | None,
+    keep_pcm: bool,
+    deadline: DeadlineV1 | None = None,
+    deadline_policy: DeadlinePolicy = "raise",
+    producers: Collection[str] | None = None,
+    key_tag: tuple[str, str | None] | None = None,
+) -> dict[str, Any]:
+    """
+    One streaming pass over `wav_path` feeding every decode-time consumer.
+
+    Registered consumers: peak level; tempo energy envelope and key chroma
+    (hint stages, skipped for audio shorter than the hint stage minimum); and,
+    with keep_pcm, the shared-memory PCM copy. Returns the DecodedAudio fields
+    they produce.
+
+    `producers` (names from `engine.features.registry_v1.PRODUCERS_V1`; None:
+    all) limits the hint stages: only the envelope/chroma consumers and the
+    tempogram/key-window searches a plan needs run; the others' fields stay None.
+
+    `key_tag` (tonic, mode or None) is a tagged key to check first against its
+    own key-profile row ("hint_windows:key_tag", see `key_tag_check_v1`). When
+    it is confirmed, its supporting windows become the key hints and the 24-key
+    search is skipped; otherwise the search runs as usual.
+
+    Hints are best-effort: a failing hint stage leaves its fields None. Only the
+    PCM copy is required; when it cannot be read the decode fails with
+    EngineError(INVALID_INPUT). With deadline_policy="raise", an expired
+    `deadline` (checked per block and per analysis window) is never swallowed:
+    it raises EngineError(TIMEOUT). With "partial", the PCM copy always
+    completes; hint stages still running at expiry drop their evidence and are
+    listed in `skipped_stages` ("decode:<consumer>", "hint_windows:<search>").
+
+    Sub-stage timings go to `stage_timings` under the same names: each
+    consumer's feed/finish time over the pass (peak, envelope, chroma, pcm)
+    and each post-pass search, with the windows it analyzed.
+    """
+    partial = deadline_policy == "partial" and deadline is not None
+    skipped: list[str] = []
+    out: dict[str, Any] = {
+        "bpm_hint_windows": None,
+        "bpm_hint_window_details": None,
+        "onset_envelope": None,
+        "key_mode_hint_windows": None,
+        "key_mode_window_scores": None,
+        "key_mode_window_spans": None,
+        "key_tag_check": None,
+        "peak_dbfs": None,
+        "pcm": None,
+        "skipped_stages": (),
+        "stage_timings": (),
+    }
+    wanted = frozenset(producers) if producers is not None else None
+
+    def needs(producer: str) -> bool:
+        return wanted is None or producer in wanted
+
+    consumers: dict[str, PcmConsumerV1] = {"peak": _BestEffortV1(PeakLevelV1())}
+    try:
+        with wave.open(str(wav_path), "rb") as wf:
+            sample_rate_hz = int(wf.getframerate())
+            channels = int(wf.getnchannels())
+            frames = int(wf.getnframes())
+        if frames / float(sample_rate_hz) < _HINT_MIN_AUDIO_SECONDS_V1:
+            if needs("tempogram"):
+                out["bpm_hint_windows"] = []
+                out["bpm_hint_window_details"] = []
+            if needs("key_windows"):
+                out["key_mode_hint_windows"] = []
+                out["key_mode_window_scores"] = []
+                out["key_mode_window_spans"] = []
+        else:
+            if needs("envelope"):
+                consumers["envelope"] = _BestEffortV1(
+                    EnergyEnvelopeAccumulatorV1(sample_rate_hz=sample_rate_hz, channels=channels)
+                )
+            if needs("chroma"):
+                consumers["chroma"] = _BestEffortV1(
+                    chroma_spec_v1(config).accumulator(
+                        sample_rate_hz=sample_rate_hz, channels=channels
+                    )
+                )
+    except Exception:
+        # Unreadable header or unsupported layout: hint stages stay off.
+        pass
+
+    gated: dict[str, _DeadlineGatedV1] = {}
+    if partial:
+        for name in ("envelope", "chroma"):
+            if name in consumers:
+                gated[name] = _DeadlineGatedV1(consumers[name], deadline)  # type: ignore[arg-type]
+                consumers[name] = gated[name]
+
+    try:
+        if keep_pcm:
+            with wave.open(str(wav_path), "rb") as wf:
+                consumers["pcm"] = SharedPcmWriterV1(
+                    frames=int(wf.getnframes()),
+                    channels=int(wf.getnchannels()),
+                    sample_rate_hz=int(wf.getframerate()),
+                )
+        timed = {
+            name: _TimedV1(consumer, SubStageTimerV1(f"decode:{name}"))
+            for name, consumer in consumers.items()
+        }
+        results = stream_wav_v1(wav_path, timed, deadline=None if partial else deadline)
+    except Exception as exc:
+        if _is_timeout_v1(exc):
+            raise
+        if not keep_pcm:
+            return out
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="Invalid input",
+            context={
+                "stage": "decode",
+                "path": str(path),
+                "suffix": suffix,
+                "reason": str(exc),
+            },
+        ) from exc
+
+    timings = [t.timer.timing() for t in timed.values()]
+    out["peak_dbfs"] = results["peak"]
+    out["pcm"] = results.get("pcm")
+    if keep_pcm:
+        out["spectrogram_cache_bytes"] = int(
+            getattr(config.tunables, "spectrogram_cache_bytes", 64 * 1024 * 1024)
+        )
+    skipped.extend(f"decode:{name}" for name, gate in gated.items() if gate.dropped)
+
+    def dropped_by_deadline(exc: Exception, search: str) -> None:
+        # A timeout is re-raised, except in partial mode where the search's
+        # evidence is dropped and reported.
+        if not _is_timeout_v1(exc):
+            return
+        if not partial:
+            raise exc
+        skipped.append(f"hint_windows:{search}")
+
+    energy = results.get("envelope")
+    if energy is not None and needs("tempogram"):
+        timer = SubStageTimerV1("hint_windows:tempogram")
+        try:
+            with timer:
+                bpm_details, onset = bpm_hint_evidence_from_energy_v1(
+                    energy[0], energy[1], tempo_prior=tempo_prior, deadline=deadline
+                )
+            out["bpm_hint_window_details"] = bpm_details
+            out["bpm_hint_windows"] = flatten_bpm_hint_windows_v1(bpm_details)
+            out["onset_envelope"] = onset
+        except Exception as exc:
+            dropped_by_deadline(exc, "tempogram")
+        timings.append(timer.timing(windows_analyzed=len(out["bpm_hint_window_details"] or ())))
+    elif energy is not None:
+        try:
+            out["onset_envelope"] = onset_envelope_from_energy_v1(energy[0], energy[1])
+        except Exception:
+            pass
+    chroma = results.get("chroma")
+    key_check = None
+    if chroma is not None and needs("key_windows") and key_tag is not None:
+        timer = SubStageTimerV1("hint_windows:key_tag")
+        try:
+            with timer:
+                key_check = key_tag_check_v1(
+                    chroma, tonic=key_tag[0], mode=key_tag[1], config=config, deadline=deadline
+                )
+            out["key_tag_check"] = key_check
+        except Exception as exc:
+            dropped_by_deadline(exc, "key_tag")
+        timings.append(timer.timing(windows_analyzed=key_check.windows if key_check else 0))
+    if key_check is not None and key_check.status == "confirmed":
+        # The tag held on its own profile row: its supporting windows stand in
+        # for the 24-key search, which is skipped.
+        out["key_mode_hint_windows"] = [key_slot_label_v1(s) for s in key_check.slots]
+        out["key_mode_window_spans"] = key_check.spans
+    elif chroma is not None and needs("key_windows"):
+        timer = SubStageTimerV1("hint_windows:key_windows")
+        try:
+            with timer:
+                (key_evidence,) = key_window_evidence_v1([chroma], config=config, deadline=deadline)
+            out["key_mode_hint_windows"] = key_evidence.hints
+            out["key_mode_window_scores"] = key_evidence.scores
+            out["key_mode_window_spans"] = key_evidence.spans
+        except Exception as exc:
+            dropped_by_deadline(exc, "key_windows")
+        timings.append(timer.timing(windows_analyzed=len(out["key_mode_window_scores"] or ())))
+    out["skipped_stages"] = tuple(skipped)
+    out["stage_timings"] = tuple(timings)
+    return out
+
+
+def _kill_process_group_v1(proc: subprocess.Popen[str] | asyncio.subprocess.Process) -> None:
+    """
+    Kill a decoder subprocess together with anything it spawned.
+
+    The decoder runs as the leader of its own session, so its pid is also the
+    process-group id. Platforms without process groups fall back to a plain kill.
+    """
+    poll = getattr(proc, "poll", None)
+    if (poll() if poll is not None else proc.returncode) is not None:
+        return
+    killpg = getattr(os, "killpg", None)
+    if killpg is not None:
+        try:
+            killpg(proc.pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _run_decoder_v1(
+    cmd: list[str], *, timeout_seconds: float | None
+) -> subprocess.CompletedProcess[str]:
+    """
+    Run an external decoder under a wall-clock budget.
+
+    Unlike `subprocess.run(timeout=...)`, expiry kills the decoder's whole process
+    group (not just the direct child) before re-raising `subprocess.TimeoutExpired`.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout_seconds)
+    except subprocess.TimeoutExpired:
+        _kill_process_group_v1(proc)
+        proc.communicate()
+        raise
+    except BaseException:
+        _kill_process_group_v1(proc)
+        proc.wait()
+        raise
+    return subprocess.CompletedProcess(cmd, int(proc.returncode), stdout, stderr)
+
+
+async def _run_decoder_async_v1(
+    cmd: list[str], *, timeout_seconds: float | None
+) -> subprocess.CompletedProcess[str]:
+    """
+    `_run_decoder_v1` over asyncio subprocess pipes: waiting never blocks the loop.
+
+    Expiry or task cancellation kills the decoder's process group; expiry then
+    raises `subprocess.TimeoutExpired` like the blocking variant.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout_seconds)
+    except TimeoutError as exc:
+        _kill_process_group_v1(proc)
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, float(timeout_seconds or 0.0)) from exc
+    except BaseException:
+        _kill_process_group_v1(proc)
+        await proc.wait()
+        raise
+    return subprocess.CompletedProcess(
+        cmd,
+        int(proc.returncode or 0),
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
+def _ffmpeg_or_raise_v1(path: Path) -> str:
     ffmpeg = shutil.which("ffmpeg")
     if not ffmpeg:
         raise EngineError(
@@ -34,74 +413,204 @@ def _decode_mp3_via_ffmpeg_v1(path: Path) -> DecodedAudio:
                 "dependency": "ffmpeg",
             },
         )
+    return ffmpeg
+
 
+def _mp3_transcode_cmd_v1(ffmpeg: str, path: Path, out_wav: Path) -> list[str]:
     # v1 ingest is metadata-only. We transcode to WAV because stdlib `wave`
     # cannot read mp3, and we avoid heavy Python deps.
-    with tempfile.TemporaryDirectory(prefix="bnk_ingest_mp3_") as td:
-        out_wav = Path(td) / "decoded.wav"
-        cmd = [
-            ffmpeg,
-            "-nostdin",
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-y",
-            "-i",
-            str(path),
-            "-vn",
-            "-f",
-            "wav",
-            str(out_wav),
-        ]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        if proc.returncode != 0:
-            raise EngineError(
-                code="INVALID_INPUT",
-                message="Failed to decode mp3",
-                context={
-                    "stage": "decode",
-                    "path": str(path),
-                    "suffix": ".mp3",
-                    "ffmpeg_returncode": int(proc.returncode),
-                    "stderr_snippet": _stderr_snippet(proc.stderr),
-                },
-            )
+    return [
+        ffmpeg,
+        "-nostdin",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        str(path),
+        "-vn",
+        "-f",
+        "wav",
+        str(out_wav),
+    ]
 
-        try:
-            wav_audio = decode_wav_v1(out_wav)
-        except Exception as exc:
-            raise EngineError(
-                code="INVALID_INPUT",
-                message="Invalid input",
-                context={
-                    "stage": "decode",
-                    "path": str(path),
-                    "suffix": ".mp3",
-                    "reason": str(exc),
-                },
-            ) from exc
 
+def _transcode_timeout_v1(cfg: EngineConfig, deadline: DeadlineV1 | None) -> float | None:
+    """The transcode budget, capped by what is left of the deadline (checked first)."""
+    timeout_s = cfg.tunables.decode_transcode_timeout_seconds
+    if deadline is None:
+        return timeout_s
+    deadline.check("decode")
+    remaining = deadline.remaining()
+    if remaining is not None:
+        timeout_s = remaining if timeout_s is None else min(timeout_s, remaining)
+    return timeout_s
+
+
+def _transcode_timeout_error_v1(
+    path: Path, *, timeout_s: float | None, deadline: DeadlineV1 | None
+) -> EngineError:
+    if deadline is not None:
+        # The analysis budget ran out before the transcode budget did.
         try:
-            bpm_details = compute_bpm_hint_window_details_from_wav_v1(out_wav)
-            bpm_windows = compute_bpm_hint_windows_from_wav_v1(out_wav)
-        except Exception:
-            bpm_details = None
-            bpm_windows = None
+            deadline.check("decode")
+        except EngineError as timeout:
+            return timeout
+    return EngineError(
+        code="TIMEOUT",
+        message="Decode exceeded time budget",
+        context={
+            "stage": "decode",
+            "budget": "decode_transcode",
+            "path": str(path),
+            "suffix": ".mp3",
+            "dependency": "ffmpeg",
+            "timeout_seconds": float(timeout_s or 0.0),
+        },
+    )
 
-        # Preserve original input format for downstream reporting.
-        return DecodedAudio(
-            sample_rate_hz=int(wav_audio.sample_rate_hz),
-            channels=int(wav_audio.channels),
-            duration_seconds=float(wav_audio.duration_seconds),
-            format="mp3",
-            codec="mp3",
-            container="mp3",
-            bpm_hint_windows=bpm_windows,
-            bpm_hint_window_details=bpm_details if bpm_details is not None else None,
+
+def _check_transcode_v1(proc: subprocess.CompletedProcess[str], path: Path) -> None:
+    if proc.returncode != 0:
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="Failed to decode mp3",
+            context={
+                "stage": "decode",
+                "path": str(path),
+                "suffix": ".mp3",
+                "ffmpeg_returncode": int(proc.returncode),
+                "stderr_snippet": _stderr_snippet(proc.stderr),
+            },
+        )
+
+
+async def transcode_mp3_async_v1(
+    path: Path,
+    out_wav: Path,
+    *,
+    config: EngineConfig | None = None,
+    deadline: DeadlineV1 | None = None,
+) -> None:
+    """
+    Transcode an mp3 to `out_wav` with ffmpeg, awaiting the subprocess natively.
+
+    Same budget and errors as the blocking mp3 decode; pair with
+    `decode_transcoded_mp3_v1` (CPU-bound, best run off the event loop).
+    """
+    ffmpeg = _ffmpeg_or_raise_v1(path)
+    timeout_s = _transcode_timeout_v1(config or EngineConfig(), deadline)
+    try:
+        proc = await _run_decoder_async_v1(
+            _mp3_transcode_cmd_v1(ffmpeg, path, out_wav), timeout_seconds=timeout_s
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise _transcode_timeout_error_v1(path, timeout_s=timeout_s, deadline=deadline) from exc
+    _check_transcode_v1(proc, path)
+
+
+def decode_transcoded_mp3_v1(
+    path: Path,
+    *,
+    wav_path: Path,
+    config: EngineConfig | None = None,
+    keep_pcm: bool = False,
+    tempo_prior: TempoPrior | None = None,
+    deadline: DeadlineV1 | None = None,
+    deadline_policy: DeadlinePolicy = "raise",
+    producers: Collection[str] | None = None,
+    key_tag: tuple[str, str | None] | None = None,
+) -> DecodedAudio:
+    """
+    Decode the WAV ffmpeg produced for the mp3 at `path` (same call shape as
+    `decode_input_path_v1`, so it can stand in for it once transcoding is done).
+    """
+    try:
+        wav_audio = decode_wav_v1(wav_path)
+    except Exception as exc:
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="Invalid input",
+            context={
+                "stage": "decode",
+                "path": str(path),
+                "suffix": ".mp3",
+                "reason": str(exc),
+            },
+        ) from exc
+
+    fanned = _decode_fan_out_v1(
+        wav_path,
+        path=path,
+        suffix=".mp3",
+        config=config or EngineConfig(),
+        tempo_prior=tempo_prior,
+        keep_pcm=keep_pcm,
+        deadline=deadline,
+        deadline_policy=deadline_policy,
+        producers=producers,
+        key_tag=key_tag,
+    )
+
+    # Preserve original input format for downstream reporting.
+    return DecodedAudio(
+        sample_rate_hz=int(wav_audio.sample_rate_hz),
+        channels=int(wav_audio.channels),
+        duration_seconds=float(wav_audio.duration_seconds),
+        format="mp3",
+        codec="mp3",
+        container="mp3",
+        **fanned,
+    )
+
+
+def _decode_mp3_via_ffmpeg_v1(
+    path: Path,
+    *,
+    config: EngineConfig | None = None,
+    keep_pcm: bool = False,
+    tempo_prior: TempoPrior | None = None,
+    deadline: DeadlineV1 | None = None,
+    deadline_policy: DeadlinePolicy = "raise",
+    producers: Collection[str] | None = None,
+    key_tag: tuple[str, str | None] | None = None,
+) -> DecodedAudio:
+    ffmpeg = _ffmpeg_or_raise_v1(path)
+    cfg = config or EngineConfig()
+    with tempfile.TemporaryDirectory(prefix="bnk_ingest_mp3_") as td:
+        out_wav = Path(td) / "decoded.wav"
+        timeout_s = _transcode_timeout_v1(cfg, deadline)
+        try:
+            proc = _run_decoder_v1(
+                _mp3_transcode_cmd_v1(ffmpeg, path, out_wav), timeout_seconds=timeout_s
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise _transcode_timeout_error_v1(path, timeout_s=timeout_s, deadline=deadline) from exc
+        _check_transcode_v1(proc, path)
+        return decode_transcoded_mp3_v1(
+            path,
+            wav_path=out_wav,
+            config=cfg,
+            keep_pcm=keep_pcm,
+            tempo_prior=tempo_prior,
+            deadline=deadline,
+            deadline_policy=deadline_policy,
+            producers=producers,
+            key_tag=key_tag,
         )
 
 
-def decode_input_path_v1(path: Path) -> DecodedAudio:
+def decode_input_path_v1(
+    path: Path,
+    *,
+    config: EngineConfig | None = None,
+    keep_pcm: bool = False,
+    tempo_prior: TempoPrior | None = None,
+    deadline: DeadlineV1 | None = None,
+    deadline_policy: DeadlinePolicy = "raise",
+    producers: Collection[str] | None = None,
+    key_tag: tuple[str, str | None] | None = None,
+) -> DecodedAudio:
     """
     v1 ingest dispatcher.
 
@@ -109,9 +618,27 @@ def decode_input_path_v1(path: Path) -> DecodedAudio:
     This file exists to keep run_analysis_v1 clean and to prepare for v2 formats
     without changing the runner contract.
 
+    tempo_prior narrows the per-window lag search of the BPM hint stage.
+
+    keep_pcm=True additionally copies the decoded samples into shared memory
+    (`DecodedAudio.pcm`); the caller then owns that segment and must unlink it.
+    The PCM copy and every hint stage share one streaming pass over the samples
+    (see `_decode_fan_out_v1`).
+
+    deadline, when given, is checked per PCM block and per analysis window (and
+    caps the external decoder's budget). deadline_policy="partial" keeps the
+    decode itself (and the mp3 transcode) all-or-nothing but lets expired hint
+    stages drop their evidence instead of raising (see `_decode_fan_out_v1`).
+
+    producers (None: all) restricts the hint stages to the evidence producers a
+    feature plan needs (see `engine.features.registry_v1`). key_tag (tonic,
+    mode) lets a tagged key that holds up skip the 24-key key-window search.
+
     Raises:
       - EngineError(UNSUPPORTED_INPUT) for unsupported extensions
       - EngineError(INVALID_INPUT) for invalid/unsupported WAV files
+      - EngineError(TIMEOUT) when an external decoder exceeds its budget or the
+        deadline expires
     """
     suffix = path.suffix.lower()
 
@@ -130,12 +657,18 @@ def decode_input_path_v1(path: Path) -> DecodedAudio:
                 },
             ) from exc
 
-        try:
-            bpm_details = compute_bpm_hint_window_details_from_wav_v1(path)
-            bpm_windows = compute_bpm_hint_windows_from_wav_v1(path)
-        except Exception:
-            bpm_details = None
-            bpm_windows = None
+        fanned = _decode_fan_out_v1(
+            path,
+            path=path,
+            suffix=suffix,
+            config=config or EngineConfig(),
+            tempo_prior=tempo_prior,
+            keep_pcm=keep_pcm,
+            deadline=deadline,
+            deadline_policy=deadline_policy,
+            producers=producers,
+            key_tag=key_tag,
+        )
 
         return DecodedAudio(
             sample_rate_hz=int(wav_audio.sample_rate_hz),
@@ -144,13 +677,20 @@ def decode_input_path_v1(path: Path) -> DecodedAudio:
             format="wav",
             codec=wav_audio.codec,
             container=wav_audio.container,
-            peak_dbfs=wav_audio.peak_dbfs,
-            bpm_hint_windows=bpm_windows,
-            bpm_hint_window_details=bpm_details if bpm_details is not None else None,
+            **fanned,
         )
 
     if suffix == ".mp3":
-        return _decode_mp3_via_ffmpeg_v1(path)
+        return _decode_mp3_via_ffmpeg_v1(
+            path,
+            config=config,
+            keep_pcm=keep_pcm,
+            tempo_prior=tempo_prior,
+            deadline=deadline,
+            deadline_policy=deadline_policy,
+            producers=producers,
+            key_tag=key_tag,
+        )
 
     raise EngineError(
         code="UNSUPPORTED_INPUT",
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any
+
+_SAMPLE_WIDTH_BYTES = 2
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    # Attaching processes must not register the segment with their resource
+    # tracker, otherwise a worker exiting would unlink memory it does not own.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Python < 3.13 has no `track` flag; undo the implicit registration.
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+class SharedPcm:
+    """
+    Interleaved 16-bit PCM held in a named shared-memory segment.
+
+    The handle is cheap to pickle: only the segment name and layout cross a
+    process boundary, and the receiving process attaches to the same memory
+    (no sample data is copied or serialized).
+
+    Ownership:
+    - The process that called `allocate()` owns the segment and must `unlink()`
+      it once every consumer is done (the context manager does this).
+    - Attached handles only `close()` their own mapping.
+    """
+
+    def __init__(
+        self,
+        *,
+        shm: shared_memory.SharedMemory,
+        frames: int,
+        channels: int,
+        sample_rate_hz: int,
+        owner: bool,
+    ):
+        self._shm = shm
+        self._closed = False
+        self.name: str = shm.name
+        self.frames: int = int(frames)
+        self.channels: int = int(channels)
+        self.sample_rate_hz: int = int(sample_rate_hz)
+        self.owner: bool = bool(owner)
+
+    @classmethod
+    def allocate(cls, *, frames: int, channels: int, sample_rate_hz: int) -> SharedPcm:
+        if frames < 0:
+            raise ValueError("frames must be >= 0")
+        if channels <= 0:
+            raise ValueError("channels must be > 0")
+        if sample_rate_hz <= 0:
+            raise ValueError("sample_rate_hz must be > 0")
+        # Zero-size segments are not allowed; keep one spare byte for empty audio.
+        nbytes = max(1, int(frames) * int(channels) * _SAMPLE_WIDTH_BYTES)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return cls(
+            shm=shm,
+            frames=frames,
+            channels=channels,
+            sample_rate_hz=sample_rate_hz,
+            owner=True,
+        )
+
+    @classmethod
+    def attach(cls, name: str, *, frames: int, channels: int, sample_rate_hz: int) -> SharedPcm:
+        return cls(
+            shm=_attach_shared_memory(name),
+            frames=frames,
+            channels=channels,
+            sample_rate_hz=sample_rate_hz,
+            owner=False,
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (
+            _attach_by_layout,
+            (self.name, self.frames, self.channels, self.sample_rate_hz),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.frames * self.channels * _SAMPLE_WIDTH_BYTES
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frames / float(self.sample_rate_hz)
+
+    def _buffer(self) -> memoryview:
+        if self._closed:
+            raise ValueError("PCM handle is closed")
+        # Segments may be rounded up to a page size; only expose the sample bytes.
+        return self._shm.buf[: self.nbytes]
+
+    def raw(self) -> memoryview:
+        """Writable byte view over the sample data (used by decoders to fill the buffer)."""
+        return self._buffer()
+
+    def samples(self) -> memoryview:
+        """Zero-copy interleaved int16 view (`len == frames * channels`)."""
+        return self._buffer().cast("h")
+
+    def iter_blocks(self, block_frames: int) -> Iterator[memoryview]:
+        """Yield consecutive interleaved int16 views of up to `block_frames` frames."""
+        if block_frames <= 0:
+            raise ValueError("block_frames must be > 0")
+        view = self.samples()
+        step = int(block_frames) * self.channels
+        for start in range(0, len(view), step):
+            yield view[start : start + step]
+
+    def peak_abs(self) -> int:
+        """Largest absolute sample value (0 for silence or empty audio)."""
+        view = self.samples()
+        if not len(view):
+            return 0
+        return max(abs(min(view)), abs(max(view)))
+
+    def close(self) -> None:
+        """
+        Release this process's mapping.
+
+        Callers must drop any views returned by `samples()`/`raw()` first;
+        `multiprocessing.shared_memory` refuses to close while views are exported.
+        """
+        if self._closed:
+            return
+        self._shm.close()
+        self._closed = True
+
+    def unlink(self) -> None:
+        """Destroy the segment (owner only). Attached handles keep working until closed."""
+        if not self.owner:
+            raise ValueError("only the owning handle may unlink shared PCM")
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self.owner = False
+
+    def __enter__(self) -> SharedPcm:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        if self.owner:
+            self.unlink()
+        self.close()
+
+
+def _attach_by_layout(name: str, frames: int, channels: int, sample_rate_hz: int) -> SharedPcm:
+    return SharedPcm.attach(
+        name,
+        frames=frames,
+        channels=channels,
+        sample_rate_hz=sample_rate_hz,
+    )
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+import wave
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Protocol
+
+from engine.core.deadline_v1 import DeadlineV1
+from engine.ingest.pcm_v1 import SharedPcm
+
+STREAM_BLOCK_FRAMES_V1 = 65536
+
+
+class PcmConsumerV1(Protocol):
+    """
+    One stage of the decode fan-out.
+
+    `feed` receives every interleaved int16 block of the decode, in order, and
+    keeps whatever running state the stage needs; `finish` returns its result
+    once the stream ends. Consumers may also define `abort()` to release
+    resources when the stream fails.
+    """
+
+    def feed(self, block: array) -> None: ...
+
+    def finish(self) -> Any: ...
+
+
+def stream_wav_v1(
+    path: str | Path,
+    consumers: Mapping[str, PcmConsumerV1],
+    *,
+    block_frames: int = STREAM_BLOCK_FRAMES_V1,
+    deadline: DeadlineV1 | None = None,
+) -> dict[str, Any]:
+    """
+    Decode a 16-bit WAV once and push each block to every consumer in turn.
+
+    Returns `{name: consumer.finish()}`. Adding a consumer adds only its own
+    per-block work: the file is read exactly once however many are registered.
+    On failure every consumer's `abort()` (when defined) is called before the
+    exception propagates. A `deadline` is checked before every block.
+
+    Raises:
+      - FileNotFoundError if path does not exist
+      - ValueError for invalid/unsupported WAV (including non-16-bit samples)
+      - EngineError(TIMEOUT) when the deadline expires mid-stream
+    """
+    if block_frames <= 0:
+        raise ValueError("block_frames must be > 0")
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(str(p))
+    try:
+        try:
+            with wave.open(str(p), "rb") as wf:
+                sampwidth = int(wf.getsampwidth())
+                if sampwidth != 2:
+                    raise ValueError(f"unsupported sample width: {sampwidth} bytes (expected 2)")
+                targets = list(consumers.values())
+                while True:
+                    if deadline is not None:
+                        deadline.check("decode")
+                    raw = wf.readframes(block_frames)
+                    if not raw:
+                        break
+                    block = array("h")
+                    block.frombytes(raw)
+                    if not block:
+                        break
+                    for consumer in targets:
+                        consumer.feed(block)
+        except wave.Error as exc:
+            raise ValueError(f"invalid or unsupported WAV: {exc}") from exc
+        return {name: consumer.finish() for name, consumer in consumers.items()}
+    except BaseException:
+        for consumer in consumers.values():
+            abort = getattr(consumer, "abort", None)
+            if abort is not None:
+                abort()
+        raise
+
+
+class SharedPcmWriterV1:
+    """
+    Fan-out consumer copying the decoded samples into a new `SharedPcm`.
+
+    `finish()` hands the segment to the caller (who then owns it); a truncated
+    stream exposes only the frames actually decoded.
+    """
+
+    def __init__(self, *, frames: int, channels: int, sample_rate_hz: int):
+        self._pcm = SharedPcm.allocate(
+            frames=frames, channels=channels, sample_rate_hz=sample_rate_hz
+        )
+        self._raw: memoryview | None = self._pcm.raw()
+        self._off = 0
+
+    def feed(self, block: array) -> None:
+        raw = self._raw
+        if raw is None:
+            return
+        data = memoryview(block).cast("B")
+        n = min(len(data), len(raw) - self._off)
+        raw[self._off : self._off + n] = data[:n]
+        self._off += n
+
+    def _release(self) -> None:
+        if self._raw is not None:
+            self._raw.release()
+            self._raw = None
+
+    def finish(self) -> SharedPcm:
+        self._release()
+        pcm = self._pcm
+        if self._off < pcm.nbytes:
+            pcm.frames = self._off // (2 * pcm.channels)
+        return pcm
+
+    def abort(self) -> None:
+        self._release()
+        self._pcm.unlink()
+        self._pcm.close()
+
+
+class PeakLevelV1:
+    """Fan-out consumer tracking the sample peak; `finish()` gives dBFS (None for silence)."""
+
+    def __init__(self) -> None:
+        self._peak = 0
+
+    def feed(self, block: array) -> None:
+        if block:
+            self._peak = max(self._peak, max(block), -min(block))
+
+    def finish(self) -> float | None:
+        if self._peak <= 0:
+            return None
+        return 20.0 * math.log10(self._peak / 32768.0)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+# Frame ids per ID3v2 major version (v2.2 uses 3-char ids).
+_BPM_FRAME_IDS = {b"TBPM", b"TBP"}
+_KEY_FRAME_IDS = {b"TKEY", b"TKE"}
+
+# Text frames are tiny; anything larger is not a tempo/key value.
+_MAX_TEXT_FRAME_BYTES = 256
+
+
+@dataclass(frozen=True)
+class EmbeddedTags:
+    """
+    Tempo/key values read from embedded ID3v2 tags (TBPM/TKEY).
+
+    Values are as tagged by earlier tools and are never trusted directly: they
+    only select what the engine verifies.
+    """
+
+    bpm: float | None = None
+    key: str | None = None
+
+
+def _syncsafe(b: bytes) -> int:
+    return (b[0] << 21) | (b[1] << 14) | (b[2] << 7) | b[3]
+
+
+def _decode_text_frame(body: bytes) -> str | None:
+    if not body:
+        return None
+    enc, data = body[0], body[1:]
+    codec = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}.get(enc)
+    if codec is None:
+        return None
+    try:
+        text = data.decode(codec)
+    except UnicodeDecodeError:
+        return None
+    # Multiple values are NUL-separated; the first one wins.
+    text = text.split("\x00", 1)[0].strip()
+    return text or None
+
+
+def _parse_bpm(text: str | None) -> float | None:
+    if text is None:
+        return None
+    try:
+        bpm = float(text.replace(",", "."))
+    except ValueError:
+        return None
+    if not (0.0 < bpm < 1000.0):
+        return None
+    return bpm
+
+
+def _read_id3v2_at(f: BinaryIO, start: int, limit: int) -> EmbeddedTags:
+    """Parse an ID3v2 tag starting at `start`, reading at most `limit` bytes."""
+    f.seek(start)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return EmbeddedTags()
+    major = header[3]
+    flags = header[5]
+    size = min(_syncsafe(header[6:10]), max(0, limit - 10))
+    if major not in (2, 3, 4):
+        return EmbeddedTags()
+
+    pos = 0
+    if major in (3, 4) and flags & 0x40:
+        # Skip the extended header (v2.4 size is syncsafe and includes itself).
+        ext = f.read(4)
+        if len(ext) < 4:
+            return EmbeddedTags()
+        ext_size = _syncsafe(ext) if major == 4 else struct.unpack(">I", ext)[0] + 4
+        pos = ext_size
+        f.seek(start + 10 + pos)
+
+    id_len, size_len, hdr_len = (3, 3, 6) if major == 2 else (4, 4, 10)
+    bpm_text: str | None = None
+    key_text: str | None = None
+    while pos + hdr_len <= size and (bpm_text is None or key_text is None):
+        fh = f.read(hdr_len)
+        if len(fh) < hdr_len or fh[0] == 0:
+            break  # padding
+        frame_id = fh[:id_len]
+        raw_size = fh[id_len : id_len + size_len]
+        if major == 2:
+            frame_size = int.from_bytes(raw_size, "big")
+        elif major == 4:
+            frame_size = _syncsafe(raw_size)
+        else:
+            frame_size = struct.unpack(">I", raw_size)[0]
+        pos += hdr_len
+        if frame_size <= 0 or pos + frame_size > size:
+            break
+
+        # Compressed/encrypted frames (v2.3/v2.4 format flags) are not text we can read.
+        fmt_flags = fh[9] if major != 2 else 0
+        wanted = frame_id in _BPM_FRAME_IDS or frame_id in _KEY_FRAME_IDS
+        if wanted and frame_size <= _MAX_TEXT_FRAME_BYTES and not (fmt_flags & 0xCC):
+            text = _decode_text_frame(f.read(frame_size))
+            if frame_id in _BPM_FRAME_IDS:
+                bpm_text = bpm_text or text
+            else:
+                key_text = key_text or text
+        else:
+            f.seek(frame_size, 1)
+        pos += frame_size
+
+    return EmbeddedTags(bpm=_parse_bpm(bpm_text), key=key_text)
+
+
+def _find_riff_id3_chunk(f: BinaryIO) -> tuple[int, int] | None:
+    """Return (offset, size) of an `id3 ` chunk inside a RIFF/WAVE file."""
+    f.seek(0)
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        return None
+    while True:
+        ch = f.read(8)
+        if len(ch) < 8:
+            return None
+        cid = ch[:4]
+        csize = struct.unpack("<I", ch[4:8])[0]
+        if cid in (b"id3 ", b"ID3 "):
+            return f.tell(), csize
+        # Chunks are word-aligned.
+        f.seek(csize + (csize & 1), 1)
+
+
+def read_embedded_tags_v1(path: str | Path) -> EmbeddedTags:
+    """
+    Read TBPM/TKEY from a leading ID3v2 tag (mp3) or a RIFF `id3 ` chunk (wav).
+
+    Best-effort and bounded: only frame headers and the two small text frames are
+    read. Missing, malformed or unsupported tags yield empty EmbeddedTags.
+    """
+    p = Path(path)
+    try:
+        with p.open("rb") as f:
+            head = f.read(4)
+            if head[:3] == b"ID3":
+                return _read_id3v2_at(f, 0, limit=p.stat().st_size)
+            if head == b"RIFF":
+                chunk = _find_riff_id3_chunk(f)
+                if chunk is not None:
+                    return _read_id3v2_at(f, chunk[0], limit=chunk[1])
+    except (OSError, struct.error):
+        pass
+    return EmbeddedTags()
@@ -1,7 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Literal
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Literal
+
+from engine.ingest.pcm_v1 import SharedPcm
+
+if TYPE_CHECKING:
+    from engine.observability.stages_v1 import SubStageTimingV1
+    from engine.preprocess.bpm_hint_windows_v1 import OnsetEnvelope
+    from engine.preprocess.key_hint_windows_v1 import KeyTagCheckV1
+    from engine.preprocess.signals_v1 import DerivedSignals
 
 AudioFormat = Literal["wav", "mp3", "flac", "ogg", "unknown"]
 
@@ -11,9 +20,10 @@ class DecodedAudio:
     """
     Canonical in-memory representation passed into the analysis pipeline.
 
-    NOTE: v1 scaffolding does NOT store PCM arrays yet (no heavy deps).
-    When decoding is implemented, this type may gain a `pcm` field or a
-    handle to a memory-mapped buffer. Until then, keep it minimal.
+    PCM samples are optional and never stored inline: `pcm` is a handle to a
+    shared-memory segment (see `SharedPcm`), so a DecodedAudio can be pickled to
+    worker processes without copying sample data. Metadata-only decodes leave it
+    as None.
     """
 
     sample_rate_hz: int
@@ -30,3 +40,43 @@ class DecodedAudio:
     bpm_hint_windows: list[float] | None = None
     # Optional per-window detail for half/double ambiguity (internal; not exposed to guests).
     bpm_hint_window_details: list[dict[str, float | None]] | None = None
+    # Onset envelope the hints were computed from (reused by the beat grid; no re-decode).
+    onset_envelope: OnsetEnvelope | None = field(default=None, compare=False, repr=False)
+    # Per-window key labels from chroma over the same read (e.g. "A minor"), and
+    # each window's correlations with the 24 key slots (C major, C minor, C# major, ...)
+    # and [start_s, end_s] span.
+    key_mode_hint_windows: list[str] | None = None
+    key_mode_window_scores: list[list[float]] | None = field(default=None, repr=False)
+    key_mode_window_spans: list[list[float]] | None = field(default=None, repr=False)
+    # Tagged-key check run instead of the 24-key search (only when a key tag was given).
+    key_tag_check: KeyTagCheckV1 | None = field(default=None, compare=False, repr=False)
+
+    # Shared-memory PCM (interleaved int16). Owned by whoever requested the decode.
+    pcm: SharedPcm | None = field(default=None, compare=False, repr=False)
+
+    # Hint stages a partial-mode deadline cut short (their fields above are None).
+    skipped_stages: tuple[str, ...] = ()
+    # Time spent in each decode consumer and post-pass hint search (see
+    # `_decode_fan_out_v1`); the runner reports them as stage_completed events.
+    stage_timings: tuple[SubStageTimingV1, ...] = field(default=(), compare=False, repr=False)
+
+    # Spectrogram cache cap for `signals` (the `spectrogram_cache_bytes` tunable of
+    # the decoding config); None keeps the DerivedSignals default.
+    spectrogram_cache_bytes: int | None = field(default=None, compare=False, repr=False)
+
+    @cached_property
+    def signals(self) -> DerivedSignals:
+        """
+        Lazily derived signal views (mono, filtered, decimated, envelopes, STFT).
+
+        Memoized per DecodedAudio so every feature in one analysis shares them.
+        Requires `pcm`; metadata-only decodes raise ValueError.
+        """
+        if self.pcm is None:
+            raise ValueError("derived signals require decoded PCM (decode with keep_pcm=True)")
+        # Imported lazily: preprocess builds on ingest, not the other way around.
+        from engine.preprocess.signals_v1 import DerivedSignals
+
+        if self.spectrogram_cache_bytes is None:
+            return DerivedSignals(self.pcm)
+        return DerivedSignals(self.pcm, spectrogram_cache_bytes=self.spectrogram_cache_bytes)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from engine.observability import hooks
+
+# Counters every `stage_completed` event carries (0 when a stage has none).
+STAGE_COUNTERS_V1 = ("bytes_read", "samples_read", "windows_analyzed", "cache_hits")
+
+# Samples kept per stage by `StageStatsV1` (oldest evicted first).
+DEFAULT_STAGE_SAMPLES_V1 = 1024
+
+
+def _percentile_v1(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty ascending list."""
+    rank = max(1, -(-len(sorted_values) * int(q) // 100))  # ceil(n * q / 100)
+    return sorted_values[rank - 1]
+
+
+class StageStatsV1:
+    """
+    In-process per-stage latency aggregator.
+
+    Keeps the last `max_samples` wall/CPU durations of each stage and reports
+    count, p50 and p95 (nearest rank). Thread-safe; memory is bounded by the
+    number of distinct stage names.
+    """
+
+    def __init__(self, *, max_samples: int = DEFAULT_STAGE_SAMPLES_V1):
+        if max_samples <= 0:
+            raise ValueError("max_samples must be > 0")
+        self._max = int(max_samples)
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[tuple[float, float]]] = {}
+
+    def record(self, stage: str, *, wall_ms: float, cpu_ms: float) -> None:
+        with self._lock:
+            q = self._samples.get(stage)
+            if q is None:
+                q = self._samples[stage] = deque(maxlen=self._max)
+            q.append((float(wall_ms), float(cpu_ms)))
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """`{stage: {count, wall_ms_p50, wall_ms_p95, cpu_ms_p50, cpu_ms_p95}}`."""
+        with self._lock:
+            snapshot = {stage: list(q) for stage, q in self._samples.items()}
+        out: dict[str, dict[str, float | int]] = {}
+        for stage in sorted(snapshot):
+            rows = snapshot[stage]
+            wall = sorted(w for w, _c in rows)
+            cpu = sorted(c for _w, c in rows)
+            out[stage] = {
+                "count": len(rows),
+                "wall_ms_p50": _percentile_v1(wall, 50),
+                "wall_ms_p95": _percentile_v1(wall, 95),
+                "cpu_ms_p50": _percentile_v1(cpu, 50),
+                "cpu_ms_p95": _percentile_v1(cpu, 95),
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+# Built-in aggregator every pipeline run records into.
+STAGE_STATS_V1 = StageStatsV1()
+
+
+def stage_stats_v1() -> dict[str, dict[str, float | int]]:
+    """Per-stage p50/p95 wall and CPU milliseconds for this process."""
+    return STAGE_STATS_V1.summary()
+
+
+@dataclass(frozen=True)
+class SubStageTimingV1:
+    """
+    Time spent in one sub-stage of a larger stage (e.g. one decode consumer).
+
+    Measured where the work happens and reported by `StageClockV1.record`
+    as its own `stage_completed` event; the enclosing stage still includes it.
+    """
+
+    stage: str
+    wall_ms: float
+    cpu_ms: float
+    windows_analyzed: int = 0
+
+
+class SubStageTimerV1:
+    """Accumulates wall/CPU time over repeated `with timer:` spans of one sub-stage."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._wall = 0.0
+        self._cpu = 0.0
+        self._wall0 = 0.0
+        self._cpu0 = 0.0
+
+    def __enter__(self) -> SubStageTimerV1:
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._wall += time.perf_counter() - self._wall0
+        self._cpu += time.process_time() - self._cpu0
+
+    def timing(self, *, windows_analyzed: int = 0) -> SubStageTimingV1:
+        return SubStageTimingV1(
+            stage=self.stage,
+            wall_ms=self._wall * 1000.0,
+            cpu_ms=self._cpu * 1000.0,
+            windows_analyzed=int(windows_analyzed),
+        )
+
+
+class StageClockV1:
+    """
+    Times consecutive pipeline stages of one analysis.
+
+    `enter(stage)` closes the open stage and starts the next; `close()` ends
+    the last one. Each closed stage emits `stage_completed` (analysis_id,
+    role, engine_version, stage, wall_ms, cpu_ms and the `STAGE_COUNTERS_V1`)
+    and is recorded in `stats`. Counters accrue on the open stage through
+    `count()`; cache hits are read from `watch_cache`'s probe as a delta.
+    A stage that raises is never closed: `analysis_failed` reports it instead.
+    Sub-stages timed elsewhere are reported through `record()`.
+
+    CPU time is process CPU time, so concurrent analyses in one process share it.
+    """
+
+    def __init__(
+        self,
+        *,
+        analysis_id: str | None,
+        role: str | None,
+        stats: StageStatsV1 | None = None,
+    ):
+        self._analysis_id = analysis_id
+        self._role = role
+        self._stats = stats if stats is not None else STAGE_STATS_V1
+        self._stage: str | None = None
+        self._wall0 = 0.0
+        self._cpu0 = 0.0
+        self._counters: dict[str, int] = {}
+        self._probe: Callable[[], int] | None = None
+        self._probe0 = 0
+
+    def enter(self, stage: str) -> str:
+        self.close()
+        self._stage = stage
+        self._counters = dict.fromkeys(STAGE_COUNTERS_V1, 0)
+        self._probe0 = self._probe() if self._probe is not None else 0
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        return stage
+
+    def count(self, **counters: int) -> None:
+        if self._stage is None:
+            return
+        for name, value in counters.items():
+            self._counters[name] = self._counters.get(name, 0) + int(value)
+
+    def watch_cache(self, probe: Callable[[], int]) -> None:
+        """Attribute `probe()` growth (e.g. memo hits) to stages from now on."""
+        self._probe = probe
+        self._probe0 = probe()
+
+    def record(self, timing: SubStageTimingV1) -> None:
+        """Report a sub-stage timed elsewhere; the open stage keeps running."""
+        counters = dict.fromkeys(STAGE_COUNTERS_V1, 0)
+        counters["windows_analyzed"] = timing.windows_analyzed
+        self._emit(timing.stage, wall_ms=timing.wall_ms, cpu_ms=timing.cpu_ms, counters=counters)
+
+    def close(self) -> None:
+        stage = self._stage
+        if stage is None:
+            return
+        wall_ms = (time.perf_counter() - self._wall0) * 1000.0
+        cpu_ms = (time.process_time() - self._cpu0) * 1000.0
+        if self._probe is not None:
+            self._counters["cache_hits"] += self._probe() - self._probe0
+        self._stage = None
+        self._emit(stage, wall_ms=wall_ms, cpu_ms=cpu_ms, counters=self._counters)
+
+    def _emit(self, stage: str, *, wall_ms: float, cpu_ms: float, counters: dict[str, int]) -> None:
+        self._stats.record(stage, wall_ms=wall_ms, cpu_ms=cpu_ms)
+        payload: dict[str, Any] = {
+            "analysis_id": self._analysis_id,
+            "role": self._role,
+            "engine_version": "v1",
+            "stage": stage,
+            "wall_ms": round(wall_ms, 3),
+            "cpu_ms": round(cpu_ms, 3),
+            **counters,
+        }
+        hooks.emit("stage_completed", **payload)
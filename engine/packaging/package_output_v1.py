@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Literal
 
+from engine.core.config import EngineConfig
+
 Role = Literal["guest", "free", "pro"]
 
 GUEST_STRIP_KEYS_DEEP = {
@@ -23,6 +25,11 @@ GUEST_STRIP_KEYS_DEEP = {
     "bpm_candidates",
 }
 
+# Pro-only metric fields (stripped for guest and free).
+PRO_ONLY_KEYS_DEEP = {
+    "tempo_curve",
+}
+
 
 def _deep_strip_keys(obj: Any, *, strip_keys: set[str]) -> Any:
     """
@@ -55,17 +62,23 @@ def _deep_strip_keys(obj: Any, *, strip_keys: set[str]) -> Any:
     return obj
 
 
-def package_output_v1(out: dict[str, Any], *, role: Role) -> dict[str, Any]:
+GRID_UNLOCK_HINT = "Upgrade to Pro to unlock the beat grid."
+
+
+def package_output_v1(
+    out: dict[str, Any], *, role: Role, config: EngineConfig | None = None
+) -> dict[str, Any]:
     """
     Applies Engine v1 packaging rules that depend on caller role.
 
-    This function is intentionally small and dependency-free. It is expected to be
-    called as the final pipeline step (after metrics/events are computed).
+    This function is intentionally small. It is expected to be called as the final
+    pipeline step (after metrics/events are computed). `config` supplies the grid
+    preview threshold (defaults to EngineConfig()).
     """
     packaged: dict[str, Any] = dict(out)
 
     _package_events(packaged, role=role)
-    _package_metrics(packaged, role=role)
+    _package_metrics(packaged, role=role, config=config or EngineConfig())
 
     return packaged
 
@@ -111,7 +124,34 @@ def _package_events(out: dict[str, Any], *, role: Role) -> None:
         noise["noise_change_ranges"] = []
 
 
-def _package_metrics(out: dict[str, Any], *, role: Role) -> None:
+def _locked_grid_v1(block: Any, *, role: Role, config: EngineConfig) -> dict[str, Any] | None:
+    """
+    Grid is Pro-only. Other roles get a locked block when the grid is usable
+    (preview only above `grid_guest_preview_min_confidence`); guests get nothing
+    below that threshold, and unusable grids are omitted for everyone but Pro.
+    """
+    if not isinstance(block, dict) or block.get("locked") is True:
+        return block
+    val = block.get("value")
+    if not isinstance(val, dict):
+        return None
+    preview_min = float(getattr(config.tunables, "grid_guest_preview_min_confidence", 0.60))
+    try:
+        previewable = float(block.get("score", 0.0)) >= preview_min
+    except (TypeError, ValueError):
+        previewable = False
+    if role == "guest" and not previewable:
+        return None
+    locked: dict[str, Any] = {"locked": True, "unlock_hint": GRID_UNLOCK_HINT}
+    if previewable and val.get("anchor_s") is not None:
+        locked["preview"] = {
+            "anchor_s": val["anchor_s"],
+            "beats_per_bar": val.get("beats_per_bar"),
+        }
+    return locked
+
+
+def _package_metrics(out: dict[str, Any], *, role: Role, config: EngineConfig) -> None:
     metrics = out.get("metrics")
     if not isinstance(metrics, dict) or not metrics:
         return
@@ -120,6 +160,15 @@ def _package_metrics(out: dict[str, Any], *, role: Role) -> None:
     new_metrics: dict[str, Any] = dict(metrics)
     changed = False
 
+    if role != "pro" and "grid" in new_metrics:
+        grid = _locked_grid_v1(new_metrics["grid"], role=role, config=config)
+        if grid is not new_metrics["grid"]:
+            if grid is None:
+                new_metrics.pop("grid")
+            else:
+                new_metrics["grid"] = grid
+            changed = True
+
     if role == "guest":
         stripped = _deep_strip_keys(new_metrics, strip_keys=GUEST_STRIP_KEYS_DEEP)
         if stripped is not new_metrics:
@@ -140,6 +189,12 @@ def _package_metrics(out: dict[str, Any], *, role: Role) -> None:
                 new_metrics[key_metric_name] = nb
                 changed = True
 
+    if role != "pro":
+        stripped = _deep_strip_keys(new_metrics, strip_keys=PRO_ONLY_KEYS_DEEP)
+        if stripped is not new_metrics:
+            new_metrics = stripped
+            changed = True
+
     # Rule: Guest must not receive bpm.value.value_exact.
     if role == "guest" and "bpm" in new_metrics and isinstance(new_metrics["bpm"], dict):
         bpm = dict(new_metrics["bpm"])
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Collection, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from engine.core.config import EngineConfig
+from engine.core.deadline_v1 import DeadlinePolicy
+from engine.core.errors import EngineError
+from engine.features.bpm_policy_v1 import compile_bpm_policy_v1
+from engine.features.key_mode_v1 import compile_key_mode_policy_v1
+from engine.features.registry_v1 import plan_features_v1
+from engine.pipeline.evidence_snapshot_v1 import EvidenceSnapshotV1
+from engine.pipeline.run import Role, _now_rfc3339, run_analysis_v1
+from engine.preprocess.bpm_hint_windows_v1 import TempoPrior
+from engine.preprocess.key_hint_windows_v1 import key_profile_matrix_v1
+
+BatchInput = str | Path | EvidenceSnapshotV1
+
+# Target dispatches per worker: small enough to balance uneven track lengths,
+# large enough to amortize the per-chunk IPC round trip.
+_CHUNKS_PER_WORKER_V1 = 4
+
+# Per-worker state installed by `_init_worker_v1` (one copy per pool process, not per
+# item). The in-process path passes its options explicitly so concurrent callers
+# never share this dict.
+_WORKER_OPTIONS_V1: dict[str, Any] = {}
+
+
+def _warm_v1(config: EngineConfig) -> None:
+    # Compile the cached policy/profile tables once so no item pays for them.
+    compile_bpm_policy_v1(config)
+    compile_key_mode_policy_v1(config)
+    key_profile_matrix_v1()
+
+
+def _init_worker_v1(options: dict[str, Any]) -> None:
+    _WORKER_OPTIONS_V1.clear()
+    _WORKER_OPTIONS_V1.update(options)
+    _warm_v1(options["config"])
+
+
+def _run_item_v1(
+    item: tuple[BatchInput, str], options: dict[str, Any] | None = None
+) -> dict[str, Any] | EngineError:
+    source, aid = item
+    try:
+        return run_analysis_v1(source, analysis_id=aid, **(options or _WORKER_OPTIONS_V1))
+    except EngineError as exc:
+        return exc
+
+
+def run_analysis_many_v1(
+    inputs: Sequence[BatchInput],
+    *,
+    role: Role,
+    workers: int = 1,
+    config: EngineConfig | None = None,
+    analysis_ids: Sequence[str] | None = None,
+    created_at: str | None = None,
+    tempo_prior: TempoPrior | tuple[float, float] | float | None = None,
+    verify_tags: bool = False,
+    assert_contract: bool = False,
+    deadline: float | None = None,
+    on_deadline: DeadlinePolicy = "raise",
+    features: Collection[str] | None = None,
+    chunksize: int | None = None,
+) -> list[dict[str, Any] | EngineError]:
+    """
+    Run `run_analysis_v1` over many inputs (paths or evidence snapshots).
+
+    Results come back in input order, one per input: the packaged output, or
+    the `EngineError` that item raised (a failing item never aborts the batch).
+
+    Execution:
+      - workers=1 runs in-process.
+      - workers>1 starts a process pool once per call; each worker installs the
+        shared options and compiles the policy tables before its first item,
+        and items are dispatched in chunks (default: about four per worker).
+      - deadline (seconds) applies to each item separately, from when its
+        analysis starts; an expired item yields its TIMEOUT (or, with
+        on_deadline="partial", a partial output) and the worker moves on.
+      - Observability hooks fire in the process that runs the item; with
+        workers>1 that is the worker, not the caller.
+
+    Determinism:
+      - created_at is taken once for the whole batch, and analysis_ids (one per
+        input) default to uuid4s drawn in the caller. Outputs therefore do not
+        depend on the worker count; pass both for byte-identical reruns.
+    """
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise EngineError(
+            code="INVALID_INPUT", message="workers must be >= 1", context={"stage": "batch"}
+        )
+    if chunksize is not None and chunksize < 1:
+        raise EngineError(
+            code="INVALID_INPUT", message="chunksize must be >= 1", context={"stage": "batch"}
+        )
+    plan_features_v1(features)  # reject unknown names once, not per item
+    items = list(inputs)
+    if analysis_ids is None:
+        ids = [str(uuid4()) for _ in items]
+    else:
+        ids = [str(a) for a in analysis_ids]
+        if len(ids) != len(items):
+            raise EngineError(
+                code="INVALID_INPUT",
+                message="analysis_ids must match inputs one-to-one",
+                context={"stage": "batch", "inputs": len(items), "analysis_ids": len(ids)},
+            )
+
+    options: dict[str, Any] = {
+        "role": role,
+        "config": config or EngineConfig(),
+        "created_at": created_at or _now_rfc3339(),
+        "tempo_prior": tempo_prior,
+        "verify_tags": verify_tags,
+        "assert_contract": assert_contract,
+        "deadline": deadline,
+        "on_deadline": on_deadline,
+        "features": tuple(features) if features is not None else None,
+    }
+    work = list(zip(items, ids, strict=True))
+    n_workers = min(workers, len(work))
+    if n_workers <= 1:
+        _warm_v1(options["config"])
+        return [_run_item_v1(item, options) for item in work]
+
+    chunk = chunksize or max(1, math.ceil(len(work) / (n_workers * _CHUNKS_PER_WORKER_V1)))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker_v1, initargs=(options,)
+        ) as pool:
+            return list(pool.map(_run_item_v1, work, chunksize=chunk))
+    except BrokenProcessPool as exc:
+        raise EngineError(
+            code="INTERNAL_ERROR",
+            message="Batch worker pool failed",
+            context={"stage": "batch", "workers": n_workers},
+        ) from exc
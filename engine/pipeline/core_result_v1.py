@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from typing import Any
+
+from engine.contracts.analysis_output import validate_analysis_output_v1
+from engine.core.config import EngineConfig
+from engine.core.errors import EngineError
+from engine.packaging.package_output_v1 import Role, package_output_v1
+
+ROLES_V1: tuple[Role, ...] = ("guest", "free", "pro")
+
+ENGINE_INFO_V1 = {"name": "bnk-analysis-engine", "version": "v1"}
+
+
+def _empty_events_v1() -> dict[str, Any]:
+    return {
+        "clipping": {"sample_clipping_ranges": [], "true_peak_exceedance_ranges": []},
+        "stereo": {"stereo_issue_ranges": []},
+        "tonality": {"tonal_drift_ranges": []},
+        "noise": {"noise_change_ranges": []},
+    }
+
+
+def roles_served_v1(features_for: Role) -> frozenset[Role]:
+    """Roles whose output is fully determined by features computed for `features_for`."""
+    return frozenset(ROLES_V1[: ROLES_V1.index(features_for) + 1])
+
+
+@dataclass(frozen=True)
+class CoreResultV1:
+    """
+    Unpackaged analysis: every metric and event before role gating.
+
+    Produced by `run_analysis_core_v1` and turned into a contract output by
+    `package_for_role`. Plain data (safe to pickle or cache); packaging never
+    mutates it, so one core can be packaged for any role in `roles`.
+
+    `roles` lists the roles the core was computed for: a full core serves all
+    three, while the core behind a single-role run skips role-only features
+    (the pro tempo curve, guest-hidden events) and serves that role and below.
+    `warnings` are shared by every role (e.g. a partial, deadline-cut analysis).
+    """
+
+    analysis_id: str
+    created_at: str
+    track: dict[str, Any]
+    metrics: dict[str, Any]
+    events: dict[str, Any]
+    roles: frozenset[Role] = frozenset(ROLES_V1)
+    warnings: list[dict[str, Any]] = field(default_factory=list)
+
+
+def package_for_role(
+    core: CoreResultV1,
+    role: Role,
+    *,
+    config: EngineConfig | None = None,
+    assert_contract: bool = False,
+) -> dict[str, Any]:
+    """
+    Package a core result for one role (no feature work; cost is a dict copy).
+
+    Output is identical to `run_analysis_v1` for the same input and role.
+    Raises INVALID_INPUT for an unknown role or one the core was not computed
+    for; with assert_contract=True the output is validated before returning.
+    """
+    if role not in core.roles:
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="Core result does not cover role",
+            context={"stage": "packaging", "role": str(role), "roles": sorted(core.roles)},
+        )
+    out: dict[str, Any] = {
+        "engine": dict(ENGINE_INFO_V1),
+        "analysis_id": core.analysis_id,
+        "created_at": core.created_at,
+        "role": role,
+        "track": dict(core.track),
+        # Packaging copies on write at the top level only; keep the core pristine.
+        "metrics": copy.deepcopy(core.metrics),
+        "warnings": copy.deepcopy(core.warnings),
+        "events": {} if role == "guest" else copy.deepcopy(core.events),
+    }
+    packaged = package_output_v1(out, role=role, config=config)
+    if assert_contract:
+        validate_analysis_output_v1(packaged)
+    return packaged
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import sys
+from array import array
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from engine.core.errors import EngineError
+from engine.core.output import TrackInfo
+from engine.features.types import FeatureContext
+from engine.ingest.tags_v1 import EmbeddedTags
+from engine.preprocess.bpm_hint_windows_v1 import OnsetEnvelope
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+SNAPSHOT_FORMAT = "bnk-evidence-snapshot"
+SNAPSHOT_VERSION = 1
+
+# FeatureContext fields serialized as plain JSON values (audio, envelope and
+# signals are handled separately; signals are never captured).
+_CONTEXT_FIELDS_V1 = (
+    "has_rhythm_evidence",
+    "has_tonal_evidence",
+    "bpm_hint_exact",
+    "bpm_hint_windows",
+    "bpm_hint_window_details",
+    "key_mode_hint",
+    "key_mode_hint_windows",
+    "key_mode_window_scores",
+    "key_mode_window_spans",
+)
+
+
+@dataclass(frozen=True)
+class EvidenceSnapshotV1:
+    """
+    Everything the feature policies consume for one track, without audio.
+
+    - track: TrackInfo reported in the output.
+    - context: FeatureContext as seen by the features (hint windows, window
+      details, onset envelope, preprocessed metadata); `signals` is dropped.
+    - tags: embedded tags when the run verified them, else None.
+
+    `run_analysis_v1(evidence_snapshot=...)` replays policies and packaging over
+    a snapshot. Tag verification is recomputed from the captured (final)
+    evidence; a refuted tag does not trigger a re-decode on replay.
+    """
+
+    track: TrackInfo
+    context: FeatureContext
+    tags: EmbeddedTags | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        ctx = self.context
+        out: dict[str, Any] = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "track": asdict(self.track),
+            "audio": asdict(ctx.audio),
+            "context": {name: getattr(ctx, name) for name in _CONTEXT_FIELDS_V1},
+            "tags": asdict(self.tags) if self.tags is not None else None,
+            "onset_envelope": None,
+        }
+        env = ctx.onset_envelope
+        if env is not None:
+            out["onset_envelope"] = {
+                "frame_seconds": env.frame_seconds,
+                "low": _encode_f32(env.low),
+                "high": _encode_f32(env.high),
+            }
+        return out
+
+    @classmethod
+    def from_dict(cls, obj: Any) -> EvidenceSnapshotV1:
+        """Raises EngineError(INVALID_INPUT) for foreign, newer or malformed snapshots."""
+        if not isinstance(obj, dict) or obj.get("format") != SNAPSHOT_FORMAT:
+            raise _invalid("not an evidence snapshot")
+        if obj.get("version") != SNAPSHOT_VERSION:
+            raise _invalid("unsupported snapshot version", version=obj.get("version"))
+        try:
+            env_obj = obj.get("onset_envelope")
+            env = None
+            if env_obj is not None:
+                env = OnsetEnvelope(
+                    frame_seconds=float(env_obj["frame_seconds"]),
+                    low=_decode_f32(env_obj["low"]),
+                    high=_decode_f32(env_obj["high"]),
+                )
+            ctx_obj = obj["context"]
+            context = FeatureContext(
+                audio=PreprocessedAudio(**obj["audio"]),
+                onset_envelope=env,
+                **{name: ctx_obj[name] for name in _CONTEXT_FIELDS_V1 if name in ctx_obj},
+            )
+            tags_obj = obj.get("tags")
+            return cls(
+                track=TrackInfo(**obj["track"]),
+                context=context,
+                tags=EmbeddedTags(**tags_obj) if tags_obj is not None else None,
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise _invalid("malformed snapshot", reason=str(exc)) from exc
+
+    def dumps(self) -> bytes:
+        """Compact UTF-8 JSON."""
+        return json.dumps(self.to_dict(), separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data: bytes | str) -> EvidenceSnapshotV1:
+        try:
+            obj = json.loads(data)
+        except ValueError as exc:
+            raise _invalid("snapshot is not valid JSON") from exc
+        return cls.from_dict(obj)
+
+
+def _invalid(message: str, **context: Any) -> EngineError:
+    return EngineError(
+        code="INVALID_INPUT",
+        message=f"Invalid evidence snapshot: {message}",
+        context={"stage": "evidence_snapshot", **context},
+    )
+
+
+def _encode_f32(values: array) -> str:
+    """Little-endian float32 samples as base64 (about 5.3 bytes per frame)."""
+    a = array("f", values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return base64.b64encode(a.tobytes()).decode("ascii")
+
+
+def _decode_f32(text: str) -> array:
+    a = array("f")
+    a.frombytes(base64.b64decode(text.encode("ascii"), validate=True))
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+def capture_evidence_snapshot_v1(
+    ctx: FeatureContext, *, track: TrackInfo, tags: EmbeddedTags | None = None
+) -> EvidenceSnapshotV1:
+    """Snapshot of a feature context (derived signals are not captured)."""
+    kept = {f.name: getattr(ctx, f.name) for f in fields(ctx) if f.name != "signals"}
+    return EvidenceSnapshotV1(track=track, context=FeatureContext(**kept), tags=tags)
+
+
+def write_evidence_snapshot_v1(snapshot: EvidenceSnapshotV1, path: str | Path) -> None:
+    """Write a snapshot; `.gz` paths are gzip-compressed."""
+    p = Path(path)
+    data = snapshot.dumps()
+    if p.suffix == ".gz":
+        data = gzip.compress(data, mtime=0)
+    p.write_bytes(data)
+
+
+def read_evidence_snapshot_v1(path: str | Path) -> EvidenceSnapshotV1:
+    """Read a snapshot written by `write_evidence_snapshot_v1`."""
+    p = Path(path)
+    data = p.read_bytes()
+    if p.suffix == ".gz":
+        try:
+            data = gzip.decompress(data)
+        except (OSError, EOFError) as exc:
+            raise _invalid("corrupt gzip stream", path=str(p)) from exc
+    return EvidenceSnapshotV1.loads(data)
@@ -1,26 +1,50 @@
 from __future__ import annotations
 
 import os
-from dataclasses import asdict
+from collections.abc import Callable, Collection
+from dataclasses import asdict, replace
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any
 from uuid import uuid4
 
 from engine.contracts.analysis_output import validate_analysis_output_v1
 from engine.core.config import EngineConfig
+from engine.core.deadline_v1 import CancellationTokenV1, DeadlinePolicy, DeadlineV1
 from engine.core.errors import EngineError
 from engine.core.output import TrackInfo
-from engine.features.bpm_v1 import extract_bpm_v1
-from engine.features.key_mode_v1 import extract_key_mode_v1
+from engine.features.registry_v1 import FEATURES_V1, plan_features_v1
+from engine.features.tag_verification_v1 import (
+    key_mode_block_from_tag_check_v1,
+    parse_tag_key_v1,
+    verify_bpm_tag_v1,
+    verify_key_tag_v1,
+    with_tag_verification_evidence,
+)
 from engine.features.types import FeatureContext
 from engine.ingest.ingest_v1 import decode_input_path_v1
+from engine.ingest.tags_v1 import EmbeddedTags, read_embedded_tags_v1
 from engine.observability import hooks
-from engine.packaging.package_output_v1 import package_output_v1
+from engine.observability.stages_v1 import StageClockV1
+from engine.packaging.package_output_v1 import Role
+from engine.pipeline.core_result_v1 import (
+    ROLES_V1,
+    CoreResultV1,
+    _empty_events_v1,
+    package_for_role,
+    roles_served_v1,
+)
+from engine.pipeline.evidence_snapshot_v1 import EvidenceSnapshotV1, capture_evidence_snapshot_v1
+from engine.preprocess.bpm_hint_windows_v1 import (
+    TempoPrior,
+    bpm_hint_details_from_onset_envelope_v1,
+    compute_bpm_hint_window_details_from_signals_v1,
+    flatten_bpm_hint_windows_v1,
+    onset_envelope_from_signals_v1,
+)
+from engine.preprocess.key_hint_windows_v1 import compute_key_window_evidence_from_signals_v1
 from engine.preprocess.preprocess_v1 import preprocess_v1
 
-Role = Literal["guest", "free", "pro"]
-
 _ASSERT_CONTRACT_ENV = "BNK_ENGINE_ASSERT_CONTRACT"
 _ASSERT_CONTRACT_TRUTHY = {"1", "true", "yes", "on"}
 
@@ -36,7 +60,85 @@ def _now_rfc3339() -> str:
     return datetime.now(UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
-def run_analysis_v1(
+def _file_bytes_v1(path: Path) -> int:
+    try:
+        return int(path.stat().st_size)
+    except OSError:
+        return 0
+
+
+def _decoded_samples_v1(audio: Any) -> int:
+    """Interleaved samples the decode produced (from the PCM, else the header)."""
+    pcm = getattr(audio, "pcm", None)
+    if pcm is not None:
+        return int(pcm.frames) * int(pcm.channels)
+    try:
+        frames = round(float(audio.duration_seconds) * int(audio.sample_rate_hz))
+        return int(frames) * int(audio.channels)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def _normalize_deadline(
+    deadline: DeadlineV1 | float | None,
+    cancel_token: CancellationTokenV1 | None,
+    *,
+    on_deadline: str,
+) -> DeadlineV1 | None:
+    if on_deadline not in ("raise", "partial"):
+        raise EngineError(
+            code="INVALID_INPUT", message="Invalid on_deadline", context={"stage": "validate"}
+        )
+    if isinstance(deadline, DeadlineV1):
+        if cancel_token is not None:
+            raise EngineError(
+                code="INVALID_INPUT",
+                message="Pass cancel_token inside the DeadlineV1",
+                context={"stage": "validate"},
+            )
+        return deadline
+    if deadline is None and cancel_token is None:
+        return None
+    try:
+        seconds = None if deadline is None else float(deadline)
+        return DeadlineV1(seconds=seconds, token=cancel_token)
+    except (TypeError, ValueError) as exc:
+        raise EngineError(
+            code="INVALID_INPUT", message="Invalid deadline", context={"stage": "validate"}
+        ) from exc
+
+
+def _deadline_warnings_v1(skipped_stages: list[str]) -> list[dict[str, Any]]:
+    if not skipped_stages:
+        return []
+    return [
+        {
+            "code": "deadline_exceeded",
+            "message": "Analysis deadline passed; remaining stages were skipped",
+            "skipped_stages": list(dict.fromkeys(skipped_stages)),
+        }
+    ]
+
+
+def _normalize_tempo_prior(
+    tempo_prior: TempoPrior | tuple[float, float] | float | None,
+) -> TempoPrior | None:
+    if tempo_prior is None or isinstance(tempo_prior, TempoPrior):
+        return tempo_prior
+    try:
+        if isinstance(tempo_prior, (int, float)) and not isinstance(tempo_prior, bool):
+            return TempoPrior.around(float(tempo_prior))
+        lo, hi = tempo_prior  # type: ignore[misc]
+        return TempoPrior(bpm_min=float(lo), bpm_max=float(hi))
+    except (TypeError, ValueError) as exc:
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="Invalid tempo_prior",
+            context={"stage": "validate"},
+        ) from exc
+
+
+def _analyze_v1(
     audio_or_track: Any | None = None,
     role: Role | None = None,
     *,
@@ -44,34 +146,36 @@ def run_analysis_v1(
     audio: Any | None = None,
     config: EngineConfig | None = None,
     analysis_id: str | None = None,
+    created_at: str | None = None,
     _test_overrides: dict[str, Any] | None = None,
     input_path: str | None = None,
     assert_contract: bool = False,
-) -> dict[str, Any]:
-    """
-    Engine v1 contract-first runner.
-
-    Supported call styles:
-      A) Keyword style (preferred):
-         run_analysis_v1(role="guest", track=TrackInfo(...))
-         run_analysis_v1(role="guest", audio=decoded_audio)
-
-      B) Back-compat positional style (used by tests):
-         run_analysis_v1(decoded_audio, "guest", config=...)
-
-    Exactly one of (track, audio) must be provided after normalization.
-
-    Contract assertion:
-      - If assert_contract=True, the final packaged output is validated against
-        the Engine v1 contract right before returning.
-      - If assert_contract=False, contract assertion can still be enabled by
-        setting BNK_ENGINE_ASSERT_CONTRACT to one of: 1, true, TRUE, yes, YES.
-    """
+    tempo_prior: TempoPrior | tuple[float, float] | float | None = None,
+    verify_tags: bool = False,
+    evidence_snapshot: EvidenceSnapshotV1 | None = None,
+    evidence_sink: Callable[[EvidenceSnapshotV1], None] | None = None,
+    deadline: DeadlineV1 | float | None = None,
+    cancel_token: CancellationTokenV1 | None = None,
+    on_deadline: DeadlinePolicy = "raise",
+    core_only: bool = False,
+    features: Collection[str] | None = None,
+    _decoder: Callable[..., Any] | None = None,
+) -> dict[str, Any] | CoreResultV1:
     current_stage = "validate"
     aid: str | None = None
     try:
-        if role is None:
+        dl = _normalize_deadline(deadline, cancel_token, on_deadline=on_deadline)
+        plan = plan_features_v1(features)
+        if core_only:
+            features_for: Role = "pro"
+        elif role is None:
             raise EngineError(code="INVALID_INPUT", message="role is required")
+        elif role not in ROLES_V1:
+            raise EngineError(
+                code="INVALID_INPUT", message="Invalid role", context={"stage": current_stage}
+            )
+        else:
+            features_for = role
 
         if input_path is not None and not isinstance(input_path, (str, Path)):
             raise EngineError(
@@ -85,11 +189,18 @@ def run_analysis_v1(
             # If caller passed a path-like, treat it as input_path (not audio).
             if isinstance(audio_or_track, (str, Path)):
                 input_path = str(audio_or_track)
+            elif isinstance(audio_or_track, EvidenceSnapshotV1):
+                evidence_snapshot = audio_or_track
             else:
                 audio = audio_or_track
 
-        # --- Validate exactly one input source (track, audio, input_path) ---
-        provided = [track is not None, audio is not None, input_path is not None]
+        # --- Validate exactly one input source (track, audio, input_path, snapshot) ---
+        provided = [
+            track is not None,
+            audio is not None,
+            input_path is not None,
+            evidence_snapshot is not None,
+        ]
         if sum(provided) != 1:
             raise EngineError(
                 code="INVALID_INPUT",
@@ -98,13 +209,16 @@ def run_analysis_v1(
                     "provided_track": track is not None,
                     "provided_audio": audio is not None,
                     "provided_input_path": input_path is not None,
+                    "provided_evidence_snapshot": evidence_snapshot is not None,
                 },
             )
 
+        prior = _normalize_tempo_prior(tempo_prior)
         cfg = config or EngineConfig()
         aid = analysis_id or str(uuid4())
 
-        current_stage = "ingest"
+        clock = StageClockV1(analysis_id=aid, role=role)
+        current_stage = clock.enter("ingest")
         hooks.emit(
             "analysis_started",
             analysis_id=aid,
@@ -114,6 +228,9 @@ def run_analysis_v1(
         )
 
         # --- Normalize input_path -> audio (v1: WAV only via stdlib ingest) ---
+        prior_applied = False
+        tags: EmbeddedTags | None = None
+        source_path: Path | None = None
         if input_path is not None:
             try:
                 p = Path(input_path)
@@ -123,8 +240,45 @@ def run_analysis_v1(
                     message="Invalid input_path",
                     context={"stage": current_stage},
                 ) from exc
-            audio = decode_input_path_v1(p)
+            decode_prior = prior
+            key_tag = None
+            if verify_tags:
+                tags = read_embedded_tags_v1(p)
+                if tags.bpm is not None:
+                    decode_prior = TempoPrior.around(tags.bpm)
+                tonic, mode = parse_tag_key_v1(tags.key)
+                drift = FEATURES_V1["tonal_drift"]
+                # Tonal drift reads every window's 24-key scores, so it keeps the
+                # full search; otherwise a tagged key is checked on its own row first.
+                if tonic is not None and not (
+                    plan.runs(drift.name) and features_for in drift.roles
+                ):
+                    key_tag = (tonic, mode)
+            clock.enter("decode")
+            # The PCM decode is all-or-nothing; in "partial" mode hint stages cut
+            # short by the deadline drop their evidence and report it instead.
+            # `_decoder` stands in for decode_input_path_v1 when the caller has
+            # already done part of the decode (the async runner's mp3 transcode).
+            decode = _decoder or decode_input_path_v1
+            audio = decode(
+                p,
+                config=cfg,
+                tempo_prior=decode_prior,
+                deadline=dl,
+                deadline_policy=on_deadline,
+                producers=plan.producers,
+                key_tag=key_tag,
+            )
+            clock.count(bytes_read=_file_bytes_v1(p), samples_read=_decoded_samples_v1(audio))
+            for timing in getattr(audio, "stage_timings", None) or ():
+                clock.record(timing)
+            source_path = p
             input_path = None
+            prior_applied = True
+
+        if evidence_snapshot is not None:
+            track = evidence_snapshot.track
+            tags = evidence_snapshot.tags
 
         # If caller provided only audio, derive TrackInfo best-effort
         if track is None:
@@ -145,11 +299,33 @@ def run_analysis_v1(
                     context={"stage": current_stage},
                 ) from exc
 
+        # After decode the deadline is checked between stages. "raise" stops with
+        # TIMEOUT; "partial" skips every remaining stage and reports a warning.
+        # Hint loops re-run below also check it per window in "raise" mode.
+        loop_deadline = dl if on_deadline == "raise" else None
+        skipped_stages: list[str] = list(getattr(audio, "skipped_stages", None) or ())
+
+        def within_budget(stage: str) -> bool:
+            if dl is None or not dl.expired():
+                return True
+            if on_deadline == "raise":
+                dl.check(stage)
+            skipped_stages.append(stage)
+            if stage.startswith("feature:"):
+                hooks.emit(
+                    "feature_omitted",
+                    analysis_id=aid,
+                    feature=stage.removeprefix("feature:"),
+                    reason="deadline_exceeded",
+                    stage=stage,
+                )
+            return False
+
         # Preprocess only if we have audio (track-only path has no audio payload)
         pre = None
+        current_stage = clock.enter("preprocess")
         if audio is not None:
             try:
-                current_stage = "preprocess"
                 pre = preprocess_v1(audio, config=cfg)
             except (TypeError, ValueError) as exc:
                 raise EngineError(
@@ -157,41 +333,73 @@ def run_analysis_v1(
                     message="Invalid input",
                     context={"stage": "preprocess_v1"},
                 ) from exc
+        elif evidence_snapshot is not None:
+            pre = evidence_snapshot.context.audio
 
-        out: dict[str, Any] = {
-            "engine": {"name": "bnk-analysis-engine", "version": "v1"},
-            "analysis_id": aid,
-            "created_at": _now_rfc3339(),
-            "role": role,
-            "track": asdict(track),
-            "metrics": {},
-            "warnings": [],
-        }
-        metrics: dict[str, Any] = out["metrics"]
-
-        # Events gating per spec: guest gets {} (or omit). We'll keep {} for stability.
-        if role == "guest":
-            out["events"] = {}
-        else:
-            out["events"] = {
-                "clipping": {"sample_clipping_ranges": [], "true_peak_exceedance_ranges": []},
-                "stereo": {"stereo_issue_ranges": []},
-                "tonality": {"tonal_drift_ranges": []},
-                "noise": {"noise_change_ranges": []},
-            }
+        created = created_at or _now_rfc3339()
+        metrics: dict[str, Any] = {}
+        # Guests get {} at packaging; the core always carries the full categories.
+        events = _empty_events_v1()
 
         # Feature extraction only if we actually have preprocessed audio
         if pre is not None:
-            ctx = FeatureContext(
-                audio=pre,
-                has_rhythm_evidence=True,
-                has_tonal_evidence=True,
-                bpm_hint_exact=None,
-                bpm_hint_windows=getattr(audio, "bpm_hint_windows", None),
-                bpm_hint_window_details=getattr(audio, "bpm_hint_window_details", None),
-                key_mode_hint=None,
-                key_mode_hint_windows=None,
-            )
+            if evidence_snapshot is not None:
+                ctx = evidence_snapshot.context
+            else:
+                hint_windows = getattr(audio, "bpm_hint_windows", None)
+                hint_details = getattr(audio, "bpm_hint_window_details", None)
+                if (
+                    prior is not None
+                    and not prior_applied
+                    and getattr(audio, "pcm", None) is not None
+                    and plan.needs("tempogram")
+                    and within_budget("hint_windows")
+                ):
+                    # Caller-decoded audio: re-derive hints under the prior from shared PCM.
+                    current_stage = clock.enter("hint_windows")
+                    hint_details = compute_bpm_hint_window_details_from_signals_v1(
+                        audio.signals, tempo_prior=prior, deadline=loop_deadline
+                    )
+                    clock.count(windows_analyzed=len(hint_details))
+                    hint_windows = flatten_bpm_hint_windows_v1(hint_details)
+                onset_envelope = getattr(audio, "onset_envelope", None)
+                if (
+                    onset_envelope is None
+                    and getattr(audio, "pcm", None) is not None
+                    and plan.needs("envelope")
+                ):
+                    onset_envelope = onset_envelope_from_signals_v1(audio.signals)
+                key_windows = getattr(audio, "key_mode_hint_windows", None)
+                key_scores = getattr(audio, "key_mode_window_scores", None)
+                key_spans = getattr(audio, "key_mode_window_spans", None)
+                if (
+                    key_windows is None
+                    and getattr(audio, "pcm", None) is not None
+                    and plan.needs("key_windows")
+                    and within_budget("hint_windows")
+                ):
+                    current_stage = clock.enter("hint_windows")
+                    key_evidence = compute_key_window_evidence_from_signals_v1(
+                        audio.signals, config=cfg, deadline=loop_deadline
+                    )
+                    clock.count(windows_analyzed=len(key_evidence.scores))
+                    key_windows = key_evidence.hints
+                    key_scores, key_spans = key_evidence.scores, key_evidence.spans
+
+                ctx = FeatureContext(
+                    audio=pre,
+                    has_rhythm_evidence=True,
+                    has_tonal_evidence=True,
+                    bpm_hint_exact=None,
+                    bpm_hint_windows=hint_windows,
+                    bpm_hint_window_details=hint_details,
+                    key_mode_hint=None,
+                    key_mode_hint_windows=key_windows,
+                    key_mode_window_scores=key_scores,
+                    key_mode_window_spans=key_spans,
+                    onset_envelope=onset_envelope,
+                    signals=(audio.signals if getattr(audio, "pcm", None) is not None else None),
+                )
 
             # --- test overrides (3.5) ---
             if _test_overrides:
@@ -212,29 +420,183 @@ def run_analysis_v1(
                     key_mode_hint_windows=_test_overrides.get(
                         "key_mode_hint_windows", ctx.key_mode_hint_windows
                     ),
+                    # Overridden labels replace (rather than compete with) audio scores.
+                    key_mode_window_scores=_test_overrides.get(
+                        "key_mode_window_scores",
+                        None
+                        if "key_mode_hint_windows" in _test_overrides
+                        else ctx.key_mode_window_scores,
+                    ),
+                    key_mode_window_spans=_test_overrides.get(
+                        "key_mode_window_spans", ctx.key_mode_window_spans
+                    ),
+                    onset_envelope=ctx.onset_envelope,
+                    signals=ctx.signals,
                 )
 
-            current_stage = "feature:bpm"
-            bpm_block = extract_bpm_v1(ctx, config=cfg)
-            current_stage = "feature:key_mode"
-            key_mode_block = extract_key_mode_v1(ctx, config=cfg)
+            signals = ctx.signals
+            if signals is not None:
+                clock.watch_cache(lambda: signals.cache_hits)
+
+            # Features run in the plan's dependency order; each extractor sees the
+            # results of the features it builds on. Features the plan leaves out,
+            # whose roles exclude this run, or that need upstream results which
+            # are missing are neither computed nor reported.
+            results: dict[str, Any] = {}
+            bpm_tag_status = None
+            key_tag_status = None
+            tag_key, tag_mode = parse_tag_key_v1(tags.key if tags is not None else None)
+            key_check = getattr(audio, "key_tag_check", None)
+            for name in plan.order:
+                spec = FEATURES_V1[name]
+                if features_for not in spec.roles:
+                    continue
+                if spec.needs_upstream and any(results.get(dep) is None for dep in spec.after):
+                    continue
+                if not within_budget(f"feature:{name}"):
+                    continue
+                current_stage = clock.enter(f"feature:{name}")
+                if name == "key_mode" and key_check is not None and key_check.status == "confirmed":
+                    # The hint stage confirmed the tag on its own profile row and
+                    # skipped the 24-key search; the policy reads that row's votes.
+                    results[name] = key_mode_block_from_tag_check_v1(
+                        key_check,
+                        duration_seconds=float(getattr(ctx.audio, "duration_seconds", 0.0) or 0.0),
+                        config=cfg,
+                    )
+                else:
+                    results[name] = spec.extract(ctx, cfg, results)
+
+                # Tag verification checks a feature before its dependents read it.
+                if (
+                    name == "bpm"
+                    and tags is not None
+                    and tags.bpm is not None
+                    and within_budget("tag_verification")
+                ):
+                    current_stage = clock.enter("tag_verification")
+                    bpm_tag_status = verify_bpm_tag_v1(
+                        results["bpm"], tagged_bpm=tags.bpm, config=cfg
+                    )
+                    if (
+                        bpm_tag_status == "refuted"
+                        and source_path is not None
+                        and within_budget("hint_windows")
+                    ):
+                        # Only a refuted tag pays for the full lag search, re-run over
+                        # the decode's onset envelope (no second decode).
+                        current_stage = clock.enter("hint_windows")
+                        if ctx.onset_envelope is not None:
+                            full_details = bpm_hint_details_from_onset_envelope_v1(
+                                ctx.onset_envelope, tempo_prior=prior, deadline=loop_deadline
+                            )
+                        else:
+                            full_details = (_decoder or decode_input_path_v1)(
+                                source_path,
+                                config=cfg,
+                                tempo_prior=prior,
+                                deadline=loop_deadline,
+                                producers=plan.producers,
+                            ).bpm_hint_window_details
+                        ctx = replace(
+                            ctx,
+                            bpm_hint_windows=(
+                                flatten_bpm_hint_windows_v1(full_details)
+                                if full_details is not None
+                                else None
+                            ),
+                            bpm_hint_window_details=full_details,
+                        )
+                        clock.count(windows_analyzed=len(full_details or ()))
+                        results["bpm"] = None
+                        if within_budget("feature:bpm"):
+                            current_stage = clock.enter("feature:bpm")
+                            results["bpm"] = spec.extract(ctx, cfg, results)
+                    if results["bpm"] is not None:
+                        results["bpm"] = with_tag_verification_evidence(
+                            results["bpm"],
+                            {"status": bpm_tag_status, "tagged_bpm": float(tags.bpm)},
+                        )
+                elif (
+                    name == "key_mode" and tag_key is not None and within_budget("tag_verification")
+                ):
+                    current_stage = clock.enter("tag_verification")
+                    if key_check is not None and key_check.status != "unknown":
+                        # Checked in the hint stage; a refuted tag already paid for
+                        # the full search (as a refuted BPM tag does).
+                        key_tag_status = key_check.status
+                    else:
+                        key_tag_status = verify_key_tag_v1(
+                            results["key_mode"], tagged_key=tag_key, tagged_mode=tag_mode
+                        )
+                    if results["key_mode"] is not None:
+                        results["key_mode"] = with_tag_verification_evidence(
+                            results["key_mode"],
+                            {
+                                "status": key_tag_status,
+                                "tagged_key": tag_key,
+                                "tagged_mode": tag_mode,
+                            },
+                        )
 
+            if tags is not None:
+                hooks.emit(
+                    "tag_verification",
+                    analysis_id=aid,
+                    stage="tag_verification",
+                    bpm_status=bpm_tag_status or "unknown",
+                    key_status=key_tag_status or "unknown",
+                )
+
+            if evidence_sink is not None:
+                evidence_sink(capture_evidence_snapshot_v1(ctx, track=track, tags=tags))
+
+            bpm_block = results.get("bpm")
             if bpm_block is not None:
-                metrics["bpm"] = bpm_block
+                tempo_curve = results.get("tempo_curve")
+                metrics["bpm"] = (
+                    bpm_block if tempo_curve is None else {**bpm_block, "tempo_curve": tempo_curve}
+                )
+            key_mode_block = results.get("key_mode")
             if key_mode_block is not None:
                 metrics["key"] = key_mode_block
                 metrics["key_mode"] = key_mode_block
+            if results.get("grid") is not None:
+                metrics["grid"] = results["grid"]
+            if "tonal_drift" in results:
+                events["tonality"]["tonal_drift_ranges"] = results["tonal_drift"]
+
+        core = CoreResultV1(
+            analysis_id=aid,
+            created_at=created,
+            track=asdict(track),
+            metrics=metrics,
+            events=events,
+            roles=roles_served_v1(features_for),
+            warnings=_deadline_warnings_v1(skipped_stages),
+        )
+        if core_only:
+            clock.close()
+            hooks.emit(
+                "analysis_completed",
+                analysis_id=aid,
+                role=role,
+                engine_version="v1",
+                stage=current_stage,
+            )
+            return core
 
         # Final v1 packaging step (role gating).
-        current_stage = "packaging"
-        packaged = package_output_v1(out, role=role)
+        current_stage = clock.enter("packaging")
+        packaged = package_for_role(core, role, config=cfg)  # type: ignore[arg-type]
 
         # Optional contract assertion (tests/debug); keep off by default.
         if assert_contract or _env_assert_contract_enabled():
-            current_stage = "contract"
+            current_stage = clock.enter("contract")
             validate_analysis_output_v1(packaged)
             current_stage = "packaging"
 
+        clock.close()
         hooks.emit(
             "analysis_completed",
             analysis_id=aid,
@@ -268,3 +630,165 @@ def run_analysis_v1(
             error_code=err.code,
         )
         raise err from exc
+
+
+def run_analysis_v1(
+    audio_or_track: Any | None = None,
+    role: Role | None = None,
+    *,
+    track: TrackInfo | None = None,
+    audio: Any | None = None,
+    config: EngineConfig | None = None,
+    analysis_id: str | None = None,
+    created_at: str | None = None,
+    _test_overrides: dict[str, Any] | None = None,
+    input_path: str | None = None,
+    assert_contract: bool = False,
+    tempo_prior: TempoPrior | tuple[float, float] | float | None = None,
+    verify_tags: bool = False,
+    evidence_snapshot: EvidenceSnapshotV1 | None = None,
+    evidence_sink: Callable[[EvidenceSnapshotV1], None] | None = None,
+    deadline: DeadlineV1 | float | None = None,
+    cancel_token: CancellationTokenV1 | None = None,
+    on_deadline: DeadlinePolicy = "raise",
+    features: Collection[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Engine v1 contract-first runner.
+
+    Supported call styles:
+      A) Keyword style (preferred):
+         run_analysis_v1(role="guest", track=TrackInfo(...))
+         run_analysis_v1(role="guest", audio=decoded_audio)
+         run_analysis_v1(role="guest", evidence_snapshot=snapshot)
+
+      B) Back-compat positional style (used by tests):
+         run_analysis_v1(decoded_audio, "guest", config=...)
+
+    Exactly one of (track, audio, input_path, evidence_snapshot) must be provided
+    after normalization.
+
+    Contract assertion:
+      - If assert_contract=True, the final packaged output is validated against
+        the Engine v1 contract right before returning.
+      - If assert_contract=False, contract assertion can still be enabled by
+        setting BNK_ENGINE_ASSERT_CONTRACT to one of: 1, true, TRUE, yes, YES.
+
+    Tempo prior:
+      - tempo_prior (TempoPrior, (bpm_min, bpm_max) or a single BPM) narrows the
+        hint-stage lag search to the prior and its half/double/triplet relatives.
+        It applies when the engine decodes input_path, or when `audio` carries
+        PCM. The BPM policy still verifies the evidence before emitting a value.
+
+    Tag verification (input_path only):
+      - verify_tags=True reads embedded TBPM/TKEY. A tagged tempo is checked with
+        a narrow lag search around its tempo family; the full search runs only
+        when the tag is refuted. The tagged key is checked against the key
+        policy output. Outcomes (confirmed/refuted/unknown) are reported in
+        `evidence.tag_verification` of the bpm/key blocks (stripped for guests).
+        Emitted values always come from audio evidence, never from the tag.
+
+    Core result:
+      - The output is `package_for_role(run_analysis_core_v1(...), role)`; use
+        those directly to serve several roles from one analysis.
+
+    Feature selection:
+      - features (names from `FEATURES_V1`: bpm, tempo_curve, grid, key_mode,
+        tonal_drift; default all) limits which metrics are computed. A feature
+        brings the features it builds on (grid and tempo_curve need bpm), and
+        only the evidence producers they need run, so a bpm-only analysis never
+        computes key evidence. Unknown names raise INVALID_INPUT. Role gating
+        still applies on top (tempo_curve is pro-only).
+
+    Identity:
+      - analysis_id and created_at default to a fresh uuid4 and the current UTC
+        time; pass both to make the output a pure function of the input.
+
+    Deadlines and cancellation:
+      - deadline (seconds from the call, or a DeadlineV1) and/or cancel_token
+        (CancellationTokenV1) bound the analysis cooperatively: decoding checks
+        per PCM block and per analysis window, and the runner checks between
+        stages. Nothing is killed; work stops at the next check.
+      - on_deadline="raise" (default) stops with EngineError(TIMEOUT).
+        on_deadline="partial" returns the output so far instead: remaining
+        stages are skipped, their metrics omitted, and a `deadline_exceeded`
+        warning lists them. The PCM decode itself always completes; decode-time
+        hint stages cut short appear as "decode:<consumer>" or
+        "hint_windows:<search>". An mp3 transcode that runs out of time still
+        raises TIMEOUT.
+
+    Evidence snapshots:
+      - evidence_sink, when given, receives an EvidenceSnapshotV1 of the final
+        feature context (after any tag-driven re-analysis).
+      - evidence_snapshot replays features, policies and packaging over a
+        captured snapshot without touching audio (see EvidenceSnapshotV1).
+    """
+    return _analyze_v1(  # type: ignore[return-value]
+        audio_or_track=audio_or_track,
+        role=role,
+        track=track,
+        audio=audio,
+        config=config,
+        analysis_id=analysis_id,
+        created_at=created_at,
+        _test_overrides=_test_overrides,
+        input_path=input_path,
+        assert_contract=assert_contract,
+        tempo_prior=tempo_prior,
+        verify_tags=verify_tags,
+        evidence_snapshot=evidence_snapshot,
+        evidence_sink=evidence_sink,
+        deadline=deadline,
+        cancel_token=cancel_token,
+        on_deadline=on_deadline,
+        features=features,
+    )
+
+
+def run_analysis_core_v1(
+    audio_or_track: Any | None = None,
+    *,
+    track: TrackInfo | None = None,
+    audio: Any | None = None,
+    config: EngineConfig | None = None,
+    analysis_id: str | None = None,
+    created_at: str | None = None,
+    _test_overrides: dict[str, Any] | None = None,
+    input_path: str | None = None,
+    tempo_prior: TempoPrior | tuple[float, float] | float | None = None,
+    verify_tags: bool = False,
+    evidence_snapshot: EvidenceSnapshotV1 | None = None,
+    evidence_sink: Callable[[EvidenceSnapshotV1], None] | None = None,
+    deadline: DeadlineV1 | float | None = None,
+    cancel_token: CancellationTokenV1 | None = None,
+    on_deadline: DeadlinePolicy = "raise",
+    features: Collection[str] | None = None,
+) -> CoreResultV1:
+    """
+    Role-independent analysis: every feature, no packaging.
+
+    Accepts the same inputs and options as `run_analysis_v1` (minus role and
+    contract assertion) and returns a `CoreResultV1` that `package_for_role`
+    turns into any role's output, identical to a per-role `run_analysis_v1`
+    call. Computes the union of role-specific features (pro tempo curve,
+    non-guest events) once.
+    """
+    return _analyze_v1(  # type: ignore[return-value]
+        audio_or_track=audio_or_track,
+        track=track,
+        audio=audio,
+        config=config,
+        analysis_id=analysis_id,
+        created_at=created_at,
+        _test_overrides=_test_overrides,
+        input_path=input_path,
+        tempo_prior=tempo_prior,
+        verify_tags=verify_tags,
+        evidence_snapshot=evidence_snapshot,
+        evidence_sink=evidence_sink,
+        deadline=deadline,
+        cancel_token=cancel_token,
+        on_deadline=on_deadline,
+        core_only=True,
+        features=features,
+    )
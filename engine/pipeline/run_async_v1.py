@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import tempfile
+from collections.abc import Collection
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from engine.core.config import EngineConfig
+from engine.core.deadline_v1 import CancellationTokenV1, DeadlinePolicy, DeadlineV1
+from engine.core.errors import EngineError
+from engine.features.registry_v1 import plan_features_v1
+from engine.ingest.ingest_v1 import decode_transcoded_mp3_v1, transcode_mp3_async_v1
+from engine.pipeline.run import Role, _analyze_v1
+from engine.preprocess.bpm_hint_windows_v1 import TempoPrior
+
+
+async def run_analysis_v1_async(
+    input_path: str | Path,
+    role: Role,
+    *,
+    executor: Executor | None = None,
+    config: EngineConfig | None = None,
+    analysis_id: str | None = None,
+    created_at: str | None = None,
+    tempo_prior: TempoPrior | tuple[float, float] | float | None = None,
+    verify_tags: bool = False,
+    assert_contract: bool = False,
+    deadline: float | None = None,
+    cancel_token: CancellationTokenV1 | None = None,
+    on_deadline: DeadlinePolicy = "raise",
+    features: Collection[str] | None = None,
+) -> dict[str, Any]:
+    """
+    `run_analysis_v1` for asyncio callers; never blocks the event loop.
+
+    Output is identical to `run_analysis_v1(input_path=..., role=...)` with the
+    same options, and many calls may run concurrently on one loop.
+
+    Execution:
+      - mp3 input is transcoded by ffmpeg through asyncio subprocess pipes, so
+        waiting on the decoder costs the loop nothing.
+      - Everything else (file reads, tag reads, PCM decode, features,
+        packaging) runs as one job on `executor`; None means the loop's
+        default thread pool. Pass a ProcessPoolExecutor to take CPU-bound
+        stages off the GIL.
+
+    Deadlines and cancellation:
+      - deadline (seconds from the call), cancel_token and on_deadline behave
+        as in `run_analysis_v1` and also bound the transcode.
+      - Cancelling the awaiting task kills a running transcode, or cancels
+        the analysis and waits for it to stop at its next deadline check
+        (thread executors) before removing the transcoded WAV, then
+        re-raises CancelledError.
+      - A process pool gets the remaining seconds instead of a deadline
+        object; cancel_token is rejected there (INVALID_INPUT) and task
+        cancellation stops only the transcode (the worker's result, or its
+        failure on the removed WAV, is discarded).
+
+    Observability hooks fire from the executor job (in the worker process
+    for a process pool); transcode failures raise before `analysis_started`.
+    """
+    if not isinstance(input_path, (str, Path)):
+        raise EngineError(
+            code="INVALID_INPUT", message="Invalid input_path", context={"stage": "validate"}
+        )
+    in_process_pool = isinstance(executor, ProcessPoolExecutor)
+    if in_process_pool and cancel_token is not None:
+        raise EngineError(
+            code="INVALID_INPUT",
+            message="cancel_token is not supported with a process pool",
+            context={"stage": "validate"},
+        )
+    try:
+        token = CancellationTokenV1(parent=cancel_token)
+        dl = DeadlineV1(seconds=deadline, token=token)
+    except (TypeError, ValueError) as exc:
+        raise EngineError(
+            code="INVALID_INPUT", message="Invalid deadline", context={"stage": "validate"}
+        ) from exc
+
+    plan_features_v1(features)  # validate before spending a transcode
+    p = Path(input_path)
+    cfg = config or EngineConfig()
+    loop = asyncio.get_running_loop()
+    try:
+        with tempfile.TemporaryDirectory(prefix="bnk_async_mp3_") as td:
+            decoder = None
+            if p.suffix.lower() == ".mp3":
+                out_wav = Path(td) / "decoded.wav"
+                await transcode_mp3_async_v1(p, out_wav, config=cfg, deadline=dl)
+                decoder = functools.partial(decode_transcoded_mp3_v1, wav_path=out_wav)
+            if in_process_pool:
+                dl.check("decode")  # a spent budget cannot be shipped as seconds
+            job = functools.partial(
+                _analyze_v1,
+                role=role,
+                input_path=str(p),
+                config=cfg,
+                analysis_id=analysis_id,
+                created_at=created_at,
+                tempo_prior=tempo_prior,
+                verify_tags=verify_tags,
+                assert_contract=assert_contract,
+                # Deadline objects hold a thread event; workers get the seconds left.
+                deadline=dl.remaining() if in_process_pool else dl,
+                on_deadline=on_deadline,
+                features=features,
+                _decoder=decoder,
+            )
+            running = loop.run_in_executor(executor, job)
+            try:
+                return await asyncio.shield(running)  # type: ignore[return-value]
+            except asyncio.CancelledError:
+                # Stop the job while its input (the transcoded WAV) still exists.
+                token.cancel()
+                if not in_process_pool:
+                    with contextlib.suppress(Exception):
+                        await running
+                raise
+    except asyncio.CancelledError:
+        token.cancel()
+        raise
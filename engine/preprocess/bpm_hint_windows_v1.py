@@ -3,8 +3,107 @@ from __future__ import annotations
 import math
 import wave
 from array import array
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from engine.core.deadline_v1 import DeadlineV1
+from engine.ingest.stream_v1 import stream_wav_v1
+
+if TYPE_CHECKING:
+    from engine.preprocess.signals_v1 import DerivedSignals
+
+
+# Tempo relatives searched around a prior: the prior itself, half/double time
+# and the triplet/dotted (2/3, 3/2) periodicities the BPM policy reasons about.
+_PRIOR_FAMILY_FACTORS_V1 = (1.0, 0.5, 2.0, 2.0 / 3.0, 1.5)
+
+
+@dataclass(frozen=True)
+class TempoPrior:
+    """
+    Caller-supplied tempo range (BPM), e.g. a catalogue genre range.
+
+    The prior only narrows which autocorrelation lags are evaluated per window
+    (the range, widened by `relative_margin`, plus its half/double/triplet
+    relatives). It does not force a value: the BPM policy still scores and
+    gates the resulting window evidence before emitting.
+    """
+
+    bpm_min: float
+    bpm_max: float
+    relative_margin: float = 0.04
+
+    def __post_init__(self) -> None:
+        if not (self.bpm_min > 0 and self.bpm_max > 0):
+            raise ValueError("tempo prior bounds must be > 0")
+        if self.bpm_max < self.bpm_min:
+            raise ValueError("tempo prior bpm_max must be >= bpm_min")
+        if self.relative_margin < 0:
+            raise ValueError("tempo prior relative_margin must be >= 0")
+
+    @classmethod
+    def around(cls, bpm: float, *, relative_margin: float = 0.04) -> TempoPrior:
+        return cls(bpm_min=float(bpm), bpm_max=float(bpm), relative_margin=relative_margin)
+
+
+@dataclass(frozen=True)
+class OnsetEnvelope:
+    """
+    Low/high-band onset strength per frame, as computed by the hint stage.
+
+    Kept so downstream rhythm features (beat grid) can reuse the envelope
+    without decoding or filtering the audio again. Samples are float32.
+    """
+
+    frame_seconds: float
+    low: array
+    high: array
+
+    @classmethod
+    def from_bands(
+        cls, low: Iterable[float], high: Iterable[float], *, frame_seconds: float
+    ) -> OnsetEnvelope:
+        return cls(frame_seconds=float(frame_seconds), low=array("f", low), high=array("f", high))
+
+    def __len__(self) -> int:
+        return len(self.low)
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.low) * self.frame_seconds
+
+
+def _prior_lag_ranges_v1(
+    prior: TempoPrior,
+    *,
+    env_sr_hz: float,
+    bpm_min: float,
+    bpm_max: float,
+) -> list[tuple[int, int]]:
+    """
+    Inclusive lag ranges covering the prior and its tempo relatives, clipped to
+    [bpm_min, bpm_max] and merged. Empty when no relative falls in range.
+    """
+    ranges: list[tuple[int, int]] = []
+    for f in _PRIOR_FAMILY_FACTORS_V1:
+        lo = max(float(bpm_min), prior.bpm_min * f * (1.0 - prior.relative_margin))
+        hi = min(float(bpm_max), prior.bpm_max * f * (1.0 + prior.relative_margin))
+        if hi < lo:
+            continue
+        lag_lo = max(1, int(math.floor(env_sr_hz * 60.0 / hi)))
+        lag_hi = int(math.ceil(env_sr_hz * 60.0 / lo))
+        ranges.append((lag_lo, lag_hi))
+
+    ranges.sort()
+    merged: list[tuple[int, int]] = []
+    for lo_lag, hi_lag in ranges:
+        if merged and lo_lag <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi_lag))
+        else:
+            merged.append((lo_lag, hi_lag))
+    return merged
 
 
 def _lowpass_alpha_v1(*, sample_rate_hz: float, cutoff_hz: float) -> float:
@@ -101,68 +200,90 @@ def _iter_energy_frames_v1(
         yield e / float(max(n, 1))
 
 
-def _iter_energy_frames_bands_v1(
-    wf: wave.Wave_read,
-    *,
-    frame_size: int,
-    lowpass_cutoff_hz: float,
-    highpass_cutoff_hz: float,
-) -> Iterable[tuple[float, float]]:
+class EnergyEnvelopeAccumulatorV1:
     """
-    Yield (low_band_energy, high_band_energy) per frame.
+    Streaming (low_band, high_band) mean-absolute energies per frame.
 
-    High band is approximated via a 1st-order high-pass:
+    Fed interleaved int16 blocks of any length (a decode fan-out consumer);
+    stereo is averaged to mono with the integer mean. Low band is a one-pole
+    low-pass; high band is approximated via a 1st-order high-pass:
       hp(x) = x - lp_hp(x)
-    """
-    channels = int(wf.getnchannels())
-    sampwidth = int(wf.getsampwidth())
 
-    if channels not in (1, 2):
-        raise ValueError(f"unsupported channels: {channels} (expected 1 or 2)")
-
-    if sampwidth != 2:
-        raise ValueError(f"unsupported sample width: {sampwidth} bytes (expected 2)")
-
-    sr = float(wf.getframerate())
-    alpha_low = _lowpass_alpha_v1(sample_rate_hz=sr, cutoff_hz=float(lowpass_cutoff_hz))
-    alpha_hp = _lowpass_alpha_v1(sample_rate_hz=sr, cutoff_hz=float(highpass_cutoff_hz))
-    y_low = 0.0
-    y_hp = 0.0
-
-    while True:
-        raw = wf.readframes(frame_size)
-        if not raw:
-            break
-
-        a = array("h")
-        a.frombytes(raw)
-        if not a:
-            break
+    `finish()` returns (env_low, env_high); a trailing partial frame is
+    averaged over the samples it has.
+    """
 
-        if channels == 1:
-            e_low = 0.0
-            e_high = 0.0
-            for xi in a:
-                x = float(int(xi))
+    def __init__(
+        self,
+        *,
+        sample_rate_hz: float,
+        channels: int,
+        frame_seconds: float = 0.01,
+        lowpass_cutoff_hz: float = 200.0,
+        highpass_cutoff_hz: float = 900.0,
+    ):
+        if channels not in (1, 2):
+            raise ValueError(f"unsupported channels: {channels} (expected 1 or 2)")
+        sr = float(sample_rate_hz)
+        self._channels = int(channels)
+        self._frame_size = max(1, int(round(sr * float(frame_seconds))))
+        self._alpha_low = _lowpass_alpha_v1(sample_rate_hz=sr, cutoff_hz=float(lowpass_cutoff_hz))
+        self._alpha_hp = _lowpass_alpha_v1(sample_rate_hz=sr, cutoff_hz=float(highpass_cutoff_hz))
+        self._y_low = 0.0
+        self._y_hp = 0.0
+        self._e_low = 0.0
+        self._e_high = 0.0
+        self._count = 0
+        self._carry: list[int] = []
+        self._low: list[float] = []
+        self._high: list[float] = []
+
+    def feed(self, block: Sequence[int]) -> None:
+        if self._channels == 2:
+            samples = self._carry + list(block) if self._carry else block
+            usable = len(samples) - len(samples) % 2
+            mono: Sequence[int] = [
+                (int(samples[i]) + int(samples[i + 1])) // 2 for i in range(0, usable, 2)
+            ]
+            self._carry = list(samples[usable:])
+        else:
+            mono = block
+
+        alpha_low = self._alpha_low
+        alpha_hp = self._alpha_hp
+        frame_size = self._frame_size
+        y_low, y_hp = self._y_low, self._y_hp
+        e_low, e_high, count = self._e_low, self._e_high, self._count
+        low, high = self._low, self._high
+        pos = 0
+        n = len(mono)
+        while pos < n:
+            take = min(frame_size - count, n - pos)
+            for v in mono[pos : pos + take]:
+                x = float(v)
                 y_low += alpha_low * (x - y_low)
                 y_hp += alpha_hp * (x - y_hp)
                 e_low += abs(y_low)
                 e_high += abs(x - y_hp)
-            n = float(len(a))
-            yield (e_low / n, e_high / n)
-            continue
-
-        e_low = 0.0
-        e_high = 0.0
-        n = len(a) // 2
-        for i in range(0, n * 2, 2):
-            m = (int(a[i]) + int(a[i + 1])) // 2
-            x = float(m)
-            y_low += alpha_low * (x - y_low)
-            y_hp += alpha_hp * (x - y_hp)
-            e_low += abs(y_low)
-            e_high += abs(x - y_hp)
-        yield (e_low / float(max(n, 1)), e_high / float(max(n, 1)))
+            pos += take
+            count += take
+            if count == frame_size:
+                low.append(e_low / float(frame_size))
+                high.append(e_high / float(frame_size))
+                e_low = 0.0
+                e_high = 0.0
+                count = 0
+        self._y_low, self._y_hp = y_low, y_hp
+        self._e_low, self._e_high, self._count = e_low, e_high, count
+
+    def finish(self) -> tuple[list[float], list[float]]:
+        if self._count:
+            self._low.append(self._e_low / float(self._count))
+            self._high.append(self._e_high / float(self._count))
+            self._e_low = 0.0
+            self._e_high = 0.0
+            self._count = 0
+        return list(self._low), list(self._high)
 
 
 def _detail_from_segment_v1(
@@ -172,6 +293,7 @@ def _detail_from_segment_v1(
     bpm_min: float,
     bpm_max: float,
     lag_bias_exponent: float,
+    lag_ranges: list[tuple[int, int]] | None = None,
 ) -> dict[str, float | None] | None:
     n = len(seg)
     if n < 8:
@@ -188,6 +310,18 @@ def _detail_from_segment_v1(
     if max_lag <= min_lag:
         return None
 
+    # A tempo prior restricts the search to a few narrow lag bands.
+    if lag_ranges is None:
+        lags: Iterable[int] = range(min_lag, max_lag + 1)
+    else:
+        lags = [
+            lag
+            for lo_lag, hi_lag in lag_ranges
+            for lag in range(max(lo_lag, min_lag), min(hi_lag, max_lag) + 1)
+        ]
+        if not lags:
+            return None
+
     denom = sum(v * v for v in x) + 1e-12
     lag_bias = max(0.0, float(lag_bias_exponent))
 
@@ -195,7 +329,7 @@ def _detail_from_segment_v1(
     best_adj: float | None = None
     best_raw: float | None = None
 
-    for lag in range(min_lag, max_lag + 1):
+    for lag in lags:
         s = 0.0
         for i in range(lag, n):
             s += x[i] * x[i - lag]
@@ -258,74 +392,35 @@ def _detail_from_segment_v1(
     return out
 
 
-def compute_bpm_hint_window_details_from_wav_v1(
-    path: str | Path,
-    *,
-    window_seconds: float = 8.0,
-    hop_seconds: float = 4.0,
-    frame_seconds: float = 0.01,
-    bpm_min: float = 60.0,
-    bpm_max: float = 200.0,
-    min_audio_seconds: float = 2.0,
-    lowpass_cutoff_hz: float = 200.0,
-    highpass_cutoff_hz: float = 900.0,
-    lag_bias_exponent: float = 0.0,
-) -> list[dict[str, float | None]]:
-    """
-    Compute per-window tempo hints and ambiguity evidence from WAV PCM (stdlib-only).
-
-    Output:
-      - list[dict]: one record per window (not flattened), containing low-band
-        keys plus optional high-band keys prefixed with `high_`.
-    """
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(str(p))
-
-    if window_seconds <= 0 or hop_seconds <= 0 or frame_seconds <= 0:
-        raise ValueError("window_seconds/hop_seconds/frame_seconds must be > 0")
-    if bpm_min <= 0 or bpm_max <= 0 or bpm_max <= bpm_min:
-        raise ValueError("invalid bpm_min/bpm_max")
-    if lowpass_cutoff_hz <= 0:
-        raise ValueError("lowpass_cutoff_hz must be > 0")
-    if highpass_cutoff_hz <= 0:
-        raise ValueError("highpass_cutoff_hz must be > 0")
-    if lag_bias_exponent < 0:
-        raise ValueError("lag_bias_exponent must be >= 0")
-
-    with wave.open(str(p), "rb") as wf:
-        sr = float(wf.getframerate())
-        frames = int(wf.getnframes())
-        duration_s = frames / sr if sr > 0 else 0.0
-        if duration_s < float(min_audio_seconds):
-            return []
-
-        frame_size = max(1, int(round(sr * float(frame_seconds))))
-        env_low: list[float] = []
-        env_high: list[float] = []
-        for e_low, e_high in _iter_energy_frames_bands_v1(
-            wf,
-            frame_size=frame_size,
-            lowpass_cutoff_hz=float(lowpass_cutoff_hz),
-            highpass_cutoff_hz=float(highpass_cutoff_hz),
-        ):
-            env_low.append(float(e_low))
-            env_high.append(float(e_high))
-
-    if len(env_low) < 4:
-        return []
-
-    def onset_from_env(env: list[float]) -> list[float]:
-        onset: list[float] = [0.0]
-        for i in range(1, len(env)):
-            d = env[i] - env[i - 1]
-            onset.append(d if d > 0 else 0.0)
-        return onset
+def _onset_from_env_v1(env: list[float]) -> list[float]:
+    """Half-wave rectified first difference of an energy envelope."""
+    onset: list[float] = [0.0]
+    for i in range(1, len(env)):
+        d = env[i] - env[i - 1]
+        onset.append(d if d > 0 else 0.0)
+    return onset
 
-    onset_low = onset_from_env(env_low)
-    onset_high = onset_from_env(env_high)
 
+def _details_from_onsets_v1(
+    onset_low: list[float],
+    onset_high: list[float],
+    *,
+    window_seconds: float,
+    hop_seconds: float,
+    frame_seconds: float,
+    bpm_min: float,
+    bpm_max: float,
+    lag_bias_exponent: float,
+    tempo_prior: TempoPrior | None = None,
+    deadline: DeadlineV1 | None = None,
+) -> list[dict[str, float | None]]:
+    """Window the low/high onset envelopes and merge per-band tempo details."""
     env_sr_hz = 1.0 / float(frame_seconds)
+    lag_ranges = (
+        _prior_lag_ranges_v1(tempo_prior, env_sr_hz=env_sr_hz, bpm_min=bpm_min, bpm_max=bpm_max)
+        if tempo_prior is not None
+        else None
+    )
 
     win_len = int(round(float(window_seconds) * env_sr_hz))
     hop_len = int(round(float(hop_seconds) * env_sr_hz))
@@ -335,7 +430,11 @@ def compute_bpm_hint_window_details_from_wav_v1(
     windows: list[dict[str, float | None]] = []
 
     def merge_low_high(
-        low: dict[str, float | None] | None, high: dict[str, float | None] | None
+        low: dict[str, float | None] | None,
+        high: dict[str, float | None] | None,
+        *,
+        start: int,
+        length: int,
     ) -> dict[str, float | None] | None:
         if low is None and high is None:
             return None
@@ -345,6 +444,9 @@ def compute_bpm_hint_window_details_from_wav_v1(
         if high is not None:
             for k, v in high.items():
                 out[f"high_{k}"] = v
+        # Window position in track time (kept so per-window tempo can be tracked).
+        out["start_s"] = round(start * float(frame_seconds), 3)
+        out["end_s"] = round((start + length) * float(frame_seconds), 3)
         return out
 
     if len(onset_low) < win_len:
@@ -354,6 +456,7 @@ def compute_bpm_hint_window_details_from_wav_v1(
             bpm_min=bpm_min,
             bpm_max=bpm_max,
             lag_bias_exponent=lag_bias_exponent,
+            lag_ranges=lag_ranges,
         )
         high = _detail_from_segment_v1(
             onset_high,
@@ -361,11 +464,14 @@ def compute_bpm_hint_window_details_from_wav_v1(
             bpm_min=bpm_min,
             bpm_max=bpm_max,
             lag_bias_exponent=lag_bias_exponent,
+            lag_ranges=lag_ranges,
         )
-        merged = merge_low_high(low, high)
+        merged = merge_low_high(low, high, start=0, length=len(onset_low))
         return [merged] if merged is not None else []
 
     for start in range(0, len(onset_low) - win_len + 1, hop_len):
+        if deadline is not None:
+            deadline.check("hint_windows")
         seg_low = onset_low[start : start + win_len]
         seg_high = onset_high[start : start + win_len]
         low = _detail_from_segment_v1(
@@ -374,6 +480,7 @@ def compute_bpm_hint_window_details_from_wav_v1(
             bpm_min=bpm_min,
             bpm_max=bpm_max,
             lag_bias_exponent=lag_bias_exponent,
+            lag_ranges=lag_ranges,
         )
         high = _detail_from_segment_v1(
             seg_high,
@@ -381,8 +488,9 @@ def compute_bpm_hint_window_details_from_wav_v1(
             bpm_min=bpm_min,
             bpm_max=bpm_max,
             lag_bias_exponent=lag_bias_exponent,
+            lag_ranges=lag_ranges,
         )
-        merged = merge_low_high(low, high)
+        merged = merge_low_high(low, high, start=start, length=win_len)
         if merged is None:
             continue
         windows.append(merged)
@@ -390,6 +498,295 @@ def compute_bpm_hint_window_details_from_wav_v1(
     return windows
 
 
+def compute_bpm_hint_window_details_from_wav_v1(
+    path: str | Path,
+    *,
+    window_seconds: float = 8.0,
+    hop_seconds: float = 4.0,
+    frame_seconds: float = 0.01,
+    bpm_min: float = 60.0,
+    bpm_max: float = 200.0,
+    min_audio_seconds: float = 2.0,
+    lowpass_cutoff_hz: float = 200.0,
+    highpass_cutoff_hz: float = 900.0,
+    lag_bias_exponent: float = 0.0,
+    tempo_prior: TempoPrior | None = None,
+) -> list[dict[str, float | None]]:
+    """
+    Compute per-window tempo hints and ambiguity evidence from WAV PCM (stdlib-only).
+
+    Output:
+      - list[dict]: one record per window (not flattened), containing low-band
+        keys plus optional high-band keys prefixed with `high_`, and the window's
+        `start_s`/`end_s` in track time.
+
+    With `tempo_prior`, only lags near the prior and its half/double/triplet
+    relatives are evaluated per window.
+    """
+    details, _ = compute_bpm_hint_evidence_from_wav_v1(
+        path,
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        min_audio_seconds=min_audio_seconds,
+        lowpass_cutoff_hz=lowpass_cutoff_hz,
+        highpass_cutoff_hz=highpass_cutoff_hz,
+        lag_bias_exponent=lag_bias_exponent,
+        tempo_prior=tempo_prior,
+    )
+    return details
+
+
+def compute_bpm_hint_evidence_from_wav_v1(
+    path: str | Path,
+    *,
+    window_seconds: float = 8.0,
+    hop_seconds: float = 4.0,
+    frame_seconds: float = 0.01,
+    bpm_min: float = 60.0,
+    bpm_max: float = 200.0,
+    min_audio_seconds: float = 2.0,
+    lowpass_cutoff_hz: float = 200.0,
+    highpass_cutoff_hz: float = 900.0,
+    lag_bias_exponent: float = 0.0,
+    tempo_prior: TempoPrior | None = None,
+) -> tuple[list[dict[str, float | None]], OnsetEnvelope | None]:
+    """
+    Per-window details (as `compute_bpm_hint_window_details_from_wav_v1`) plus
+    the onset envelope they were computed from, in one read of the file.
+
+    The envelope is None when the audio is too short to window. To share the
+    read with other stages, register an `EnergyEnvelopeAccumulatorV1` in a
+    decode fan-out (`stream_wav_v1`) and finish with
+    `bpm_hint_evidence_from_energy_v1`.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(str(p))
+
+    if lowpass_cutoff_hz <= 0:
+        raise ValueError("lowpass_cutoff_hz must be > 0")
+    if highpass_cutoff_hz <= 0:
+        raise ValueError("highpass_cutoff_hz must be > 0")
+    _validate_window_params_v1(
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+    )
+
+    with wave.open(str(p), "rb") as wf:
+        sr = float(wf.getframerate())
+        channels = int(wf.getnchannels())
+        frames = int(wf.getnframes())
+    duration_s = frames / sr if sr > 0 else 0.0
+    if duration_s < float(min_audio_seconds):
+        return [], None
+
+    envelope = EnergyEnvelopeAccumulatorV1(
+        sample_rate_hz=sr,
+        channels=channels,
+        frame_seconds=frame_seconds,
+        lowpass_cutoff_hz=lowpass_cutoff_hz,
+        highpass_cutoff_hz=highpass_cutoff_hz,
+    )
+    env_low, env_high = stream_wav_v1(p, {"envelope": envelope})["envelope"]
+    return bpm_hint_evidence_from_energy_v1(
+        env_low,
+        env_high,
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+        tempo_prior=tempo_prior,
+    )
+
+
+def _validate_window_params_v1(
+    *,
+    window_seconds: float,
+    hop_seconds: float,
+    frame_seconds: float,
+    bpm_min: float,
+    bpm_max: float,
+    lag_bias_exponent: float,
+) -> None:
+    if window_seconds <= 0 or hop_seconds <= 0 or frame_seconds <= 0:
+        raise ValueError("window_seconds/hop_seconds/frame_seconds must be > 0")
+    if bpm_min <= 0 or bpm_max <= 0 or bpm_max <= bpm_min:
+        raise ValueError("invalid bpm_min/bpm_max")
+    if lag_bias_exponent < 0:
+        raise ValueError("lag_bias_exponent must be >= 0")
+
+
+def bpm_hint_evidence_from_energy_v1(
+    env_low: list[float],
+    env_high: list[float],
+    *,
+    window_seconds: float = 8.0,
+    hop_seconds: float = 4.0,
+    frame_seconds: float = 0.01,
+    bpm_min: float = 60.0,
+    bpm_max: float = 200.0,
+    lag_bias_exponent: float = 0.0,
+    tempo_prior: TempoPrior | None = None,
+    deadline: DeadlineV1 | None = None,
+) -> tuple[list[dict[str, float | None]], OnsetEnvelope | None]:
+    """Window details and onset envelope from `EnergyEnvelopeAccumulatorV1` output."""
+    _validate_window_params_v1(
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+    )
+    if len(env_low) < 4:
+        return [], None
+
+    onset_low = _onset_from_env_v1(env_low)
+    onset_high = _onset_from_env_v1(env_high)
+    details = _details_from_onsets_v1(
+        onset_low,
+        onset_high,
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+        tempo_prior=tempo_prior,
+        deadline=deadline,
+    )
+    return details, OnsetEnvelope.from_bands(onset_low, onset_high, frame_seconds=frame_seconds)
+
+
+def onset_envelope_from_energy_v1(
+    env_low: list[float], env_high: list[float], *, frame_seconds: float = 0.01
+) -> OnsetEnvelope | None:
+    """The onset envelope alone from `EnergyEnvelopeAccumulatorV1` output (no lag search)."""
+    if len(env_low) < 4:
+        return None
+    return OnsetEnvelope.from_bands(
+        _onset_from_env_v1(env_low), _onset_from_env_v1(env_high), frame_seconds=frame_seconds
+    )
+
+
+def bpm_hint_details_from_onset_envelope_v1(
+    envelope: OnsetEnvelope,
+    *,
+    window_seconds: float = 8.0,
+    hop_seconds: float = 4.0,
+    bpm_min: float = 60.0,
+    bpm_max: float = 200.0,
+    lag_bias_exponent: float = 0.0,
+    tempo_prior: TempoPrior | None = None,
+    deadline: DeadlineV1 | None = None,
+) -> list[dict[str, float | None]]:
+    """
+    Re-run the per-window lag search over a kept onset envelope (no audio read),
+    e.g. to widen a prior-narrowed search. The envelope is float32, so scores
+    can differ from the decode-time search in the last digits.
+    """
+    _validate_window_params_v1(
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=envelope.frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+    )
+    return _details_from_onsets_v1(
+        list(envelope.low),
+        list(envelope.high),
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=envelope.frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+        tempo_prior=tempo_prior,
+        deadline=deadline,
+    )
+
+
+def onset_envelope_from_signals_v1(
+    signals: DerivedSignals,
+    *,
+    frame_seconds: float = 0.01,
+    lowpass_cutoff_hz: float = 200.0,
+    highpass_cutoff_hz: float = 900.0,
+) -> OnsetEnvelope | None:
+    """The hint stage's onset envelope, read from memoized `DerivedSignals`."""
+    onset_low, onset_high = signals.onset_envelope(
+        frame_seconds=frame_seconds,
+        lowpass_cutoff_hz=lowpass_cutoff_hz,
+        highpass_cutoff_hz=highpass_cutoff_hz,
+    )
+    if len(onset_low) < 4:
+        return None
+    return OnsetEnvelope.from_bands(onset_low, onset_high, frame_seconds=frame_seconds)
+
+
+def compute_bpm_hint_window_details_from_signals_v1(
+    signals: DerivedSignals,
+    *,
+    window_seconds: float = 8.0,
+    hop_seconds: float = 4.0,
+    frame_seconds: float = 0.01,
+    bpm_min: float = 60.0,
+    bpm_max: float = 200.0,
+    min_audio_seconds: float = 2.0,
+    lowpass_cutoff_hz: float = 200.0,
+    highpass_cutoff_hz: float = 900.0,
+    lag_bias_exponent: float = 0.0,
+    tempo_prior: TempoPrior | None = None,
+    deadline: DeadlineV1 | None = None,
+) -> list[dict[str, float | None]]:
+    """
+    Same output as `compute_bpm_hint_window_details_from_wav_v1`, but reads the
+    memoized onset envelope from `DerivedSignals` instead of re-reading the file.
+    """
+    _validate_window_params_v1(
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+    )
+
+    if signals.pcm.duration_seconds < float(min_audio_seconds):
+        return []
+
+    onset_low, onset_high = signals.onset_envelope(
+        frame_seconds=frame_seconds,
+        lowpass_cutoff_hz=lowpass_cutoff_hz,
+        highpass_cutoff_hz=highpass_cutoff_hz,
+    )
+    if len(onset_low) < 4:
+        return []
+
+    return _details_from_onsets_v1(
+        onset_low,
+        onset_high,
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        frame_seconds=frame_seconds,
+        bpm_min=bpm_min,
+        bpm_max=bpm_max,
+        lag_bias_exponent=lag_bias_exponent,
+        tempo_prior=tempo_prior,
+        deadline=deadline,
+    )
+
+
 def compute_bpm_hint_windows_from_wav_v1(
     path: str | Path,
     *,
@@ -403,6 +800,7 @@ def compute_bpm_hint_windows_from_wav_v1(
     lowpass_cutoff_hz: float = 200.0,
     highpass_cutoff_hz: float = 900.0,
     lag_bias_exponent: float = 0.0,
+    tempo_prior: TempoPrior | None = None,
 ) -> list[float]:
     """
     Compute window-level tempo hints from WAV PCM using stdlib only.
@@ -427,8 +825,23 @@ def compute_bpm_hint_windows_from_wav_v1(
         lowpass_cutoff_hz=lowpass_cutoff_hz,
         highpass_cutoff_hz=highpass_cutoff_hz,
         lag_bias_exponent=lag_bias_exponent,
+        tempo_prior=tempo_prior,
     )
 
+    return flatten_bpm_hint_windows_v1(details, double_tempo_alpha=double_tempo_alpha)
+
+
+def flatten_bpm_hint_windows_v1(
+    details: list[dict[str, float | None]],
+    *,
+    double_tempo_alpha: float = 0.80,
+) -> list[float]:
+    """
+    Flatten per-window details into `FeatureContext.bpm_hint_windows` BPMs.
+
+    Each window contributes its best BPM per band, plus the double-time BPM when
+    its correlation ratio reaches `double_tempo_alpha`.
+    """
     hints: list[float] = []
     for d in details:
         low_best = d.get("best_bpm")
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Literal
+
+from engine.preprocess.stft_v1 import (
+    FrameStreamV1,
+    SpectrogramSpecV1,
+    hann_window_v1,
+    rfft_magnitudes_v1,
+)
+
+# Pitch classes are indexed from C (0) to B (11), matching key_mode_v1's key order.
+_A4_HZ = 440.0
+_A4_PITCH_CLASS = 9
+
+
+@dataclass(frozen=True)
+class PitchClassFoldV1:
+    """
+    Sparse 12 x bins folding matrix from STFT bins to pitch classes.
+
+    Each bin in [bin_lo, bin_hi) maps to exactly one pitch class (its nearest
+    equal-tempered semitone), so the matrix is stored as one class per bin.
+    """
+
+    bin_lo: int
+    bin_hi: int
+    pitch_classes: bytes
+
+    def fold(self, mags: Sequence[float], out: list[float]) -> None:
+        """Accumulate one magnitude frame into a 12-slot chroma vector."""
+        pcs = self.pitch_classes
+        lo = self.bin_lo
+        for k in range(lo, self.bin_hi):
+            out[pcs[k - lo]] += mags[k]
+
+
+@lru_cache(maxsize=16)
+def pitch_class_fold_v1(
+    *, n_fft: int, sample_rate_hz: float, fmin_hz: float, fmax_hz: float
+) -> PitchClassFoldV1:
+    """Folding matrix for an `n_fft` STFT at `sample_rate_hz` (cached per geometry)."""
+    if not 0.0 < fmin_hz < fmax_hz:
+        raise ValueError("chroma requires 0 < fmin_hz < fmax_hz")
+    bin_hz = float(sample_rate_hz) / float(n_fft)
+    bin_lo = max(1, int(math.ceil(fmin_hz / bin_hz)))
+    bin_hi = min(n_fft // 2 + 1, int(math.floor(fmax_hz / bin_hz)) + 1)
+    pcs = bytearray()
+    for k in range(bin_lo, max(bin_lo, bin_hi)):
+        semis = 12.0 * math.log2(k * bin_hz / _A4_HZ)
+        pcs.append((int(round(semis)) + _A4_PITCH_CLASS) % 12)
+    return PitchClassFoldV1(bin_lo=bin_lo, bin_hi=max(bin_lo, bin_hi), pitch_classes=bytes(pcs))
+
+
+@dataclass(frozen=True)
+class ChromaFrames:
+    """Per-frame 12-bin chroma (float32); frame i starts at i * frame_seconds."""
+
+    frame_seconds: float
+    frames: list[array] = field(default_factory=list)
+
+
+class _ChromaStreamV1:
+    """
+    Shared streaming front end (`FrameStreamV1`): int16 blocks -> one chroma
+    frame per `hop` decimated samples (each frame reads `frame_len` samples
+    from its start). Subclasses implement `_chroma()`.
+    """
+
+    def __init__(
+        self, *, sample_rate_hz: int, channels: int, decimate: int, frame_len: int, hop: int
+    ):
+        if channels <= 0 or sample_rate_hz <= 0:
+            raise ValueError("channels and sample_rate_hz must be > 0")
+        self._framer = FrameStreamV1(
+            channels=channels, decimate=decimate, frame_len=frame_len, hop=hop
+        )
+        self._hop = int(hop)
+        self._rate = float(sample_rate_hz) / float(decimate)
+        self._frames: list[array] = []
+
+    def feed(self, block: Sequence[int]) -> None:
+        """Consume one interleaved int16 block (any length)."""
+        for seg in self._framer.feed(block):
+            self._frames.append(array("f", self._chroma(seg)))
+
+    def _chroma(self, seg: list[float]) -> list[float]:
+        raise NotImplementedError
+
+    def finish(self) -> ChromaFrames:
+        return ChromaFrames(frame_seconds=self._hop / self._rate, frames=list(self._frames))
+
+
+class ChromaAccumulatorV1(_ChromaStreamV1):
+    """
+    Streaming FFT chroma from interleaved int16 blocks.
+
+    Blocks are downmixed to mono and boxcar-decimated by `decimate`, then cut
+    into Hann-windowed `n_fft` frames every `hop` decimated samples; each
+    magnitude frame is folded into 12 pitch classes over [fmin_hz, fmax_hz].
+    Window, FFT plan and folding matrix are cached per geometry, so many
+    accumulators (tracks) share them.
+
+    It is a decode fan-out consumer (`stream_wav_v1`): it reads the same blocks
+    as the other decode-time stages, with no second pass over the audio.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate_hz: int,
+        channels: int,
+        decimate: int = 8,
+        n_fft: int = 2048,
+        hop: int = 2048,
+        fmin_hz: float = 110.0,
+        fmax_hz: float = 2000.0,
+    ):
+        super().__init__(
+            sample_rate_hz=sample_rate_hz,
+            channels=channels,
+            decimate=decimate,
+            frame_len=n_fft,
+            hop=hop,
+        )
+        self._n_fft = int(n_fft)
+        self._window = hann_window_v1(self._n_fft)
+        self._fold = pitch_class_fold_v1(
+            n_fft=self._n_fft,
+            sample_rate_hz=self._rate,
+            fmin_hz=float(fmin_hz),
+            fmax_hz=min(float(fmax_hz), self._rate / 2.0),
+        )
+
+    def _chroma(self, seg: list[float]) -> list[float]:
+        mags = rfft_magnitudes_v1(
+            [v * w for v, w in zip(seg, self._window, strict=True)], n_fft=self._n_fft
+        )
+        chroma = [0.0] * 12
+        self._fold.fold(mags, chroma)
+        return chroma
+
+    def feed_magnitudes(self, mags: Sequence[float]) -> None:
+        """
+        Consume one precomputed magnitude frame of this accumulator's geometry
+        (see `ChromaSpecV1.spectrogram`), e.g. from a shared spectrogram cache.
+        """
+        chroma = [0.0] * 12
+        self._fold.fold(mags, chroma)
+        self._frames.append(array("f", chroma))
+
+
+@dataclass(frozen=True)
+class GoertzelBankV1:
+    """
+    One Goertzel filter per semitone: (pitch_class, coefficient, length) rows.
+
+    Each filter runs over the first `length` samples of a frame, i.e. about
+    `cycles` periods of its centre frequency, so a low note listens longer than
+    a high one (constant-Q) and no bins outside the bank are ever computed.
+    """
+
+    filters: tuple[tuple[int, float, int], ...]
+
+    @property
+    def frame_len(self) -> int:
+        return max(length for _pc, _coeff, length in self.filters)
+
+
+@lru_cache(maxsize=16)
+def goertzel_bank_v1(
+    *, sample_rate_hz: float, fmin_hz: float, octaves: int, cycles: float
+) -> GoertzelBankV1:
+    """Semitone bank from the note nearest `fmin_hz` upwards (cached per geometry)."""
+    if fmin_hz <= 0 or octaves <= 0 or cycles <= 0:
+        raise ValueError("goertzel bank requires fmin_hz, octaves and cycles > 0")
+    first = int(round(12.0 * math.log2(fmin_hz / _A4_HZ)))
+    filters: list[tuple[int, float, int]] = []
+    for semis in range(first, first + 12 * int(octaves)):
+        f = _A4_HZ * 2.0 ** (semis / 12.0)
+        if f >= sample_rate_hz / 2.0:
+            break
+        length = max(2, int(round(cycles * sample_rate_hz / f)))
+        coeff = 2.0 * math.cos(2.0 * math.pi * f / sample_rate_hz)
+        filters.append(((semis + _A4_PITCH_CLASS) % 12, coeff, length))
+    if not filters:
+        raise ValueError("goertzel bank is empty below Nyquist")
+    return GoertzelBankV1(filters=tuple(filters))
+
+
+class GoertzelChromaAccumulatorV1(_ChromaStreamV1):
+    """
+    Low-CPU streaming chroma: a Goertzel bank instead of a full FFT.
+
+    Same front end and frame period as `ChromaAccumulatorV1` (frame i starts at
+    i * hop decimated samples), but each frame only evaluates the semitones in
+    `octaves` octaves from `fmin_hz`, on heavier decimation. Per-note amplitude
+    (sqrt(power) / length) is summed into its pitch class.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate_hz: int,
+        channels: int,
+        decimate: int = 16,
+        hop: int = 1024,
+        fmin_hz: float = 110.0,
+        octaves: int = 3,
+        cycles: float = 17.0,
+    ):
+        rate = float(sample_rate_hz) / float(decimate) if decimate > 0 else 0.0
+        self._bank = goertzel_bank_v1(
+            sample_rate_hz=rate, fmin_hz=float(fmin_hz), octaves=int(octaves), cycles=float(cycles)
+        )
+        super().__init__(
+            sample_rate_hz=sample_rate_hz,
+            channels=channels,
+            decimate=decimate,
+            frame_len=self._bank.frame_len,
+            hop=hop,
+        )
+
+    def _chroma(self, seg: list[float]) -> list[float]:
+        chroma = [0.0] * 12
+        for pc, coeff, length in self._bank.filters:
+            s1 = s2 = 0.0
+            for x in seg[:length]:
+                s1, s2 = x + coeff * s1 - s2, s1
+            power = s1 * s1 + s2 * s2 - coeff * s1 * s2
+            chroma[pc] += math.sqrt(max(power, 0.0)) / length
+        return chroma
+
+
+ChromaBackend = Literal["fft", "goertzel"]
+
+
+@dataclass(frozen=True)
+class ChromaSpecV1:
+    """
+    Backend and geometry of a chroma pass (hashable; memoization key).
+
+    `decimate`, `n_fft`, `hop`, `fmin_hz` and `fmax_hz` configure the FFT
+    backend. The Goertzel backend decimates by `goertzel_decimate`, covers
+    `goertzel_octaves` octaves from `fmin_hz` with `goertzel_cycles`-period
+    filters, and keeps the FFT backend's frame period.
+    """
+
+    backend: ChromaBackend = "fft"
+    decimate: int = 8
+    n_fft: int = 2048
+    hop: int = 2048
+    fmin_hz: float = 110.0
+    fmax_hz: float = 2000.0
+    goertzel_decimate: int = 16
+    goertzel_octaves: int = 3
+    goertzel_cycles: float = 17.0
+
+    @property
+    def spectrogram(self) -> SpectrogramSpecV1 | None:
+        """Spectrogram geometry the FFT backend folds (None for Goertzel)."""
+        if self.backend != "fft":
+            return None
+        return SpectrogramSpecV1(n_fft=self.n_fft, hop=self.hop, decimate=self.decimate)
+
+    def accumulator(self, *, sample_rate_hz: int, channels: int) -> _ChromaStreamV1:
+        if self.backend == "fft":
+            return ChromaAccumulatorV1(
+                sample_rate_hz=sample_rate_hz,
+                channels=channels,
+                decimate=self.decimate,
+                n_fft=self.n_fft,
+                hop=self.hop,
+                fmin_hz=self.fmin_hz,
+                fmax_hz=self.fmax_hz,
+            )
+        if self.backend == "goertzel":
+            return GoertzelChromaAccumulatorV1(
+                sample_rate_hz=sample_rate_hz,
+                channels=channels,
+                decimate=self.goertzel_decimate,
+                hop=max(1, int(round(self.hop * self.decimate / self.goertzel_decimate))),
+                fmin_hz=self.fmin_hz,
+                octaves=self.goertzel_octaves,
+                cycles=self.goertzel_cycles,
+            )
+        raise ValueError(f"unknown chroma backend: {self.backend!r}")
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from engine.core.config import EngineConfig
+from engine.core.deadline_v1 import DeadlineV1
+from engine.preprocess.chroma_v1 import ChromaFrames, ChromaSpecV1
+from engine.preprocess.signals_v1 import DerivedSignals
+
+_PITCH_NAMES_V1 = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+_MODES_V1 = ("major", "minor")
+
+# Krumhansl-Kessler key profiles, tonic first.
+_MAJOR_PROFILE_V1 = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)
+_MINOR_PROFILE_V1 = (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)
+
+
+def _zscore_v1(x: Sequence[float]) -> list[float] | None:
+    """Zero-mean, unit-norm copy of x (None when x is flat)."""
+    n = len(x)
+    mean = sum(x) / n
+    dev = [float(v) - mean for v in x]
+    var = sum(d * d for d in dev)
+    if var <= 0.0:
+        return None
+    inv = 1.0 / math.sqrt(var)
+    return [d * inv for d in dev]
+
+
+@lru_cache(maxsize=1)
+def key_profile_matrix_v1() -> tuple[tuple[float, ...], ...]:
+    """
+    24 x 12 key-profile matrix, one zero-mean, unit-norm row per key slot.
+
+    Rows follow the key/mode policy's slot order (`tonic_index * 2 + mode_index`,
+    major before minor), so the dot product of a row with a z-scored chroma
+    vector is the Pearson correlation for that key.
+    """
+    rows: list[tuple[float, ...]] = []
+    for tonic in range(12):
+        for profile in (_MAJOR_PROFILE_V1, _MINOR_PROFILE_V1):
+            rotated = [profile[(pc - tonic) % 12] for pc in range(12)]
+            rows.append(tuple(_zscore_v1(rotated) or ()))
+    return tuple(rows)
+
+
+def key_slot_label_v1(slot: int) -> str:
+    """Label of a key slot, e.g. 19 -> "A minor"."""
+    return f"{_PITCH_NAMES_V1[slot // 2]} {_MODES_V1[slot % 2]}"
+
+
+def score_key_windows_v1(chroma_rows: Sequence[Sequence[float]]) -> list[list[float] | None]:
+    """
+    Correlate every chroma row with all 24 key profiles in one pass.
+
+    This is the matrix product Z @ P.T of the z-scored rows (n x 12) with
+    `key_profile_matrix_v1()` (24 x 12); rows may come from any number of
+    windows and tracks. Flat (featureless) rows score None.
+    """
+    profiles = key_profile_matrix_v1()
+    out: list[list[float] | None] = []
+    for row in chroma_rows:
+        z = _zscore_v1(row)
+        out.append(None if z is None else [sum(map(float.__mul__, z, p)) for p in profiles])
+    return out
+
+
+def best_key_for_chroma_v1(chroma: Sequence[float]) -> tuple[str, float] | None:
+    """
+    Best of the 24 major/minor keys for one chroma vector, as ("F# minor", r).
+
+    r is the Pearson correlation with the rotated key profile. Returns None for
+    flat (featureless) chroma.
+    """
+    scores = score_key_windows_v1([chroma])[0]
+    if scores is None:
+        return None
+    slot = max(range(len(scores)), key=scores.__getitem__)
+    return key_slot_label_v1(slot), scores[slot]
+
+
+@dataclass(frozen=True)
+class KeyWindowEvidenceV1:
+    """
+    Per-window key evidence for one track.
+
+    - hints: best key label per kept window (e.g. "A minor").
+    - scores: the kept windows' correlations with all 24 key slots, aligned
+      with `hints`; the key/mode policy aggregates these as soft votes.
+    - spans: [start_s, end_s] of each kept window, aligned with `hints`
+      (tonal drift detection places its change points on these).
+    """
+
+    hints: list[str] = field(default_factory=list)
+    scores: list[list[float]] = field(default_factory=list)
+    spans: list[list[float]] = field(default_factory=list)
+
+
+def _window_sums_v1(
+    chroma: ChromaFrames,
+    *,
+    window_seconds: float,
+    hop_seconds: float,
+    deadline: DeadlineV1 | None = None,
+) -> list[tuple[list[float], list[float]]]:
+    """(chroma sum, [start_s, end_s]) per window."""
+    frames = chroma.frames
+    if not frames:
+        return []
+    fs = float(chroma.frame_seconds)
+    win = max(1, int(round(window_seconds / fs)))
+    hop = max(1, int(round(hop_seconds / fs)))
+    sums: list[tuple[list[float], list[float]]] = []
+    for s in range(0, max(1, len(frames) - win + 1), hop):
+        if deadline is not None:
+            deadline.check("hint_windows")
+        acc = [0.0] * 12
+        for frame in frames[s : s + win]:
+            for pc in range(12):
+                acc[pc] += frame[pc]
+        sums.append((acc, [s * fs, min(s + win, len(frames)) * fs]))
+    return sums
+
+
+def key_window_evidence_batch_v1(
+    chromas: Sequence[ChromaFrames],
+    *,
+    window_seconds: float = 8.0,
+    hop_seconds: float = 4.0,
+    min_correlation: float = 0.6,
+    min_relative_energy: float = 0.05,
+    deadline: DeadlineV1 | None = None,
+) -> list[KeyWindowEvidenceV1]:
+    """
+    Per-window key evidence for many tracks, scored in one `score_key_windows_v1` pass.
+
+    Windows follow the BPM hint windowing (window_seconds every hop_seconds; a
+    shorter track yields one window over everything). A window is dropped when
+    it is near-silent (energy below `min_relative_energy` of its track's
+    loudest window) or when no key profile correlates at least
+    `min_correlation` with its chroma, so unpitched material yields no key
+    evidence at all.
+    """
+    if window_seconds <= 0 or hop_seconds <= 0:
+        raise ValueError("window_seconds/hop_seconds must be > 0")
+
+    rows: list[list[float]] = []
+    row_spans: list[list[float]] = []
+    tracks: list[tuple[int, int]] = []
+    for chroma in chromas:
+        sums = _window_sums_v1(
+            chroma, window_seconds=window_seconds, hop_seconds=hop_seconds, deadline=deadline
+        )
+        loudest = max((sum(acc) for acc, _span in sums), default=0.0)
+        start = len(rows)
+        if loudest > 0.0:
+            for acc, span in sums:
+                if sum(acc) >= min_relative_energy * loudest:
+                    rows.append(acc)
+                    row_spans.append(span)
+        tracks.append((start, len(rows)))
+
+    scored = score_key_windows_v1(rows)
+    out: list[KeyWindowEvidenceV1] = []
+    for lo, hi in tracks:
+        ev = KeyWindowEvidenceV1()
+        for scores, span in zip(scored[lo:hi], row_spans[lo:hi], strict=True):
+            if scores is None:
+                continue
+            slot = max(range(len(scores)), key=scores.__getitem__)
+            if scores[slot] >= float(min_correlation):
+                ev.hints.append(key_slot_label_v1(slot))
+                ev.scores.append(scores)
+                ev.spans.append(span)
+        out.append(ev)
+    return out
+
+
+@dataclass(frozen=True)
+class KeyTagCheckV1:
+    """
+    A tagged key checked against chroma windows with its own profile row only.
+
+    - status: "confirmed" when enough windows correlate with the tagged row,
+      "refuted" when pitched windows exist but too few do, "unknown" when
+      there are no pitched windows to check.
+    - slots / spans: the tagged key slot each supporting window matched (the
+      tonic's better mode row when the tag names no mode) and its
+      [start_s, end_s].
+    - windows: windows correlated (the non-silent, non-flat ones).
+    """
+
+    status: str
+    slots: list[int] = field(default_factory=list)
+    spans: list[list[float]] = field(default_factory=list)
+    windows: int = 0
+
+
+def key_tag_check_v1(
+    chroma: ChromaFrames,
+    *,
+    tonic: str,
+    mode: str | None,
+    config: EngineConfig,
+    deadline: DeadlineV1 | None = None,
+) -> KeyTagCheckV1:
+    """
+    Check a tagged key (tonic in sharps, e.g. "F#"; mode None for either)
+    against the chroma windows without the 24-key search.
+
+    Windows and the silence cut follow `key_window_evidence_v1`. Each window is
+    correlated with the tagged row(s) of `key_profile_matrix_v1()` only; it
+    supports the tag at `key_chroma_min_correlation` or better, and the tag is
+    confirmed when at least the key policy's medium stability
+    (`key_emit_stability_min_medium`) of the windows support it.
+    """
+    t = config.tunables
+    min_correlation = float(getattr(t, "key_chroma_min_correlation", 0.6))
+    min_relative_energy = float(getattr(t, "key_chroma_min_relative_energy", 0.05))
+    min_support = float(
+        getattr(
+            t, "key_emit_stability_min_medium", getattr(t, "key_mode_stability_min_medium", 0.60)
+        )
+    )
+    tonic_index = _PITCH_NAMES_V1.index(tonic)
+    modes = range(len(_MODES_V1)) if mode is None else (_MODES_V1.index(mode),)
+    profiles = key_profile_matrix_v1()
+    rows = [(tonic_index * 2 + m, profiles[tonic_index * 2 + m]) for m in modes]
+
+    sums = _window_sums_v1(
+        chroma,
+        window_seconds=float(getattr(t, "key_chroma_window_seconds", 8.0)),
+        hop_seconds=float(getattr(t, "key_chroma_hop_seconds", 4.0)),
+        deadline=deadline,
+    )
+    loudest = max((sum(acc) for acc, _span in sums), default=0.0)
+    slots: list[int] = []
+    spans: list[list[float]] = []
+    windows = 0
+    for acc, span in sums:
+        if loudest <= 0.0 or sum(acc) < min_relative_energy * loudest:
+            continue
+        z = _zscore_v1(acc)
+        if z is None:
+            continue
+        windows += 1
+        best_r, best_slot = -math.inf, rows[0][0]
+        for slot, profile in rows:
+            r = sum(map(float.__mul__, z, profile))
+            if r > best_r:
+                best_r, best_slot = r, slot
+        if best_r >= min_correlation:
+            slots.append(best_slot)
+            spans.append(span)
+    if not windows:
+        return KeyTagCheckV1(status="unknown")
+    confirmed = len(slots) >= min_support * windows
+    return KeyTagCheckV1(
+        status="confirmed" if confirmed else "refuted", slots=slots, spans=spans, windows=windows
+    )
+
+
+def key_hint_windows_from_chroma_v1(
+    chroma: ChromaFrames,
+    *,
+    window_seconds: float = 8.0,
+    hop_seconds: float = 4.0,
+    min_correlation: float = 0.6,
+    min_relative_energy: float = 0.05,
+) -> list[str]:
+    """Per-window key labels only (see `key_window_evidence_batch_v1`)."""
+    return key_window_evidence_batch_v1(
+        [chroma],
+        window_seconds=window_seconds,
+        hop_seconds=hop_seconds,
+        min_correlation=min_correlation,
+        min_relative_energy=min_relative_energy,
+    )[0].hints
+
+
+def chroma_spec_v1(config: EngineConfig) -> ChromaSpecV1:
+    """Chroma backend and geometry from the `key_chroma_*` tunables."""
+    t = config.tunables
+    return ChromaSpecV1(
+        backend=getattr(t, "key_chroma_backend", "fft"),
+        decimate=int(getattr(t, "key_chroma_decimate", 8)),
+        n_fft=int(getattr(t, "key_chroma_n_fft", 2048)),
+        hop=int(getattr(t, "key_chroma_hop", 2048)),
+        fmin_hz=float(getattr(t, "key_chroma_fmin_hz", 110.0)),
+        fmax_hz=float(getattr(t, "key_chroma_fmax_hz", 2000.0)),
+        goertzel_decimate=int(getattr(t, "key_chroma_goertzel_decimate", 16)),
+        goertzel_octaves=int(getattr(t, "key_chroma_goertzel_octaves", 3)),
+        goertzel_cycles=float(getattr(t, "key_chroma_goertzel_cycles", 17.0)),
+    )
+
+
+def key_window_evidence_v1(
+    chromas: Sequence[ChromaFrames],
+    *,
+    config: EngineConfig,
+    deadline: DeadlineV1 | None = None,
+) -> list[KeyWindowEvidenceV1]:
+    """`key_window_evidence_batch_v1` with the `key_chroma_*` tunables."""
+    t = config.tunables
+    return key_window_evidence_batch_v1(
+        chromas,
+        window_seconds=float(getattr(t, "key_chroma_window_seconds", 8.0)),
+        hop_seconds=float(getattr(t, "key_chroma_hop_seconds", 4.0)),
+        min_correlation=float(getattr(t, "key_chroma_min_correlation", 0.6)),
+        min_relative_energy=float(getattr(t, "key_chroma_min_relative_energy", 0.05)),
+        deadline=deadline,
+    )
+
+
+def compute_key_window_evidence_from_signals_v1(
+    signals: DerivedSignals, *, config: EngineConfig, deadline: DeadlineV1 | None = None
+) -> KeyWindowEvidenceV1:
+    """Key window evidence from memoized `DerivedSignals` (caller-decoded PCM)."""
+    chroma = signals.chroma(chroma_spec_v1(config))
+    return key_window_evidence_v1([chroma], config=config, deadline=deadline)[0]
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterator
+from typing import Any, TypeVar
+
+from engine.ingest.pcm_v1 import SharedPcm
+from engine.preprocess.bpm_hint_windows_v1 import _lowpass_alpha_v1, _onset_from_env_v1
+from engine.preprocess.chroma_v1 import ChromaAccumulatorV1, ChromaFrames, ChromaSpecV1
+from engine.preprocess.stft_v1 import SpectrogramSpecV1, StftStreamV1, frame_count_v1
+
+T = TypeVar("T")
+
+# Default cap on spectrogram frames cached per analysis (all geometries together);
+# ingest passes the `spectrogram_cache_bytes` tunable instead.
+DEFAULT_SPECTROGRAM_CACHE_BYTES_V1 = 64 * 1024 * 1024
+
+
+class SpectrogramV1:
+    """
+    Magnitude frames of one geometry over one track (see `DerivedSignals.spectrogram`).
+
+    Iterating yields float32 frames of `spec.bins` bins in time order. A cached
+    spectrogram computes its frames on first iteration and keeps them; a
+    streamed one (over the memory cap) re-reads the PCM and recomputes the FFTs
+    on every iteration.
+    """
+
+    def __init__(
+        self,
+        spec: SpectrogramSpecV1,
+        *,
+        frame_seconds: float,
+        frame_count: int,
+        stream: Callable[[], Iterator[array]],
+        cached: bool,
+    ):
+        self.spec = spec
+        self.frame_seconds = float(frame_seconds)
+        self.cached = bool(cached)
+        self._frame_count = int(frame_count)
+        self._stream = stream
+        self._frames: list[array] | None = None
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the frames when held in memory."""
+        return self._frame_count * self.spec.bins * 4
+
+    def __len__(self) -> int:
+        return self._frame_count
+
+    def __iter__(self) -> Iterator[array]:
+        if not self.cached:
+            return self._stream()
+        if self._frames is None:
+            self._frames = list(self._stream())
+        return iter(self._frames)
+
+
+class DerivedSignals:
+    """
+    Lazily derived, memoized views of one decoded track.
+
+    Every accessor computes its representation on first use and caches it under
+    its parameters for the rest of the analysis, so features only pay for what
+    they read and two features asking for the same view share one computation.
+
+    Spectrograms share one memory cap (`spectrogram_cache_bytes`): geometries
+    that fit are computed once and cached; the rest are streamed. Today the
+    only production reader is FFT chroma on caller-decoded PCM (`chroma()`);
+    the decode fan-out computes its chroma in the single streaming pass and
+    never builds a spectrogram.
+
+    Pickling ships only the PCM handle (the cache stays in the owning process).
+    """
+
+    def __init__(
+        self, pcm: SharedPcm, *, spectrogram_cache_bytes: int = DEFAULT_SPECTROGRAM_CACHE_BYTES_V1
+    ):
+        self._pcm = pcm
+        self._memo: dict[tuple[Any, ...], Any] = {}
+        self._spectrogram_cache_bytes = int(spectrogram_cache_bytes)
+        self._spectrogram_bytes = 0
+        self._hits = 0
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_restore_signals_v1, (self._pcm, self._spectrogram_cache_bytes))
+
+    @property
+    def spectrogram_bytes(self) -> int:
+        """Bytes of the spectrogram cache budget reserved so far."""
+        return self._spectrogram_bytes
+
+    @property
+    def cache_hits(self) -> int:
+        """Accessor calls served from the memo so far."""
+        return self._hits
+
+    @property
+    def pcm(self) -> SharedPcm:
+        return self._pcm
+
+    @property
+    def sample_rate_hz(self) -> int:
+        return int(self._pcm.sample_rate_hz)
+
+    def computed(self) -> list[tuple[Any, ...]]:
+        """Keys of the representations materialized so far (for diagnostics/tests)."""
+        return sorted(self._memo, key=repr)
+
+    def _memoize(self, key: tuple[Any, ...], fn: Callable[[], T]) -> T:
+        if key in self._memo:
+            self._hits += 1
+            return self._memo[key]
+        value = fn()
+        self._memo[key] = value
+        return value
+
+    # --- time-domain views -------------------------------------------------
+
+    def mono(self) -> array:
+        """Mono downmix (float32); stereo uses the same integer mean as the hint stage."""
+        return self._memoize(("mono",), self._compute_mono)
+
+    def _compute_mono(self) -> array:
+        view = self._pcm.samples()
+        channels = self._pcm.channels
+        if channels == 1:
+            out = array("f", view)
+        elif channels == 2:
+            left = view[0::2]
+            right = view[1::2]
+            out = array("f", [(a + b) // 2 for a, b in zip(left, right, strict=True)])
+        else:
+            out = array(
+                "f",
+                [sum(view[i : i + channels]) // channels for i in range(0, len(view), channels)],
+            )
+        del view
+        return out
+
+    def lowpass(self, cutoff_hz: float) -> array:
+        """One-pole low-pass of the mono downmix (float32)."""
+        return self._memoize(("lowpass", float(cutoff_hz)), lambda: self._one_pole(cutoff_hz))
+
+    def highpass(self, cutoff_hz: float) -> array:
+        """Complement of `lowpass(cutoff_hz)`: x - lp(x) (float32)."""
+
+        def compute() -> array:
+            x = self.mono()
+            lp = self.lowpass(cutoff_hz)
+            return array("f", [a - b for a, b in zip(x, lp, strict=True)])
+
+        return self._memoize(("highpass", float(cutoff_hz)), compute)
+
+    def bandpass(self, low_hz: float, high_hz: float) -> array:
+        """Band between two one-pole corners: lp(high_hz) - lp(low_hz) (float32)."""
+        if low_hz >= high_hz:
+            raise ValueError("low_hz must be < high_hz")
+
+        def compute() -> array:
+            hi = self.lowpass(high_hz)
+            lo = self.lowpass(low_hz)
+            return array("f", [a - b for a, b in zip(hi, lo, strict=True)])
+
+        return self._memoize(("bandpass", float(low_hz), float(high_hz)), compute)
+
+    def _one_pole(self, cutoff_hz: float) -> array:
+        alpha = _lowpass_alpha_v1(sample_rate_hz=self.sample_rate_hz, cutoff_hz=float(cutoff_hz))
+        y = 0.0
+        out = array("f", bytes(4 * len(self.mono())))
+        for i, v in enumerate(self.mono()):
+            y += alpha * (v - y)
+            out[i] = y
+        return out
+
+    def decimated(self, factor: int) -> array:
+        """
+        Mono downmix decimated by an integer factor (float32).
+
+        Each output sample is the mean of `factor` inputs (boxcar anti-aliasing);
+        the resulting rate is `sample_rate_hz / factor`.
+        """
+        f = int(factor)
+        if f <= 0:
+            raise ValueError("factor must be > 0")
+        if f == 1:
+            return self.mono()
+
+        def compute() -> array:
+            x = self.mono()
+            inv = 1.0 / float(f)
+            return array("f", [sum(x[i : i + f]) * inv for i in range(0, len(x) - f + 1, f)])
+
+        return self._memoize(("decimated", f), compute)
+
+    # --- envelopes ---------------------------------------------------------
+
+    def energy_envelope(
+        self,
+        *,
+        frame_seconds: float = 0.01,
+        lowpass_cutoff_hz: float = 200.0,
+        highpass_cutoff_hz: float = 900.0,
+    ) -> tuple[list[float], list[float]]:
+        """
+        (low_band, high_band) mean-absolute energies per frame.
+
+        Numerically identical to the streaming WAV hint stage for the same parameters.
+        """
+        key = (
+            "energy_envelope",
+            float(frame_seconds),
+            float(lowpass_cutoff_hz),
+            float(highpass_cutoff_hz),
+        )
+
+        def compute() -> tuple[list[float], list[float]]:
+            sr = float(self.sample_rate_hz)
+            frame_size = max(1, int(round(sr * float(frame_seconds))))
+            alpha_low = _lowpass_alpha_v1(sample_rate_hz=sr, cutoff_hz=float(lowpass_cutoff_hz))
+            alpha_hp = _lowpass_alpha_v1(sample_rate_hz=sr, cutoff_hz=float(highpass_cutoff_hz))
+            y_low = 0.0
+            y_hp = 0.0
+            env_low: list[float] = []
+            env_high: list[float] = []
+            x = self.mono()
+            for start in range(0, len(x), frame_size):
+                e_low = 0.0
+                e_high = 0.0
+                block = x[start : start + frame_size]
+                for v in block:
+                    y_low += alpha_low * (v - y_low)
+                    y_hp += alpha_hp * (v - y_hp)
+                    e_low += abs(y_low)
+                    e_high += abs(v - y_hp)
+                n = float(len(block))
+                env_low.append(e_low / n)
+                env_high.append(e_high / n)
+            return env_low, env_high
+
+        return self._memoize(key, compute)
+
+    def onset_envelope(
+        self,
+        *,
+        frame_seconds: float = 0.01,
+        lowpass_cutoff_hz: float = 200.0,
+        highpass_cutoff_hz: float = 900.0,
+    ) -> tuple[list[float], list[float]]:
+        """(low_band, high_band) half-wave rectified energy differences per frame."""
+        key = (
+            "onset_envelope",
+            float(frame_seconds),
+            float(lowpass_cutoff_hz),
+            float(highpass_cutoff_hz),
+        )
+
+        def compute() -> tuple[list[float], list[float]]:
+            env_low, env_high = self.energy_envelope(
+                frame_seconds=frame_seconds,
+                lowpass_cutoff_hz=lowpass_cutoff_hz,
+                highpass_cutoff_hz=highpass_cutoff_hz,
+            )
+            return _onset_from_env_v1(env_low), _onset_from_env_v1(env_high)
+
+        return self._memoize(key, compute)
+
+    # --- spectral views ----------------------------------------------------
+
+    def spectrogram(self, spec: SpectrogramSpecV1, *, block_frames: int = 65536) -> SpectrogramV1:
+        """
+        Shared magnitude spectrogram for `spec` (the per-analysis STFT cache).
+
+        Frames come from `StftStreamV1` over the PCM in blocks (mono downmix,
+        boxcar-decimated by `spec.decimate`; frame i starts at i * hop decimated
+        samples, full frames only), so `mono()` is never materialized. When the
+        frames fit in the remaining cache budget they are computed once, on
+        first iteration, and shared by every consumer; otherwise the returned
+        view streams (each iteration pays for the FFTs again, in bounded memory).
+        """
+
+        def compute() -> SpectrogramV1:
+            channels = self._pcm.channels
+            rate = float(self.sample_rate_hz) / float(spec.decimate)
+            n = frame_count_v1(
+                samples=self._pcm.frames // int(spec.decimate), frame_len=spec.n_fft, hop=spec.hop
+            )
+            nbytes = n * spec.bins * 4
+            cached = self._spectrogram_bytes + nbytes <= self._spectrogram_cache_bytes
+            if cached:
+                self._spectrogram_bytes += nbytes
+
+            def stream() -> Iterator[array]:
+                stft = StftStreamV1(spec, channels=channels)
+                for block in self._pcm.iter_blocks(block_frames):
+                    yield from stft.feed(block)
+
+            return SpectrogramV1(
+                spec, frame_seconds=spec.hop / rate, frame_count=n, stream=stream, cached=cached
+            )
+
+        return self._memoize(("spectrogram", spec), compute)
+
+    def stft(self, *, n_fft: int, hop: int, decimate: int = 1) -> list[array]:
+        """
+        Hann-windowed magnitude frames (float32, n_fft // 2 + 1 bins each) as a list.
+
+        Materialized from the shared `spectrogram()` of the same geometry.
+        """
+        return list(self.spectrogram(SpectrogramSpecV1(n_fft=n_fft, hop=hop, decimate=decimate)))
+
+    def chroma(self, spec: ChromaSpecV1, *, block_frames: int = 65536) -> ChromaFrames:
+        """
+        12-bin chroma frames for `spec` (FFT or Goertzel backend).
+
+        Streamed from the PCM in blocks, so it does not materialize `mono()`.
+        The FFT backend folds the shared `spectrogram()` of its geometry.
+        """
+
+        def compute() -> ChromaFrames:
+            acc = spec.accumulator(sample_rate_hz=self.sample_rate_hz, channels=self._pcm.channels)
+            sgram = spec.spectrogram
+            if isinstance(acc, ChromaAccumulatorV1) and sgram is not None:
+                for mags in self.spectrogram(sgram, block_frames=block_frames):
+                    acc.feed_magnitudes(mags)
+                return acc.finish()
+            for block in self._pcm.iter_blocks(block_frames):
+                acc.feed(block)
+            return acc.finish()
+
+        return self._memoize(("chroma", spec), compute)
+
+
+def _restore_signals_v1(pcm: SharedPcm, spectrogram_cache_bytes: int) -> DerivedSignals:
+    return DerivedSignals(pcm, spectrogram_cache_bytes=spectrogram_cache_bytes)
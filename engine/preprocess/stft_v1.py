@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import cmath
+import math
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@lru_cache(maxsize=16)
+def hann_window_v1(n: int) -> array:
+    """Periodic Hann window of length n (float32, cached per size)."""
+    if n <= 0:
+        raise ValueError("window length must be > 0")
+    return array("f", [0.5 - 0.5 * math.cos(2.0 * math.pi * i / n) for i in range(n)])
+
+
+@lru_cache(maxsize=16)
+def _fft_plan_v1(n: int) -> tuple[tuple[int, ...], tuple[complex, ...]]:
+    """Bit-reversal permutation and twiddle factors for a radix-2 complex FFT."""
+    if n <= 0 or (n & (n - 1)) != 0:
+        raise ValueError("FFT size must be a power of two")
+    bits = n.bit_length() - 1
+    rev = tuple(int(f"{i:0{bits}b}"[::-1], 2) if bits else 0 for i in range(n))
+    tw = tuple(cmath.exp(-2j * math.pi * k / n) for k in range(n // 2))
+    return rev, tw
+
+
+def _fft_inplace_v1(z: list[complex]) -> None:
+    n = len(z)
+    rev, tw = _fft_plan_v1(n)
+    for i, j in enumerate(rev):
+        if i < j:
+            z[i], z[j] = z[j], z[i]
+    size = 2
+    while size <= n:
+        half = size // 2
+        step = n // size
+        for start in range(0, n, size):
+            k = 0
+            for i in range(start, start + half):
+                t = tw[k] * z[i + half]
+                u = z[i]
+                z[i] = u + t
+                z[i + half] = u - t
+                k += step
+        size *= 2
+
+
+def rfft_magnitudes_v1(frame: Sequence[float], *, n_fft: int) -> array:
+    """
+    Magnitude spectrum (n_fft // 2 + 1 bins, float32) of a real frame.
+
+    The frame is zero-padded or truncated to n_fft. Uses the standard trick of
+    packing even/odd samples into one half-size complex FFT.
+    """
+    if n_fft < 2 or (n_fft & (n_fft - 1)) != 0:
+        raise ValueError("n_fft must be a power of two >= 2")
+    half = n_fft // 2
+    x = list(frame[:n_fft])
+    if len(x) < n_fft:
+        x.extend([0.0] * (n_fft - len(x)))
+
+    z = [complex(x[2 * k], x[2 * k + 1]) for k in range(half)]
+    _fft_inplace_v1(z)
+
+    _, tw_full = _fft_plan_v1(n_fft)
+    mags = array("f", bytes(4 * (half + 1)))
+    z0 = z[0]
+    mags[0] = abs(z0.real + z0.imag)
+    mags[half] = abs(z0.real - z0.imag)
+    for k in range(1, half):
+        zk = z[k]
+        zc = z[half - k].conjugate()
+        even = (zk + zc) * 0.5
+        odd = (zk - zc) * -0.5j
+        mags[k] = abs(even + tw_full[k] * odd)
+    return mags
+
+
+class FrameStreamV1:
+    """
+    Streaming analysis front end: interleaved int16 blocks -> mono downmix,
+    boxcar-decimated by `decimate` -> frames of `frame_len` samples starting
+    every `hop` decimated samples.
+
+    Only full frames are produced, independent of how the input is blocked.
+    """
+
+    def __init__(self, *, channels: int, decimate: int, frame_len: int, hop: int):
+        if channels <= 0:
+            raise ValueError("channels must be > 0")
+        if decimate <= 0 or hop <= 0 or frame_len <= 0:
+            raise ValueError("decimate, frame_len and hop must be > 0")
+        self._step = int(channels) * int(decimate)
+        self._frame_len = int(frame_len)
+        self._hop = int(hop)
+        self._pending: list[int] = []
+        self._buf: list[float] = []
+
+    def feed(self, block: Sequence[int]) -> list[list[float]]:
+        """Consume one block (any length); returns the frames it completed."""
+        step = self._step
+        samples = self._pending + list(block) if self._pending else block
+        usable = len(samples) - len(samples) % step
+        inv = 1.0 / float(step)
+        self._buf.extend(sum(samples[i : i + step]) * inv for i in range(0, usable, step))
+        self._pending = list(samples[usable:])
+        frame_len = self._frame_len
+        out: list[list[float]] = []
+        while len(self._buf) >= max(frame_len, self._hop):
+            out.append(self._buf[:frame_len])
+            del self._buf[: self._hop]
+        return out
+
+
+def frame_count_v1(*, samples: int, frame_len: int, hop: int) -> int:
+    """Frames `FrameStreamV1` yields for `samples` decimated samples."""
+    span = max(int(frame_len), int(hop))
+    if samples < span:
+        return 0
+    return (int(samples) - span) // int(hop) + 1
+
+
+@dataclass(frozen=True)
+class SpectrogramSpecV1:
+    """Geometry of a magnitude spectrogram (hashable; cache key)."""
+
+    n_fft: int
+    hop: int
+    decimate: int = 1
+
+    @property
+    def bins(self) -> int:
+        return self.n_fft // 2 + 1
+
+
+class StftStreamV1:
+    """Streaming Hann-windowed magnitude frames over `FrameStreamV1`."""
+
+    def __init__(self, spec: SpectrogramSpecV1, *, channels: int):
+        self._n_fft = int(spec.n_fft)
+        self._window = hann_window_v1(self._n_fft)
+        self._framer = FrameStreamV1(
+            channels=channels, decimate=spec.decimate, frame_len=spec.n_fft, hop=spec.hop
+        )
+
+    def feed(self, block: Sequence[int]) -> list[array]:
+        """Consume one int16 block; returns the magnitude frames it completed."""
+        window = self._window
+        return [
+            rfft_magnitudes_v1([v * w for v, w in zip(seg, window, strict=True)], n_fft=self._n_fft)
+            for seg in self._framer.feed(block)
+        ]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import math
+import pickle
+import threading
+import wave
+from array import array
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from engine.core.errors import EngineError
+from engine.pipeline.batch_v1 import run_analysis_many_v1
+from engine.pipeline.run import run_analysis_v1
+
+SR = 44100
+
+
+def _write_clicks(path: Path, *, bpm: float, seconds: float = 8.0) -> None:
+    n = int(seconds * SR)
+    data = array("h", [0]) * n
+    for i in range(n):
+        data[i] = int(3000 * math.sin(2.0 * math.pi * 220.0 * i / SR))
+    t = 0.25
+    while t < seconds:
+        i0 = int(round(t * SR))
+        for j in range(min(int(0.005 * SR), n - i0)):
+            data[i0 + j] = 20000
+        t += 60.0 / bpm
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def test_engine_error_survives_pickling() -> None:
+    err = pickle.loads(
+        pickle.dumps(EngineError(code="TIMEOUT", message="slow", context={"stage": "ingest"}))
+    )
+    assert (err.code, err.message, err.context) == ("TIMEOUT", "slow", {"stage": "ingest"})
+
+
+def test_batch_output_is_ordered_and_independent_of_worker_count(tmp_path: Path) -> None:
+    inputs: list[str | Path] = []
+    for i, bpm in enumerate((100.0, 120.0, 128.0)):
+        wav = tmp_path / f"t{i}.wav"
+        _write_clicks(wav, bpm=bpm)
+        inputs.append(wav)
+    inputs.insert(1, str(tmp_path / "missing.wav"))
+    ids = [f"id-{i}" for i in range(len(inputs))]
+    stamp = "2026-01-01T00:00:00Z"
+
+    serial = run_analysis_many_v1(inputs, role="pro", workers=1, analysis_ids=ids, created_at=stamp)
+    pooled = run_analysis_many_v1(
+        inputs, role="pro", workers=2, analysis_ids=ids, created_at=stamp, chunksize=1
+    )
+
+    assert isinstance(serial[1], EngineError) and isinstance(pooled[1], EngineError)
+    assert pooled[1].code == serial[1].code == "INVALID_INPUT"
+    ok = [i for i in range(len(inputs)) if i != 1]
+    for i in ok:
+        assert json.dumps(serial[i], sort_keys=True) == json.dumps(pooled[i], sort_keys=True)
+        assert serial[i]["analysis_id"] == ids[i]  # type: ignore[index]
+    single = run_analysis_v1(
+        role="pro", input_path=str(inputs[0]), analysis_id=ids[0], created_at=stamp
+    )
+    assert json.dumps(single, sort_keys=True) == json.dumps(serial[0], sort_keys=True)
+
+
+def test_batch_rejects_bad_arguments(tmp_path: Path) -> None:
+    with pytest.raises(EngineError) as excinfo:
+        run_analysis_many_v1([tmp_path / "a.wav"], role="guest", workers=0)
+    assert excinfo.value.code == "INVALID_INPUT"
+    with pytest.raises(EngineError):
+        run_analysis_many_v1([tmp_path / "a.wav"], role="guest", analysis_ids=["a", "b"])
+    assert run_analysis_many_v1([], role="guest", workers=4) == []
+
+
+def test_concurrent_in_process_batches_keep_their_own_options(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav, bpm=120.0, seconds=4.0)
+    results: dict[str, list[dict[str, Any] | EngineError]] = {}
+    start = threading.Barrier(2)
+
+    def run(role: str) -> None:
+        start.wait()
+        results[role] = run_analysis_many_v1([wav] * 3, role=role, workers=1)  # type: ignore[arg-type]
+
+    threads = [threading.Thread(target=run, args=(r,)) for r in ("guest", "pro")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for role, outs in results.items():
+        assert [o["role"] for o in outs] == [role] * 3  # type: ignore[index]
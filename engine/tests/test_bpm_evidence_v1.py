@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from engine.core.config import EngineConfig
+from engine.features.bpm_evidence_v1 import aggregate_bpm_evidence_v1
+from engine.features.bpm_policy_v1 import compile_bpm_policy_v1
+from engine.features.bpm_v1 import extract_bpm_v1
+from engine.features.types import FeatureContext
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+
+def _ctx(details: list, **kwargs) -> FeatureContext:  # type: ignore[no-untyped-def]
+    pre = PreprocessedAudio(
+        internal_sample_rate_hz=44100, channels=2, duration_seconds=30.0, layout="stereo"
+    )
+    return FeatureContext(audio=pre, bpm_hint_window_details=details, **kwargs)
+
+
+def test_single_pass_builds_windows_band_histograms_and_ratio_counts() -> None:
+    policy = compile_bpm_policy_v1(EngineConfig())
+    details = [
+        {"best_bpm": 128.0, "best_score": 0.9, "high_best_bpm": 64.0, "high_best_score": 0.8},
+        {"best_bpm": 128.4, "best_score": 0.1, "high_best_bpm": 256.0, "double_ratio": 0.7},
+        {"best_bpm": 96.0, "best_score": 2.5, "high_double_ratio": 0.2},
+        "not-a-window",
+        {"best_bpm": float("nan"), "best_score": 0.5},
+        {"best_bpm": float("inf"), "high_best_bpm": float("-inf")},
+    ]
+    ev = aggregate_bpm_evidence_v1(_ctx(details), policy=policy)
+
+    # Scoring windows drop the 0.1-score low-band window and non-finite tempos;
+    # folding maps 256 -> 128.
+    assert ev.windows_folded == (128.0, 64.0, 128.0, 96.0)
+    assert ev.has_details
+
+    # Band weights keep every window (scores clamped to [0, 1]); NaN tempos are skipped.
+    assert ev.low.ranked == ((96, 1.0), (128, 1.0))
+    assert ev.low.mode() == (96, 0.5)
+    assert ev.high.ranked == ((128, 1.0), (64, 0.8))
+
+    assert (ev.double_ratio_n, ev.double_ratio_ambiguous_n) == (2, 1)
+
+
+def test_falls_back_to_plain_windows_then_exact_hint() -> None:
+    policy = compile_bpm_policy_v1(EngineConfig())
+    low_score = [{"best_bpm": 120.0, "best_score": 0.0}]
+
+    ev = aggregate_bpm_evidence_v1(_ctx(low_score, bpm_hint_windows=[240.0]), policy=policy)
+    assert ev.windows_folded == (120.0,)
+    # Zero total weight carries no band vote.
+    assert ev.low.mode() == (None, 0.0)
+
+    ev = aggregate_bpm_evidence_v1(_ctx([], bpm_hint_exact=45.0), policy=policy)
+    assert ev.windows_folded == (90.0, 90.0, 90.0)
+    assert not ev.has_details
+
+
+def test_extract_bpm_ignores_non_finite_window_tempos() -> None:
+    good = [{"best_bpm": 120.0, "best_score": 0.9, "high_best_bpm": 120.0} for _ in range(6)]
+    noisy = [*good, {"best_bpm": float("nan"), "best_score": 0.9, "high_best_bpm": float("inf")}]
+    clean = extract_bpm_v1(_ctx(good), config=EngineConfig())
+    out = extract_bpm_v1(_ctx(noisy), config=EngineConfig())
+    assert out is not None and clean is not None
+    assert out["value"] == clean["value"]
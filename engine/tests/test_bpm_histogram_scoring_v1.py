@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import random
+
+from engine.core.config import EngineConfig
+from engine.features import bpm_v1
+from engine.features.bpm_v1 import extract_bpm_v1
+from engine.features.types import FeatureContext
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+
+def test_histogram_queries_match_direct_window_scans() -> None:
+    rng = random.Random(3)
+    folded = [rng.uniform(60.0, 200.0) for _ in range(300)] + [40.0, 1e6]
+    hist = bpm_v1._bpm_histogram_v1(folded, lo=60, hi=200)
+    ints = [int(round(x)) for x in folded]
+    assert hist.n == len(ints)
+    assert sorted(hist.outliers) == [40, 1000000]
+
+    for c in (35, 59, 60, 61, 120, 133, 199, 200, 201, 400):
+        for tol in (0, 1, 2):
+            assert hist.count_within(c, tol) == sum(1 for w in ints if abs(c - w) <= tol)
+        assert hist.abs_distance_sum(c) == sum(abs(c - w) for w in ints)
+
+
+def test_many_small_hop_windows_score_like_a_few() -> None:
+    pre = PreprocessedAudio(
+        internal_sample_rate_hz=44100, channels=2, duration_seconds=600.0, layout="stereo"
+    )
+    few = [128.0, 128.0, 128.0, 85.3]
+    cfg = EngineConfig()
+    out_few = extract_bpm_v1(FeatureContext(audio=pre, bpm_hint_windows=few), config=cfg)
+    out_many = extract_bpm_v1(FeatureContext(audio=pre, bpm_hint_windows=few * 5000), config=cfg)
+    assert out_few is not None and "value" in out_few
+    assert out_many == out_few
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from engine.core.config import EngineConfig
+from engine.features import bpm_policy_v1 as bp
+from engine.features.bpm_policy_v1 import compile_bpm_policy_v1
+
+
+def test_compiled_policy_is_cached_per_config() -> None:
+    cfg = EngineConfig()
+    assert compile_bpm_policy_v1(cfg) is compile_bpm_policy_v1(EngineConfig())
+
+    tuned = EngineConfig(tunables=replace(cfg.tunables, bpm_gap_family_tolerance_bpm=3))
+    policy = compile_bpm_policy_v1(tuned)
+    assert policy is not compile_bpm_policy_v1(cfg)
+    assert policy.gap_tol == 3
+
+
+def test_relation_tables_match_reference_arithmetic() -> None:
+    policy = compile_bpm_policy_v1(EngineConfig())
+    # Inside the table domain plus a margin that exercises the direct fallback.
+    bpms = list(range(40, 260, 3)) + [60, 120, 190, 200]
+    for a in bpms:
+        for b in bpms:
+            assert policy.family_agrees(a, b) == bp._tempo_family_agrees(
+                a, b, tol_bpm=policy.gap_tol
+            )
+            assert policy.triplet_family_agrees(a, b) == bp._tempo_triplet_family_agrees(
+                a, b, tol_bpm=policy.gap_tol
+            )
+            assert policy.multiband_family_agrees(a, b) == bp._tempo_family_agrees(
+                a, b, tol_bpm=policy.multiband_family_tol
+            )
+            assert policy.candidate_family(a, b) == bp._candidate_family_v1(a, b, tol_bpm=1)
+            assert policy.relation_to_base(a, b) == bp._relation_to_base(a, b)
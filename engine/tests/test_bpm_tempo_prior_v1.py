@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import wave
+from array import array
+from pathlib import Path
+
+import pytest
+
+from engine.core.config import EngineConfig
+from engine.core.errors import EngineError
+from engine.ingest.ingest_v1 import decode_input_path_v1
+from engine.pipeline.run import run_analysis_v1
+from engine.preprocess import bpm_hint_windows_v1 as bpmh
+from engine.preprocess.bpm_hint_windows_v1 import (
+    TempoPrior,
+    compute_bpm_hint_window_details_from_wav_v1,
+)
+
+
+def _write_click_track_wav(path: Path, *, bpm: float, duration_s: float) -> None:
+    sr = 44100
+    n = int(round(duration_s * sr))
+    data = array("h", [0]) * n
+    period_s = 60.0 / float(bpm)
+    t = 0.0
+    while t < duration_s:
+        i0 = int(round(t * sr))
+        for j in range(int(0.005 * sr)):
+            if i0 + j >= n:
+                break
+            data[i0 + j] = 20000
+        t += period_s
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(data.tobytes())
+
+
+def _lag(bpm: float) -> int:
+    return int(round(100.0 * 60.0 / bpm))
+
+
+def test_prior_lag_ranges_cover_family_relatives_only() -> None:
+    ranges = bpmh._prior_lag_ranges_v1(
+        TempoPrior(bpm_min=160.0, bpm_max=180.0), env_sr_hz=100.0, bpm_min=60.0, bpm_max=200.0
+    )
+
+    def covered(lag: int) -> bool:
+        return any(lo <= lag <= hi for lo, hi in ranges)
+
+    for bpm in (170.0, 85.0, 113.0):  # prior, half, triplet (2/3)
+        assert covered(_lag(bpm))
+    for bpm in (100.0, 140.0, 62.0):
+        assert not covered(_lag(bpm))
+
+    full = _lag(60.0) - _lag(200.0) + 1
+    assert sum(hi - lo + 1 for lo, hi in ranges) < (2 * full) // 3
+
+
+def test_prior_outside_search_range_evaluates_nothing() -> None:
+    assert (
+        bpmh._detail_from_segment_v1(
+            [0.0, 1.0] * 400,
+            env_sr_hz=100.0,
+            bpm_min=60.0,
+            bpm_max=200.0,
+            lag_bias_exponent=0.0,
+            lag_ranges=[],
+        )
+        is None
+    )
+
+
+def test_prior_keeps_the_in_family_tempo(tmp_path: Path) -> None:
+    p = tmp_path / "click_124.wav"
+    _write_click_track_wav(p, bpm=124.0, duration_s=20.0)
+
+    free = compute_bpm_hint_window_details_from_wav_v1(p)
+    narrowed = compute_bpm_hint_window_details_from_wav_v1(
+        p, tempo_prior=TempoPrior(bpm_min=118.0, bpm_max=130.0)
+    )
+    assert [d["best_bpm"] for d in narrowed] == [d["best_bpm"] for d in free]
+
+
+def test_run_analysis_accepts_range_prior_for_input_path_and_pcm_audio(tmp_path: Path) -> None:
+    p = tmp_path / "click_140.wav"
+    _write_click_track_wav(p, bpm=140.0, duration_s=40.0)
+
+    out = run_analysis_v1(role="free", input_path=p, config=EngineConfig(), tempo_prior=(130, 150))
+    assert out["metrics"]["bpm"]["value"]["value_rounded"] in {139, 140, 141}
+
+    audio = decode_input_path_v1(p, keep_pcm=True)
+    assert audio.pcm is not None
+    with audio.pcm:
+        out_audio = run_analysis_v1(role="free", audio=audio, tempo_prior=140.0)
+    assert out_audio["metrics"]["bpm"]["value"]["value_rounded"] in {139, 140, 141}
+
+
+@pytest.mark.parametrize("prior", [(150, 130), (0, 120), "fast", (-5.0,)])
+def test_invalid_prior_raises_invalid_input(prior: object) -> None:
+    with pytest.raises(EngineError) as excinfo:
+        run_analysis_v1(
+            role="guest",
+            input_path="does-not-matter.wav",
+            tempo_prior=prior,  # type: ignore[arg-type]
+        )
+    assert excinfo.value.code == "INVALID_INPUT"
+    assert (excinfo.value.context or {}).get("stage") == "validate"
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import copy
+import json
+import math
+import pickle
+import wave
+from array import array
+from pathlib import Path
+
+import pytest
+
+from engine.core.errors import EngineError
+from engine.pipeline.core_result_v1 import package_for_role
+from engine.pipeline.run import run_analysis_core_v1, run_analysis_v1
+
+SR = 44100
+
+
+def _write_track(path: Path, *, segments: list[tuple[float, float]]) -> None:
+    """Clicks at each (bpm, seconds) segment's tempo over a quiet A minor triad."""
+    n = int(sum(d for _, d in segments) * SR)
+    data = array("h", [0]) * n
+    chord = (220.0, 261.63, 329.63)
+    for i in range(n):
+        data[i] = int(800 * sum(math.sin(2.0 * math.pi * f * i / SR) for f in chord))
+    t0 = 0.0
+    for bpm, dur in segments:
+        t = t0
+        while t < t0 + dur:
+            i0 = int(round(t * SR))
+            for j in range(min(int(0.005 * SR), n - i0)):
+                data[i0 + j] = 20000
+            t += 60.0 / bpm
+        t0 += dur
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def test_one_core_packages_identically_to_per_role_runs(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_track(wav, segments=[(120.0, 18.0), (130.0, 8.0)])
+    ident = {
+        "analysis_id": "00000000-0000-4000-8000-000000000001",
+        "created_at": "2026-01-01T00:00:00Z",
+    }
+
+    core = pickle.loads(pickle.dumps(run_analysis_core_v1(input_path=str(wav), **ident)))
+    assert "tempo_curve" in core.metrics["bpm"] and "key_mode" in core.metrics
+    before = copy.deepcopy(core)
+    for role in ("guest", "free", "pro"):
+        packaged = package_for_role(core, role, assert_contract=True)
+        direct = run_analysis_v1(role=role, input_path=str(wav), **ident)
+        assert json.dumps(packaged, sort_keys=True) == json.dumps(direct, sort_keys=True)
+        packaged["metrics"].clear()
+    assert core == before
+
+
+def test_single_role_core_serves_only_roles_it_computed_for(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_track(wav, segments=[(120.0, 6.0)])
+    with pytest.raises(EngineError) as excinfo:
+        run_analysis_v1(role="admin", input_path=str(wav))  # type: ignore[arg-type]
+    assert excinfo.value.code == "INVALID_INPUT"
+
+    core = run_analysis_core_v1(input_path=str(wav))
+    guest_core = type(core)(**{**core.__dict__, "roles": frozenset({"guest"})})
+    assert package_for_role(guest_core, "guest")["events"] == {}
+    with pytest.raises(EngineError) as excinfo:
+        package_for_role(guest_core, "pro")
+    assert excinfo.value.code == "INVALID_INPUT"
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import importlib
+import math
+import wave
+from array import array
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import engine.pipeline.run as run_mod
+from engine.core.deadline_v1 import CancellationTokenV1, DeadlineV1
+from engine.core.errors import EngineError
+from engine.ingest.ingest_v1 import decode_input_path_v1
+from engine.ingest.stream_v1 import stream_wav_v1
+from engine.pipeline.run import run_analysis_v1
+from engine.preprocess.bpm_hint_windows_v1 import (
+    OnsetEnvelope,
+    bpm_hint_details_from_onset_envelope_v1,
+)
+
+# `engine.ingest` re-exports a function named `ingest_v1`, which shadows the module attribute.
+ingest_v1 = importlib.import_module("engine.ingest.ingest_v1")
+
+SR = 44100
+
+
+def _write_clicks(path: Path, *, seconds: float = 8.0, bpm: float = 120.0) -> None:
+    n = int(seconds * SR)
+    data = array("h", [0]) * n
+    for i in range(n):
+        data[i] = int(2000 * math.sin(2.0 * math.pi * 220.0 * i / SR))
+    t = 0.25
+    while t < seconds:
+        i0 = int(round(t * SR))
+        for j in range(min(int(0.005 * SR), n - i0)):
+            data[i0 + j] = 20000
+        t += 60.0 / bpm
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def test_cancellation_stops_the_pcm_loop_at_the_next_block(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav, seconds=3.0)
+    token = CancellationTokenV1()
+
+    class CancelAfterFirst:
+        def __init__(self) -> None:
+            self.blocks = 0
+
+        def feed(self, block: array) -> None:
+            self.blocks += 1
+            token.cancel()
+
+        def finish(self) -> None:
+            return None
+
+    consumer = CancelAfterFirst()
+    with pytest.raises(EngineError) as excinfo:
+        stream_wav_v1(wav, {"c": consumer}, block_frames=4096, deadline=DeadlineV1(token=token))
+    assert consumer.blocks == 1
+    assert excinfo.value.code == "TIMEOUT"
+    assert excinfo.value.context == {"stage": "decode", "reason": "cancelled"}
+
+
+def test_expired_deadline_raises_timeout_from_decode_and_window_loops(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav)
+    spent = DeadlineV1(seconds=1e-9)
+    assert spent.expired() and spent.remaining() == 0.0
+
+    with pytest.raises(EngineError) as excinfo:
+        decode_input_path_v1(wav, keep_pcm=True, deadline=spent)
+    assert excinfo.value.code == "TIMEOUT"
+    assert excinfo.value.context is not None and excinfo.value.context["reason"] == "deadline"
+
+    envelope = OnsetEnvelope.from_bands([0.0] * 2000, [0.0] * 2000, frame_seconds=0.01)
+    with pytest.raises(EngineError) as excinfo:
+        bpm_hint_details_from_onset_envelope_v1(envelope, deadline=spent)
+    assert excinfo.value.context is not None and excinfo.value.context["stage"] == "hint_windows"
+
+    # Partial mode still decodes the track; the hint stages drop their evidence.
+    out = run_analysis_v1(role="pro", input_path=str(wav), deadline=spent, on_deadline="partial")
+    assert out["metrics"] == {}
+    assert out["track"]["duration_seconds"] == pytest.approx(8.0)
+    assert out["warnings"][0]["skipped_stages"][:2] == ["decode:envelope", "decode:chroma"]
+
+
+def test_partial_mode_deadline_during_decode_returns_track_and_reports_cut_stages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav)
+    token = CancellationTokenV1()
+
+    class CancelMidStream(ingest_v1.PeakLevelV1):  # type: ignore[misc]
+        blocks = 0
+
+        def feed(self, block: array) -> None:
+            CancelMidStream.blocks += 1
+            if CancelMidStream.blocks == 3:
+                token.cancel()
+            super().feed(block)
+
+    monkeypatch.setattr(ingest_v1, "PeakLevelV1", CancelMidStream)
+    audio = decode_input_path_v1(
+        wav,
+        keep_pcm=True,
+        deadline=DeadlineV1(token=token),
+        deadline_policy="partial",
+    )
+    assert audio.pcm is not None
+    with audio.pcm as pcm:
+        assert pcm.frames == 8 * SR  # the PCM copy ran to the end
+    assert audio.skipped_stages == ("decode:envelope", "decode:chroma")
+    assert audio.bpm_hint_windows is None and audio.key_mode_hint_windows is None
+    assert CancelMidStream.blocks > 3
+
+    token = CancellationTokenV1()
+    CancelMidStream.blocks = 0
+    out = run_analysis_v1(
+        role="pro",
+        input_path=str(wav),
+        cancel_token=token,
+        on_deadline="partial",
+        assert_contract=True,
+    )
+    assert out["metrics"] == {}
+    (warning,) = out["warnings"]
+    assert warning["skipped_stages"] == [
+        "decode:envelope",
+        "decode:chroma",
+        "feature:bpm",
+        "feature:grid",
+        "feature:key_mode",
+        "feature:tonal_drift",
+    ]
+
+
+def test_partial_mode_drops_a_post_pass_search_cut_by_the_deadline(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav)
+    token = CancellationTokenV1()
+    real = ingest_v1.bpm_hint_evidence_from_energy_v1
+
+    def cancel_then_search(*args: Any, **kwargs: Any) -> Any:
+        token.cancel()
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(ingest_v1, "bpm_hint_evidence_from_energy_v1", cancel_then_search)
+    audio = decode_input_path_v1(wav, deadline=DeadlineV1(token=token), deadline_policy="partial")
+    assert audio.skipped_stages == ("hint_windows:tempogram", "hint_windows:key_windows")
+    with pytest.raises(EngineError) as excinfo:
+        decode_input_path_v1(wav, deadline=DeadlineV1(token=token))
+    assert excinfo.value.code == "TIMEOUT"
+
+
+def _cancel_after_preprocess(monkeypatch: pytest.MonkeyPatch, token: CancellationTokenV1) -> None:
+    real = run_mod.preprocess_v1
+
+    def preprocess_then_cancel(*args: Any, **kwargs: Any) -> Any:
+        out = real(*args, **kwargs)
+        token.cancel()
+        return out
+
+    monkeypatch.setattr(run_mod, "preprocess_v1", preprocess_then_cancel)
+
+
+def test_partial_mode_omits_remaining_features_with_a_warning(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav)
+    assert "bpm" in run_analysis_v1(role="pro", input_path=str(wav))["metrics"]
+
+    token = CancellationTokenV1()
+    _cancel_after_preprocess(monkeypatch, token)
+    out = run_analysis_v1(
+        role="pro",
+        input_path=str(wav),
+        cancel_token=token,
+        on_deadline="partial",
+        assert_contract=True,
+    )
+    assert out["metrics"] == {}
+    assert out["track"]["duration_seconds"] == pytest.approx(8.0)
+    (warning,) = out["warnings"]
+    assert warning["code"] == "deadline_exceeded"
+    assert warning["skipped_stages"] == [
+        "feature:bpm",
+        "feature:grid",
+        "feature:key_mode",
+        "feature:tonal_drift",
+    ]
+
+
+def test_raise_mode_stops_between_stages_with_timeout(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav)
+    token = CancellationTokenV1()
+    _cancel_after_preprocess(monkeypatch, token)
+    with pytest.raises(EngineError) as excinfo:
+        run_analysis_v1(role="free", input_path=str(wav), deadline=DeadlineV1(token=token))
+    assert excinfo.value.code == "TIMEOUT"
+    assert excinfo.value.context == {"stage": "feature:bpm", "reason": "cancelled"}
+
+    for bad in ({"deadline": -1.0}, {"on_deadline": "later"}):
+        with pytest.raises(EngineError) as excinfo:
+            run_analysis_v1(role="free", input_path=str(wav), **bad)  # type: ignore[arg-type]
+        assert excinfo.value.code == "INVALID_INPUT"
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import wave
+from array import array
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from engine.core.config import EngineConfig
+from engine.core.errors import EngineError
+from engine.core.output import TrackInfo
+from engine.features.types import FeatureContext
+from engine.ingest.tags_v1 import EmbeddedTags
+from engine.pipeline.evidence_snapshot_v1 import (
+    EvidenceSnapshotV1,
+    capture_evidence_snapshot_v1,
+    read_evidence_snapshot_v1,
+    write_evidence_snapshot_v1,
+)
+from engine.pipeline.run import run_analysis_v1
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+AID = "00000000-0000-4000-8000-000000000037"
+
+
+def _write_clicks(path: Path, *, bpm: float, seconds: float) -> None:
+    sr = 44100
+    n = int(seconds * sr)
+    data = array("h", [0]) * n
+    t = 0.25
+    while t < seconds:
+        i0 = int(round(t * sr))
+        for j in range(int(0.005 * sr)):
+            if i0 + j < n:
+                data[i0 + j] = 20000
+        t += 60.0 / bpm
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(data.tobytes())
+
+
+def _without_created_at(out: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in out.items() if k != "created_at"}
+
+
+@pytest.mark.parametrize("role", ["guest", "free", "pro"])
+def test_replay_from_file_matches_live_run_without_audio(tmp_path: Path, role: str) -> None:
+    wav = tmp_path / "clicks.wav"
+    _write_clicks(wav, bpm=124.0, seconds=16.0)
+
+    captured: list[EvidenceSnapshotV1] = []
+    live = run_analysis_v1(
+        role=role, input_path=wav, analysis_id=AID, evidence_sink=captured.append
+    )
+    assert len(captured) == 1
+    assert captured[0].context.signals is None
+
+    snap_path = tmp_path / "clicks.evidence.json.gz"
+    write_evidence_snapshot_v1(captured[0], snap_path)
+    wav.unlink()
+
+    snap = read_evidence_snapshot_v1(snap_path)
+    assert snap == captured[0]
+    replayed = run_analysis_v1(
+        role=role, evidence_snapshot=snap, analysis_id=AID, assert_contract=True
+    )
+    assert _without_created_at(replayed) == _without_created_at(live)
+    # Positional style accepts a snapshot too.
+    assert _without_created_at(run_analysis_v1(snap, role, analysis_id=AID)) == (
+        _without_created_at(live)
+    )
+
+
+def test_replay_applies_policy_changes_and_replays_tag_checks() -> None:
+    pre = PreprocessedAudio(
+        internal_sample_rate_hz=44100, channels=2, duration_seconds=30.0, layout="stereo"
+    )
+    ctx = FeatureContext(
+        audio=pre,
+        bpm_hint_windows=[120.0] * 8,
+        key_mode_hint_windows=["A minor"] * 8,
+    )
+    track = TrackInfo(duration_seconds=30.0, format="wav", sample_rate_hz=44100, channels=2)
+    snap = EvidenceSnapshotV1.loads(
+        capture_evidence_snapshot_v1(ctx, track=track, tags=EmbeddedTags(bpm=120.0)).dumps()
+    )
+
+    out = run_analysis_v1(role="pro", evidence_snapshot=snap)
+    assert out["track"]["duration_seconds"] == 30.0
+    assert out["metrics"]["bpm"]["value"]["value_rounded"] == 120
+    assert out["metrics"]["bpm"]["evidence"]["tag_verification"]["status"] == "confirmed"
+
+    strict = EngineConfig(
+        tunables=replace(EngineConfig().tunables, bpm_normalize_min=130, bpm_normalize_max=260)
+    )
+    folded = run_analysis_v1(role="pro", evidence_snapshot=snap, config=strict)
+    assert folded["metrics"]["bpm"]["value"]["value_rounded"] == 240
+
+
+def test_rejects_foreign_or_newer_snapshots_and_extra_sources(tmp_path: Path) -> None:
+    pre = PreprocessedAudio(
+        internal_sample_rate_hz=44100, channels=1, duration_seconds=5.0, layout="mono"
+    )
+    track = TrackInfo(duration_seconds=5.0, format="wav", sample_rate_hz=44100, channels=1)
+    snap = capture_evidence_snapshot_v1(FeatureContext(audio=pre), track=track)
+
+    newer = snap.to_dict() | {"version": 2}
+    for bad in (json.dumps(newer), "{}", "not json", json.dumps(snap.to_dict() | {"audio": {}})):
+        with pytest.raises(EngineError) as ei:
+            EvidenceSnapshotV1.loads(bad)
+        assert ei.value.code == "INVALID_INPUT"
+
+    with pytest.raises(EngineError) as ei:
+        run_analysis_v1(role="free", evidence_snapshot=snap, track=track)
+    assert ei.value.code == "INVALID_INPUT"
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from engine.core.config import EngineConfig
+from engine.core.errors import EngineError
+from engine.features.bpm_v1 import extract_bpm_v1
+from engine.features.key_mode_v1 import extract_key_mode_v1
+from engine.features.types import FeatureContext
+from engine.observability import hooks
+from engine.pipeline.evidence_store_v1 import (
+    EvidenceStoreV1,
+    replay_evidence_store_v1,
+    write_evidence_store_v1,
+)
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+
+def _library(n: int) -> list[FeatureContext]:
+    rng = random.Random(38)
+    out: list[FeatureContext] = []
+    for i in range(n):
+        base = rng.uniform(55.0, 205.0)
+        details: list[Any] = []
+        for _ in range(rng.randint(0, 16)):
+            d: dict[str, Any] = {"best_bpm": base * rng.choice([1.0, 1.0, 0.5, 2.0, 1.5])}
+            if rng.random() < 0.8:
+                d["best_score"] = rng.choice([None, rng.uniform(-0.2, 1.2)])
+            if rng.random() < 0.5:
+                d["double_ratio"] = rng.uniform(0.0, 1.0)
+            if rng.random() < 0.6:
+                d["high_best_bpm"] = base * rng.choice([1.0, 0.5]) + rng.gauss(0.0, 0.5)
+                d["high_best_score"] = rng.uniform(0.0, 1.0)
+                d["high_double_ratio"] = rng.choice([None, rng.uniform(0.0, 1.0)])
+            details.append(d)
+        if i % 13 == 0:
+            details.append("not-a-window")
+        pre = PreprocessedAudio(
+            internal_sample_rate_hz=44100,
+            channels=2,
+            duration_seconds=rng.uniform(2.0, 240.0),
+            layout="stereo",
+        )
+        out.append(
+            FeatureContext(
+                audio=pre,
+                has_rhythm_evidence=(i % 17 != 0),
+                has_tonal_evidence=(i % 19 != 0),
+                bpm_hint_exact=rng.choice([None, base]),
+                bpm_hint_window_details=details or None,
+                key_mode_hint_windows=[
+                    f"{rng.choice(['C', 'Eb', 'F#', 'A', '?'])} {rng.choice(['minor', 'major'])}"
+                    for _ in range(rng.randint(0, 10))
+                ]
+                or None,
+                key_mode_hint=rng.choice([None, "D minor"]),
+                key_mode_window_scores=[
+                    [rng.uniform(-0.6, 0.95) for _ in range(24)] for _ in range(rng.randint(0, 8))
+                ]
+                if i % 3 == 0
+                else None,
+            )
+        )
+    return out
+
+
+def _record_events(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict[str, Any]]]:
+    events: list[tuple[str, dict[str, Any]]] = []
+    monkeypatch.setattr(hooks, "emit", lambda event, **payload: events.append((event, payload)))
+    return events
+
+
+def test_store_replay_matches_scalar_policies(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cfg = EngineConfig()
+    ctxs = _library(300)
+    path = tmp_path / "library.evs"
+    assert write_evidence_store_v1(path, ((f"trk-{i}", c) for i, c in enumerate(ctxs))) == 300
+
+    events = _record_events(monkeypatch)
+    bpm = [extract_bpm_v1(c, config=cfg) for c in ctxs]
+    key = [extract_key_mode_v1(c, config=cfg) for c in ctxs]
+    scalar_events = sorted(events, key=lambda e: e[1]["feature"])
+    events.clear()
+    with EvidenceStoreV1(path) as store:
+        assert len(store) == 300
+        rows = list(replay_evidence_store_v1(store, config=cfg))
+        replay_events = sorted(events, key=lambda e: e[1]["feature"])
+        window = list(replay_evidence_store_v1(store, config=cfg, start=290, stop=400))
+
+    assert [r[0] for r in rows] == [f"trk-{i}" for i in range(300)]
+    assert [r[1] for r in rows] == bpm
+    assert [r[2] for r in rows] == key
+    assert replay_events == scalar_events
+    assert window == rows[290:]
+    assert any(b is not None and "value" in b for b in bpm)
+
+
+def test_store_replay_matches_dict_path_on_nan_and_non_numeric_values(tmp_path: Path) -> None:
+    cfg = EngineConfig()
+    nan, inf = float("nan"), float("inf")
+    odd_rows: list[list[dict[str, Any]]] = [
+        [{"best_bpm": 120.0, "best_score": nan}, {"best_bpm": 121.0, "best_score": "abc"}],
+        [{"best_bpm": nan, "best_score": 0.9}, {"best_bpm": "abc", "double_ratio": 0.9}],
+        [{"best_bpm": inf, "best_score": 0.9}, {"best_bpm": 128.0, "best_score": inf}],
+        [{"best_bpm": 128.0, "double_ratio": nan}, {"best_bpm": 128.0, "double_ratio": "x"}],
+        [{"best_bpm": 90.0, "high_best_bpm": 180.0, "high_best_score": nan}] * 3,
+        [{"best_bpm": "95", "best_score": "0.8", "double_ratio": "0.7"}] * 4,
+    ]
+    ctxs = [
+        FeatureContext(
+            audio=PreprocessedAudio(
+                internal_sample_rate_hz=44100, channels=1, duration_seconds=30.0, layout="mono"
+            ),
+            has_rhythm_evidence=True,
+            has_tonal_evidence=False,
+            bpm_hint_window_details=rows,
+        )
+        for rows in odd_rows
+    ]
+    path = tmp_path / "odd.evs"
+    write_evidence_store_v1(path, ((f"odd-{i}", c) for i, c in enumerate(ctxs)))
+
+    expected = [extract_bpm_v1(c, config=cfg) for c in ctxs]
+    with EvidenceStoreV1(path) as store:
+        assert [r[1] for r in replay_evidence_store_v1(store, config=cfg)] == expected
+    assert any(b is not None and "value" in b for b in expected)
+
+
+def test_rejects_foreign_files_and_versions(tmp_path: Path) -> None:
+    path = tmp_path / "library.evs"
+    write_evidence_store_v1(path, [])
+    with EvidenceStoreV1(path) as store:
+        assert len(store) == 0
+
+    bad_version = tmp_path / "v9.evs"
+    bad_version.write_bytes(path.read_bytes().replace(b'"version":2', b'"version":9'))
+    junk = tmp_path / "junk.evs"
+    junk.write_bytes(b"x" * 64)
+    empty = tmp_path / "empty.evs"
+    empty.write_bytes(b"")
+    for bad in (bad_version, junk, empty):
+        with pytest.raises(EngineError) as ei:
+            EvidenceStoreV1(bad)
+        assert ei.value.code == "INVALID_INPUT"
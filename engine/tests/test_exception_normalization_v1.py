@@ -55,7 +55,7 @@ def test_packaging_failure_wrapped_as_internal_error(monkeypatch):
     def boom(*args: Any, **kwargs: Any) -> Any:
         raise RuntimeError("packaging exploded")
 
-    monkeypatch.setattr(run_mod, "package_output_v1", boom)
+    monkeypatch.setattr(run_mod, "package_for_role", boom)
 
     with pytest.raises(EngineError) as excinfo:
         run_analysis_v1(
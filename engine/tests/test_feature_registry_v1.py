@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import importlib
+import math
+import wave
+from array import array
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import engine.pipeline.run as run_mod
+from engine.core.errors import EngineError
+from engine.features.registry_v1 import FEATURES_V1, PRODUCERS_V1, plan_features_v1
+from engine.pipeline.run import run_analysis_v1
+
+# `engine.ingest` re-exports a function named `ingest_v1`, which shadows the module attribute.
+ingest_v1 = importlib.import_module("engine.ingest.ingest_v1")
+
+SR = 44100
+AID = "00000000-0000-4000-8000-000000000001"
+CREATED = "2026-01-01T00:00:00Z"
+
+
+def _write_clicks_over_triad(path: Path, *, bpm: float = 120.0, seconds: float = 8.0) -> None:
+    n = int(seconds * SR)
+    data = array("h", [0]) * n
+    for i in range(n):
+        t = i / SR
+        data[i] = int(800 * sum(math.sin(2.0 * math.pi * f * t) for f in (220.0, 261.63, 329.63)))
+    t = 0.25
+    while t < seconds:
+        i0 = int(round(t * SR))
+        for j in range(min(int(0.005 * SR), n - i0)):
+            data[i0 + j] = 20000
+        t += 60.0 / bpm
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def _count(monkeypatch: pytest.MonkeyPatch, module: Any, name: str) -> list[int]:
+    calls: list[int] = []
+    real = getattr(module, name)
+
+    def counting(*args: Any, **kwargs: Any) -> Any:
+        calls.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, counting)
+    return calls
+
+
+def test_registry_declarations_resolve_and_plans_close_over_dependencies() -> None:
+    for producer in PRODUCERS_V1.values():
+        assert set(producer.requires) <= set(PRODUCERS_V1)
+    for feature in FEATURES_V1.values():
+        assert set(feature.producers) <= set(PRODUCERS_V1)
+        assert set(feature.after) <= set(FEATURES_V1)
+
+    full = plan_features_v1()
+    assert full.features == set(FEATURES_V1) and full.producers == set(PRODUCERS_V1)
+
+    grid = plan_features_v1(["grid"])
+    assert grid.features == {"grid", "bpm"}
+    assert grid.producers == {"envelope", "tempogram"}
+    assert not grid.needs("chroma")
+
+    key = plan_features_v1(("key_mode",))
+    assert key.runs("key_mode") and not key.runs("bpm")
+    assert key.producers == {"chroma", "key_windows"}
+    assert plan_features_v1([]).producers == frozenset()
+    assert full.order == ("bpm", "tempo_curve", "grid", "key_mode", "tonal_drift")
+    assert plan_features_v1(["grid", "tempo_curve"]).order == ("bpm", "tempo_curve", "grid")
+
+    for bad in ("bpm", ["bpm", "loudness"]):
+        with pytest.raises(EngineError) as excinfo:
+            plan_features_v1(bad)
+        assert excinfo.value.code == "INVALID_INPUT"
+    assert excinfo.value.context is not None and excinfo.value.context["features"] == ["loudness"]
+
+
+def test_bpm_only_analysis_never_computes_key_evidence(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks_over_triad(wav)
+    full = run_analysis_v1(role="pro", input_path=str(wav), analysis_id=AID, created_at=CREATED)
+    assert {"bpm", "key_mode", "grid"} <= set(full["metrics"])
+
+    chroma = _count(monkeypatch, ingest_v1, "chroma_spec_v1")
+    key_windows = _count(monkeypatch, ingest_v1, "key_window_evidence_v1")
+    out = run_analysis_v1(
+        role="pro",
+        input_path=str(wav),
+        analysis_id=AID,
+        created_at=CREATED,
+        features=["bpm"],
+        assert_contract=True,
+    )
+    assert chroma == [] and key_windows == []
+    assert set(out["metrics"]) == {"bpm"}
+    assert out["metrics"]["bpm"] == {
+        k: v for k, v in full["metrics"]["bpm"].items() if k != "tempo_curve"
+    }
+    assert out["events"]["tonality"]["tonal_drift_ranges"] == []
+
+
+def test_key_only_analysis_skips_the_tempogram_and_caller_audio_derivations(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks_over_triad(wav)
+    full = run_analysis_v1(role="free", input_path=str(wav))
+
+    tempogram = _count(monkeypatch, ingest_v1, "bpm_hint_evidence_from_energy_v1")
+    out = run_analysis_v1(role="free", input_path=str(wav), features=["key_mode"])
+    assert tempogram == []
+    assert set(out["metrics"]) == {"key", "key_mode"}
+    assert out["metrics"]["key_mode"] == full["metrics"]["key_mode"]
+
+    audio = ingest_v1.decode_input_path_v1(wav, keep_pcm=True, producers=())
+    assert audio.pcm is not None
+    assert audio.onset_envelope is None and audio.key_mode_hint_windows is None
+    envelope_from_signals = _count(monkeypatch, run_mod, "onset_envelope_from_signals_v1")
+    key_from_signals = _count(monkeypatch, run_mod, "compute_key_window_evidence_from_signals_v1")
+    with audio.pcm:
+        out = run_analysis_v1(audio, "pro", features=["key_mode"])
+    assert envelope_from_signals == [] and len(key_from_signals) == 1
+    assert set(out["metrics"]) == {"key", "key_mode"}
+
+
+def test_runner_calls_registry_extractors_in_dependency_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks_over_triad(wav)
+    calls: list[tuple[str, tuple[str, ...]]] = []
+    registry = dict(FEATURES_V1)
+    for name, spec in FEATURES_V1.items():
+
+        def recording(ctx: Any, config: Any, upstream: Any, *, _spec: Any = spec) -> Any:
+            calls.append((_spec.name, tuple(upstream)))
+            return _spec.extract(ctx, config, upstream)
+
+        registry[name] = replace(spec, extract=recording)
+    monkeypatch.setattr(run_mod, "FEATURES_V1", registry)
+
+    out = run_analysis_v1(role="free", input_path=str(wav), features=["grid", "tonal_drift"])
+    # Free runs no tempo_curve (Pro only); grid reads the bpm block computed before it.
+    assert calls == [("bpm", ()), ("grid", ("bpm",)), ("tonal_drift", ("bpm", "grid"))]
+    assert "bpm" in out["metrics"] and "key_mode" not in out["metrics"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import pytest
+
+from engine.core.config import EngineConfig
+from engine.features.bpm_evidence_v1 import BpmEvidenceColumnsV1
+from engine.features.bpm_v1 import extract_bpm_batch_v1, extract_bpm_v1
+from engine.features.key_mode_v1 import (
+    KeyModeEvidenceV1,
+    extract_key_mode_batch_v1,
+    extract_key_mode_v1,
+)
+from engine.features.types import FeatureContext
+from engine.observability import hooks
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+
+def _library(n: int) -> list[FeatureContext]:
+    rng = random.Random(11)
+    out: list[FeatureContext] = []
+    for i in range(n):
+        base = rng.uniform(60.0, 180.0)
+        windows = [
+            base * rng.choice([1.0, 1.0, 1.0, 0.5, 2.0, 2.0 / 3.0]) + rng.gauss(0.0, 0.6)
+            for _ in range(rng.randint(0, 24))
+        ]
+        tonic = rng.choice(["C", "D", "F#", "A", "Bb"])
+        key_windows = [
+            f"{rng.choice([tonic, tonic, tonic, 'E'])} {rng.choice(['minor', 'minor', 'major'])}"
+            for _ in range(rng.randint(0, 12))
+        ]
+        details: list[Any] = []
+        if i % 2:
+            for w in windows:
+                d: dict[str, Any] = {"best_bpm": w, "best_score": rng.uniform(-0.2, 1.2)}
+                if rng.random() < 0.5:
+                    d["double_ratio"] = rng.choice([None, "n/a", float("nan"), rng.random()])
+                if rng.random() < 0.5:
+                    d["high_best_bpm"] = rng.choice([w / 2.0, float("inf")])
+                details.append(d)
+        pre = PreprocessedAudio(
+            internal_sample_rate_hz=44100,
+            channels=2,
+            duration_seconds=rng.uniform(2.0, 240.0),
+            layout="stereo",
+        )
+        out.append(
+            FeatureContext(
+                audio=pre,
+                has_rhythm_evidence=(i % 17 != 0),
+                has_tonal_evidence=(i % 19 != 0),
+                bpm_hint_windows=windows or None,
+                bpm_hint_window_details=details or None,
+                key_mode_hint_windows=key_windows or None,
+                key_mode_window_scores=[
+                    [rng.uniform(-0.6, 0.95) for _ in range(24)] for _ in range(rng.randint(0, 6))
+                ]
+                if i % 5 == 0
+                else None,
+            )
+        )
+    return out
+
+
+def _record_events(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict[str, Any]]]:
+    events: list[tuple[str, dict[str, Any]]] = []
+    monkeypatch.setattr(hooks, "emit", lambda event, **payload: events.append((event, payload)))
+    return events
+
+
+def test_bpm_batch_matches_scalar_blocks_and_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    cfg = EngineConfig()
+    ctxs = _library(200)
+    events = _record_events(monkeypatch)
+
+    scalar = [extract_bpm_v1(c, config=cfg) for c in ctxs]
+    scalar_events = list(events)
+    events.clear()
+    batch = extract_bpm_batch_v1(ctxs, config=cfg)
+
+    assert batch == scalar
+    assert events == scalar_events
+    assert any(b is not None and "value" in b for b in batch)
+    assert any(b is None for b in batch)
+
+
+def test_key_mode_batch_matches_scalar_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    cfg = EngineConfig()
+    ctxs = _library(200)
+    events = _record_events(monkeypatch)
+
+    scalar = [extract_key_mode_v1(c, config=cfg) for c in ctxs]
+    scalar_events = list(events)
+    events.clear()
+
+    assert extract_key_mode_batch_v1(iter(ctxs), config=cfg) == scalar
+    assert events == scalar_events
+    assert any(b is not None and b["value"] is not None for b in scalar)
+
+
+def test_batch_accepts_evidence_records(monkeypatch: pytest.MonkeyPatch) -> None:
+    cfg = EngineConfig()
+    ctxs = _library(120)
+    events = _record_events(monkeypatch)
+
+    from_ctx = extract_bpm_batch_v1(ctxs, config=cfg) + extract_key_mode_batch_v1(ctxs, config=cfg)
+    ctx_events = list(events)
+    events.clear()
+    from_records = extract_bpm_batch_v1(
+        [BpmEvidenceColumnsV1.from_context(c) for c in ctxs], config=cfg
+    ) + extract_key_mode_batch_v1([KeyModeEvidenceV1.from_context(c) for c in ctxs], config=cfg)
+
+    assert from_records == from_ctx
+    assert events == ctx_events
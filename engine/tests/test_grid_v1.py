@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import math
+import random
+import wave
+from array import array
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from engine.core.config import EngineConfig
+from engine.features.grid_v1 import extract_grid_v1, grid_markers_v1
+from engine.features.types import FeatureContext
+from engine.observability import hooks
+from engine.packaging.package_output_v1 import package_output_v1
+from engine.pipeline.run import run_analysis_v1
+from engine.preprocess.bpm_hint_windows_v1 import (
+    OnsetEnvelope,
+    compute_bpm_hint_window_details_from_wav_v1,
+)
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+
+def _write_click_track(path: Path, *, bpm: float, seconds: float, offset_s: float) -> None:
+    """Clicks on every beat; bar starts (every 4th beat) add a 60 Hz kick."""
+    sr = 44100
+    n = int(seconds * sr)
+    data = array("h", [0]) * n
+    t = offset_s
+    i = 0
+    while t < seconds:
+        i0 = int(round(t * sr))
+        for j in range(int(0.03 * sr)):
+            if i0 + j >= n:
+                break
+            v = 8000 if j < int(0.004 * sr) else 0
+            if i % 4 == 0:
+                v += int(20000 * math.sin(2.0 * math.pi * 60.0 * j / sr))
+            data[i0 + j] = max(-32767, min(32767, v))
+        t += 60.0 / bpm
+        i += 1
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(data.tobytes())
+
+
+def _ctx(env: OnsetEnvelope) -> FeatureContext:
+    pre = PreprocessedAudio(
+        internal_sample_rate_hz=44100,
+        channels=1,
+        duration_seconds=env.duration_seconds,
+        layout="mono",
+    )
+    return FeatureContext(audio=pre, onset_envelope=env)
+
+
+def test_pro_grid_tracks_beats_and_downbeats_from_decode_envelope(tmp_path: Path) -> None:
+    p = tmp_path / "click.wav"
+    _write_click_track(p, bpm=120.0, seconds=20.0, offset_s=0.3)
+
+    out = run_analysis_v1(role="pro", input_path=p, assert_contract=True)
+    grid = out["metrics"]["grid"]
+    assert grid["confidence"] == "high"
+    val = grid["value"]
+    assert abs(val["bpm"] - 120.0) <= 0.5
+    assert val["anchor_s"] == pytest.approx(0.3, abs=0.02)
+    diffs = [b - a for a, b in zip(val["beats_s"], val["beats_s"][1:], strict=False)]
+    assert all(abs(d - 0.5) <= 0.02 for d in diffs)
+    assert val["downbeats_s"] == val["beats_s"][::4]
+
+    markers = grid_markers_v1(grid, duration_seconds=20.0)
+    assert [m["type"] for m in markers[:2]] == ["downbeat", "grid_anchor"]
+    assert [m["time_seconds"] for m in markers] == sorted(m["time_seconds"] for m in markers)
+    assert len(markers) == len(val["downbeats_s"]) + 1
+    assert len(grid_markers_v1(grid, duration_seconds=20.0, max_markers=3)) == 3
+
+
+def test_decode_keeps_the_hint_stage_envelope(tmp_path: Path) -> None:
+    from importlib import import_module
+
+    ingest = import_module("engine.ingest.ingest_v1")
+    p = tmp_path / "click.wav"
+    _write_click_track(p, bpm=100.0, seconds=10.0, offset_s=0.0)
+
+    audio = ingest.decode_input_path_v1(p)
+    assert audio.bpm_hint_window_details == compute_bpm_hint_window_details_from_wav_v1(p)
+    assert audio.onset_envelope is not None
+    assert audio.onset_envelope.frame_seconds == 0.01
+    assert len(audio.onset_envelope) == 1000
+
+
+def test_grid_is_locked_for_free_and_guest(tmp_path: Path) -> None:
+    p = tmp_path / "click.wav"
+    _write_click_track(p, bpm=120.0, seconds=20.0, offset_s=0.3)
+
+    for role in ("free", "guest"):
+        out = run_analysis_v1(role=role, input_path=p, assert_contract=True)
+        grid = out["metrics"]["grid"]
+        assert grid["locked"] is True
+        assert grid["preview"]["beats_per_bar"] == 4
+        assert "value" not in grid
+
+
+def test_high_confidence_and_preview_thresholds_are_independent(tmp_path: Path) -> None:
+    p = tmp_path / "click.wav"
+    _write_click_track(p, bpm=120.0, seconds=20.0, offset_s=0.3)
+    tunables = EngineConfig().tunables
+
+    strict_high = EngineConfig(tunables=replace(tunables, grid_min_confidence_high=1.01))
+    pro = run_analysis_v1(role="pro", input_path=p, config=strict_high)
+    assert pro["metrics"]["grid"]["confidence"] == "medium"
+    free = run_analysis_v1(role="free", input_path=p, config=strict_high)
+    assert free["metrics"]["grid"]["preview"]["beats_per_bar"] == 4
+
+    no_preview = EngineConfig(tunables=replace(tunables, grid_guest_preview_min_confidence=1.01))
+    pro = run_analysis_v1(role="pro", input_path=p, config=no_preview)
+    assert pro["metrics"]["grid"]["confidence"] == "high"
+    free = run_analysis_v1(role="free", input_path=p, config=no_preview)
+    assert free["metrics"]["grid"] == {
+        "locked": True,
+        "unlock_hint": "Upgrade to Pro to unlock the beat grid.",
+    }
+    guest = run_analysis_v1(role="guest", input_path=p, config=no_preview)
+    assert "grid" not in guest["metrics"]
+
+
+def test_low_confidence_grid_omits_value_and_is_hidden_outside_pro(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    rng = random.Random(5)
+    env = OnsetEnvelope.from_bands(
+        [rng.random() for _ in range(2000)],
+        [rng.random() for _ in range(2000)],
+        frame_seconds=0.01,
+    )
+    # Pure noise: nothing beat-aligned at all.
+    events: list[tuple[str, dict[str, Any]]] = []
+    monkeypatch.setattr(hooks, "emit", lambda event, **payload: events.append((event, payload)))
+    assert extract_grid_v1(_ctx(env), config=EngineConfig(), bpm_block={"bpm_raw": 120}) is None
+    assert events[0][1]["reason"] == "confidence_below_threshold"
+
+    # Relax the thresholds so the same evidence lands in the "not usable" band.
+    cfg = EngineConfig(tunables=replace(EngineConfig().tunables, grid_min_confidence_omit=0.0))
+    block = extract_grid_v1(_ctx(env), config=cfg, bpm_block={"bpm_raw": 120})
+    assert block is not None
+    assert block["confidence"] == "low"
+    assert "value" not in block
+    assert "grid_not_minimally_usable" in block["reason_codes"]
+
+    base: dict[str, Any] = {"role": "free", "metrics": {"grid": block}, "events": {}}
+    assert "grid" not in package_output_v1(base, role="free")["metrics"]
+    assert package_output_v1(base, role="pro")["metrics"]["grid"] is block
+
+
+def test_grid_needs_tempo_and_envelope(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[tuple[str, dict[str, Any]]] = []
+    monkeypatch.setattr(hooks, "emit", lambda event, **payload: events.append((event, payload)))
+
+    onset = [1.0 if i % 50 == 0 else 0.0 for i in range(1000)]
+    env = OnsetEnvelope.from_bands(onset, onset, frame_seconds=0.01)
+    assert extract_grid_v1(_ctx(env), config=EngineConfig(), bpm_block=None) is None
+
+    pre = PreprocessedAudio(
+        internal_sample_rate_hz=44100, channels=1, duration_seconds=10.0, layout="mono"
+    )
+    ctx = FeatureContext(audio=pre)
+    assert extract_grid_v1(ctx, config=EngineConfig(), bpm_block={"bpm_raw": 120}) is None
+
+    # Nothing to track is not a confidence omission.
+    assert events == []
+
+    block = extract_grid_v1(_ctx(env), config=EngineConfig(), bpm_block={"bpm_raw": 120})
+    assert block is not None
+    assert block["value"]["beats_s"][:3] == [0.0, 0.5, 1.0]
+    # Identical accents on every beat: bar phase is ambiguous, so no downbeats.
+    assert block["value"]["downbeats_s"] == []
+    assert "downbeat_phase_ambiguous" in block["reason_codes"]
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import importlib
+import os
 import subprocess
+import time
 import wave
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
+from engine.core.config import EngineConfig
 from engine.core.errors import EngineError
 from engine.ingest.ingest_v1 import decode_input_path_v1
 
+# `engine.ingest` re-exports a function named `ingest_v1`, which shadows the module attribute.
+ingest_v1 = importlib.import_module("engine.ingest.ingest_v1")
+
 
 def _write_tiny_wav(path: Path) -> None:
     # Minimal valid WAV for stdlib wave reader (metadata-only ingest).
@@ -51,7 +59,7 @@ def test_decode_mp3_ffmpeg_failure_raises_invalid_input(
             args=["ffmpeg"], returncode=1, stdout="", stderr="decode failed"
         )
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(ingest_v1, "_run_decoder_v1", fake_run)
 
     with pytest.raises(EngineError) as excinfo:
         decode_input_path_v1(p)
@@ -78,7 +86,7 @@ def test_decode_mp3_success_uses_temp_wav_and_preserves_format(
         _write_tiny_wav(out_wav)
         return subprocess.CompletedProcess(args=args, returncode=0, stdout="", stderr="")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(ingest_v1, "_run_decoder_v1", fake_run)
 
     audio = decode_input_path_v1(p)
     assert audio.format == "mp3"
@@ -87,3 +95,54 @@ def test_decode_mp3_success_uses_temp_wav_and_preserves_format(
     assert audio.channels == 2
     assert audio.sample_rate_hz == 44100
     assert audio.duration_seconds > 0
+
+
+def test_decode_mp3_timeout_raises_timeout_with_stage_context(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "x.mp3"
+    p.write_bytes(b"not really an mp3")
+
+    import shutil
+
+    monkeypatch.setattr(shutil, "which", lambda _name: "/opt/homebrew/bin/ffmpeg")
+
+    def fake_run(args: list[str], **_kwargs: object) -> subprocess.CompletedProcess[str]:
+        raise subprocess.TimeoutExpired(cmd=args, timeout=0.5)
+
+    monkeypatch.setattr(ingest_v1, "_run_decoder_v1", fake_run)
+
+    cfg = EngineConfig(
+        tunables=replace(EngineConfig().tunables, decode_transcode_timeout_seconds=0.5)
+    )
+    with pytest.raises(EngineError) as excinfo:
+        decode_input_path_v1(p, config=cfg)
+
+    err = excinfo.value
+    assert err.code == "TIMEOUT"
+    ctx = err.context or {}
+    assert ctx.get("stage") == "decode"
+    assert ctx.get("budget") == "decode_transcode"
+    assert ctx.get("timeout_seconds") == 0.5
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_run_decoder_kills_process_group_on_timeout(tmp_path: Path) -> None:
+    pid_file = tmp_path / "grandchild.pid"
+    # The shell spawns a grandchild and waits on it; both must die on expiry.
+    cmd = ["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"]
+
+    t0 = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        ingest_v1._run_decoder_v1(cmd, timeout_seconds=0.3)
+    assert time.monotonic() - t0 < 10.0
+
+    grandchild = int(pid_file.read_text().strip())
+    for _ in range(50):
+        try:
+            os.kill(grandchild, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("decoder grandchild survived the process-group kill")
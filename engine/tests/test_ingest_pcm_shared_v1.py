@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pickle
+import wave
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from engine.ingest.ingest_v1 import decode_input_path_v1
+from engine.ingest.pcm_v1 import SharedPcm
+from engine.ingest.stream_v1 import SharedPcmWriterV1, stream_wav_v1
+
+
+def _write_ramp_wav(path: Path, *, frames: int, channels: int = 2) -> array:
+    data = array("h", [((i * 37) % 20000) - 10000 for i in range(frames * channels)])
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(44100)
+        wf.writeframes(data.tobytes())
+    return data
+
+
+def _read_pcm(path: Path) -> SharedPcm:
+    """The whole file as shared-memory PCM, via the decode fan-out's PCM consumer."""
+    with wave.open(str(path), "rb") as wf:
+        writer = SharedPcmWriterV1(
+            frames=wf.getnframes(), channels=wf.getnchannels(), sample_rate_hz=wf.getframerate()
+        )
+    return stream_wav_v1(path, {"pcm": writer})["pcm"]
+
+
+def test_streamed_pcm_copy_matches_file_samples(tmp_path: Path) -> None:
+    p = tmp_path / "ramp.wav"
+    expected = _write_ramp_wav(p, frames=100_000)
+
+    with _read_pcm(p) as pcm:
+        assert pcm.frames == 100_000
+        assert pcm.channels == 2
+        assert pcm.sample_rate_hz == 44100
+        view = pcm.samples()
+        assert len(view) == len(expected)
+        assert view.tolist() == expected.tolist()
+        del view
+
+
+def test_pickled_handle_shares_memory_without_sample_payload(tmp_path: Path) -> None:
+    p = tmp_path / "ramp.wav"
+    _write_ramp_wav(p, frames=200_000)
+
+    with _read_pcm(p) as pcm:
+        blob = pickle.dumps(pcm)
+        # Only the segment name + layout are serialized.
+        assert len(blob) < 512 < pcm.nbytes
+
+        attached = pickle.loads(blob)
+        try:
+            assert attached.owner is False
+            view = pcm.samples()
+            view[0] = 1234
+            other = attached.samples()
+            assert other[0] == 1234
+            del view, other
+            with pytest.raises(ValueError):
+                attached.unlink()
+        finally:
+            attached.close()
+
+
+def test_worker_process_reads_shared_samples(tmp_path: Path) -> None:
+    p = tmp_path / "ramp.wav"
+    expected = _write_ramp_wav(p, frames=50_000, channels=1)
+
+    with _read_pcm(p) as pcm:
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            peak = ex.submit(pcm.peak_abs).result(timeout=60)
+    assert peak == max(abs(v) for v in expected)
+
+
+def test_iter_blocks_covers_all_frames() -> None:
+    with SharedPcm.allocate(frames=10, channels=2, sample_rate_hz=8000) as pcm:
+        blocks = [len(b) for b in pcm.iter_blocks(4)]
+        assert blocks == [8, 8, 4]
+
+
+def test_decode_input_path_keeps_pcm_only_on_request(tmp_path: Path) -> None:
+    p = tmp_path / "ramp.wav"
+    _write_ramp_wav(p, frames=44100)
+
+    assert decode_input_path_v1(p).pcm is None
+
+    audio = decode_input_path_v1(p, keep_pcm=True)
+    assert audio.pcm is not None
+    with audio.pcm as pcm:
+        assert pcm.frames == 44100
+        assert pcm.duration_seconds == pytest.approx(audio.duration_seconds)
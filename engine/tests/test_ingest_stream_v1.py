@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+import wave
+from array import array
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import engine.ingest.ingest_v1 as ingest_mod
+from engine.ingest.ingest_v1 import decode_input_path_v1
+from engine.ingest.pcm_v1 import SharedPcm
+from engine.ingest.stream_v1 import PeakLevelV1, SharedPcmWriterV1, stream_wav_v1
+from engine.preprocess.bpm_hint_windows_v1 import EnergyEnvelopeAccumulatorV1
+
+SR = 44100
+
+
+def _write_wav(path: Path, *, seconds: float, channels: int) -> None:
+    n = int(seconds * SR)
+    data = array("h", [0]) * (n * channels)
+    for i in range(n):
+        v = int(9000 * math.sin(2.0 * math.pi * 220.0 * i / SR)) + (6000 if i % 22050 < 200 else 0)
+        for c in range(channels):
+            data[i * channels + c] = v - 500 * c
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def _read_pcm(path: Path) -> SharedPcm:
+    """The whole file as shared-memory PCM, via the decode fan-out's PCM consumer."""
+    with wave.open(str(path), "rb") as wf:
+        writer = SharedPcmWriterV1(
+            frames=wf.getnframes(), channels=wf.getnchannels(), sample_rate_hz=wf.getframerate()
+        )
+    return stream_wav_v1(path, {"pcm": writer})["pcm"]
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.blocks: list[array] = []
+
+    def feed(self, block: array) -> None:
+        self.blocks.append(block)
+
+    def finish(self) -> int:
+        return sum(len(b) for b in self.blocks)
+
+
+def test_every_consumer_sees_every_block_of_one_read(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_wav(wav, seconds=3.0, channels=2)
+    first, second = _Recorder(), _Recorder()
+    out = stream_wav_v1(
+        wav, {"first": first, "second": second, "peak": PeakLevelV1()}, block_frames=5000
+    )
+    assert out["first"] == out["second"] == 2 * int(3.0 * SR)
+    assert [b is c for b, c in zip(first.blocks, second.blocks, strict=True)] == [True] * 27
+    with _read_pcm(wav) as pcm:
+        assert out["peak"] == pytest.approx(20.0 * math.log10(pcm.peak_abs() / 32768.0))
+
+
+def test_energy_envelope_is_independent_of_block_boundaries(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_wav(wav, seconds=2.5, channels=2)
+    whole = EnergyEnvelopeAccumulatorV1(sample_rate_hz=SR, channels=2)
+    ragged = EnergyEnvelopeAccumulatorV1(sample_rate_hz=SR, channels=2)
+    pcm = _read_pcm(wav)
+    with pcm:
+        samples = pcm.samples()
+        whole.feed(samples)
+        for i in range(0, len(samples), 1001):  # odd: splits stereo frames
+            ragged.feed(samples[i : i + 1001])
+        del samples
+    low, high = whole.finish()
+    assert (low, high) == ragged.finish()
+    assert len(low) == 250
+    with pytest.raises(ValueError):
+        EnergyEnvelopeAccumulatorV1(sample_rate_hz=SR, channels=3)
+
+
+def test_decode_fans_out_pcm_and_hints_from_a_single_pass(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_wav(wav, seconds=4.0, channels=1)
+    streams: list[list[str]] = []
+    real = ingest_mod.stream_wav_v1
+
+    def counting(path: Path, consumers: Any, **kwargs: Any) -> Any:
+        streams.append(sorted(consumers))
+        return real(path, consumers, **kwargs)
+
+    monkeypatch.setattr(ingest_mod, "stream_wav_v1", counting)
+    audio = decode_input_path_v1(wav, keep_pcm=True)
+    assert streams == [["chroma", "envelope", "pcm", "peak"]]
+    assert audio.pcm is not None
+    with audio.pcm, _read_pcm(wav) as ref:
+        assert audio.pcm.samples().tobytes() == ref.samples().tobytes()
+    assert audio.bpm_hint_window_details and audio.onset_envelope is not None
+    assert audio.peak_dbfs is not None and audio.peak_dbfs < 0.0
+
+
+def test_failed_stream_releases_the_pcm_segment(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_wav(wav, seconds=0.5, channels=1)
+    writer = SharedPcmWriterV1(frames=int(0.5 * SR), channels=1, sample_rate_hz=SR)
+
+    class Boom:
+        def feed(self, block: array) -> None:
+            raise RuntimeError("boom")
+
+        def finish(self) -> None:
+            return None
+
+    with pytest.raises(RuntimeError):
+        stream_wav_v1(wav, {"pcm": writer, "boom": Boom()})
+    with pytest.raises(ValueError):
+        writer.finish().samples()
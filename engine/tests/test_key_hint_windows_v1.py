@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import math
+import wave
+from array import array
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from engine.core.config import EngineConfig
+from engine.ingest.ingest_v1 import decode_input_path_v1
+from engine.pipeline.run import run_analysis_v1
+from engine.preprocess.chroma_v1 import (
+    ChromaAccumulatorV1,
+    ChromaSpecV1,
+    goertzel_bank_v1,
+    pitch_class_fold_v1,
+)
+from engine.preprocess.key_hint_windows_v1 import (
+    best_key_for_chroma_v1,
+    compute_key_window_evidence_from_signals_v1,
+    key_hint_windows_from_chroma_v1,
+    key_profile_matrix_v1,
+    key_window_evidence_batch_v1,
+    score_key_windows_v1,
+)
+
+SR = 44100
+
+
+def _write_wav(path: Path, data: array, *, channels: int) -> None:
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def _chord(freqs: list[float], *, seconds: float, channels: int) -> array:
+    n = int(seconds * SR)
+    data = array("h", [0]) * (n * channels)
+    amp = 7500.0 / len(freqs)
+    for i in range(n):
+        v = int(amp * sum(math.sin(2.0 * math.pi * f * i / SR) for f in freqs))
+        for c in range(channels):
+            data[i * channels + c] = v
+    return data
+
+
+def _clicks(*, bpm: float, seconds: float) -> array:
+    n = int(seconds * SR)
+    data = array("h", [0]) * n
+    t = 0.25
+    while t < seconds:
+        i0 = int(round(t * SR))
+        for j in range(int(0.005 * SR)):
+            if i0 + j < n:
+                data[i0 + j] = 20000
+        t += 60.0 / bpm
+    return data
+
+
+def test_fold_maps_bins_to_nearest_pitch_class_and_is_cached() -> None:
+    fold = pitch_class_fold_v1(n_fft=2048, sample_rate_hz=5512.5, fmin_hz=110.0, fmax_hz=2000.0)
+    assert fold is pitch_class_fold_v1(
+        n_fft=2048, sample_rate_hz=5512.5, fmin_hz=110.0, fmax_hz=2000.0
+    )
+    bin_hz = 5512.5 / 2048
+    a4 = int(round(440.0 / bin_hz))
+    c5 = int(round(523.25 / bin_hz))
+    assert fold.pitch_classes[a4 - fold.bin_lo] == 9
+    assert fold.pitch_classes[c5 - fold.bin_lo] == 0
+
+
+def test_chroma_is_independent_of_block_boundaries() -> None:
+    data = _chord([261.63, 329.63, 392.0], seconds=3.0, channels=2)
+    whole = ChromaAccumulatorV1(sample_rate_hz=SR, channels=2)
+    whole.feed(data)
+    ragged = ChromaAccumulatorV1(sample_rate_hz=SR, channels=2)
+    for i in range(0, len(data), 883):
+        ragged.feed(data[i : i + 883])
+    assert ragged.finish() == whole.finish()
+    assert len(whole.finish().frames) == 8
+
+
+def test_template_scorer_names_major_and_minor_triads() -> None:
+    c_major = [0.0] * 12
+    for pc in (0, 4, 7):
+        c_major[pc] = 1.0
+    f_sharp_minor = [0.0] * 12
+    for pc in (6, 9, 1):
+        f_sharp_minor[pc] = 1.0
+    assert best_key_for_chroma_v1(c_major)[0] == "C major"  # type: ignore[index]
+    assert best_key_for_chroma_v1(f_sharp_minor)[0] == "F# minor"  # type: ignore[index]
+    assert best_key_for_chroma_v1([1.0] * 12) is None
+
+
+def test_decode_yields_key_windows_from_the_hint_read(tmp_path: Path) -> None:
+    wav = tmp_path / "a_minor.wav"
+    _write_wav(wav, _chord([220.0, 261.63, 329.63], seconds=20.0, channels=2), channels=2)
+
+    audio = decode_input_path_v1(wav, keep_pcm=True)
+    assert audio.pcm is not None
+    with audio.pcm:
+        assert audio.key_mode_hint_windows == ["A minor"] * 3
+        # Caller-decoded PCM takes the signals path and agrees with the decode.
+        evidence = compute_key_window_evidence_from_signals_v1(audio.signals, config=EngineConfig())
+        assert evidence.hints == audio.key_mode_hint_windows
+        assert evidence.scores == audio.key_mode_window_scores
+
+    out = run_analysis_v1(role="pro", input_path=wav)
+    assert out["metrics"]["key_mode"]["value"] == "A"
+    assert out["metrics"]["key_mode"]["mode"] == "minor"
+
+
+def test_unpitched_or_silent_audio_gives_no_key_evidence(tmp_path: Path) -> None:
+    wav = tmp_path / "clicks.wav"
+    _write_wav(wav, _clicks(bpm=124.0, seconds=16.0), channels=1)
+    assert decode_input_path_v1(wav).key_mode_hint_windows == []
+    assert "key_mode" not in run_analysis_v1(role="pro", input_path=wav)["metrics"]
+
+    silent = ChromaAccumulatorV1(sample_rate_hz=SR, channels=1)
+    silent.feed(array("h", [0]) * (SR * 10))
+    assert key_hint_windows_from_chroma_v1(silent.finish()) == []
+
+
+def test_goertzel_bank_covers_requested_semitones_only() -> None:
+    bank = goertzel_bank_v1(sample_rate_hz=2756.25, fmin_hz=110.0, octaves=3, cycles=17.0)
+    assert bank is goertzel_bank_v1(sample_rate_hz=2756.25, fmin_hz=110.0, octaves=3, cycles=17.0)
+    assert len(bank.filters) == 36
+    assert [pc for pc, _c, _n in bank.filters[:3]] == [9, 10, 11]
+    # Lowest note listens longest (constant-Q).
+    assert bank.frame_len == bank.filters[0][2] > bank.filters[-1][2]
+    with pytest.raises(ValueError):
+        ChromaSpecV1(backend="wavelet").accumulator(  # type: ignore[arg-type]
+            sample_rate_hz=SR, channels=1
+        )
+
+
+def test_goertzel_backend_agrees_with_fft_on_key_windows(tmp_path: Path) -> None:
+    wav = tmp_path / "e_major.wav"
+    _write_wav(wav, _chord([164.81, 207.65, 246.94, 329.63], seconds=16.0, channels=1), channels=1)
+    goertzel = EngineConfig(
+        tunables=replace(EngineConfig().tunables, key_chroma_backend="goertzel")
+    )
+
+    fft_audio = decode_input_path_v1(wav)
+    g_audio = decode_input_path_v1(wav, config=goertzel)
+    assert fft_audio.key_mode_hint_windows == ["E major"] * 2
+    assert g_audio.key_mode_hint_windows == fft_audio.key_mode_hint_windows
+
+    # Same frame period, so window boundaries line up across backends.
+    fft_period = ChromaSpecV1().accumulator(sample_rate_hz=SR, channels=1).finish()
+    g_period = ChromaSpecV1(backend="goertzel").accumulator(sample_rate_hz=SR, channels=1).finish()
+    assert g_period.frame_seconds == pytest.approx(fft_period.frame_seconds)
+
+
+def test_matrix_scorer_matches_pearson_and_batches_across_tracks() -> None:
+    rows = [[float((i * 7 + j * j) % 11) for j in range(12)] for i in range(5)] + [[2.0] * 12]
+    scored = score_key_windows_v1(rows)
+    assert scored[-1] is None
+    for row, scores in zip(rows[:-1], scored[:-1], strict=True):
+        assert scores is not None
+        for slot, profile in enumerate(key_profile_matrix_v1()):
+            mx = sum(row) / 12
+            dx = [v - mx for v in row]
+            ref = sum(a * b for a, b in zip(dx, profile, strict=True)) / math.sqrt(
+                sum(d * d for d in dx)
+            )
+            assert scores[slot] == pytest.approx(ref, abs=1e-9)
+
+    tracks = []
+    for freqs in ([261.63, 329.63, 392.0], [220.0, 261.63, 329.63], [100.0]):
+        acc = ChromaSpecV1().accumulator(sample_rate_hz=SR, channels=1)
+        acc.feed(_chord(freqs, seconds=9.0, channels=1))
+        tracks.append(acc.finish())
+    batch = key_window_evidence_batch_v1(tracks)
+    assert batch == [key_window_evidence_batch_v1([t])[0] for t in tracks]
+    assert [ev.hints for ev in batch[:2]] == [["C major"], ["A minor"]]
+    assert all(len(s) == 24 for ev in batch for s in ev.scores)
@@ -235,3 +235,35 @@ def test_free_gating_keeps_advanced_key_fields():
     assert km.get("confidence") in ("medium", "high")
     assert km.get("reason_codes") == ["emit_confident"]
     assert isinstance(km.get("candidates"), list) and km["candidates"]
+
+
+def _scores(best: int, runner_up: int, gap: float) -> list[float]:
+    row = [0.1] * 24
+    row[best] = 0.85
+    row[runner_up] = 0.85 - gap
+    return row
+
+
+def test_window_scores_replace_label_counting_and_split_torn_windows() -> None:
+    cfg = EngineConfig()
+    a_minor, c_major = 19, 0  # slot = key_index * 2 + mode_index
+    clear = FeatureContext(
+        audio=_ctx(duration_seconds=40.0, windows=[]).audio,
+        # Labels disagree with the scores: scores win when present.
+        key_mode_hint_windows=["D major"] * 8,
+        key_mode_window_scores=[_scores(a_minor, c_major, 0.2)] * 8,
+    )
+    out = extract_key_mode_v1(clear, config=cfg)
+    assert out is not None
+    assert (out["value"], out["mode"]) == ("A", "minor")
+
+    # Every window barely prefers A minor over its relative major: the vote is
+    # split, so the policy does not pretend to know the mode (or even the key).
+    torn = FeatureContext(
+        audio=clear.audio,
+        key_mode_window_scores=[_scores(a_minor, c_major, 0.005)] * 8,
+    )
+    out = extract_key_mode_v1(torn, config=cfg)
+    assert out is not None
+    assert out["mode"] is None
+    assert out["candidates"][0]["score"] < 0.7
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import wave
+from array import array
+from pathlib import Path
 from typing import Any
 
 import pytest
 
+import engine.observability.stages_v1 as stages_mod
 from engine.core.config import EngineConfig
 from engine.core.errors import EngineError
 from engine.core.output import TrackInfo
 from engine.ingest.types import DecodedAudio
 from engine.observability import hooks
+from engine.observability.stages_v1 import StageStatsV1
 from engine.pipeline.run import run_analysis_v1
 
 
@@ -68,3 +73,79 @@ def test_emits_feature_omitted_when_below_threshold(monkeypatch):
     assert "bpm" in omitted_features
     assert "key_mode" in omitted_features
     assert all(p.get("reason") == "confidence_below_threshold" for p in omitted)
+
+
+def _write_clicks(path: Path, *, seconds: float = 8.0, bpm: float = 120.0) -> None:
+    sr = 44100
+    n = int(seconds * sr)
+    data = array("h", [0]) * n
+    t = 0.25
+    while t < seconds:
+        i0 = int(round(t * sr))
+        for j in range(min(int(0.005 * sr), n - i0)):
+            data[i0 + j] = 20000
+        t += 60.0 / bpm
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(data.tobytes())
+
+
+def test_emits_stage_completed_with_timings_and_counters(monkeypatch, tmp_path):
+    events: list[tuple[str, dict[str, Any]]] = []
+
+    def capture(event: str, **payload: Any) -> None:
+        events.append((event, payload))
+
+    monkeypatch.setattr(hooks, "emit", capture)
+    wav = tmp_path / "clicks.wav"
+    _write_clicks(wav)
+    stats = StageStatsV1()
+    monkeypatch.setattr(stages_mod, "STAGE_STATS_V1", stats)
+
+    run_analysis_v1(role="pro", input_path=str(wav), assert_contract=True)
+
+    stages = {p["stage"]: p for e, p in events if e == "stage_completed"}
+    assert list(stages) == [
+        "ingest",
+        "decode:peak",
+        "decode:envelope",
+        "decode:chroma",
+        "hint_windows:tempogram",
+        "hint_windows:key_windows",
+        "decode",
+        "preprocess",
+        "feature:bpm",
+        "feature:tempo_curve",
+        "feature:grid",
+        "feature:key_mode",
+        "feature:tonal_drift",
+        "packaging",
+        "contract",
+    ]
+    assert all(p["wall_ms"] >= 0.0 and p["cpu_ms"] >= 0.0 for p in stages.values())
+    assert stages["decode"]["bytes_read"] == wav.stat().st_size
+    assert stages["decode"]["samples_read"] == 8 * 44100
+    # Window searches run inside decode and are reported there, not by the features.
+    assert stages["hint_windows:tempogram"]["windows_analyzed"] > 0
+    assert stages["feature:bpm"]["windows_analyzed"] == 0
+    sub_wall = sum(p["wall_ms"] for s, p in stages.items() if s.startswith(("decode:", "hint_")))
+    assert sub_wall <= stages["decode"]["wall_ms"]
+    names = [e for e, _ in events]
+    assert names.index("stage_completed") > names.index("analysis_started")
+    assert names[-1] == "analysis_completed"
+    assert set(stats.summary()) == set(stages)
+
+
+def test_stage_stats_report_nearest_rank_percentiles():
+    stats = StageStatsV1(max_samples=100)
+    for ms in range(1, 101):
+        stats.record("decode", wall_ms=float(ms), cpu_ms=float(ms) / 2)
+    stats.record("decode", wall_ms=1000.0, cpu_ms=1000.0)  # evicts the 1 ms sample
+    row = stats.summary()["decode"]
+    assert row["count"] == 100
+    assert (row["wall_ms_p50"], row["wall_ms_p95"]) == (51.0, 96.0)
+    assert row["cpu_ms_p95"] == 48.0
+    stats.reset()
+    assert stats.summary() == {}
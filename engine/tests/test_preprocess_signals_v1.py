@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import cmath
+import math
+import pickle
+import wave
+from array import array
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from engine.core.config import EngineConfig
+from engine.ingest.ingest_v1 import decode_input_path_v1
+from engine.ingest.pcm_v1 import SharedPcm
+from engine.ingest.types import DecodedAudio
+from engine.preprocess.bpm_hint_windows_v1 import (
+    compute_bpm_hint_window_details_from_signals_v1,
+    compute_bpm_hint_window_details_from_wav_v1,
+)
+from engine.preprocess.chroma_v1 import ChromaSpecV1
+from engine.preprocess.signals_v1 import DerivedSignals
+from engine.preprocess.stft_v1 import SpectrogramSpecV1, rfft_magnitudes_v1
+
+
+def _write_click_track_wav(path: Path, *, bpm: float, duration_s: float, channels: int) -> None:
+    sr = 44100
+    n = int(round(duration_s * sr))
+    data = array("h", [0]) * (n * channels)
+    period_s = 60.0 / bpm
+    t = 0.0
+    while t < duration_s:
+        i0 = int(round(t * sr))
+        for j in range(int(0.005 * sr)):
+            idx = i0 + j
+            if idx >= n:
+                break
+            for c in range(channels):
+                data[idx * channels + c] = 20000 - 3000 * c
+        t += period_s
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(data.tobytes())
+
+
+def _pcm_from_samples(values: list[int], *, channels: int = 1, sr: int = 8000) -> SharedPcm:
+    pcm = SharedPcm.allocate(frames=len(values) // channels, channels=channels, sample_rate_hz=sr)
+    view = pcm.samples()
+    for i, v in enumerate(values):
+        view[i] = v
+    del view
+    return pcm
+
+
+def test_signal_hint_details_match_wav_streaming_path(tmp_path: Path) -> None:
+    p = tmp_path / "click.wav"
+    _write_click_track_wav(p, bpm=120.0, duration_s=10.0, channels=2)
+
+    audio = decode_input_path_v1(p, keep_pcm=True)
+    assert audio.pcm is not None
+    with audio.pcm:
+        from_signals = compute_bpm_hint_window_details_from_signals_v1(audio.signals)
+        assert from_signals == compute_bpm_hint_window_details_from_wav_v1(p)
+        assert audio.bpm_hint_window_details == from_signals
+
+
+def test_accessors_are_memoized_and_shared() -> None:
+    with _pcm_from_samples([0, 100, -100, 200, 50, -50, 10, 0]) as pcm:
+        sig = DerivedSignals(pcm)
+        assert sig.computed() == []
+
+        onset_a = sig.onset_envelope(frame_seconds=0.0005)
+        onset_b = sig.onset_envelope(frame_seconds=0.0005)
+        assert onset_a is onset_b
+        # The onset view reused (and memoized) the mono + energy views it depends on.
+        kinds = {k[0] for k in sig.computed()}
+        assert kinds == {"mono", "energy_envelope", "onset_envelope"}
+        assert sig.mono() is sig.mono()
+
+
+def test_stereo_mono_downmix_and_decimation() -> None:
+    with _pcm_from_samples([10, 20, -10, -31, 4, 4, 8, 0], channels=2) as pcm:
+        sig = DerivedSignals(pcm)
+        assert list(sig.mono()) == [15.0, -21.0, 4.0, 4.0]
+        assert list(sig.decimated(2)) == [-3.0, 4.0]
+        assert sig.decimated(1) is sig.mono()
+
+
+def test_bandpass_is_difference_of_lowpasses() -> None:
+    with _pcm_from_samples([1000, -1000] * 32) as pcm:
+        sig = DerivedSignals(pcm)
+        band = sig.bandpass(100.0, 1000.0)
+        hi = sig.lowpass(1000.0)
+        lo = sig.lowpass(100.0)
+        assert list(band) == pytest.approx([a - b for a, b in zip(hi, lo, strict=True)])
+        with pytest.raises(ValueError):
+            sig.bandpass(500.0, 100.0)
+
+
+def test_rfft_magnitudes_match_naive_dft() -> None:
+    n = 16
+    x = [
+        math.sin(0.7 * i) + 0.25 * math.cos(2.1 * i) + (0.1 if i % 3 == 0 else 0.0)
+        for i in range(n)
+    ]
+    got = rfft_magnitudes_v1(x, n_fft=n)
+    for k in range(n // 2 + 1):
+        ref = abs(sum(x[t] * cmath.exp(-2j * math.pi * k * t / n) for t in range(n)))
+        assert got[k] == pytest.approx(ref, rel=1e-5, abs=1e-5)
+
+
+def test_stft_peak_tracks_sine_frequency() -> None:
+    sr = 8000
+    freq = 1000.0
+    values = [int(10000 * math.sin(2 * math.pi * freq * i / sr)) for i in range(2048)]
+    with _pcm_from_samples(values, sr=sr) as pcm:
+        frames = DerivedSignals(pcm).stft(n_fft=256, hop=128)
+        assert len(frames) == (2048 - 256) // 128 + 1
+        peak_bin = max(range(len(frames[0])), key=lambda k: frames[0][k])
+        assert peak_bin == int(freq * 256 / sr)
+
+
+def test_spectrogram_is_shared_within_the_cap_and_streams_beyond_it() -> None:
+    sr = 8000
+    values = [int(8000 * math.sin(2 * math.pi * 440.0 * i / sr)) for i in range(16384)]
+    chroma_spec = ChromaSpecV1(decimate=1, n_fft=256, hop=256)
+    sgram_spec = chroma_spec.spectrogram
+    assert sgram_spec == SpectrogramSpecV1(n_fft=256, hop=256, decimate=1)
+    with _pcm_from_samples(values, sr=sr) as pcm:
+        sig = DerivedSignals(pcm)
+        sgram = sig.spectrogram(sgram_spec, block_frames=1000)
+        assert sgram.cached and sig.spectrogram_bytes == sgram.nbytes == 64 * 129 * 4
+        frames = list(sgram)
+        assert len(frames) == len(sgram) == 64
+        assert next(iter(sgram)) is frames[0]  # computed once, then shared
+
+        # Chroma (FFT backend) folds the cached spectrogram instead of its own STFT.
+        chroma = sig.chroma(chroma_spec)
+        streamed = chroma_spec.accumulator(sample_rate_hz=sr, channels=1)
+        streamed.feed(pcm.samples())
+        assert chroma == streamed.finish()
+        assert sig.spectrogram(sgram_spec) is sgram
+
+        capped = DerivedSignals(pcm, spectrogram_cache_bytes=sgram.nbytes - 1)
+        over = capped.spectrogram(sgram_spec)
+        assert not over.cached and capped.spectrogram_bytes == 0
+        assert list(over) == frames == list(over)
+        assert capped.chroma(chroma_spec) == chroma
+        assert capped.stft(n_fft=256, hop=256) == frames
+
+
+def test_decode_passes_the_spectrogram_cache_tunable_to_signals(tmp_path: Path) -> None:
+    p = tmp_path / "click.wav"
+    _write_click_track_wav(p, bpm=120.0, duration_s=10.0, channels=1)
+    cfg = EngineConfig(tunables=replace(EngineConfig().tunables, spectrogram_cache_bytes=0))
+    sgram_spec = SpectrogramSpecV1(n_fft=256, hop=256, decimate=8)
+
+    audio = decode_input_path_v1(p, config=cfg, keep_pcm=True)
+    assert audio.pcm is not None
+    with audio.pcm:
+        assert not audio.signals.spectrogram(sgram_spec).cached
+        assert audio.signals.spectrogram_bytes == 0
+
+    audio = decode_input_path_v1(p, keep_pcm=True)
+    assert audio.pcm is not None
+    with audio.pcm:
+        assert audio.signals.spectrogram(sgram_spec).cached
+
+
+def test_decoded_audio_signals_require_pcm_and_pickle_without_cache() -> None:
+    audio = DecodedAudio(sample_rate_hz=44100, channels=2, duration_seconds=1.0)
+    with pytest.raises(ValueError):
+        _ = audio.signals
+
+    with _pcm_from_samples([1, 2, 3, 4]) as pcm:
+        sig = DerivedSignals(pcm)
+        sig.mono()
+        clone = pickle.loads(pickle.dumps(sig))
+        try:
+            assert clone.computed() == []
+            assert list(clone.mono()) == [1.0, 2.0, 3.0, 4.0]
+        finally:
+            clone.pcm.close()
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import math
+import os
+import subprocess
+import threading
+import time
+import wave
+from array import array
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import engine.pipeline.run as run_mod
+from engine.core.errors import EngineError
+from engine.pipeline.run import run_analysis_v1
+from engine.pipeline.run_async_v1 import run_analysis_v1_async
+
+# `engine.ingest` re-exports a function named `ingest_v1`, which shadows the module attribute.
+ingest_v1 = importlib.import_module("engine.ingest.ingest_v1")
+
+SR = 44100
+AID = "00000000-0000-4000-8000-000000000001"
+CREATED = "2026-01-01T00:00:00Z"
+
+
+def _write_clicks(path: Path, *, bpm: float = 120.0, seconds: float = 8.0) -> None:
+    n = int(seconds * SR)
+    data = array("h", [0]) * n
+    for i in range(n):
+        data[i] = int(3000 * math.sin(2.0 * math.pi * 220.0 * i / SR))
+    t = 0.25
+    while t < seconds:
+        i0 = int(round(t * SR))
+        for j in range(min(int(0.005 * SR), n - i0)):
+            data[i0 + j] = 20000
+        t += 60.0 / bpm
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def test_async_output_matches_sync_and_runs_concurrently(tmp_path: Path) -> None:
+    wavs = []
+    for i, bpm in enumerate((100.0, 128.0)):
+        wav = tmp_path / f"t{i}.wav"
+        _write_clicks(wav, bpm=bpm)
+        wavs.append(wav)
+
+    async def main() -> list[dict[str, Any]]:
+        return await asyncio.gather(
+            *(run_analysis_v1_async(w, "pro", analysis_id=AID, created_at=CREATED) for w in wavs)
+        )
+
+    outs = asyncio.run(main())
+    for wav, out in zip(wavs, outs, strict=True):
+        expected = run_analysis_v1(
+            role="pro", input_path=str(wav), analysis_id=AID, created_at=CREATED
+        )
+        assert out == expected
+    assert [o["metrics"]["bpm"]["value"]["value_rounded"] for o in outs] == [100, 128]
+
+
+def test_async_mp3_transcodes_on_the_loop_and_keeps_format(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mp3 = tmp_path / "x.mp3"
+    mp3.write_bytes(b"not really an mp3")
+    src = tmp_path / "src.wav"
+    _write_clicks(src)
+    monkeypatch.setattr(ingest_v1.shutil, "which", lambda _name: "/usr/bin/ffmpeg")
+
+    def no_blocking_decoder(*_args: Any, **_kwargs: Any) -> Any:
+        raise AssertionError("the async runner must not use the blocking decoder")
+
+    calls: list[list[str]] = []
+
+    async def fake_async_run(
+        cmd: list[str], *, timeout_seconds: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(src.read_bytes())
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(ingest_v1, "_run_decoder_v1", no_blocking_decoder)
+    monkeypatch.setattr(ingest_v1, "_run_decoder_async_v1", fake_async_run)
+
+    out = asyncio.run(run_analysis_v1_async(mp3, "free", assert_contract=True))
+    assert len(calls) == 1 and calls[0][0] == "/usr/bin/ffmpeg"
+    assert out["track"]["format"] == "mp3"
+    assert out["metrics"]["bpm"]["value"]["value_rounded"] == 120
+
+    async def failing_run(
+        cmd: list[str], *, timeout_seconds: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        return subprocess.CompletedProcess(cmd, 1, "", "bad frame")
+
+    monkeypatch.setattr(ingest_v1, "_run_decoder_async_v1", failing_run)
+    with pytest.raises(EngineError) as excinfo:
+        asyncio.run(run_analysis_v1_async(mp3, "free"))
+    assert excinfo.value.code == "INVALID_INPUT"
+    assert (excinfo.value.context or {}).get("stderr_snippet") == "bad frame"
+
+
+def test_cancelling_the_task_stops_the_analysis(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wav = tmp_path / "a.wav"
+    _write_clicks(wav)
+    started = threading.Event()
+    finished: list[BaseException | None] = []
+    real = run_mod.preprocess_v1
+
+    def slow_preprocess(*args: Any, **kwargs: Any) -> Any:
+        started.set()
+        time.sleep(0.3)  # the task is cancelled meanwhile
+        return real(*args, **kwargs)
+
+    def record(*args: Any, **kwargs: Any) -> Any:
+        try:
+            out = real_analyze(*args, **kwargs)
+        except BaseException as exc:
+            finished.append(exc)
+            raise
+        finished.append(None)
+        return out
+
+    real_analyze = run_mod._analyze_v1
+    monkeypatch.setattr(run_mod, "preprocess_v1", slow_preprocess)
+    run_async_mod = importlib.import_module("engine.pipeline.run_async_v1")
+    monkeypatch.setattr(run_async_mod, "_analyze_v1", record)
+
+    async def main() -> None:
+        task = asyncio.create_task(run_analysis_v1_async(wav, "pro"))
+        await asyncio.to_thread(started.wait, 10.0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())  # joins the default executor, so the job has finished
+    (exc,) = finished
+    assert isinstance(exc, EngineError) and exc.code == "TIMEOUT"
+    assert (exc.context or {}).get("reason") == "cancelled"
+
+
+def test_cancelling_during_mp3_analysis_stops_before_the_transcode_is_removed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mp3 = tmp_path / "x.mp3"
+    mp3.write_bytes(b"not really an mp3")
+    src = tmp_path / "src.wav"
+    _write_clicks(src)
+    monkeypatch.setattr(ingest_v1.shutil, "which", lambda _name: "/usr/bin/ffmpeg")
+
+    async def fake_async_run(
+        cmd: list[str], *, timeout_seconds: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        Path(cmd[-1]).write_bytes(src.read_bytes())
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(ingest_v1, "_run_decoder_async_v1", fake_async_run)
+    run_async_mod = importlib.import_module("engine.pipeline.run_async_v1")
+    real_decode = run_async_mod.decode_transcoded_mp3_v1
+    started = threading.Event()
+    seen: list[tuple[bool, BaseException | None]] = []
+
+    def slow_decode(path: Path, *, wav_path: Path, **kwargs: Any) -> Any:
+        started.set()
+        time.sleep(0.3)  # the task is cancelled meanwhile
+        try:
+            out = real_decode(path, wav_path=wav_path, **kwargs)
+        except BaseException as exc:
+            seen.append((wav_path.exists(), exc))
+            raise
+        seen.append((wav_path.exists(), None))
+        return out
+
+    monkeypatch.setattr(run_async_mod, "decode_transcoded_mp3_v1", slow_decode)
+
+    async def main() -> None:
+        task = asyncio.create_task(run_analysis_v1_async(mp3, "pro"))
+        await asyncio.to_thread(started.wait, 10.0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The worker has already stopped by the time the task re-raises.
+        assert len(seen) == 1
+
+    asyncio.run(main())
+    ((wav_existed, exc),) = seen
+    assert wav_existed
+    assert isinstance(exc, EngineError) and exc.code == "TIMEOUT"
+    assert (exc.context or {}).get("reason") == "cancelled"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_async_decoder_kills_process_group_on_timeout(tmp_path: Path) -> None:
+    pid_file = tmp_path / "grandchild.pid"
+    cmd = ["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"]
+
+    t0 = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(ingest_v1._run_decoder_async_v1(cmd, timeout_seconds=0.3))
+    assert time.monotonic() - t0 < 10.0
+
+    grandchild = int(pid_file.read_text().strip())
+    for _ in range(50):
+        try:
+            os.kill(grandchild, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("decoder grandchild survived the process-group kill")
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import math
+import struct
+import wave
+from array import array
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from engine.features.tag_verification_v1 import parse_tag_key_v1, verify_key_tag_v1
+from engine.ingest.tags_v1 import read_embedded_tags_v1
+from engine.observability import hooks
+from engine.pipeline import run as run_mod
+from engine.pipeline.run import run_analysis_v1
+
+
+def _syncsafe(n: int) -> bytes:
+    return bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+
+
+def _text_frame(frame_id: bytes, text: str, *, major: int) -> bytes:
+    body = b"\x03" + text.encode("utf-8")
+    if major == 2:
+        return frame_id + len(body).to_bytes(3, "big") + body
+    size = _syncsafe(len(body)) if major == 4 else struct.pack(">I", len(body))
+    return frame_id + size + b"\x00\x00" + body
+
+
+def _id3(frames: list[bytes], *, major: int, padding: int = 16) -> bytes:
+    payload = b"".join(frames) + b"\x00" * padding
+    return b"ID3" + bytes([major, 0, 0]) + _syncsafe(len(payload)) + payload
+
+
+def _write_wav_with_tags(path: Path, data: array, *, sr: int, tag: bytes | None) -> None:
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(data.tobytes())
+    if tag is not None:
+        chunk = b"id3 " + struct.pack("<I", len(tag)) + tag + (b"\x00" if len(tag) & 1 else b"")
+        raw = bytearray(path.read_bytes() + chunk)
+        raw[4:8] = struct.pack("<I", len(raw) - 8)
+        path.write_bytes(bytes(raw))
+
+
+def _write_click_wav_with_tags(path: Path, *, bpm: float, tag: bytes | None) -> None:
+    sr = 44100
+    duration_s = 30.0
+    n = int(duration_s * sr)
+    data = array("h", [0]) * n
+    t = 0.0
+    while t < duration_s:
+        i0 = int(round(t * sr))
+        for j in range(int(0.005 * sr)):
+            if i0 + j < n:
+                data[i0 + j] = 20000
+        t += 60.0 / bpm
+    _write_wav_with_tags(path, data, sr=sr, tag=tag)
+
+
+def _write_a_minor_wav_with_tags(path: Path, *, tag: bytes) -> None:
+    sr = 22050
+    freqs = (220.0, 261.63, 329.63, 440.0)  # A minor triad, root doubled
+    data = array(
+        "h",
+        (
+            int(6000 * sum(math.sin(2.0 * math.pi * f * i / sr) for f in freqs))
+            for i in range(int(20.0 * sr))
+        ),
+    )
+    _write_wav_with_tags(path, data, sr=sr, tag=tag)
+
+
+@pytest.mark.parametrize(
+    ("major", "ids"),
+    [(2, (b"TBP", b"TKE")), (3, (b"TBPM", b"TKEY")), (4, (b"TBPM", b"TKEY"))],
+)
+def test_reads_tbpm_tkey_from_leading_id3v2(tmp_path: Path, major: int, ids: tuple) -> None:
+    p = tmp_path / "x.mp3"
+    tag = _id3(
+        [
+            _text_frame(b"TIT2" if major != 2 else b"TT2", "Title", major=major),
+            _text_frame(ids[0], "128", major=major),
+            _text_frame(ids[1], "F#m", major=major),
+        ],
+        major=major,
+    )
+    p.write_bytes(tag + b"\xff\xfb" + b"\x00" * 64)
+
+    tags = read_embedded_tags_v1(p)
+    assert tags.bpm == 128.0
+    assert tags.key == "F#m"
+
+
+def test_untagged_or_garbage_files_yield_empty_tags(tmp_path: Path) -> None:
+    p = tmp_path / "x.mp3"
+    p.write_bytes(b"ID3\x03\x00\x00\x7f\x7f\x7f\x7fTBPM")
+    assert read_embedded_tags_v1(p).bpm is None
+    assert read_embedded_tags_v1(tmp_path / "missing.mp3").key is None
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Am", ("A", "minor")),
+        ("Dbm", ("C#", "minor")),
+        ("E", ("E", None)),
+        ("G major", ("G", "major")),
+        ("8A", ("A", "minor")),
+        ("o", (None, None)),
+        ("", (None, None)),
+    ],
+)
+def test_parse_tag_key(text: str, expected: tuple) -> None:
+    assert parse_tag_key_v1(text) == expected
+
+
+def test_verify_key_tag_statuses() -> None:
+    block = {"value": "A", "mode": "minor"}
+    assert verify_key_tag_v1(block, tagged_key="A", tagged_mode="minor") == "confirmed"
+    assert verify_key_tag_v1(block, tagged_key="A", tagged_mode=None) == "confirmed"
+    assert verify_key_tag_v1(block, tagged_key="A", tagged_mode="major") == "refuted"
+    assert verify_key_tag_v1(block, tagged_key="C", tagged_mode="minor") == "refuted"
+    assert verify_key_tag_v1(None, tagged_key="C", tagged_mode=None) == "unknown"
+    assert verify_key_tag_v1(block, tagged_key=None, tagged_mode=None) == "unknown"
+
+
+def _count_decodes(monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    calls: list[Any] = []
+    real = run_mod.decode_input_path_v1
+
+    def counting(path: Path, **kwargs: Any) -> Any:
+        calls.append(kwargs.get("tempo_prior"))
+        return real(path, **kwargs)
+
+    monkeypatch.setattr(run_mod, "decode_input_path_v1", counting)
+    return calls
+
+
+def test_confirmed_tag_skips_full_search(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    p = tmp_path / "click_120.wav"
+    tag = _id3([_text_frame(b"TBPM", "120", major=3), _text_frame(b"TKEY", "Am", major=3)], major=3)
+    _write_click_wav_with_tags(p, bpm=120.0, tag=tag)
+    calls = _count_decodes(monkeypatch)
+
+    out = run_analysis_v1(role="pro", input_path=p, verify_tags=True)
+    bpm = out["metrics"]["bpm"]
+    assert bpm["value"]["value_rounded"] in {119, 120, 121}
+    assert bpm["evidence"]["tag_verification"] == {"status": "confirmed", "tagged_bpm": 120.0}
+    assert len(calls) == 1 and calls[0] is not None
+
+
+def test_refuted_tag_falls_back_to_full_search(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "click_120.wav"
+    _write_click_wav_with_tags(
+        p, bpm=120.0, tag=_id3([_text_frame(b"TBPM", "97", major=4)], major=4)
+    )
+    calls = _count_decodes(monkeypatch)
+
+    out = run_analysis_v1(role="free", input_path=p, verify_tags=True)
+    bpm = out["metrics"]["bpm"]
+    assert bpm["value"]["value_rounded"] in {119, 120, 121}
+    assert bpm["evidence"]["tag_verification"]["status"] == "refuted"
+    # The full search re-runs over the kept onset envelope: still one decode.
+    assert len(calls) == 1 and calls[0] is not None
+
+    guest = run_analysis_v1(role="guest", input_path=p, verify_tags=True, assert_contract=True)
+    assert "evidence" not in guest["metrics"]["bpm"]
+
+
+def test_untagged_file_runs_normal_analysis(tmp_path: Path) -> None:
+    p = tmp_path / "click_120.wav"
+    _write_click_wav_with_tags(p, bpm=120.0, tag=None)
+
+    out = run_analysis_v1(role="pro", input_path=p, verify_tags=True)
+    assert "evidence" not in out["metrics"]["bpm"]
+
+
+def _stages(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    stages: list[str] = []
+
+    def capture(event: str, **payload: Any) -> None:
+        if event == "stage_completed":
+            stages.append(payload["stage"])
+
+    monkeypatch.setattr(hooks, "emit", capture)
+    return stages
+
+
+def test_confirmed_key_tag_skips_the_24_key_search(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "a_minor.wav"
+    _write_a_minor_wav_with_tags(p, tag=_id3([_text_frame(b"TKEY", "Am", major=3)], major=3))
+    stages = _stages(monkeypatch)
+
+    out = run_analysis_v1(role="pro", input_path=p, verify_tags=True, features=("key_mode",))
+    key = out["metrics"]["key_mode"]
+    assert (key["value"], key["mode"]) == ("A", "minor")
+    assert key["evidence"]["tag_verification"]["status"] == "confirmed"
+    assert "hint_windows:key_tag" in stages
+    assert "hint_windows:key_windows" not in stages
+
+
+def test_refuted_key_tag_runs_the_24_key_search(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    p = tmp_path / "a_minor.wav"
+    _write_a_minor_wav_with_tags(p, tag=_id3([_text_frame(b"TKEY", "F#", major=3)], major=3))
+    stages = _stages(monkeypatch)
+
+    out = run_analysis_v1(role="pro", input_path=p, verify_tags=True, features=("key_mode",))
+    key = out["metrics"]["key_mode"]
+    assert key["value"] == "A"
+    assert key["evidence"]["tag_verification"]["status"] == "refuted"
+    assert stages.index("hint_windows:key_tag") < stages.index("hint_windows:key_windows")
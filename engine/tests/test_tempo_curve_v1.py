@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import wave
+from array import array
+from pathlib import Path
+
+from engine.core.config import EngineConfig
+from engine.features.tempo_curve_v1 import extract_tempo_curve_v1
+from engine.features.types import FeatureContext
+from engine.pipeline.run import run_analysis_v1
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+
+def _ctx(details: list[dict]) -> FeatureContext:
+    pre = PreprocessedAudio(
+        internal_sample_rate_hz=44100, channels=2, duration_seconds=60.0, layout="stereo"
+    )
+    return FeatureContext(audio=pre, bpm_hint_window_details=details)
+
+
+def _window(i: int, **keys: float) -> dict:
+    return {"start_s": 4.0 * i, "end_s": 4.0 * i + 8.0, **keys}
+
+
+def test_viterbi_rides_through_a_single_octave_outlier() -> None:
+    details = [_window(i, best_bpm=120.0, best_score=0.8) for i in range(6)]
+    # One window prefers half time but still carries weaker 120 evidence.
+    details[3] = _window(3, best_bpm=60.0, best_score=0.9, high_best_bpm=120.0, high_best_score=0.4)
+
+    curve = extract_tempo_curve_v1(_ctx(details), config=EngineConfig())
+    assert curve is not None
+    assert [p["bpm"] for p in curve["points"]] == [120.0] * 6
+    assert curve["points"][3] == {"start_s": 12.0, "end_s": 20.0, "bpm": 120.0}
+
+
+def test_curve_follows_timefeel_and_omits_short_evidence() -> None:
+    details = [_window(i, best_bpm=85.0, best_score=0.7) for i in range(4)]
+    curve = extract_tempo_curve_v1(
+        _ctx(details),
+        config=EngineConfig(),
+        bpm_block={"value": {"value_rounded": 170}, "timefeel": "double_time_preferred"},
+    )
+    assert curve is not None
+    assert {p["bpm"] for p in curve["points"]} == {170.0}
+
+    assert extract_tempo_curve_v1(_ctx(details[:2]), config=EngineConfig()) is None
+    # A low-confidence block without a value gets no curve either.
+    withheld = {"confidence": "low", "timefeel": "double_time_preferred"}
+    assert extract_tempo_curve_v1(_ctx(details), config=EngineConfig(), bpm_block=withheld) is None
+    untimed = [{"best_bpm": 120.0, "best_score": 0.9}] * 5
+    assert extract_tempo_curve_v1(_ctx(untimed), config=EngineConfig()) is None
+
+
+def _write_tempo_change_wav(path: Path, *, segments: list[tuple[float, float]]) -> None:
+    sr = 44100
+    total_s = sum(d for _, d in segments)
+    n = int(total_s * sr)
+    data = array("h", [0]) * n
+    t0 = 0.0
+    for bpm, dur in segments:
+        t = t0
+        while t < t0 + dur:
+            i0 = int(round(t * sr))
+            for j in range(int(0.005 * sr)):
+                if i0 + j < n:
+                    data[i0 + j] = 20000
+            t += 60.0 / bpm
+        t0 += dur
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(data.tobytes())
+
+
+def test_pro_output_carries_tempo_curve_and_other_roles_do_not(tmp_path: Path) -> None:
+    p = tmp_path / "ramp.wav"
+    _write_tempo_change_wav(p, segments=[(120.0, 36.0), (130.0, 16.0)])
+
+    pro = run_analysis_v1(role="pro", input_path=p, assert_contract=True)
+    assert pro["metrics"]["bpm"]["value"]["value_rounded"] == 120
+    points = pro["metrics"]["bpm"]["tempo_curve"]["points"]
+    assert abs(points[0]["bpm"] - 120.0) <= 2.5
+    assert abs(points[-1]["bpm"] - 130.0) <= 2.5
+    assert all(b["start_s"] > a["start_s"] for a, b in zip(points, points[1:], strict=False))
+
+    for role in ("free", "guest"):
+        out = run_analysis_v1(role=role, input_path=p, assert_contract=True)
+        assert "tempo_curve" not in out["metrics"].get("bpm", {})
+
+
+def test_withheld_bpm_publishes_no_tempo_curve(tmp_path: Path) -> None:
+    p = tmp_path / "jump.wav"
+    _write_tempo_change_wav(p, segments=[(120.0, 24.0), (140.0, 24.0)])
+    bpm = run_analysis_v1(role="pro", input_path=p, assert_contract=True)["metrics"]["bpm"]
+    assert "value" not in bpm
+    assert "tempo_curve" not in bpm
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import math
+import wave
+from array import array
+from pathlib import Path
+
+from engine.core.config import EngineConfig
+from engine.features.tonal_drift_v1 import TonalDriftDetectorV1, extract_tonal_drift_ranges_v1
+from engine.features.types import FeatureContext
+from engine.pipeline.evidence_snapshot_v1 import EvidenceSnapshotV1
+from engine.pipeline.run import run_analysis_v1
+from engine.preprocess.preprocess_v1 import PreprocessedAudio
+
+SR = 44100
+C_MAJOR, G_MAJOR, A_MINOR, AB_MAJOR = 0, 14, 19, 16
+
+
+def _row(slot: int, *, lead: float = 0.3) -> list[float]:
+    row = [0.2] * 24
+    row[slot] = 0.2 + lead
+    return row
+
+
+def _ctx(slots: list[int], *, hop_s: float = 4.0) -> FeatureContext:
+    return FeatureContext(
+        audio=PreprocessedAudio(
+            internal_sample_rate_hz=SR,
+            channels=1,
+            duration_seconds=hop_s * len(slots) + 4.0,
+            layout="mono",
+        ),
+        key_mode_window_scores=[_row(s) for s in slots],
+        key_mode_window_spans=[[hop_s * i, hop_s * i + 8.0] for i in range(len(slots))],
+    )
+
+
+def test_detector_segments_key_changes_and_ignores_single_window_blips() -> None:
+    det = TonalDriftDetectorV1(threshold=0.3, margin=0.05, min_windows=2)
+    slots = [C_MAJOR] * 5 + [G_MAJOR] + [C_MAJOR] * 3 + [AB_MAJOR] * 4 + [C_MAJOR] * 3
+    for i, slot in enumerate(slots):
+        det.feed(_row(slot), start_s=4.0 * i, end_s=4.0 * i + 8.0)
+    det.feed([1.0] * 12, start_s=64.0, end_s=72.0)  # malformed rows are skipped
+    segments = det.finish()
+
+    assert [(s.slot, s.start_s, s.end_s, s.windows) for s in segments] == [
+        (C_MAJOR, 0.0, 36.0, 9),
+        (AB_MAJOR, 36.0, 52.0, 4),
+        (C_MAJOR, 52.0, 68.0, 3),
+    ]
+
+
+def test_ranges_mark_departures_from_the_home_key_with_severity() -> None:
+    cfg = EngineConfig()
+    ctx = _ctx([C_MAJOR] * 6 + [A_MINOR] * 3 + [C_MAJOR] * 3 + [G_MAJOR] * 3 + [AB_MAJOR] * 3)
+    assert extract_tonal_drift_ranges_v1(ctx, config=cfg) == [
+        {"start_s": 24.0, "end_s": 36.0, "severity": "low", "key": "A minor"},
+        {"start_s": 48.0, "end_s": 60.0, "severity": "medium", "key": "G major"},
+        {"start_s": 60.0, "end_s": 76.0, "severity": "high", "key": "G# major"},
+    ]
+    assert extract_tonal_drift_ranges_v1(_ctx([C_MAJOR] * 10), config=cfg) == []
+    untimed = FeatureContext(audio=ctx.audio, key_mode_window_scores=ctx.key_mode_window_scores)
+    assert extract_tonal_drift_ranges_v1(untimed, config=cfg) == []
+
+
+def _write_progression(path: Path, sections: list[tuple[list[float], float]]) -> None:
+    data = array("h")
+    i = 0
+    for freqs, seconds in sections:
+        amp = 7500.0 / len(freqs)
+        for _ in range(int(seconds * SR)):
+            data.append(int(amp * sum(math.sin(2.0 * math.pi * f * i / SR) for f in freqs)))
+            i += 1
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(data.tobytes())
+
+
+def test_section_key_change_reaches_free_and_pro_events(tmp_path: Path) -> None:
+    wav = tmp_path / "c_then_ab.wav"
+    c_major = [261.63, 329.63, 392.0]
+    ab_major = [207.65, 261.63, 311.13]
+    _write_progression(wav, [(c_major, 24.0), (ab_major, 16.0)])
+
+    snapshots: list[EvidenceSnapshotV1] = []
+    pro = run_analysis_v1(role="pro", input_path=wav, evidence_sink=snapshots.append)
+    (drift,) = pro["events"]["tonality"]["tonal_drift_ranges"]
+    assert drift["key"] == "G# major" and drift["severity"] == "high"
+    # Change points sit on window starts: within one hop (about 4 s) of the edit.
+    assert abs(drift["start_s"] - 24.0) <= 4.5 and drift["end_s"] > drift["start_s"]
+
+    free = run_analysis_v1(role="free", evidence_snapshot=snapshots[0])
+    assert free["events"]["tonality"]["tonal_drift_ranges"] == [drift]
+    assert run_analysis_v1(role="guest", input_path=wav)["events"] == {}